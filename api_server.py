@@ -6,6 +6,7 @@ Bridges Next.js frontend with Bolna AI Python backend
 import os
 import json
 import logging
+import threading
 from datetime import datetime
 from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
@@ -13,7 +14,21 @@ import requests
 import subprocess
 from bolna_agent import BolnaAgent
 from update_candidate_status import update_candidate_in_json, parse_call_outcome
-from config import BOLNA_API_KEY, AGENT_ID
+from candidate_store import get_candidate_store
+from webhook_store import get_webhook_log
+from execution_mapping import get_execution_mappings
+from webhook_queue import WebhookIngestQueue
+from webhook_dedup import get_webhook_deduplicator, TERMINAL_STATUSES
+from webhook_payload import WebhookPayload
+from bolna_http import get_bolna_http, CircuitOpenError
+from call_status_cache import get_call_status_cache
+from execution_sync import load_sync_state
+from campaigns import CampaignQueue, CampaignDispatcher, DialDeferred, matches_filter, FILTER_FIELDS
+from retry_scheduler import RetryScheduler
+from call_reconciler import CallReconciler
+from call_registry import get_call_registry, CallInFlightError
+from call_jobs import CallJobQueue, CallJobWorkers, PermanentJobError
+from config import BOLNA_API_KEY, AGENT_ID, WEBHOOK_ASYNC, CANDIDATE_STREAM_HEARTBEAT, CAMPAIGN_MAX_IN_FLIGHT, CALL_RECONCILE_ENABLED, CALL_JOB_WAIT
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -63,21 +78,7 @@ else:
 def save_execution_mapping(execution_id: str, candidate_id: int, phone: str):
     """Save execution_id to candidate_id mapping"""
     try:
-        mapping_file = 'execution_mapping.json'
-        mappings = {}
-        if os.path.exists(mapping_file):
-            with open(mapping_file, 'r', encoding='utf-8') as f:
-                mappings = json.load(f)
-        
-        mappings[execution_id] = {
-            'candidate_id': candidate_id,
-            'phone': phone,
-            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
-        
-        with open(mapping_file, 'w', encoding='utf-8') as f:
-            json.dump(mappings, f, indent=2, ensure_ascii=False)
-        
+        get_execution_mappings().set(execution_id, candidate_id, phone)
         print(f"💾 Saved execution mapping: {execution_id} -> candidate {candidate_id}")
     except Exception as e:
         print(f"⚠️  Error saving execution mapping: {e}")
@@ -85,60 +86,31 @@ def save_execution_mapping(execution_id: str, candidate_id: int, phone: str):
 def get_execution_mapping(execution_id: str):
     """Get candidate_id from execution_id"""
     try:
-        mapping_file = 'execution_mapping.json'
-        if os.path.exists(mapping_file):
-            with open(mapping_file, 'r', encoding='utf-8') as f:
-                mappings = json.load(f)
-                return mappings.get(execution_id)
-        return None
+        return get_execution_mappings().get(execution_id)
     except Exception as e:
         print(f"⚠️  Error reading execution mapping: {e}")
         return None
 
-def save_webhook_data(execution_id: str, payload: dict, candidate_id: int = None):
+def save_webhook_data(execution_id: str, payload: dict, candidate_id: int = None, webhook: WebhookPayload = None):
     """
-    Save complete webhook data to data/webhook_data.json
+    Save complete webhook data to the append-only webhook event log (data/webhook_log/)
     Stores all payload data permanently organized by execution_id
+    
+    Args:
+        execution_id: Execution ID
+        payload: Raw webhook payload
+        candidate_id: Candidate ID (looked up from the execution mapping if not provided)
+        webhook: Already-normalized payload, to avoid resolving the fields again
     """
     try:
-        data_dir = 'data'
-        if not os.path.exists(data_dir):
-            os.makedirs(data_dir)
-        
-        webhook_data_file = os.path.join(data_dir, 'webhook_data.json')
-        
-        # Load existing webhook data
-        webhook_data = {}
-        if os.path.exists(webhook_data_file):
-            try:
-                with open(webhook_data_file, 'r', encoding='utf-8') as f:
-                    webhook_data = json.load(f)
-            except:
-                webhook_data = {}
-        
         # Extract candidate_id if not provided
         if candidate_id is None:
             mapping = get_execution_mapping(execution_id)
             if mapping:
                 candidate_id = mapping.get('candidate_id')
         
-        # Get execution details (could be nested in data/execution)
-        execution_details = payload.get('data') or payload.get('execution') or payload
-        
-        # Extract telephony data
-        telephony_data = (
-            payload.get('telephony_data') or
-            execution_details.get('telephony_data') or
-            {}
-        )
-        
-        # Extract recording URL from telephony_data
-        recording_url = (
-            telephony_data.get('recording_url') or
-            payload.get('recording_url') or
-            execution_details.get('recording_url') or
-            ''
-        )
+        if webhook is None:
+            webhook = WebhookPayload(payload)
         
         # Create/update entry for this execution with ALL extracted fields
         entry = {
@@ -151,151 +123,18 @@ def save_webhook_data(execution_id: str, payload: dict, candidate_id: int = None
             'payload': payload,
             
             # Core extracted fields (easily accessible)
-            'status': (
-                payload.get('status') or
-                execution_details.get('status') or
-                'unknown'
-            ),
-            'transcript': (
-                payload.get('transcript') or
-                payload.get('conversation_transcript') or
-                execution_details.get('transcript') or
-                execution_details.get('conversation_transcript') or
-                ''
-            ),
-            'summary': (
-                payload.get('summary') or
-                execution_details.get('summary') or
-                ''
-            ),
-            'extracted_data': (
-                payload.get('extracted_data') or
-                execution_details.get('extracted_data') or
-                {}
-            ),
-            'recipient_phone_number': (
-                payload.get('user_number') or  # Bolna AI webhook format uses "user_number"
-                payload.get('recipient_phone_number') or
-                payload.get('phone_number') or
-                payload.get('phone') or
-                execution_details.get('user_number') or
-                execution_details.get('recipient_phone_number') or
-                telephony_data.get('to_number') or
-                None
-            ),
-            'agent_phone_number': (
-                payload.get('agent_number') or  # Bolna AI webhook format uses "agent_number"
-                payload.get('agent_phone_number') or
-                telephony_data.get('from_number') or
-                None
-            ),
-            'telephony_data': telephony_data,
-            'recording_url': recording_url,
-            'conversation_duration': (
-                payload.get('conversation_duration') or
-                execution_details.get('conversation_duration') or
-                telephony_data.get('duration') or
-                None
-            ),
-            'total_cost': (
-                payload.get('total_cost') or
-                execution_details.get('total_cost') or
-                None
-            ),
-            'cost_breakdown': (
-                payload.get('cost_breakdown') or
-                execution_details.get('cost_breakdown') or
-                {}
-            ),
-            'usage_breakdown': (
-                payload.get('usage_breakdown') or
-                execution_details.get('usage_breakdown') or
-                {}
-            ),
-            'context_details': (
-                payload.get('context_details') or
-                execution_details.get('context_details') or
-                {}
-            ),
-            'latency_data': (
-                payload.get('latency_data') or
-                execution_details.get('latency_data') or
-                {}
-            ),
-            'agent_id': (
-                payload.get('agent_id') or
-                execution_details.get('agent_id') or
-                None
-            ),
-            'batch_id': (
-                payload.get('batch_id') or
-                execution_details.get('batch_id') or
-                None
-            ),
-            'created_at': (
-                payload.get('created_at') or
-                execution_details.get('created_at') or
-                None
-            ),
-            'updated_at': (
-                payload.get('updated_at') or
-                execution_details.get('updated_at') or
-                None
-            ),
-            'answered_by_voice_mail': (
-                payload.get('answered_by_voice_mail') or
-                execution_details.get('answered_by_voice_mail') or
-                None
-            ),
-            'error_message': (
-                payload.get('error_message') or
-                execution_details.get('error_message') or
-                None
-            ),
-            'agent_extraction': (
-                payload.get('agent_extraction') or
-                execution_details.get('agent_extraction') or
-                None
-            ),
-            'provider': (
-                payload.get('provider') or
-                execution_details.get('provider') or
-                telephony_data.get('provider') or
-                None
-            )
+            **webhook.stored_fields()
         }
         
-        # Store by execution_id (allows updates to same execution)
-        webhook_data[execution_id] = entry
-        
-        # Also maintain a chronological list
-        if 'all_webhooks' not in webhook_data:
-            webhook_data['all_webhooks'] = []
-        
-        # Add to chronological list (most recent first)
-        webhook_data['all_webhooks'].insert(0, {
-            'execution_id': execution_id,
-            'candidate_id': candidate_id,
-            'timestamp': entry['timestamp'],
-            'status': entry['status']
-        })
-        
-        # Remove duplicates from all_webhooks based on execution_id, keeping the most recent
-        seen_execution_ids = set()
-        unique_all_webhooks = []
-        for webhook_entry in webhook_data['all_webhooks']:
-            if webhook_entry['execution_id'] not in seen_execution_ids:
-                unique_all_webhooks.append(webhook_entry)
-                seen_execution_ids.add(webhook_entry['execution_id'])
-        webhook_data['all_webhooks'] = unique_all_webhooks
-
-        with open(webhook_data_file, 'w', encoding='utf-8') as f:
-            json.dump(webhook_data, f, indent=2, ensure_ascii=False)
-        print(f"💾 Saved complete webhook data for execution {execution_id} to {webhook_data_file}")
+        # Append to the event log (latest record per execution wins)
+        get_webhook_log().append(entry)
+        # The cached call status for this execution is now out of date
+        get_call_status_cache().invalidate(execution_id)
+        print(f"💾 Saved complete webhook data for execution {execution_id} to webhook event log")
         
         # Also save transcript separately with candidate info
         if entry.get('transcript'):
-            save_transcript_separately(execution_id, entry['transcript'], candidate_id, payload)
+            save_transcript_separately(execution_id, entry['transcript'], candidate_id, payload, webhook)
         
         return True
     except Exception as e:
@@ -304,7 +143,7 @@ def save_webhook_data(execution_id: str, payload: dict, candidate_id: int = None
         traceback.print_exc()
         return False
 
-def save_transcript_separately(execution_id: str, transcript: str, candidate_id: int = None, payload: dict = None):
+def save_transcript_separately(execution_id: str, transcript: str, candidate_id: int = None, payload: dict = None, webhook: WebhookPayload = None):
     """
     Save transcript separately in data/transcripts.json
     Stores in data/transcripts.json organized by candidate_id and execution_id
@@ -329,47 +168,23 @@ def save_transcript_separately(execution_id: str, transcript: str, candidate_id:
         candidate_info = {}
         if candidate_id:
             try:
-                # Use absolute path
-                base_dir = os.path.dirname(os.path.abspath(__file__))
-                json_path = os.path.join(base_dir, 'data', 'candidates.json')
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    candidates_data = json.load(f)
-                    candidate = next(
-                        (c for c in candidates_data.get('candidates', []) if c.get('id') == candidate_id),
-                        None
-                    )
-                    if candidate:
-                        candidate_info = {
-                            'candidate_id': candidate_id,
-                            'name': candidate.get('name', 'Unknown'),
-                            'position': candidate.get('position', 'Unknown'),
-                            'phone': candidate.get('phone', 'Unknown'),
-                            'email': candidate.get('email', 'Unknown')
-                        }
+                candidate = get_candidate_store().get_candidate(candidate_id)
+                if candidate:
+                    candidate_info = {
+                        'candidate_id': candidate_id,
+                        'name': candidate.get('name', 'Unknown'),
+                        'position': candidate.get('position', 'Unknown'),
+                        'phone': candidate.get('phone', 'Unknown'),
+                        'email': candidate.get('email', 'Unknown')
+                    }
             except:
                 pass
         
         # Get phone numbers from payload
-        telephony_data = (
-            payload.get('telephony_data') or
-            payload.get('data', {}).get('telephony_data') or
-            payload.get('execution', {}).get('telephony_data') or
-            {}
-        ) if payload else {}
-        
-        caller_id = (
-            telephony_data.get('from_number') or
-            payload.get('agent_phone_number') if payload else None or
-            payload.get('caller_id') if payload else None or
-            None
-        )
-        
-        recipient_phone = (
-            telephony_data.get('to_number') or
-            payload.get('recipient_phone_number') if payload else None or
-            candidate_info.get('phone') if candidate_info else None or
-            None
-        )
+        if webhook is None:
+            webhook = WebhookPayload(payload or {})
+        caller_id = webhook.agent_phone_number
+        recipient_phone = webhook.recipient_phone_number or candidate_info.get('phone')
         
         # Create transcript entry
         transcript_entry = {
@@ -384,16 +199,8 @@ def save_transcript_separately(execution_id: str, transcript: str, candidate_id:
             'transcript': transcript,
             'timestamp': datetime.now().isoformat(),
             'received_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'status': (
-                payload.get('status') if payload else 'unknown' or
-                payload.get('data', {}).get('status') if payload else None or
-                'unknown'
-            ),
-            'call_duration': (
-                telephony_data.get('duration') or
-                payload.get('conversation_duration') if payload else None or
-                None
-            )
+            'status': webhook.status,
+            'call_duration': webhook.telephony_data.get('duration') or webhook.conversation_duration
         }
         
         # Initialize structure if needed
@@ -703,10 +510,6 @@ def show_logs():
 def health_check():
     """Health check endpoint to verify Flask backend is running"""
     try:
-        # Check if candidates file exists and is readable
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        json_path = os.path.join(base_dir, 'data', 'candidates.json')
-        
         health_status = {
             'status': 'healthy',
             'service': 'Bolna Calling Agent API',
@@ -715,28 +518,61 @@ def health_check():
             'checks': {
                 'api_server': True,
                 'bolna_agent': agent is not None,
-                'candidates_file': os.path.exists(json_path),
-                'candidates_file_readable': os.access(json_path, os.R_OK) if os.path.exists(json_path) else False,
-                'candidates_file_writable': os.access(json_path, os.W_OK) if os.path.exists(json_path) else False
+                'candidate_store': False
             }
         }
         
-        # Try to read candidates file to verify it's valid JSON
-        if os.path.exists(json_path):
-            try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    health_status['checks']['candidates_count'] = len(data.get('candidates', []))
-                    health_status['checks']['available_slots_count'] = len(data.get('availableSlots', []))
-            except Exception as e:
-                health_status['checks']['candidates_file_valid'] = False
-                health_status['checks']['candidates_file_error'] = str(e)
+        # Try to read from the candidate store to verify it's usable
+        try:
+            store = get_candidate_store()
+            health_status['checks']['candidate_store'] = True
+            health_status['checks']['candidate_store_backend'] = store.describe()
+            health_status['checks']['candidates_count'] = store.count_candidates()
+            health_status['checks']['available_slots_count'] = len(store.get_available_slots())
+        except Exception as e:
+            health_status['checks']['candidate_store_error'] = str(e)
+        
+        # Webhook ingestion queue depth/lag (a full queue means webhooks are being rejected)
+        if WEBHOOK_ASYNC:
+            queue_stats = get_webhook_queue().get_stats()
+            health_status['checks']['webhook_queue'] = queue_stats['depth'] < queue_stats['max_depth']
+            health_status['checks']['webhook_queue_stats'] = queue_stats
+        
+        # Bolna API connection pool reuse and retry counters
+        bolna_http_stats = get_bolna_http().get_stats()
+        bolna_http_stats['single_flight'] = BolnaAgent._single_flight.get_stats()
+        health_status['checks']['bolna_http_stats'] = bolna_http_stats
+        # False while any endpoint class is failing fast; informational, the server itself still works
+        health_status['checks']['bolna_api'] = get_bolna_http().is_available()
+        
+        # Outbound campaign dispatcher (only once it has been started)
+        if _campaign_dispatcher is not None:
+            health_status['checks']['campaign_stats'] = _campaign_dispatcher.get_stats()
+        
+        # Reconciler for candidates stuck in "calling" (only once it has been started)
+        if _call_reconciler is not None:
+            health_status['checks']['call_reconciler_stats'] = _call_reconciler.get_stats()
+        
+        # Durable /api/call job queue (only once its workers have been started)
+        if _call_job_workers is not None:
+            health_status['checks']['call_job_stats'] = _call_job_workers.get_stats()
+        
+        # Calls currently holding a candidate / phone number
+        health_status['checks']['call_registry_stats'] = get_call_registry().get_stats()
+        
+        # Automatic call retries (only once the scheduler has been used)
+        if _retry_scheduler is not None:
+            health_status['checks']['call_retry_stats'] = _retry_scheduler.get_stats()
+        
+        # Last pass of the execution sync service (execution_sync.py), if it runs on this host
+        sync_state = load_sync_state()
+        if sync_state:
+            health_status['checks']['execution_sync_stats'] = sync_state
         
         # Determine overall health status
         all_checks_pass = (
             health_status['checks']['api_server'] and
-            health_status['checks']['candidates_file'] and
-            health_status['checks']['candidates_file_readable']
+            health_status['checks']['candidate_store']
         )
         
         if not all_checks_pass:
@@ -979,14 +815,13 @@ def generate_check_items(checks):
     check_labels = {
         'api_server': 'API Server',
         'bolna_agent': 'Bolna AI Agent',
-        'candidates_file': 'Candidates File',
-        'candidates_file_readable': 'File Readable',
-        'candidates_file_writable': 'File Writable',
-        'candidates_file_valid': 'File Valid JSON',
+        'candidate_store': 'Candidate Store',
+        'webhook_queue': 'Webhook Queue',
+        'bolna_api': 'Bolna API (circuit closed)',
     }
     
     for key, value in checks.items():
-        if key in ['candidates_count', 'available_slots_count']:
+        if key in ['candidates_count', 'available_slots_count', 'candidate_store_backend', 'candidate_store_error', 'webhook_queue_stats', 'bolna_http_stats', 'execution_sync_stats', 'campaign_stats', 'call_retry_stats', 'call_reconciler_stats', 'call_registry_stats', 'call_job_stats']:
             continue
         
         label = check_labels.get(key, key.replace('_', ' ').title())
@@ -1004,62 +839,54 @@ def generate_check_items(checks):
 
 @app.route('/api/candidates', methods=['GET'])
 def get_candidates():
-    """Get all candidates"""
+    """
+    Get all candidates
+
+    Responses carry ETag "v<version>" (the store version, stable across
+    restarts and workers). If-None-Match with the current version returns 304
+    without reading any candidate. ?since=<version> returns only the changes
+    after that version: {version, reset, candidates, deleted, availableSlots}.
+    """
     try:
-        # Use absolute path to ensure consistency with update operations
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        json_path = os.path.join(base_dir, 'data', 'candidates.json')
-        
-        # Fallback to relative if absolute doesn't exist
-        if not os.path.exists(json_path):
-            json_path = 'data/candidates.json'
-        
-        # Normalize to absolute path
-        json_path = os.path.abspath(json_path)
-        
-        # Ensure file exists
-        if not os.path.exists(json_path):
-            print(f"❌ Candidates file not found at: {json_path}")
-            # Try alternative locations
-            alt_paths = [
-                'data/candidates.json',
-                os.path.join(os.getcwd(), 'data', 'candidates.json')
-            ]
-            for alt_path in alt_paths:
-                if os.path.exists(alt_path):
-                    json_path = os.path.abspath(alt_path)
-                    print(f"✅ Found candidates file at alternative location: {json_path}")
-                    break
-            else:
-                raise FileNotFoundError(f"Candidates file not found at any location")
-        
-        # Check file modification time
-        file_mtime = os.path.getmtime(json_path)
-        mtime_str = datetime.fromtimestamp(file_mtime).strftime('%Y-%m-%d %H:%M:%S')
-        
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Log current status counts for debugging
-        status_counts = {}
-        for candidate in data.get('candidates', []):
-            status = candidate.get('status', 'unknown')
-            status_counts[status] = status_counts.get(status, 0) + 1
-        
-        # Log file path, modification time, and status breakdown  
-        # This helps debug if read/write operations are using different files
-        print(f"📖 [GET /api/candidates] Reading from: {json_path}")
-        print(f"   File last modified: {mtime_str}")
-        print(f"📊 Status breakdown: {status_counts}")
-        print(f"   Total candidates: {len(data.get('candidates', []))}")
-        
+        store = get_candidate_store()
+        version = store.get_version()
+        etag = f'"v{version}"'
+
+        if_none_match = request.headers.get('If-None-Match', '')
+        if etag in [tag.strip().replace('W/', '', 1) for tag in if_none_match.split(',')]:
+            response = Response(status=304)
+            response.headers['ETag'] = etag
+            response.headers['Cache-Control'] = 'no-cache, private'
+            return response
+
+        since = request.args.get('since')
+        if since not in (None, ''):
+            try:
+                since = int(since)
+            except ValueError:
+                return jsonify({'error': 'since must be an integer version'}), 400
+            data = store.changes_since(since)
+            print(f"📖 [GET /api/candidates?since={since}] v{data['version']}: "
+                  f"{len(data['candidates'])} changed, {len(data['deleted'])} deleted"
+                  f"{' (reset)' if data['reset'] else ''}")
+        else:
+            data = store.export_data()
+            data['version'] = version
+
+            # Log current status counts for debugging
+            status_counts = {}
+            for candidate in data.get('candidates', []):
+                status = candidate.get('status', 'unknown')
+                status_counts[status] = status_counts.get(status, 0) + 1
+
+            print(f"📖 [GET /api/candidates] Reading from: {store.describe()} (v{version})")
+            print(f"📊 Status breakdown: {status_counts}")
+            print(f"   Total candidates: {len(data.get('candidates', []))}")
+
         response = jsonify(data)
-        # Add aggressive cache-busting headers
-        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate, private'
-        response.headers['Pragma'] = 'no-cache'
-        response.headers['Expires'] = '0'
-        response.headers['Last-Modified'] = datetime.now().strftime('%a, %d %b %Y %H:%M:%S GMT')
-        response.headers['ETag'] = f'"{hash(json.dumps(data, sort_keys=True))}"'
+        # Clients may cache but must revalidate; unchanged data costs a 304
+        response.headers['Cache-Control'] = 'no-cache, private'
+        response.headers['ETag'] = f'"v{data["version"]}"'
         return response
     except Exception as e:
         import traceback
@@ -1071,81 +898,106 @@ def get_candidates():
             'availableSlots': []
         }), 500
 
+def _sse_event(event: str, data: dict, event_id=None) -> str:
+    """Format one Server-Sent Events message"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+    return '\n'.join(lines) + '\n\n'
+
+@app.route('/api/candidates/stream', methods=['GET'])
+def stream_candidates():
+    """
+    Server-Sent Events stream of candidate changes
+
+    The first event is a 'snapshot' (full candidate list), or a 'changes' delta
+    when the client resumes with ?since=<version> or the Last-Event-ID header
+    (sent automatically by EventSource on reconnect). After that only changed
+    candidates are pushed as 'changes' events: {version, reset, candidates,
+    deleted, availableSlots}. A comment line is sent every
+    CANDIDATE_STREAM_HEARTBEAT seconds to keep proxies from closing the connection.
+    """
+    store = get_candidate_store()
+    since = request.args.get('since') or request.headers.get('Last-Event-ID')
+    try:
+        since = int(since) if since not in (None, '') else None
+    except ValueError:
+        since = None
+
+    def generate():
+        version = since
+        try:
+            if version is None:
+                version = store.get_version()
+                data = store.export_data()
+                data['version'] = version
+                yield _sse_event('snapshot', data, version)
+            else:
+                changes = store.changes_since(version)
+                version = changes['version']
+                yield _sse_event('changes', changes, version)
+
+            while True:
+                current = store.wait_for_change(version, CANDIDATE_STREAM_HEARTBEAT)
+                if current == version:
+                    yield ': heartbeat\n\n'
+                    continue
+                changes = store.changes_since(version)
+                version = changes['version']
+                yield _sse_event('changes', changes, version)
+        except GeneratorExit:
+            pass
+        except Exception as e:
+            print(f"❌ Candidate stream error: {e}")
+            yield _sse_event('error', {'error': str(e)})
+
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 @app.route('/api/reset-statuses', methods=['POST'])
 def reset_candidate_statuses():
     """Reset ALL candidate statuses to 'pending'"""
     try:
-        # Use absolute path to ensure we're writing to the correct location
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        json_path = os.path.join(base_dir, 'data', 'candidates.json')
-        
-        print(f"📝 Reset statuses - Using path: {json_path}")
-        
-        if not os.path.exists(json_path):
-            print(f"⚠️  Candidates file not found: {json_path}")
-            return jsonify({
-                'success': False,
-                'error': f'Candidates file not found: {json_path}'
-            }), 404
-        
-        # Check file permissions
-        if not os.access(json_path, os.W_OK):
-            print(f"⚠️  No write permission for file: {json_path}")
-            return jsonify({
-                'success': False,
-                'error': f'No write permission for file: {json_path}'
-            }), 403
-            
-        # Read current data
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        store = get_candidate_store()
+        print(f"📝 Reset statuses - Using store: {store.describe()}")
         
         # Reset ALL statuses to 'pending' and restore original interviews if rescheduled
-        reset_count = 0
         changes = []
-        for candidate in data['candidates']:
+        
+        def reset_to_pending(candidate):
             old_status = candidate.get('status', 'unknown')
-            if old_status != 'pending':
-                # If candidate was rescheduled, restore original interview
-                if 'originalInterview' in candidate and candidate['originalInterview']:
-                    candidate['scheduledInterview'] = candidate['originalInterview'].copy()
-                    del candidate['originalInterview']
-                    changes.append(f"{candidate.get('name', 'Unknown')}: {old_status} → pending (original interview restored)")
-                else:
-                    changes.append(f"{candidate.get('name', 'Unknown')}: {old_status} → pending")
-                
-                candidate['status'] = 'pending'
-                reset_count += 1
-                print(f"  ✅ Reset candidate {candidate['id']} ({candidate.get('name', 'Unknown')}): {old_status} → pending")
+            if old_status == 'pending':
+                return False
+            # If candidate was rescheduled, restore original interview
+            if 'originalInterview' in candidate and candidate['originalInterview']:
+                candidate['scheduledInterview'] = candidate['originalInterview'].copy()
+                del candidate['originalInterview']
+                changes.append(f"{candidate.get('name', 'Unknown')}: {old_status} → pending (original interview restored)")
+            else:
+                changes.append(f"{candidate.get('name', 'Unknown')}: {old_status} → pending")
+            
+            candidate['status'] = 'pending'
+            print(f"  ✅ Reset candidate {candidate['id']} ({candidate.get('name', 'Unknown')}): {old_status} → pending")
+            return True
         
-        # Write back to file
         try:
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            print(f"✅ Successfully wrote {reset_count} changes to {json_path}")
+            reset = store.update_all(reset_to_pending, exclude_status='pending')
+            reset_count = len(reset)
         except PermissionError as pe:
-            print(f"❌ Permission error writing file: {pe}")
+            print(f"❌ Permission error writing candidate store: {pe}")
             return jsonify({
                 'success': False,
-                'error': f'Permission denied writing to file: {str(pe)}'
+                'error': f'Permission denied writing to candidate store: {str(pe)}'
             }), 403
-        except Exception as write_error:
-            print(f"❌ Error writing file: {write_error}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
-                'success': False,
-                'error': f'Error writing file: {str(write_error)}'
-            }), 500
         
-        # Verify the file was written correctly
-        try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                verify_data = json.load(f)
-            verify_pending = sum(1 for c in verify_data.get('candidates', []) if c.get('status') == 'pending')
-            print(f"✅ Verified: {verify_pending} candidates now have 'pending' status")
-        except Exception as verify_error:
-            print(f"⚠️  Could not verify file write: {verify_error}")
+        # Let them be called again right away, even if a call was still registered as in flight
+        registry = get_call_registry()
+        for candidate in reset:
+            registry.release_candidate(candidate['id'])
         
         print(f"✅ Reset {reset_count} candidate statuses to pending")
         return jsonify({
@@ -1163,9 +1015,253 @@ def reset_candidate_statuses():
             'error': str(e)
         }), 500
 
+def bolna_unavailable_response(e: CircuitOpenError, **extra):
+    """503 returned without contacting Bolna while its circuit breaker is open"""
+    retry_after = max(round(e.retry_after), 1)
+    response = jsonify(dict({
+        'success': False,
+        'error': str(e),
+        'error_type': 'bolna_unavailable',
+        'retry_after': retry_after
+    }, **extra))
+    response.headers['Retry-After'] = str(retry_after)
+    return response, 503
+
+def start_candidate_call(candidate_id, phone, name, interview_date, interview_time, scheduled_at=None):
+    """
+    Dial a candidate through Bolna and record the call (execution mapping,
+    candidate status "calling"). Used by /api/call, the campaign dispatcher
+    and the retry scheduler.
+    
+    Args:
+        scheduled_at: ISO datetime to have Bolna place the call later; the
+                      candidate's status is left as is until it happens, but
+                      the call holds its in-flight claim from now on
+    
+    Returns:
+        Tuple of (execution_id, alternative_slots)
+    
+    Raises:
+        CallInFlightError: The candidate or number already has a call in flight,
+                           placed or scheduled (nothing was sent)
+        CircuitOpenError: Bolna is unavailable (nothing was sent)
+        ValueError: Bolna rejected the call (e.g. low wallet balance)
+    """
+    # One call in flight (or scheduled) per candidate and phone number, across all workers
+    registry = get_call_registry()
+    claim = registry.acquire(candidate_id, phone)
+    if not claim['acquired']:
+        # A double click usually lands while the first dial is still running
+        # (scheduling a retry doesn't wait: a call already in flight makes it unnecessary)
+        execution_id = claim['execution_id'] or (None if scheduled_at else registry.wait_for_execution(claim['claim_id']))
+        print(f"⚠️  Candidate {candidate_id} ({phone}) already has a call in flight: {execution_id or 'still dialing'}")
+        raise CallInFlightError(execution_id, candidate_id, phone)
+    
+    # Get candidate data, position and available slots from the candidate store
+    store = get_candidate_store()
+    candidate = store.get_candidate(candidate_id) if candidate_id is not None else None
+    available_slots = store.get_available_slots()
+    
+    position = candidate.get('position', '') if candidate else ''
+    
+    alternative_slots = []
+    if candidate:
+        current_datetime = candidate['scheduledInterview']['datetime']
+        
+        # Check if candidate has specific rescheduling slots assigned
+        if 'reschedulingSlots' in candidate and candidate['reschedulingSlots']:
+            # Use candidate-specific rescheduling slots ONLY
+            slot_ids = candidate['reschedulingSlots']
+            
+            # Create a map of slot IDs to slots for quick lookup
+            slot_map = {slot['id']: slot for slot in available_slots}
+            
+            # Validate and filter: ONLY include slots that:
+            # 1. Exist in the slot_map (valid slot ID)
+            # 2. Are not the current scheduled interview datetime
+            valid_slots = []
+            invalid_slot_ids = []
+            
+            for slot_id in slot_ids:
+                if slot_id not in slot_map:
+                    invalid_slot_ids.append(slot_id)
+                    print(f"⚠️  Slot ID {slot_id} not found in availableSlots for candidate {candidate_id}")
+                    continue
+                
+                slot_datetime = slot_map[slot_id]['datetime']
+                if slot_datetime == current_datetime:
+                    print(f"⚠️  Skipping slot ID {slot_id} (same as current interview) for candidate {candidate_id}")
+                    continue
+                
+                valid_slots.append(slot_datetime)
+            
+            alternative_slots = valid_slots
+            
+            if invalid_slot_ids:
+                print(f"⚠️  Invalid slot IDs for candidate {candidate_id}: {invalid_slot_ids}")
+            
+            print(f"📅 Using candidate-specific rescheduling slots for candidate {candidate_id}:")
+            print(f"   Requested slot IDs: {slot_ids}")
+            print(f"   Valid slot datetimes: {alternative_slots}")
+            
+            if not alternative_slots:
+                print(f"❌ WARNING: No valid alternative slots found for candidate {candidate_id} after filtering!")
+        else:
+            # Fallback: Use all available slots (excluding current)
+            alternative_slots = [
+                slot['datetime']
+                for slot in available_slots
+                if slot['datetime'] != current_datetime
+            ][:3]  # Limit to 3 slots
+            print(f"⚠️  No reschedulingSlots assigned to candidate {candidate_id}, using default slots: {alternative_slots}")
+
+    # Get caller ID from environment (optional - Twilio can use default)
+    caller_id = os.getenv('CALLER_ID', None)
+    
+    if caller_id:
+        print(f"📞 Using caller ID from .env: {caller_id}")
+    else:
+        print("📞 No CALLER_ID set - Twilio will use your default registered number")
+
+    # Make the call using the correct API structure
+    try:
+        result = agent.make_call(
+            phone_number=phone,
+            caller_id=caller_id,
+            candidate_name=name,
+            interview_date=interview_date,
+            interview_time=interview_time,
+            alternative_slots=alternative_slots,
+            scheduled_at=scheduled_at,
+            position=position
+        )
+    except Exception:
+        registry.release_claim(claim['claim_id'])
+        raise
+    
+    # Bolna AI API may return "id" or "execution_id" in response
+    execution_id = result.get('id') or result.get('execution_id') or result.get('executionId')
+    if execution_id:
+        # A scheduled retry blocks other dials until it has been placed (and answered or not)
+        hold_until = datetime.fromisoformat(scheduled_at).timestamp() if scheduled_at else None
+        registry.attach(claim['claim_id'], execution_id, hold_until=hold_until)
+    else:
+        registry.release_claim(claim['claim_id'])
+    
+    # Save execution_id to candidate_id mapping for webhook processing
+    if execution_id and candidate_id:
+        save_execution_mapping(execution_id, candidate_id, phone)
+        if scheduled_at:
+            # Scheduled calls are recorded in the attempt history by the retry scheduler
+            return execution_id, alternative_slots
+        try:
+            get_retry_scheduler().record_call(candidate_id, execution_id)
+        except Exception as history_error:
+            print(f"⚠️  Error recording call attempt: {history_error}")
+        # Update candidate status to "calling" immediately
+        try:
+            update_candidate_in_json(candidate_id, 'calling')
+            print(f"✅ Updated candidate {candidate_id} status to 'calling'")
+        except Exception as status_error:
+            print(f"⚠️  Error updating candidate status to 'calling': {status_error}")
+    
+    return execution_id, alternative_slots
+
+def run_call_job(payload):
+    """
+    Call job handler: dial the candidate from an /api/call request
+    
+    Returns:
+        Job result (executionId, alternativeSlots; duplicate if the candidate was already in a call)
+    
+    Raises:
+        PermanentJobError: Bolna rejected the call (e.g. low wallet balance), or the
+            request failed after it may have reached Bolna; not retried, so a
+            candidate is never dialed twice
+        requests.exceptions.RequestException: The dial never reached Bolna
+            (refused connection, connect timeout); the job is retried
+    """
+    if not agent:
+        raise PermanentJobError('Bolna Agent not initialized. Check your .env file.')
+    try:
+        execution_id, alternative_slots = start_candidate_call(
+            payload.get('candidateId'),
+            payload.get('phone'),
+            payload.get('name'),
+            payload.get('interviewDate'),
+            payload.get('interviewTime')
+        )
+    except CallInFlightError as e:
+        if not e.execution_id:
+            raise  # the other dial is still running or failed: try again shortly
+        return {'executionId': e.execution_id, 'duplicate': True}
+    except ValueError as e:
+        raise PermanentJobError(str(e))
+    return {'executionId': execution_id, 'alternativeSlots': alternative_slots}
+
+_call_job_workers = None
+_call_job_workers_lock = threading.Lock()
+
+def get_call_job_workers() -> CallJobWorkers:
+    """Get the call job workers (started on first use; jobs left by a previous process are resumed)"""
+    global _call_job_workers
+    if _call_job_workers is None:
+        with _call_job_workers_lock:
+            if _call_job_workers is None:
+                workers = CallJobWorkers(CallJobQueue(), run_call_job)
+                workers.start()
+                _call_job_workers = workers
+    return _call_job_workers
+
+def call_job_response(job):
+    """/api/call response for a call job, as it stands after waiting for it"""
+    if job['state'] == 'done':
+        result = job['result'] or {}
+        if result.get('duplicate'):
+            # Duplicate request (double click, second operator): point it at the existing call
+            return jsonify({
+                'success': True,
+                'executionId': result['executionId'],
+                'duplicate': True,
+                'jobId': job['id'],
+                'message': 'A call to this candidate is already in progress'
+            })
+        return jsonify({
+            'success': True,
+            'executionId': result.get('executionId'),
+            'jobId': job['id'],
+            'message': 'Call initiated successfully',
+            'alternativeSlots': result.get('alternativeSlots', [])
+        })
+    if job['state'] == 'dead':
+        # Handle wallet balance and other API errors
+        error_message = job['error'] or 'Call failed'
+        is_wallet = 'wallet' in error_message.lower() or 'balance' in error_message.lower()
+        return jsonify({
+            'success': False,
+            'error': error_message,
+            'error_type': 'wallet_balance' if is_wallet else 'api_error',
+            'jobId': job['id']
+        }), 402 if is_wallet else 500
+    # Still queued (e.g. Bolna is unavailable): the workers keep retrying it
+    return jsonify({
+        'success': True,
+        'queued': True,
+        'jobId': job['id'],
+        'attempts': job['attempts'],
+        'error': job['error'],
+        'message': 'Call queued; it will be placed as soon as Bolna accepts it'
+    }), 202
+
 @app.route('/api/call', methods=['POST'])
 def make_call():
-    """Make a call using Bolna AI"""
+    """
+    Make a call using Bolna AI
+    
+    The request is stored as a durable call job before anything is sent, so
+    it survives a restart; the response waits (up to CALL_JOB_WAIT seconds)
+    for a worker to place the call.
+    """
     if not agent:
         return jsonify({
             'success': False,
@@ -1174,164 +1270,197 @@ def make_call():
 
     try:
         data = request.json
-        candidate_id = data.get('candidateId')
-        phone = data.get('phone')
-        name = data.get('name')
-        interview_date = data.get('interviewDate')
-        interview_time = data.get('interviewTime')
-
-        # Read available slots from JSON using absolute path
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        json_path = os.path.join(base_dir, 'data', 'candidates.json')
-        if not os.path.exists(json_path):
-            json_path = 'data/candidates.json'
-        json_path = os.path.abspath(json_path)
-        
-        with open(json_path, 'r', encoding='utf-8') as f:
-            candidates_data = json.load(f)
-        
-        # Get candidate data and position
-        candidate = next(
-            (c for c in candidates_data['candidates'] if c['id'] == candidate_id),
-            None
-        )
-        
-        position = candidate.get('position', '') if candidate else ''
-        
-        alternative_slots = []
-        if candidate:
-            current_datetime = candidate['scheduledInterview']['datetime']
-            
-            # Check if candidate has specific rescheduling slots assigned
-            if 'reschedulingSlots' in candidate and candidate['reschedulingSlots']:
-                # Use candidate-specific rescheduling slots ONLY
-                slot_ids = candidate['reschedulingSlots']
-                
-                # Create a map of slot IDs to slots for quick lookup
-                slot_map = {slot['id']: slot for slot in candidates_data['availableSlots']}
-                
-                # Validate and filter: ONLY include slots that:
-                # 1. Exist in the slot_map (valid slot ID)
-                # 2. Are not the current scheduled interview datetime
-                valid_slots = []
-                invalid_slot_ids = []
-                
-                for slot_id in slot_ids:
-                    if slot_id not in slot_map:
-                        invalid_slot_ids.append(slot_id)
-                        print(f"⚠️  Slot ID {slot_id} not found in availableSlots for candidate {candidate_id}")
-                        continue
-                    
-                    slot_datetime = slot_map[slot_id]['datetime']
-                    if slot_datetime == current_datetime:
-                        print(f"⚠️  Skipping slot ID {slot_id} (same as current interview) for candidate {candidate_id}")
-                        continue
-                    
-                    valid_slots.append(slot_datetime)
-                
-                alternative_slots = valid_slots
-                
-                if invalid_slot_ids:
-                    print(f"⚠️  Invalid slot IDs for candidate {candidate_id}: {invalid_slot_ids}")
-                
-                print(f"📅 Using candidate-specific rescheduling slots for candidate {candidate_id}:")
-                print(f"   Requested slot IDs: {slot_ids}")
-                print(f"   Valid slot datetimes: {alternative_slots}")
-                
-                if not alternative_slots:
-                    print(f"❌ WARNING: No valid alternative slots found for candidate {candidate_id} after filtering!")
-            else:
-                # Fallback: Use all available slots (excluding current)
-                alternative_slots = [
-                    slot['datetime']
-                    for slot in candidates_data['availableSlots']
-                    if slot['datetime'] != current_datetime
-                ][:3]  # Limit to 3 slots
-                print(f"⚠️  No reschedulingSlots assigned to candidate {candidate_id}, using default slots: {alternative_slots}")
-
-        # Get caller ID from environment (optional - Twilio can use default)
-        caller_id = os.getenv('CALLER_ID', None)
-        
-        if caller_id:
-            print(f"📞 Using caller ID from .env: {caller_id}")
-        else:
-            print("📞 No CALLER_ID set - Twilio will use your default registered number")
+        payload = {key: data.get(key) for key in ('candidateId', 'phone', 'name', 'interviewDate', 'interviewTime')}
+        workers = get_call_job_workers()
+        job_id = workers.queue.enqueue(payload)
+        workers.wake()
+        return call_job_response(workers.queue.wait(job_id, CALL_JOB_WAIT))
+    except Exception as e:
+        import traceback
+        print(f"Error making call: {e}")
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
 
-        # Make the call using the correct API structure
-        try:
-            result = agent.make_call(
-                phone_number=phone,
-                caller_id=caller_id,
-                candidate_name=name,
-                interview_date=interview_date,
-                interview_time=interview_time,
-                alternative_slots=alternative_slots,
-                position=position
-            )
-        except ValueError as e:
-            # Handle wallet balance and other API errors
-            error_message = str(e)
+@app.route('/api/call-jobs/<int:job_id>', methods=['GET'])
+def get_call_job(job_id):
+    """State of a call job queued by /api/call"""
+    try:
+        job = get_call_job_workers().queue.get_job(job_id)
+        if not job:
             return jsonify({
                 'success': False,
-                'error': error_message,
-                'error_type': 'wallet_balance' if 'wallet' in error_message.lower() or 'balance' in error_message.lower() else 'api_error'
-            }), 402 if 'wallet' in error_message.lower() or 'balance' in error_message.lower() else 500
+                'error': f'Call job {job_id} not found'
+            }), 404
+        job.pop('lease_id', None)
+        return jsonify({'success': True, 'job': job})
+    except Exception as e:
+        print(f"Error fetching call job: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
 
-        # Bolna AI API may return "id" or "execution_id" in response
-        execution_id = result.get('id') or result.get('execution_id') or result.get('executionId')
-        
-        # Save execution_id to candidate_id mapping for webhook processing
-        if execution_id and candidate_id:
-            save_execution_mapping(execution_id, candidate_id, phone)
-            # Update candidate status to "calling" immediately
-            try:
-                update_candidate_in_json(candidate_id, 'calling')
-                print(f"✅ Updated candidate {candidate_id} status to 'calling'")
-            except Exception as status_error:
-                print(f"⚠️  Error updating candidate status to 'calling': {status_error}")
+@app.route('/api/campaigns', methods=['POST'])
+def create_campaign():
+    """
+    Start an outbound calling campaign
+    
+    Body:
+        - filter (required): {"status": "pending", "position": "...", "ids": [...]};
+          values may be a string or a list
+        - name (optional)
+        - priority (optional, default 0): higher-priority campaigns are dialed first
+        - maxInFlight (optional): calls from this campaign live at once
+    
+    Matching candidates are queued immediately; the dispatcher dials them in
+    the background. Poll GET /api/campaigns/<id> for progress.
+    """
+    if not agent:
+        return jsonify({
+            'success': False,
+            'error': 'Bolna Agent not initialized. Check your .env file.'
+        }), 500
+    
+    try:
+        data = request.json or {}
+        filters = data.get('filter') or {}
+        if not isinstance(filters, dict) or not filters or any(key not in FILTER_FIELDS for key in filters):
+            return jsonify({
+                'success': False,
+                'error': f"filter must be a non-empty object with keys from {list(FILTER_FIELDS)}"
+            }), 400
+        try:
+            priority = int(data.get('priority', 0))
+            max_in_flight = max(1, int(data.get('maxInFlight', CAMPAIGN_MAX_IN_FLIGHT)))
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': 'priority and maxInFlight must be integers'}), 400
+        
+        candidate_ids = [
+            candidate['id'] for candidate in get_candidate_store().list_candidates()
+            if matches_filter(candidate, filters)
+        ]
+        dispatcher = get_campaign_dispatcher()
+        campaign_id = dispatcher.queue.create_campaign(
+            filters,
+            candidate_ids,
+            name=data.get('name'),
+            priority=priority,
+            max_in_flight=max_in_flight
+        )
+        dispatcher.wake()
+        print(f"📣 Campaign {campaign_id} created: {len(candidate_ids)} candidates queued (filter: {filters})")
         
         return jsonify({
             'success': True,
-            'executionId': execution_id,
-            'message': 'Call initiated successfully',
-            'alternativeSlots': alternative_slots
-        })
+            'campaign': dispatcher.queue.get_campaign(campaign_id)
+        }), 201
     except Exception as e:
         import traceback
-        print(f"Error making call: {e}")
+        print(f"❌ Error creating campaign: {e}")
         traceback.print_exc()
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+@app.route('/api/campaigns', methods=['GET'])
+def list_campaigns():
+    """List campaigns with progress, plus dispatcher counters"""
+    try:
+        dispatcher = get_campaign_dispatcher()
+        return jsonify({
+            'success': True,
+            'campaigns': dispatcher.queue.list_campaigns(),
+            'dispatcher': dispatcher.get_stats()
+        })
+    except Exception as e:
+        print(f"❌ Error listing campaigns: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/campaigns/<int:campaign_id>', methods=['GET'])
+def get_campaign(campaign_id):
+    """
+    Campaign progress: per-state counts, throughput (dials/minute) and ETA
+    Add ?items=true to include every queued candidate and its outcome
+    """
+    try:
+        queue = get_campaign_dispatcher().queue
+        campaign = queue.get_campaign(campaign_id)
+        if campaign is None:
+            return jsonify({'success': False, 'error': 'Campaign not found'}), 404
+        if request.args.get('items', 'false').lower() == 'true':
+            campaign['items'] = queue.get_items(campaign_id)
+        return jsonify({'success': True, 'campaign': campaign})
+    except Exception as e:
+        print(f"❌ Error fetching campaign {campaign_id}: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/campaigns/<int:campaign_id>/<action>', methods=['POST'])
+def control_campaign(campaign_id, action):
+    """Pause, resume or cancel a campaign (POST /api/campaigns/<id>/pause|resume|cancel)"""
+    if action not in ('pause', 'resume', 'cancel'):
+        return jsonify({'success': False, 'error': f'Unknown action: {action}'}), 400
+    try:
+        dispatcher = get_campaign_dispatcher()
+        if not dispatcher.queue.set_status(campaign_id, action):
+            return jsonify({'success': False, 'error': 'Campaign not found or already finished'}), 404
+        dispatcher.wake()
+        print(f"📣 Campaign {campaign_id}: {action}")
+        return jsonify({'success': True, 'campaign': dispatcher.queue.get_campaign(campaign_id)})
+    except Exception as e:
+        print(f"❌ Error updating campaign {campaign_id}: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/api/call-status/<execution_id>', methods=['GET'])
 def get_call_status(execution_id):
-    """Get call execution status - checks local webhook data first, then Bolna API"""
+    """
+    Get call execution status - checks the call status cache, then local
+    webhook data, then Bolna API
+
+    Terminal executions stay cached until evicted, in-progress ones for
+    CALL_STATUS_CACHE_TTL seconds; a webhook for the execution invalidates it.
+    While the Bolna circuit breaker is open, an expired cache entry is served
+    (marked stale) instead of failing.
+    """
+    cache = get_call_status_cache()
+    cached = cache.get(execution_id)
+    if cached is not None:
+        return jsonify(dict(cached, cached=True))
+    
     # First, check if we have webhook data locally (faster and more reliable)
     try:
-        webhook_data_file = os.path.join('data', 'webhook_data.json')
-        if os.path.exists(webhook_data_file):
-            with open(webhook_data_file, 'r', encoding='utf-8') as f:
-                webhook_data = json.load(f)
-                if execution_id in webhook_data:
-                    stored_data = webhook_data[execution_id]
-                    print(f"✅ Found execution {execution_id} in local webhook data")
-                    return jsonify({
-                        'success': True,
-                        'details': {
-                            'execution_id': execution_id,
-                            'status': stored_data.get('status', 'unknown'),
-                            'transcript': stored_data.get('transcript', ''),
-                            'extracted_data': stored_data.get('extracted_data', {}),
-                            'summary': stored_data.get('summary', ''),
-                            'conversation_duration': stored_data.get('conversation_duration'),
-                            'total_cost': stored_data.get('total_cost'),
-                            'recording_url': stored_data.get('recording_url'),
-                            'telephony_data': stored_data.get('telephony_data', {}),
-                            'from_webhook': True  # Flag to indicate this is from webhook data
-                        }
-                    })
+        stored_data = get_webhook_log().get(execution_id)
+        if stored_data:
+            print(f"✅ Found execution {execution_id} in local webhook data")
+            result = {
+                'success': True,
+                'details': {
+                    'execution_id': execution_id,
+                    'status': stored_data.get('status', 'unknown'),
+                    'transcript': stored_data.get('transcript', ''),
+                    'extracted_data': stored_data.get('extracted_data', {}),
+                    'summary': stored_data.get('summary', ''),
+                    'conversation_duration': stored_data.get('conversation_duration'),
+                    'total_cost': stored_data.get('total_cost'),
+                    'recording_url': stored_data.get('recording_url'),
+                    'telephony_data': stored_data.get('telephony_data', {}),
+                    'from_webhook': True  # Flag to indicate this is from webhook data
+                }
+            }
+            cache.put(execution_id, result, status=stored_data.get('status'))
+            return jsonify(result)
     except Exception as e:
         print(f"⚠️  Error reading local webhook data: {e}")
     
@@ -1344,11 +1473,18 @@ def get_call_status(execution_id):
     
     try:
         details = agent.get_execution_details(execution_id)
-        return jsonify({
+        result = {
             'success': True,
             'details': details,
             'from_webhook': False  # Flag to indicate this is from API
-        })
+        }
+        cache.put(execution_id, result, status=(details or {}).get('status'))
+        return jsonify(result)
+    except CircuitOpenError as e:
+        stale = cache.peek(execution_id)
+        if stale is not None:
+            return jsonify(dict(stale, cached=True, stale=True))
+        return bolna_unavailable_response(e, execution_id=execution_id)
     except requests.exceptions.RequestException as e:
         # Handle 404 specifically - execution may not exist or may have expired
         # 404s are expected for expired executions, so we handle them gracefully without error logging
@@ -1386,217 +1522,372 @@ def get_call_status(execution_id):
             'error': str(e)
         }), 500
 
+def process_webhook_payload(payload):
+    """
+    Process a webhook payload: resolve the candidate, store the data and
+    update the candidate status from the call outcome
+    
+    Runs on a webhook worker thread (or inline when WEBHOOK_ASYNC is off).
+    
+    Args:
+        payload: Raw webhook payload, or the WebhookPayload already built by the endpoint
+    
+    Returns:
+        Tuple of (result dict, HTTP status code)
+    """
+    webhook = payload if isinstance(payload, WebhookPayload) else WebhookPayload(payload)
+    payload = webhook.raw
+    execution_id = webhook.execution_id
+    if not execution_id:
+        return {
+            'success': False,
+            'error': 'execution_id not found in payload'
+        }, 400
+    
+    print(f"🔍 Processing webhook for execution_id: {execution_id}")
+    
+    # Find candidate mapping
+    mapping = get_execution_mapping(execution_id)
+    candidate_id = None
+    
+    if not mapping:
+        # Try to find by phone number as fallback
+        # Bolna AI uses "user_number" as the field name
+        phone_number = webhook.recipient_phone_number
+        
+        if phone_number:
+            try:
+                candidate = get_candidate_store().find_by_phone(phone_number)
+                if candidate:
+                    candidate_id = candidate['id']
+                    # Save mapping for future use
+                    save_execution_mapping(execution_id, candidate_id, phone_number)
+                    print(f"✅ Found candidate by phone: {candidate_id}")
+            except:
+                pass
+        
+        if not candidate_id:
+            print(f"⚠️  No mapping found for execution_id: {execution_id}")
+            # Still save webhook data even if no candidate mapping
+            save_webhook_data(execution_id, payload, None, webhook)
+            return {
+                'success': False,
+                'error': 'Could not determine candidate for this execution'
+            }, 404
+    else:
+        candidate_id = mapping['candidate_id']
+        print(f"✅ Found mapping: execution {execution_id} -> candidate {candidate_id}")
+    
+    # Save webhook data FIRST (before processing)
+    save_webhook_data(execution_id, payload, candidate_id, webhook)
+    
+    # Bolna AI sends flat payload, so details are the payload itself if no nested structure
+    execution_details = webhook.details
+    status = webhook.status_lower
+    transcript = webhook.transcript
+    extracted_data = webhook.extracted_data
+    
+    print(f"📊 Call status: {status}")
+    
+    if status in TERMINAL_STATUSES:
+        finish_call(candidate_id, execution_id, status)
+    
+    # Only process completed calls
+    if status in ['completed', 'ended', 'stopped', 'finished']:
+        print(f"✅ Call completed. Processing outcome...")
+        
+        # Parse the outcome
+        outcome = parse_call_outcome(execution_details, transcript)
+        print(f"📊 Parsed outcome: {outcome}")
+        
+        # Determine final status
+        final_status = outcome['status'] if outcome['status'] != 'pending' else 'pending'
+        
+        # Log extracted data for debugging
+        if extracted_data and extracted_data.get('call_outcome'):
+            print(f"📋 Structured Extraction Data:")
+            print(f"   Call Outcome: {extracted_data.get('call_outcome')}")
+            print(f"   Original Slot: {extracted_data.get('original_slot')}")
+            print(f"   Final Slot: {extracted_data.get('final_slot')}")
+            print(f"   Notes: {extracted_data.get('notes', 'N/A')}")
+        
+        # Update candidate status
+        success = update_candidate_in_json(
+            candidate_id,
+            final_status,
+            outcome.get('updated_interview')
+        )
+        
+        if success:
+            print(f"✅ Candidate {candidate_id} updated: {final_status}")
+            if final_status == 'rescheduled' and outcome.get('updated_interview'):
+                print(f"   📅 New interview slot: {outcome['updated_interview'].get('datetime', 'N/A')}")
+            
+            return {
+                'success': True,
+                'message': f'Candidate {candidate_id} updated successfully',
+                'status': final_status,
+                'execution_id': execution_id,
+                'extracted_data': extracted_data if extracted_data else None
+            }, 200
+        else:
+            print(f"❌ Failed to update candidate {candidate_id}")
+            return {
+                'success': False,
+                'error': 'Failed to update candidate'
+            }, 500
+    
+    elif status in ['no_answer', 'no-answer', 'no answer']:
+        print(f"📞 Call status: NO ANSWER")
+        # Set status to "no_answer" to display it
+        update_candidate_in_json(candidate_id, 'no_answer')
+        return {
+            'success': True,
+            'message': f'Call ended: No Answer',
+            'status': 'no_answer',
+            'execution_id': execution_id,
+            'display_status': 'No Answer'
+        }, 200
+    elif status in ['failed', 'error', 'cancelled', 'canceled', 'cut', 'terminated', 'hung_up', 'disconnected', 'busy', 'rejected']:
+        print(f"❌ Call ended ({status}). Resetting candidate status...")
+        update_candidate_in_json(candidate_id, 'pending')
+        return {
+            'success': True,
+            'message': f'Call {status}. Candidate reset to pending',
+            'status': 'pending',
+            'execution_id': execution_id
+        }, 200
+    
+    else:
+        # Call is still in progress (initiated, ringing, in_progress, etc.)
+        print(f"⏳ Call status: {status} (still in progress)")
+        # If status is unknown but we have a transcript, try to process it anyway
+        if transcript and len(transcript) > 50:
+            print(f"⚠️  Unknown status but transcript available. Attempting to process...")
+            try:
+                outcome = parse_call_outcome(execution_details, transcript)
+                final_status = outcome['status'] if outcome['status'] != 'pending' else 'pending'
+                if final_status != 'pending':
+                    update_candidate_in_json(candidate_id, final_status, outcome.get('updated_interview'))
+                    return {
+                        'success': True,
+                        'message': f'Processed call with unknown status. Candidate updated to {final_status}',
+                        'status': final_status,
+                        'execution_id': execution_id
+                    }, 200
+            except:
+                pass
+        
+        return {
+            'success': True,
+            'message': f'Call status received: {status}',
+            'status': status,
+            'execution_id': execution_id
+        }, 200
+
+def handle_webhook_payload(payload):
+    """
+    Run process_webhook_payload for an accepted delivery
+    
+    If processing fails (exception or non-2xx result) the delivery is removed
+    from the deduplicator so a redelivery from Bolna is processed again.
+    """
+    webhook = payload if isinstance(payload, WebhookPayload) else WebhookPayload(payload)
+    try:
+        result, status_code = process_webhook_payload(webhook)
+    except Exception:
+        get_webhook_deduplicator().forget(webhook.execution_id)
+        raise
+    if status_code >= 300:
+        get_webhook_deduplicator().forget(webhook.execution_id)
+    return result, status_code
+
+def handle_queued_webhook(payload):
+    """
+    Queue handler: like handle_webhook_payload, but raises on a server-side
+    failure (5xx) so the queue retries the payload instead of acknowledging it
+    """
+    result, status_code = handle_webhook_payload(payload)
+    if status_code >= 500:
+        raise RuntimeError(result.get('error') or f'webhook processing failed ({status_code})')
+    return result, status_code
+
+_webhook_queue = None
+_webhook_queue_lock = threading.Lock()
+
+def get_webhook_queue() -> WebhookIngestQueue:
+    """Get the webhook ingestion queue (journal replayed and workers started on first use)"""
+    global _webhook_queue
+    if _webhook_queue is None:
+        with _webhook_queue_lock:
+            if _webhook_queue is None:
+                _webhook_queue = WebhookIngestQueue(handle_queued_webhook)
+    return _webhook_queue
+
+def dial_campaign_item(item):
+    """
+    Campaign dispatcher dial function: re-check the candidate against the
+    campaign filter (their status may have changed since it was queued), then
+    call them exactly as /api/call does
+    
+    Returns:
+        The execution ID (the existing one if the candidate is already in a
+        call), or None to skip the candidate
+    
+    Raises:
+        DialDeferred: Another dial for the candidate failed or hasn't returned
+                      yet; the item is tried again once that claim has expired
+    """
+    if not agent:
+        raise ValueError('Bolna Agent not initialized')
+    candidate = get_candidate_store().get_candidate(item['candidate_id'])
+    if not candidate or not matches_filter(candidate, item['filters']):
+        return None
+    interview = candidate.get('scheduledInterview') or {}
+    try:
+        execution_id, _ = start_candidate_call(
+            candidate['id'],
+            candidate.get('phone'),
+            candidate.get('name'),
+            interview.get('date'),
+            interview.get('time')
+        )
+    except CallInFlightError as e:
+        if not e.execution_id:
+            raise DialDeferred(str(e), get_call_registry().dial_timeout)
+        # Someone already called them: the campaign waits on that call instead
+        return e.execution_id
+    return execution_id
+
+_campaign_dispatcher = None
+_campaign_dispatcher_lock = threading.Lock()
+
+def get_campaign_dispatcher() -> CampaignDispatcher:
+    """Get the campaign dispatcher (interrupted dials recovered and loop started on first use)"""
+    global _campaign_dispatcher
+    if _campaign_dispatcher is None:
+        with _campaign_dispatcher_lock:
+            if _campaign_dispatcher is None:
+                dispatcher = CampaignDispatcher(CampaignQueue(), dial_campaign_item)
+                dispatcher.start()
+                _campaign_dispatcher = dispatcher
+    return _campaign_dispatcher
+
+def dial_retry(candidate_id, scheduled_at):
+    """
+    Retry scheduler dial function: schedule the candidate's next call with
+    Bolna, unless they have since been reached (confirmed/declined/rescheduled)
+    
+    Returns:
+        The execution ID, or None to skip the candidate
+    """
+    if not agent:
+        raise ValueError('Bolna Agent not initialized')
+    candidate = get_candidate_store().get_candidate(candidate_id)
+    if not candidate or candidate.get('status') in ('confirmed', 'declined', 'rescheduled'):
+        return None
+    interview = candidate.get('scheduledInterview') or {}
+    execution_id, _ = start_candidate_call(
+        candidate['id'],
+        candidate.get('phone'),
+        candidate.get('name'),
+        interview.get('date'),
+        interview.get('time'),
+        scheduled_at=scheduled_at
+    )
+    return execution_id
+
+def apply_call_retry(candidate_id, result):
+    """Show a scheduled retry on the candidate (callRetry), or clear it once the series has ended"""
+    if result['action'] == 'scheduled':
+        retry = {key: result[key] for key in ('attempt', 'maxAttempts', 'scheduledAt', 'executionId')}
+        get_candidate_store().update_candidate(candidate_id, lambda candidate: candidate.update(callRetry=retry))
+    elif result['action'] in ('exhausted', 'not_retryable', 'skipped'):
+        get_candidate_store().update_candidate(candidate_id, lambda candidate: candidate.pop('callRetry', None))
+
+_retry_scheduler = None
+_retry_scheduler_lock = threading.Lock()
+
+def get_retry_scheduler() -> RetryScheduler:
+    """Get the call retry scheduler"""
+    global _retry_scheduler
+    if _retry_scheduler is None:
+        with _retry_scheduler_lock:
+            if _retry_scheduler is None:
+                _retry_scheduler = RetryScheduler(dial_retry)
+    return _retry_scheduler
+
 @app.route('/api/webhook', methods=['POST'])
 @app.route('/', methods=['POST'])
 @validate_bolna_ip
 def webhook_handler():
     """
     Webhook endpoint to receive real-time call execution data from Bolna Voice AI
+    
+    The payload is validated, journaled and acknowledged with 202; processing
+    happens on the webhook worker pool (see webhook_queue.py).
     """
+    execution_id = None
     try:
-        payload = request.json
-        print(f"📨 Received webhook payload")
-        print(f"   Payload keys: {list(payload.keys()) if isinstance(payload, dict) else 'Not a dict'}")
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            return jsonify({
+                'success': False,
+                'error': 'Webhook payload must be a JSON object'
+            }), 400
         
         # Extract execution_id from payload FIRST (needed for storage)
-        # Bolna AI uses "id" as the field name in webhook payloads
-        execution_id = (
-            payload.get('id') or  # Bolna AI webhook format uses "id"
-            payload.get('execution_id') or 
-            payload.get('executionId') or 
-            payload.get('data', {}).get('id') or
-            payload.get('data', {}).get('execution_id') or
-            payload.get('data', {}).get('executionId')
-        )
+        webhook = WebhookPayload(payload)
+        execution_id = webhook.execution_id
         
         if not execution_id:
             print(f"⚠️  No execution_id found in webhook payload")
-            print(f"   Payload: {json.dumps(payload, indent=2)}")
+            print(f"   Payload keys: {list(payload.keys())}")
             return jsonify({
                 'success': False,
                 'error': 'execution_id not found in payload'
             }), 400
         
-        print(f"🔍 Processing webhook for execution_id: {execution_id}")
-        
-        # Find candidate mapping
-        mapping = get_execution_mapping(execution_id)
-        candidate_id = None
-        
-        if not mapping:
-            # Try to find by phone number as fallback
-            # Bolna AI uses "user_number" as the field name
-            phone_number = (
-                payload.get('user_number') or  # Bolna AI webhook format uses "user_number"
-                payload.get('recipient_phone_number') or
-                payload.get('phone_number') or
-                payload.get('phone') or
-                payload.get('telephony_data', {}).get('to_number') or
-                payload.get('data', {}).get('user_number') or
-                payload.get('data', {}).get('recipient_phone_number') or
-                None
-            )
-            
-            if phone_number:
-                try:
-                    # Use absolute path
-                    base_dir = os.path.dirname(os.path.abspath(__file__))
-                    json_path = os.path.join(base_dir, 'data', 'candidates.json')
-                    with open(json_path, 'r', encoding='utf-8') as f:
-                        candidates_data = json.load(f)
-                    candidate = next(
-                        (c for c in candidates_data['candidates'] if c['phone'] == phone_number),
-                        None
-                    )
-                    if candidate:
-                        candidate_id = candidate['id']
-                        # Save mapping for future use
-                        save_execution_mapping(execution_id, candidate_id, phone_number)
-                        print(f"✅ Found candidate by phone: {candidate_id}")
-                except:
-                    pass
-            
-            if not candidate_id:
-                print(f"⚠️  No mapping found for execution_id: {execution_id}")
-                # Still save webhook data even if no candidate mapping
-                save_webhook_data(execution_id, payload, None)
-                return jsonify({
-                    'success': False,
-                    'error': 'Could not determine candidate for this execution'
-                }), 404
-        else:
-            candidate_id = mapping['candidate_id']
-            print(f"✅ Found mapping: execution {execution_id} -> candidate {candidate_id}")
-        
-        # Save webhook data FIRST (before processing)
-        save_webhook_data(execution_id, payload, candidate_id)
-        
-        # Extract execution details from payload
-        # Bolna AI sends flat payload, so use payload directly if no nested structure
-        execution_details = payload.get('data') or payload.get('execution') or payload
-        
-        # Extract status (Bolna AI uses "status" directly in payload)
-        status = (
-            payload.get('status') or
-            execution_details.get('status') or
-            'unknown'
-        ).lower()
-        
-        print(f"📊 Call status: {status}")
-        
-        # Extract transcript if available
-        transcript = (
-            payload.get('transcript') or
-            payload.get('conversation_transcript') or
-            execution_details.get('transcript') or
-            execution_details.get('conversation_transcript') or
-            ''
-        )
-        
-        # Extract extracted_data if available
-        extracted_data = (
-            payload.get('extracted_data') or
-            execution_details.get('extracted_data') or
-            {}
-        )
-        
-        # Only process completed calls
-        if status in ['completed', 'ended', 'stopped', 'finished']:
-            print(f"✅ Call completed. Processing outcome...")
-            
-            # Parse the outcome
-            outcome = parse_call_outcome(execution_details, transcript)
-            print(f"📊 Parsed outcome: {outcome}")
-            
-            # Determine final status
-            final_status = outcome['status'] if outcome['status'] != 'pending' else 'pending'
-            
-            # Log extracted data for debugging
-            if extracted_data and extracted_data.get('call_outcome'):
-                print(f"📋 Structured Extraction Data:")
-                print(f"   Call Outcome: {extracted_data.get('call_outcome')}")
-                print(f"   Original Slot: {extracted_data.get('original_slot')}")
-                print(f"   Final Slot: {extracted_data.get('final_slot')}")
-                print(f"   Notes: {extracted_data.get('notes', 'N/A')}")
-            
-            # Update candidate status
-            success = update_candidate_in_json(
-                candidate_id,
-                final_status,
-                outcome.get('updated_interview')
-            )
-            
-            if success:
-                print(f"✅ Candidate {candidate_id} updated: {final_status}")
-                if final_status == 'rescheduled' and outcome.get('updated_interview'):
-                    print(f"   📅 New interview slot: {outcome['updated_interview'].get('datetime', 'N/A')}")
-                
-                return jsonify({
-                    'success': True,
-                    'message': f'Candidate {candidate_id} updated successfully',
-                    'status': final_status,
-                    'execution_id': execution_id,
-                    'extracted_data': extracted_data if extracted_data else None
-                })
-            else:
-                print(f"❌ Failed to update candidate {candidate_id}")
-                return jsonify({
-                    'success': False,
-                    'error': 'Failed to update candidate'
-                }), 500
-        
-        elif status in ['no_answer', 'no-answer', 'no answer']:
-            print(f"📞 Call status: NO ANSWER")
-            # Set status to "no_answer" to display it
-            update_candidate_in_json(candidate_id, 'no_answer')
+        # Drop re-deliveries and out-of-order status updates before touching disk
+        status = webhook.status_lower
+        skip_reason = get_webhook_deduplicator().check(execution_id, payload, status, webhook.updated_at)
+        if skip_reason:
+            print(f"⏭️  Ignoring {skip_reason} webhook for execution_id: {execution_id} (status: {status})")
             return jsonify({
                 'success': True,
-                'message': f'Call ended: No Answer',
-                'status': 'no_answer',
+                'message': f'{skip_reason.capitalize()} delivery ignored',
                 'execution_id': execution_id,
-                'display_status': 'No Answer'
-            })
-        elif status in ['failed', 'error', 'cancelled', 'canceled', 'cut', 'terminated', 'hung_up', 'disconnected', 'busy', 'rejected']:
-            print(f"❌ Call ended ({status}). Resetting candidate status...")
-            update_candidate_in_json(candidate_id, 'pending')
-            return jsonify({
-                'success': True,
-                'message': f'Call {status}. Candidate reset to pending',
-                'status': 'pending',
-                'execution_id': execution_id
+                'status': status,
+                'duplicate': True
             })
         
-        else:
-            # Call is still in progress (initiated, ringing, in_progress, etc.)
-            print(f"⏳ Call status: {status} (still in progress)")
-            # If status is unknown but we have a transcript, try to process it anyway
-            if transcript and len(transcript) > 50:
-                print(f"⚠️  Unknown status but transcript available. Attempting to process...")
-                try:
-                    outcome = parse_call_outcome(execution_details, transcript)
-                    final_status = outcome['status'] if outcome['status'] != 'pending' else 'pending'
-                    if final_status != 'pending':
-                        update_candidate_in_json(candidate_id, final_status, outcome.get('updated_interview'))
-                        return jsonify({
-                            'success': True,
-                            'message': f'Processed call with unknown status. Candidate updated to {final_status}',
-                            'status': final_status,
-                            'execution_id': execution_id
-                        })
-                except:
-                    pass
-            
+        if not WEBHOOK_ASYNC:
+            result, status_code = handle_webhook_payload(webhook)
+            return jsonify(result), status_code
+        
+        seq = get_webhook_queue().enqueue(payload, prepared=webhook, key=execution_id)
+        if seq is None:
+            get_webhook_deduplicator().forget(execution_id)
+            # Queue is full: ask Bolna to retry later instead of losing the webhook
+            print(f"⚠️  Webhook queue full, rejecting execution_id: {execution_id}")
             return jsonify({
-                'success': True,
-                'message': f'Call status received: {status}',
-                'status': status,
-                'execution_id': execution_id
-            })
+                'success': False,
+                'error': 'Webhook queue is full, retry later'
+            }), 503
+        
+        print(f"📨 Queued webhook #{seq} for execution_id: {execution_id}")
+        return jsonify({
+            'success': True,
+            'message': 'Webhook accepted',
+            'execution_id': execution_id
+        }), 202
     
     except Exception as e:
         import traceback
-        print(f"❌ Error processing webhook: {e}")
+        print(f"❌ Error receiving webhook: {e}")
         traceback.print_exc()
+        if execution_id:
+            get_webhook_deduplicator().forget(execution_id)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -1607,16 +1898,16 @@ def webhook_status():
     """Check webhook configuration status"""
     try:
         # Check execution mappings
-        mapping_count = 0
-        if os.path.exists('execution_mapping.json'):
-            with open('execution_mapping.json', 'r', encoding='utf-8') as f:
-                mappings = json.load(f)
-                mapping_count = len(mappings)
+        mapping_count = len(get_execution_mappings())
         
         return jsonify({
             'success': True,
             'webhook_configured': True,
             'execution_mappings': mapping_count,
+            'async_processing': WEBHOOK_ASYNC,
+            'queue': get_webhook_queue().get_stats() if WEBHOOK_ASYNC else None,
+            'deduplication': get_webhook_deduplicator().get_stats(),
+            'call_status_cache': get_call_status_cache().get_stats(),
             'message': 'Webhook endpoint is ready'
         })
     except Exception as e:
@@ -1625,6 +1916,106 @@ def webhook_status():
             'error': str(e)
         }), 500
 
+def finish_call(candidate_id, execution_id, status):
+    """
+    A call reached a terminal status: free the campaign slot it was holding
+    (if it was dialed by a campaign), release its in-flight registry claim and,
+    if it went unanswered, schedule the next attempt
+    """
+    get_campaign_dispatcher().on_execution_finished(execution_id, status)
+    get_call_registry().release_execution(execution_id)
+    try:
+        apply_call_retry(candidate_id, get_retry_scheduler().on_call_outcome(candidate_id, execution_id, status))
+    except Exception as retry_error:
+        print(f"⚠️  Error scheduling call retry: {retry_error}")
+
+def apply_execution_status(execution_id, candidate_id, details, transcript=''):
+    """
+    Update a candidate from execution details fetched from Bolna (fallback for
+    a missing webhook). Used by the manual check-status endpoint and the
+    background call reconciler.
+    
+    Args:
+        execution_id: Execution ID
+        candidate_id: Candidate the execution belongs to
+        details: Execution details from Bolna
+        transcript: Call transcript (only used for completed calls)
+    
+    Returns:
+        Result dict (success, message, status, execution_id); 'updated' is True
+        if the candidate's status was changed
+    """
+    status = details.get('status', '').lower()
+    
+    # Process based on status
+    if status in ['completed', 'ended', 'stopped', 'finished']:
+        outcome = parse_call_outcome(details, transcript or details.get('transcript', ''))
+        final_status = outcome['status'] if outcome['status'] != 'pending' else 'pending'
+        
+        success = update_candidate_in_json(
+            candidate_id,
+            final_status,
+            outcome.get('updated_interview')
+        )
+        if not success:
+            return {
+                'success': False,
+                'error': 'Failed to update candidate',
+                'execution_id': execution_id,
+                'updated': False
+            }
+        result = {
+            'success': True,
+            'message': f'Call completed. Candidate updated to {final_status}',
+            'status': final_status,
+            'execution_id': execution_id,
+            'updated': True
+        }
+    elif status in ['no_answer', 'no-answer', 'no answer']:
+        # Set status to "no_answer" to display it
+        update_candidate_in_json(candidate_id, 'no_answer')
+        result = {
+            'success': True,
+            'message': f'Call ended: No Answer',
+            'status': 'no_answer',
+            'execution_id': execution_id,
+            'display_status': 'No Answer',
+            'updated': True
+        }
+    elif status in ['failed', 'error', 'cancelled', 'canceled', 'cut', 'terminated', 'hung_up', 'disconnected', 'busy', 'rejected']:
+        update_candidate_in_json(candidate_id, 'pending')
+        result = {
+            'success': True,
+            'message': f'Call {status}. Candidate reset to pending',
+            'status': 'pending',
+            'execution_id': execution_id,
+            'updated': True
+        }
+    else:
+        return {
+            'success': True,
+            'message': f'Call status: {status} (still in progress)',
+            'status': status,
+            'execution_id': execution_id,
+            'updated': False
+        }
+    
+    # The webhook never arrived, so run its terminal-status follow-ups here
+    finish_call(candidate_id, execution_id, status)
+    return result
+
+_call_reconciler = None
+_call_reconciler_lock = threading.Lock()
+
+def get_call_reconciler() -> CallReconciler:
+    """Get the reconciler for candidates stuck in "calling" """
+    global _call_reconciler
+    if _call_reconciler is None:
+        with _call_reconciler_lock:
+            if _call_reconciler is None:
+                _call_reconciler = CallReconciler(agent, get_candidate_store(), get_execution_mappings(), apply_execution_status)
+    return _call_reconciler
+
 @app.route('/api/call/<execution_id>/check-status', methods=['POST'])
 def manually_check_call_status(execution_id):
     """Manually check and update call status (fallback if webhook doesn't fire)"""
@@ -1637,7 +2028,6 @@ def manually_check_call_status(execution_id):
     try:
         # Get execution details from Bolna AI
         details = agent.get_execution_details(execution_id)
-        status = details.get('status', '').lower()
         
         # Get candidate mapping
         mapping = get_execution_mapping(execution_id)
@@ -1647,55 +2037,12 @@ def manually_check_call_status(execution_id):
                 'error': 'No candidate mapping found for this execution'
             }), 404
         
-        candidate_id = mapping['candidate_id']
-        
-        # Process based on status
-        if status in ['completed', 'ended', 'stopped', 'finished']:
-            transcript = agent.get_transcript(execution_id) or details.get('transcript', '')
-            outcome = parse_call_outcome(details, transcript)
-            final_status = outcome['status'] if outcome['status'] != 'pending' else 'pending'
-            
-            success = update_candidate_in_json(
-                candidate_id,
-                final_status,
-                outcome.get('updated_interview')
-            )
-            
-            if success:
-                return jsonify({
-                    'success': True,
-                    'message': f'Call completed. Candidate updated to {final_status}',
-                    'status': final_status,
-                    'execution_id': execution_id
-                })
-        
-        elif status in ['no_answer', 'no-answer', 'no answer']:
-            # Set status to "no_answer" to display it
-            update_candidate_in_json(candidate_id, 'no_answer')
-            return jsonify({
-                'success': True,
-                'message': f'Call ended: No Answer',
-                'status': 'no_answer',
-                'execution_id': execution_id,
-                'display_status': 'No Answer'
-            })
-        elif status in ['failed', 'error', 'cancelled', 'canceled', 'cut', 'terminated']:
-            update_candidate_in_json(candidate_id, 'pending')
-            return jsonify({
-                'success': True,
-                'message': f'Call {status}. Candidate reset to pending',
-                'status': 'pending',
-                'execution_id': execution_id
-            })
-        
-        else:
-            return jsonify({
-                'success': True,
-                'message': f'Call status: {status} (still in progress)',
-                'status': status,
-                'execution_id': execution_id
-            })
+        result = apply_execution_status(execution_id, mapping['candidate_id'], details, agent.transcript_from_details(details))
+        result.pop('updated', None)
+        return jsonify(result), 200 if result['success'] else 500
     
+    except CircuitOpenError as e:
+        return bolna_unavailable_response(e, execution_id=execution_id)
     except requests.exceptions.RequestException as e:
         # Handle 404 specifically - execution may not exist or may have expired
         if hasattr(e, 'response') and e.response is not None and e.response.status_code == 404:
@@ -1739,77 +2086,52 @@ def reset_candidate_status(candidate_id):
     """Reset a candidate's status to 'pending' and restore original interview if rescheduled"""
     try:
         candidate_id_int = int(candidate_id)
-        # Use absolute path
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        json_path = os.path.join(base_dir, 'data', 'candidates.json')
+        store = get_candidate_store()
         
-        print(f"📝 Reset candidate {candidate_id} - Using path: {json_path}")
+        print(f"📝 Reset candidate {candidate_id} - Using store: {store.describe()}")
         
-        # Check if file exists
-        if not os.path.exists(json_path):
-            print(f"⚠️  Candidates file not found: {json_path}")
-            return jsonify({
-                'success': False,
-                'error': f'Candidates file not found: {json_path}'
-            }), 404
+        result = {}
+        
+        def reset_to_pending(candidate):
+            result['had_original'] = 'originalInterview' in candidate and candidate['originalInterview']
+            
+            # If candidate was rescheduled, restore original interview
+            if result['had_original']:
+                print(f"🔄 Restoring original interview for candidate {candidate_id}")
+                original_interview = candidate['originalInterview'].copy()
+                candidate['scheduledInterview'] = original_interview
+                # Remove the originalInterview field since we're resetting
+                del candidate['originalInterview']
+                print(f"   Restored interview: {candidate['scheduledInterview']['datetime']}")
+            
+            # Set status to pending
+            candidate['status'] = 'pending'
         
-        # Check file permissions
-        if not os.access(json_path, os.W_OK):
-            print(f"⚠️  No write permission for file: {json_path}")
+        try:
+            candidate = store.update_candidate(candidate_id_int, reset_to_pending)
+        except PermissionError as pe:
+            print(f"❌ Permission error writing candidate store: {pe}")
+            import traceback
+            traceback.print_exc()
             return jsonify({
                 'success': False,
-                'error': f'No write permission for file: {json_path}. Please check file permissions on EC2.'
+                'error': f'Permission denied writing to candidate store. Check file permissions on EC2: {str(pe)}'
             }), 403
         
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        candidate = next((c for c in data['candidates'] if c['id'] == candidate_id_int), None)
         if not candidate:
             return jsonify({
                 'success': False,
                 'error': 'Candidate not found'
             }), 404
         
-        old_status = candidate.get('status', 'unknown')
-        had_original = 'originalInterview' in candidate and candidate['originalInterview']
+        # Let them be called again right away, even if a call was still registered as in flight
+        if get_call_registry().release_candidate(candidate_id_int):
+            print(f"🔓 Released in-flight call claim for candidate {candidate_id}")
         
-        # If candidate was rescheduled, restore original interview
-        if had_original:
-            print(f"🔄 Restoring original interview for candidate {candidate_id}")
-            original_interview = candidate['originalInterview'].copy()
-            candidate['scheduledInterview'] = original_interview
-            # Remove the originalInterview field since we're resetting
-            del candidate['originalInterview']
-            print(f"   Restored interview: {candidate['scheduledInterview']['datetime']}")
-        
-        # Set status to pending
-        candidate['status'] = 'pending'
-        
-        # Write back to file
-        try:
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            message = f'Candidate {candidate_id} status reset to pending'
-            if had_original:
-                message += ' and original interview restored'
-            print(f"✅ {message}")
-        except PermissionError as pe:
-            print(f"❌ Permission error writing file: {pe}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
-                'success': False,
-                'error': f'Permission denied writing to file. Check file permissions on EC2: {str(pe)}'
-            }), 403
-        except Exception as write_error:
-            print(f"❌ Error writing file: {write_error}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
-                'success': False,
-                'error': f'Error writing file: {str(write_error)}'
-            }), 500
+        message = f'Candidate {candidate_id} status reset to pending'
+        if result.get('had_original'):
+            message += ' and original interview restored'
+        print(f"✅ {message}")
         
         return jsonify({
             'success': True,
@@ -1824,37 +2146,53 @@ def reset_candidate_status(candidate_id):
             'error': str(e)
         }), 500
 
+@app.route('/api/candidate/<candidate_id>/attempts', methods=['GET'])
+def get_candidate_attempts(candidate_id):
+    """Call attempt history for a candidate, with the retry state"""
+    try:
+        candidate_id = int(candidate_id)
+        scheduler = get_retry_scheduler()
+        candidate = get_candidate_store().get_candidate(candidate_id)
+        return jsonify({
+            'success': True,
+            'candidateId': candidate_id,
+            'attempts': scheduler.get_history(candidate_id),
+            'unansweredStreak': scheduler.unanswered_streak(candidate_id),
+            'maxAttempts': scheduler.max_attempts,
+            'callRetry': candidate.get('callRetry') if candidate else None
+        })
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': f'Invalid candidate ID: {candidate_id}'
+        }), 400
+    except Exception as e:
+        print(f"Error fetching call attempts: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/api/candidate/<candidate_id>', methods=['DELETE'])
 def delete_candidate(candidate_id):
     """Delete a candidate from the system"""
     try:
         candidate_id_int = int(candidate_id)
-        # Use absolute path
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        json_path = os.path.join(base_dir, 'data', 'candidates.json')
-        
-        print(f"📝 Delete candidate {candidate_id_int} - Using path: {json_path}")
+        store = get_candidate_store()
         
-        # Check if file exists
-        if not os.path.exists(json_path):
-            print(f"⚠️  Candidates file not found: {json_path}")
-            return jsonify({
-                'success': False,
-                'error': f'Candidates file not found: {json_path}'
-            }), 404
+        print(f"📝 Delete candidate {candidate_id_int} - Using store: {store.describe()}")
         
-        # Check file permissions
-        if not os.access(json_path, os.W_OK):
-            print(f"⚠️  No write permission for file: {json_path}")
+        try:
+            candidate = store.delete_candidate(candidate_id_int)
+        except PermissionError as pe:
+            print(f"❌ Permission error writing candidate store: {pe}")
+            import traceback
+            traceback.print_exc()
             return jsonify({
                 'success': False,
-                'error': f'No write permission for file: {json_path}. Please check file permissions on EC2.'
+                'error': f'Permission denied writing to candidate store. Check file permissions on EC2: {str(pe)}'
             }), 403
         
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        candidate = next((c for c in data['candidates'] if c['id'] == candidate_id_int), None)
         if not candidate:
             return jsonify({
                 'success': False,
@@ -1862,30 +2200,6 @@ def delete_candidate(candidate_id):
             }), 404
         
         candidate_name = candidate.get('name', 'Unknown')
-        # Remove candidate from list
-        data['candidates'] = [c for c in data['candidates'] if c['id'] != candidate_id_int]
-        
-        # Write back to file with error handling
-        try:
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except PermissionError as pe:
-            print(f"❌ Permission error writing file: {pe}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
-                'success': False,
-                'error': f'Permission denied writing to file. Check file permissions on EC2: {str(pe)}'
-            }), 403
-        except Exception as write_error:
-            print(f"❌ Error writing file: {write_error}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
-                'success': False,
-                'error': f'Error writing file: {str(write_error)}'
-            }), 500
-        
         print(f"🗑️  Deleted candidate {candidate_id} ({candidate_name})")
         return jsonify({
             'success': True,
@@ -1904,13 +2218,6 @@ def delete_candidate(candidate_id):
 def add_candidate():
     """Add a new candidate"""
     try:
-        # Use absolute path
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        json_path = os.path.join(base_dir, 'data', 'candidates.json')
-        
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
         candidate_data = request.json
         
         # Validate required fields
@@ -1922,13 +2229,8 @@ def add_candidate():
                     'error': f'Missing required field: {field}'
                 }), 400
         
-        # Generate new ID
-        max_id = max([c['id'] for c in data['candidates']], default=0)
-        new_id = max_id + 1
-        
-        # Create new candidate
+        # Create new candidate (the store assigns the next ID)
         new_candidate = {
-            'id': new_id,
             'name': candidate_data['name'],
             'phone': candidate_data['phone'],
             'email': candidate_data['email'],
@@ -1939,10 +2241,7 @@ def add_candidate():
             'reschedulingSlots': candidate_data.get('reschedulingSlots', [])
         }
         
-        data['candidates'].append(new_candidate)
-        
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        new_id = get_candidate_store().add_candidate(new_candidate)
         
         print(f"✅ Added new candidate: {new_candidate['name']} (ID: {new_id})")
         return jsonify({
@@ -1964,42 +2263,14 @@ def update_rescheduling_slots(candidate_id):
     """Update rescheduling slots for a candidate"""
     try:
         candidate_id_int = int(candidate_id)
-        # Use absolute path (same as reset endpoint)
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        json_path = os.path.join(base_dir, 'data', 'candidates.json')
-        
-        print(f"📝 Update rescheduling slots for candidate {candidate_id_int} - Using path: {json_path}")
-        
-        # Check if file exists
-        if not os.path.exists(json_path):
-            print(f"⚠️  Candidates file not found: {json_path}")
-            return jsonify({
-                'success': False,
-                'error': f'Candidates file not found: {json_path}'
-            }), 404
-        
-        # Check file permissions
-        if not os.access(json_path, os.W_OK):
-            print(f"⚠️  No write permission for file: {json_path}")
-            return jsonify({
-                'success': False,
-                'error': f'No write permission for file: {json_path}. Please check file permissions on EC2.'
-            }), 403
+        store = get_candidate_store()
         
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        candidate = next((c for c in data['candidates'] if c['id'] == candidate_id_int), None)
-        if not candidate:
-            return jsonify({
-                'success': False,
-                'error': 'Candidate not found'
-            }), 404
+        print(f"📝 Update rescheduling slots for candidate {candidate_id_int} - Using store: {store.describe()}")
         
         slot_ids = request.json.get('reschedulingSlots', [])
         
         # Validate slot IDs exist
-        available_slot_ids = [s['id'] for s in data.get('availableSlots', [])]
+        available_slot_ids = [s['id'] for s in store.get_available_slots()]
         invalid_ids = [sid for sid in slot_ids if sid not in available_slot_ids]
         if invalid_ids:
             return jsonify({
@@ -2007,28 +2278,25 @@ def update_rescheduling_slots(candidate_id):
                 'error': f'Invalid slot IDs: {invalid_ids}'
             }), 400
         
-        candidate['reschedulingSlots'] = slot_ids
+        def set_slots(candidate):
+            candidate['reschedulingSlots'] = slot_ids
         
-        # Write back to file with error handling
         try:
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            candidate = store.update_candidate(candidate_id_int, set_slots)
         except PermissionError as pe:
-            print(f"❌ Permission error writing file: {pe}")
+            print(f"❌ Permission error writing candidate store: {pe}")
             import traceback
             traceback.print_exc()
             return jsonify({
                 'success': False,
-                'error': f'Permission denied writing to file. Check file permissions on EC2: {str(pe)}'
+                'error': f'Permission denied writing to candidate store. Check file permissions on EC2: {str(pe)}'
             }), 403
-        except Exception as write_error:
-            print(f"❌ Error writing file: {write_error}")
-            import traceback
-            traceback.print_exc()
+        
+        if not candidate:
             return jsonify({
                 'success': False,
-                'error': f'Error writing file: {str(write_error)}'
-            }), 500
+                'error': 'Candidate not found'
+            }), 404
         
         print(f"✅ Updated rescheduling slots for candidate {candidate_id}: {slot_ids}")
         return jsonify({
@@ -2057,6 +2325,10 @@ def get_batch_executions():
         - page_number (optional, default: 1): Page number for pagination
         - page_size (optional, default: 10): Number of results per page
         - all_pages (optional, default: false): If true, fetch all pages automatically
+        - stream (optional, default: false): With all_pages, stream executions as
+          newline-delimited JSON (application/x-ndjson) as each page arrives, so
+          memory stays bounded by the page size. Also selected by
+          "Accept: application/x-ndjson".
     
     Returns:
         JSON response with:
@@ -2082,6 +2354,29 @@ def get_batch_executions():
         
         # Validate page_size (max typically 100)
         page_size = min(page_size, 100)
+        stream = (
+            request.args.get('stream', 'false').lower() == 'true' or
+            'application/x-ndjson' in request.headers.get('Accept', '')
+        )
+        
+        if all_pages and stream:
+            # One execution per line; a failure mid-crawl ends the stream with an error line
+            def generate():
+                count = 0
+                try:
+                    for executions in agent.iter_execution_pages(agent_id=agent_id, page_size=page_size):
+                        for execution in executions:
+                            yield json.dumps(execution, ensure_ascii=False) + '\n'
+                        count += len(executions)
+                    print(f"✅ Streamed {count} executions")
+                except Exception as e:
+                    print(f"❌ Error streaming executions after {count}: {e}")
+                    yield json.dumps({'success': False, 'error': str(e), 'streamed': count}) + '\n'
+            
+            response = Response(generate(), mimetype='application/x-ndjson')
+            response.headers['Cache-Control'] = 'no-cache'
+            response.headers['X-Accel-Buffering'] = 'no'
+            return response
         
         if all_pages:
             # Fetch all pages automatically
@@ -2141,6 +2436,8 @@ def get_batch_executions():
                     'page_size': page_size,
                     'has_more': False
                 })
+    except CircuitOpenError as e:
+        return bolna_unavailable_response(e)
     except requests.exceptions.RequestException as e:
         # Handle HTTP errors (404, 500, etc.)
         status_code = 500
@@ -2179,5 +2476,21 @@ if __name__ == '__main__':
     print(f"📡 Server will run on http://{host}:{port}")
     print(f"📝 Webhook endpoint: http://{host}:{port}/api/webhook")
     print(f"🔧 Debug mode: {debug_mode}")
+    
+    # Replay journaled webhooks and start the workers now rather than on the first
+    # webhook (in debug mode only in the reloader child that actually serves requests)
+    if WEBHOOK_ASYNC and (not debug_mode or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'):
+        queue_stats = get_webhook_queue().get_stats()
+        print(f"📥 Webhook queue ready ({queue_stats['depth']} pending)")
+    # Resume running campaigns (same reloader rule as the webhook queue)
+    if not debug_mode or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        campaign_stats = get_campaign_dispatcher().get_stats()
+        print(f"📣 Campaign dispatcher ready ({campaign_stats['live']} calls live)")
+        # Resume /api/call jobs interrupted by the restart
+        job_stats = get_call_job_workers().get_stats()
+        print(f"📞 Call job workers ready ({job_stats['workers']} workers, {job_stats['jobs'].get('queued', 0)} jobs queued)")
+        if agent and CALL_RECONCILE_ENABLED:
+            get_call_reconciler().start()
+            print(f"🔧 Call reconciler checking candidates in 'calling' for over {get_call_reconciler().stale_after:.0f}s")
     app.run(debug=debug_mode, host=host, port=port)
 
@@ -77,7 +77,10 @@ export async function POST(request: Request) {
 
       if (flaskResponse.ok) {
         const flaskData = await flaskResponse.json()
-        if (flaskData.success) {
+        if (flaskData.success && flaskData.queued) {
+          // Bolna didn't accept the call yet; Flask keeps it queued and retries
+          return NextResponse.json({ success: true, queued: true, jobId: flaskData.jobId, message: flaskData.message })
+        } else if (flaskData.success) {
           executionId = flaskData.executionId
         } else {
           throw new Error(flaskData.error || 'Flask backend returned error')
@@ -97,13 +100,9 @@ export async function POST(request: Request) {
         { status: 500 }
       )
     }
-    
-    // Only update candidate status to 'calling' if call was successfully initiated
-    if (executionId) {
-      candidate.status = 'calling'
-      // Write back to file
-      fs.writeFileSync(filePath, JSON.stringify(data, null, 2))
-    }
+
+    // Flask marks the candidate as 'calling' in its store, which rewrites candidates.json;
+    // writing our (older) copy back here would undo its changes
 
     return NextResponse.json({
       success: true,
@@ -1,6 +1,6 @@
 'use client'
 
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef } from 'react'
 import CandidateList from '@/components/CandidateList'
 import CallStatus from '@/components/CallStatus'
 import AddCandidateModal from '@/components/AddCandidateModal'
@@ -12,6 +12,8 @@ export default function Home() {
   const [loading, setLoading] = useState(true)
   const [callStatus, setCallStatus] = useState<any>(null)
   const [showAddModal, setShowAddModal] = useState(false)
+  // Store version of the data on screen (from /api/candidates and the stream)
+  const versionRef = useRef<number | null>(null)
 
   useEffect(() => {
     fetchCandidates()
@@ -21,15 +23,11 @@ export default function Home() {
     try {
       const backendUrl = getFlaskBackendUrl()
       
-      // Read directly from Flask backend to ensure we get the latest data
-      // This avoids any caching or path mismatch issues
+      // Read directly from Flask backend to ensure we get the latest data.
+      // 'no-cache' revalidates with the ETag, so unchanged data is a cheap 304
       const timestamp = new Date().getTime()
-      const response = await fetch(`${backendUrl}/api/candidates?t=${timestamp}`, {
-        cache: 'no-store',
-        headers: {
-          'Cache-Control': 'no-cache, no-store, must-revalidate',
-          'Pragma': 'no-cache',
-        }
+      const response = await fetch(`${backendUrl}/api/candidates`, {
+        cache: 'no-cache',
       })
       
       if (!response.ok) {
@@ -55,6 +53,7 @@ export default function Home() {
       console.log(`✅ Fetched ${data.candidates?.length || 0} candidates from Flask at ${new Date().toLocaleTimeString()}`)
       console.log(`   Status breakdown:`, statusCounts)
       
+      versionRef.current = data.version ?? null
       setCandidates(data.candidates || [])
       setAvailableSlots(data.availableSlots || [])
     } catch (error) {
@@ -134,13 +133,104 @@ export default function Home() {
     }
   }
   
-  // Auto-refresh candidates periodically to catch status updates
-  // More frequent polling to catch status changes faster
+  // Apply a change event from the candidate stream
+  const applyCandidateChanges = (changes: any) => {
+    versionRef.current = changes.version ?? versionRef.current
+    if (changes.reset) {
+      setCandidates(changes.candidates || [])
+      if (changes.availableSlots) {
+        setAvailableSlots(changes.availableSlots)
+      }
+      return
+    }
+    const changed = new Map<number, any>((changes.candidates || []).map((c: any) => [c.id, c] as [number, any]))
+    const deleted = new Set<number>(changes.deleted || [])
+    if (changed.size === 0 && deleted.size === 0) {
+      return
+    }
+    setCandidates(prev => {
+      const next = prev
+        .filter(c => !deleted.has(c.id))
+        .map(c => {
+          const updated = changed.get(c.id)
+          if (updated) {
+            changed.delete(c.id)
+            return updated
+          }
+          return c
+        })
+      return [...next, ...Array.from(changed.values())]
+    })
+  }
+
+  // Poll for changes since the version on screen (full fetch if unknown)
+  const pollCandidateChanges = async () => {
+    if (versionRef.current === null) {
+      return fetchCandidates()
+    }
+    try {
+      const backendUrl = getFlaskBackendUrl()
+      const response = await fetch(`${backendUrl}/api/candidates?since=${versionRef.current}`, {
+        cache: 'no-cache',
+      })
+      if (!response.ok) {
+        return fetchCandidates()
+      }
+      applyCandidateChanges(await response.json())
+    } catch (error) {
+      console.error('Error polling candidate changes:', error)
+    }
+  }
+
+  // Live updates: the backend pushes only changed candidates over SSE.
+  // Fall back to polling every 3 seconds while the stream is disconnected.
   useEffect(() => {
-    const interval = setInterval(() => {
-      fetchCandidates()
-    }, 3000) // Refresh every 3 seconds (increased frequency for faster status updates)
-    return () => clearInterval(interval)
+    const backendUrl = getFlaskBackendUrl()
+    let pollInterval: ReturnType<typeof setInterval> | null = null
+
+    const startPolling = () => {
+      if (!pollInterval) {
+        pollInterval = setInterval(() => {
+          pollCandidateChanges()
+        }, 3000)
+      }
+    }
+    const stopPolling = () => {
+      if (pollInterval) {
+        clearInterval(pollInterval)
+        pollInterval = null
+      }
+    }
+
+    if (typeof EventSource === 'undefined') {
+      startPolling()
+      return () => stopPolling()
+    }
+
+    // EventSource reconnects on its own and resumes from the last event id
+    const source = new EventSource(`${backendUrl}/api/candidates/stream`)
+    source.addEventListener('open', () => stopPolling())
+    source.addEventListener('snapshot', (event: MessageEvent) => {
+      const data = JSON.parse(event.data)
+      versionRef.current = data.version ?? null
+      setCandidates(data.candidates || [])
+      setAvailableSlots(data.availableSlots || [])
+      setLoading(false)
+    })
+    source.addEventListener('changes', (event: MessageEvent) => {
+      const changes = JSON.parse(event.data)
+      console.log(`🔄 Candidate stream: ${changes.candidates?.length || 0} changed, ${changes.deleted?.length || 0} deleted (v${changes.version})`)
+      applyCandidateChanges(changes)
+    })
+    source.addEventListener('error', () => {
+      console.warn('Candidate stream disconnected, polling until it reconnects')
+      startPolling()
+    })
+
+    return () => {
+      source.close()
+      stopPolling()
+    }
   }, [])
 
   return (
@@ -0,0 +1,192 @@
+"""
+Asyncio Bolna client
+Same surface as BolnaAgent (make_call, get_execution_details, get_execution_logs,
+list_executions, list_all_executions) as coroutines, so hundreds of status
+fetches or dials can be awaited concurrently
+
+Requests run on the shared pooled keep-alive session from bolna_http.py (with
+its timeouts and retries) in a bounded thread pool; an asyncio semaphore caps
+in-flight requests and a token bucket caps the request rate across all tasks.
+"""
+
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Iterable
+from bolna_agent import BolnaAgent
+from config import BOLNA_ASYNC_CONCURRENCY, BOLNA_ASYNC_RATE_LIMIT
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket for coroutines: `rate` requests per second, bursts up to `burst`
+
+    A rate of 0 or less disables limiting.
+    """
+
+    def __init__(self, rate: float = BOLNA_ASYNC_RATE_LIMIT, burst: Optional[int] = None):
+        self.rate = rate
+        self.burst = (burst or max(1, int(rate))) if rate > 0 else 0
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = None
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        # Waiters queue on the lock so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncBolnaAgent:
+    """
+    Async wrapper around BolnaAgent
+
+    Usage:
+        async with AsyncBolnaAgent() as agent:
+            details = await agent.get_many_execution_details(execution_ids)
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        concurrency: int = BOLNA_ASYNC_CONCURRENCY,
+        rate_limit: float = BOLNA_ASYNC_RATE_LIMIT,
+        agent: Optional[BolnaAgent] = None,
+        limiter: Optional[AsyncRateLimiter] = None
+    ):
+        """
+        Args:
+            api_key: Bolna API key (optional, defaults to .env)
+            concurrency: Maximum requests in flight
+            rate_limit: Maximum requests per second (0 = unlimited)
+            agent: Existing BolnaAgent to wrap (keeps its agent_id)
+            limiter: Rate limiter shared with other clients (overrides rate_limit)
+        """
+        self.sync_agent = agent or BolnaAgent(api_key)
+        self.concurrency = concurrency
+        self.limiter = limiter or AsyncRateLimiter(rate_limit)
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='bolna-async')
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    @property
+    def agent_id(self) -> Optional[str]:
+        return self.sync_agent.agent_id
+
+    @agent_id.setter
+    def agent_id(self, value: Optional[str]):
+        self.sync_agent.agent_id = value
+
+    async def _run(self, func, *args, **kwargs):
+        """Run one blocking BolnaAgent call under the semaphore and rate limit"""
+        async with self._semaphore:
+            await self.limiter.acquire()
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def make_call(self, *args, **kwargs) -> Dict[str, Any]:
+        """See BolnaAgent.make_call"""
+        return await self._run(self.sync_agent.make_call, *args, **kwargs)
+
+    async def get_execution_details(self, execution_id: str) -> Dict[str, Any]:
+        """See BolnaAgent.get_execution_details"""
+        return await self._run(self.sync_agent.get_execution_details, execution_id)
+
+    async def get_execution_logs(self, execution_id: str) -> Dict[str, Any]:
+        """See BolnaAgent.get_execution_logs"""
+        return await self._run(self.sync_agent.get_execution_logs, execution_id)
+
+    async def list_executions(
+        self,
+        agent_id: Optional[str] = None,
+        page_number: int = 1,
+        page_size: int = 10
+    ) -> Dict[str, Any]:
+        """See BolnaAgent.list_executions"""
+        return await self._run(
+            self.sync_agent.list_executions,
+            agent_id=agent_id, page_number=page_number, page_size=page_size
+        )
+
+    async def list_all_executions(
+        self,
+        agent_id: Optional[str] = None,
+        page_size: int = 50,
+        max_pages: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch all executions across pages
+
+        The first page reveals `total`; the remaining pages are then fetched
+        concurrently and merged in page order. Without a total, pages are
+        walked one by one until has_more is false.
+        """
+        first = await self.list_executions(agent_id=agent_id, page_number=1, page_size=page_size)
+        if isinstance(first, list):
+            return first
+        if not isinstance(first, dict):
+            return []
+
+        all_executions = list(first.get('data', []))
+        if not first.get('has_more', False):
+            return all_executions
+
+        total = first.get('total')
+        if isinstance(total, int) and total > 0:
+            last_page = -(-total // page_size)
+            if max_pages:
+                last_page = min(last_page, max_pages)
+            pages = await asyncio.gather(*(
+                self.list_executions(agent_id=agent_id, page_number=page, page_size=page_size)
+                for page in range(2, last_page + 1)
+            ))
+            for result in pages:
+                if isinstance(result, dict):
+                    all_executions.extend(result.get('data', []))
+            print(f"✅ Fetched {len(all_executions)} total executions across {last_page} page(s)")
+            return all_executions
+
+        page = 1
+        result = first
+        while result.get('has_more', False) and not (max_pages and page >= max_pages):
+            page += 1
+            result = await self.list_executions(agent_id=agent_id, page_number=page, page_size=page_size)
+            if not isinstance(result, dict):
+                break
+            all_executions.extend(result.get('data', []))
+        print(f"✅ Fetched {len(all_executions)} total executions across {page} page(s)")
+        return all_executions
+
+    async def get_many_execution_details(self, execution_ids: Iterable[str]) -> Dict[str, Any]:
+        """
+        Fetch details for many executions concurrently
+
+        Returns:
+            Dict of execution_id -> details dict, or the exception raised for it
+        """
+        execution_ids = list(dict.fromkeys(execution_ids))
+        results = await asyncio.gather(
+            *(self.get_execution_details(execution_id) for execution_id in execution_ids),
+            return_exceptions=True
+        )
+        return dict(zip(execution_ids, results))
+
+    async def close(self):
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
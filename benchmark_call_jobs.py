@@ -0,0 +1,99 @@
+"""
+Throughput benchmark: durable call job queue
+Enqueues and drains a temporary SQLite queue, comparing one transaction per
+job with batched transactions, and several worker threads (each with its own
+connection) against a single one. Job handling itself is a no-op, so the
+numbers are the queue's own overhead per dial.
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from call_jobs import CallJobQueue
+
+
+def fresh_queue() -> CallJobQueue:
+    return CallJobQueue(os.path.join(tempfile.mkdtemp(), 'call_jobs.db'))
+
+
+def payloads(count: int):
+    return [{'candidateId': i, 'phone': f'+9190000{i % 100000:05d}', 'name': 'Candidate'} for i in range(count)]
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def enqueue_single(queue: CallJobQueue, jobs):
+    for payload in jobs:
+        queue.enqueue(payload)
+
+
+def enqueue_batched(queue: CallJobQueue, jobs, batch: int):
+    for start in range(0, len(jobs), batch):
+        queue.enqueue_many(jobs[start:start + batch])
+
+
+def drain(db_path: str, workers: int, limit: int):
+    """Lease + ack until the queue is empty, from `workers` threads"""
+    def worker():
+        queue = CallJobQueue(db_path)
+        while True:
+            jobs = queue.lease(limit)
+            if not jobs:
+                return
+            for job in jobs:
+                queue.ack(job['id'], job['lease_id'], {'executionId': f"exec-{job['id']}"})
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def report(label: str, count: int, elapsed: float):
+    print(f"   {label:<34} {count / elapsed:>10,.0f} jobs/s  ({elapsed:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the durable call job queue")
+    parser.add_argument('--jobs', '-n', type=int, default=20000, help='Jobs per measurement (default: 20000)')
+    parser.add_argument('--batch', type=int, default=500, help='Jobs per enqueue_many()/lease() batch (default: 500)')
+    parser.add_argument('--workers', type=int, default=4, help='Worker threads for the concurrent drain (default: 4)')
+    args = parser.parse_args()
+    jobs = payloads(args.jobs)
+
+    print(f"{'='*70}")
+    print(f"⏱️  Call Job Queue Benchmark ({args.jobs} jobs)")
+    print(f"{'='*70}\n")
+
+    print("📥 Enqueue")
+    single = fresh_queue()
+    report('enqueue() one per transaction', args.jobs, timed(lambda: enqueue_single(single, jobs)))
+    batched = fresh_queue()
+    report(f'enqueue_many() batches of {args.batch}', args.jobs, timed(lambda: enqueue_batched(batched, jobs, args.batch)))
+
+    print("\n📤 Lease + ack")
+    report('1 worker, lease(1)', args.jobs, timed(lambda: drain(single.db_path, 1, 1)))
+    report(f'1 worker, lease({args.batch})', args.jobs, timed(lambda: drain(batched.db_path, 1, args.batch)))
+    concurrent = fresh_queue()
+    enqueue_batched(concurrent, jobs, args.batch)
+    report(f'{args.workers} workers, lease(1)', args.jobs, timed(lambda: drain(concurrent.db_path, args.workers, 1)))
+
+    # Finished jobs stay in the table until purged; leasing must not slow down with them
+    print(f"\n🔎 Lease latency with {args.jobs} finished jobs in the table")
+    batched.enqueue(jobs[0])
+    start = time.perf_counter()
+    job = batched.lease(1)[0]
+    print(f"   lease(1): {(time.perf_counter() - start) * 1000:.2f} ms")
+    batched.ack(job['id'], job['lease_id'])
+    print(f"   counts: {batched.counts()}")
+
+
+if __name__ == '__main__':
+    main()
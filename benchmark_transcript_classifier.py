@@ -0,0 +1,210 @@
+"""
+Golden-corpus check and throughput benchmark for the transcript classifier
+Compares parse_call_outcome's single-scan classifier (transcript_classifier.py)
+with the original per-pattern re.search implementation on:
+  - the built-in golden transcripts below (with their expected statuses)
+  - every transcript stored in the webhook event log and data/transcripts.json
+  - optionally, randomly generated transcripts (--fuzz N)
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import re
+import time
+from update_candidate_status import parse_call_outcome
+from transcript_classifier import classify_transcript, PATTERNS
+
+# (transcript, expected status)
+GOLDEN_TRANSCRIPTS = [
+    ("assistant: Hello, am I speaking with Rahul?\nuser: Yes.\n"
+     "assistant: I'm calling to confirm your interview on Monday, the 15th of December at 2:00 P.M.\n"
+     "user: Yes, that time works. I'll be there.", 'rescheduled'),
+    ("assistant: Hi Priya, this is about your interview slot.\nuser: Yes sure, the slot is fine.\n"
+     "assistant: Perfect, thank you for the confirmation.", 'confirmed'),
+    ("assistant: Is this a good time to talk about your application?\n"
+     "user: Sorry, I am not interested anymore. Please remove my application.", 'declined'),
+    ("assistant: Can you attend the interview?\nuser: I can't make it, can we change it to Wednesday?\n"
+     "assistant: Sure, I will move it to Wednesday, the 17th of December at 4:00 P.M.", 'rescheduled'),
+    ("assistant: Hello?\nuser: Hello, who is this?\nassistant: Am I speaking with Amit?\nuser: No, wrong number.",
+     'declined'),
+    ("assistant: Hello, is this Neha?\nuser: Hmm.\nassistant: We will call back later.", 'pending'),
+    ("user: Okay, I will come on time.\nassistant: Great, see you then.", 'confirmed'),
+    ("user: I don't want this job any more, no thanks, I am not pursuing it.", 'declined'),
+    ("assistant: Would a different date suit you better?\nuser: A different date would be better, yes.",
+     'rescheduled'),
+    ("user: Thank you, great.", 'confirmed'),
+]
+
+# The original parse_call_outcome transcript patterns, used as the reference
+LEGACY_CONFIRMED = [
+    r'\b(confirmed|confirm|confirmation)\b',
+    r'\b(yes|yeah|sure|okay|ok|alright|sounds good|that works|perfect)\b.*\b(interview|slot|time)\b',
+    r'\b(i will|i\'ll|i can).*\b(attend|come|be there)\b',
+    r'\b(see you|looking forward|thank you).*\b(confirmation|confirm)\b'
+]
+LEGACY_DECLINED = [
+    r'\b(declined|decline|not interested|no longer interested)\b',
+    r'\b(i don\'t want|i do not want).*\b(interview|position|job)\b',
+    r'\b(remove|withdraw|not pursuing).*\b(application|position)\b',
+    r'\b(no thank you|no thanks).*\b(not interested|not pursuing)\b'
+]
+LEGACY_RESCHEDULED = [
+    r'\b(rescheduled|reschedule|change|different|another)\b.*\b(time|slot|date|day)\b',
+    r'\b(monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b.*\b(\d{1,2}(?:st|nd|rd|th)?)\b.*\b(december|january|february|march|april|may|june|july|august|september|october|november)\b',
+    r'\b(new|different|another)\b.*\b(slot|time|date)\b',
+    r'\b(change|switch|move).*\b(to|for)\b.*\b(monday|tuesday|wednesday|thursday|friday)\b'
+]
+
+
+def legacy_scores(transcript: str) -> dict:
+    """Scores exactly as the original implementation computed them"""
+    transcript_lower = transcript.lower()
+    return {
+        'confirmed': sum(1 for p in LEGACY_CONFIRMED if re.search(p, transcript_lower, re.IGNORECASE)),
+        'declined': sum(1 for p in LEGACY_DECLINED if re.search(p, transcript_lower, re.IGNORECASE)),
+        'rescheduled': sum(1 for p in LEGACY_RESCHEDULED if re.search(p, transcript, re.IGNORECASE)),
+        'fallback_confirmed': int(bool(re.search(r'\b(great|perfect|thank you|sounds good)\b.*\b(confirmation|confirm|confirmed)\b', transcript_lower))),
+        'negative_word': int(bool(re.search(r'\b(not|no|decline|cancel|withdraw)\b', transcript_lower))),
+        'positive_word': int(bool(re.search(r'\b(yes|sure|okay|confirm)\b', transcript_lower))),
+        'positive_language': int(bool(re.search(r'\b(yes|sure|okay|alright|perfect|great|thank you)\b', transcript_lower))),
+    }
+
+
+def legacy_status(transcript: str) -> str:
+    """Status the original transcript fallback would have returned"""
+    scores = legacy_scores(transcript)
+    if scores['rescheduled'] > 0 and scores['rescheduled'] >= scores['declined']:
+        return 'rescheduled'
+    if scores['declined'] > 0 and scores['declined'] > scores['confirmed']:
+        return 'declined'
+    if scores['confirmed'] > 0:
+        return 'confirmed'
+    if scores['fallback_confirmed']:
+        return 'confirmed'
+    if scores['negative_word'] and not scores['positive_word']:
+        return 'declined'
+    if scores['positive_language']:
+        return 'confirmed'
+    return 'pending'
+
+
+def current_status(transcript: str) -> str:
+    """Status parse_call_outcome returns today (its logging is suppressed)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return parse_call_outcome({}, transcript)['status']
+
+
+def load_stored_transcripts() -> list:
+    """Transcripts from the webhook event log and data/transcripts.json"""
+    transcripts = []
+    try:
+        from webhook_store import get_webhook_log
+        for entry in get_webhook_log(background=False).iter_latest():
+            if entry.get('transcript'):
+                transcripts.append(entry['transcript'])
+    except Exception as e:
+        print(f"⚠️  Could not read webhook event log: {e}")
+
+    transcripts_file = os.path.join('data', 'transcripts.json')
+    if os.path.exists(transcripts_file):
+        try:
+            with open(transcripts_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for candidate in data.get('by_candidate', {}).values():
+                for entry in candidate.get('transcripts', {}).values():
+                    if entry.get('transcript'):
+                        transcripts.append(entry['transcript'])
+        except Exception as e:
+            print(f"⚠️  Could not read {transcripts_file}: {e}")
+
+    return list(dict.fromkeys(transcripts))
+
+
+def random_transcripts(count: int, seed: int) -> list:
+    """Random transcripts built from the classifier vocabulary plus look-alike words"""
+    vocabulary = sorted({
+        phrase for _, groups in PATTERNS for phrases, _ in groups for phrase in phrases
+        if not phrase.startswith('#')
+    })
+    vocabulary += ['15th', '2', '123', '3rd', 'cannot', 'removed', 'withdrawn', 'changes', 'your',
+                   'Monday', 'I', "DON'T", 'hello', 'the', 'interviews', "i'm", 'nothing', 'okay.',
+                   'movement', '5pm', 'no-thanks', 'willing', 'unchanged', 'user:', 'assistant:']
+    separators = [' ', ' ', ' ', ' ', "'", '\n', ', ', '. ', '  ', '-', '\r\n', '?']
+    rng = random.Random(seed)
+    transcripts = []
+    for _ in range(count):
+        text = ''.join(rng.choice(vocabulary) + rng.choice(separators) for _ in range(rng.randint(1, 30)))
+        transcripts.append(text.upper() if rng.random() < 0.2 else text)
+    return transcripts
+
+
+def throughput(func, transcripts: list, min_seconds: float = 1.0) -> float:
+    """Transcripts per second"""
+    processed = 0
+    start = time.perf_counter()
+    while True:
+        for transcript in transcripts:
+            func(transcript)
+        processed += len(transcripts)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return processed / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify and benchmark the transcript outcome classifier")
+    parser.add_argument('--fuzz', type=int, default=0, help='Also compare N random transcripts (default: 0)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for --fuzz')
+    parser.add_argument('--no-benchmark', action='store_true', help='Only run the golden corpus check')
+    args = parser.parse_args()
+
+    print(f"{'='*70}")
+    print(f"🧪 Transcript Classifier: Golden Corpus Check")
+    print(f"{'='*70}\n")
+
+    failures = 0
+    for i, (transcript, expected) in enumerate(GOLDEN_TRANSCRIPTS, 1):
+        status = current_status(transcript)
+        if status != expected or legacy_status(transcript) != expected:
+            failures += 1
+            print(f"❌ Golden #{i}: expected {expected}, got {status} (legacy: {legacy_status(transcript)})")
+    print(f"✅ Golden transcripts: {len(GOLDEN_TRANSCRIPTS) - failures}/{len(GOLDEN_TRANSCRIPTS)} match")
+
+    stored = load_stored_transcripts()
+    generated = random_transcripts(args.fuzz, args.seed) if args.fuzz else []
+    for label, transcripts in (('Stored transcripts', stored), ('Random transcripts', generated)):
+        if not transcripts:
+            continue
+        mismatches = 0
+        for transcript in transcripts:
+            if classify_transcript(transcript) != legacy_scores(transcript) or current_status(transcript) != legacy_status(transcript):
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"❌ Mismatch: {transcript[:120]!r}")
+        failures += mismatches
+        print(f"{'✅' if not mismatches else '❌'} {label}: {len(transcripts) - mismatches}/{len(transcripts)} identical")
+
+    if not args.no_benchmark:
+        corpus = stored or [transcript for transcript, _ in GOLDEN_TRANSCRIPTS]
+        print(f"\n⏱️  Throughput on {len(corpus)} {'stored' if stored else 'golden'} transcript(s)")
+        before = throughput(legacy_scores, corpus)
+        after = throughput(classify_transcript, corpus)
+        print(f"   Before (per-pattern re.search): {before:10.0f} transcripts/sec")
+        print(f"   After  (single-scan classifier): {after:10.0f} transcripts/sec")
+        print(f"   Speedup: {after / before:.2f}x")
+
+    print(f"\n{'='*70}")
+    if failures:
+        print(f"❌ {failures} mismatch(es)")
+    else:
+        print(f"✅ All statuses identical")
+    print(f"{'='*70}")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""
+Micro-benchmark: per-webhook field extraction cost
+Compares the old per-consumer fallback chains (webhook endpoint + worker +
+save_webhook_data + save_transcript_separately, each probing the raw payload)
+with a single WebhookPayload resolution shared by all of them
+"""
+
+import argparse
+import time
+from webhook_payload import WebhookPayload
+
+# Representative Bolna webhook (flat format) and a nested variant
+FLAT_PAYLOAD = {
+    'id': '4c5b8f2e-0d7a-4a9b-9a55-1f6f3c1d2e90',
+    'agent_id': 'a1b2c3d4',
+    'batch_id': None,
+    'status': 'completed',
+    'user_number': '+918755887760',
+    'agent_number': '+918035451234',
+    'conversation_duration': 74.2,
+    'total_cost': 3.1,
+    'transcript': 'assistant: Hello, am I speaking with Rahul?\nuser: Yes.\n' * 20,
+    'summary': 'Candidate confirmed the interview slot.',
+    'extracted_data': {'call_outcome': 'ACCEPTED', 'final_slot': None, 'notes': ''},
+    'cost_breakdown': {'llm': 1.2, 'network': 0.4, 'synthesizer': 0.9, 'transcriber': 0.6},
+    'usage_breakdown': {'llmTokens': 4210},
+    'telephony_data': {
+        'duration': '75', 'to_number': '+918755887760', 'from_number': '+918035451234',
+        'recording_url': 'https://example.com/recording.mp3', 'provider': 'plivo'
+    },
+    'created_at': '2024-12-01T10:00:00.000Z',
+    'updated_at': '2024-12-01T10:01:20.000Z',
+}
+NESTED_PAYLOAD = {'event': 'execution.completed', 'data': dict(FLAT_PAYLOAD)}
+
+
+def legacy_extract(payload):
+    """The fallback chains each consumer evaluated before WebhookPayload"""
+    # webhook endpoint: execution id, status and updated_at for the dedup check
+    endpoint_id = (
+        payload.get('id') or payload.get('execution_id') or payload.get('executionId') or
+        payload.get('data', {}).get('id') or payload.get('data', {}).get('execution_id') or
+        payload.get('data', {}).get('executionId')
+    )
+    execution_details = payload.get('data') or payload.get('execution') or payload
+    endpoint_status = (payload.get('status') or execution_details.get('status') or 'unknown').lower()
+    updated_at = payload.get('updated_at') or execution_details.get('updated_at')
+
+    # webhook_handler: execution id, phone fallback, status, transcript, extracted_data
+    execution_id = (
+        payload.get('id') or payload.get('execution_id') or payload.get('executionId') or
+        payload.get('data', {}).get('id') or payload.get('data', {}).get('execution_id') or
+        payload.get('data', {}).get('executionId')
+    )
+    phone_number = (
+        payload.get('user_number') or payload.get('recipient_phone_number') or
+        payload.get('phone_number') or payload.get('phone') or
+        payload.get('telephony_data', {}).get('to_number') or
+        payload.get('data', {}).get('user_number') or
+        payload.get('data', {}).get('recipient_phone_number') or None
+    )
+    execution_details = payload.get('data') or payload.get('execution') or payload
+    status = (payload.get('status') or execution_details.get('status') or 'unknown').lower()
+    transcript = (
+        payload.get('transcript') or payload.get('conversation_transcript') or
+        execution_details.get('transcript') or execution_details.get('conversation_transcript') or ''
+    )
+    extracted_data = payload.get('extracted_data') or execution_details.get('extracted_data') or {}
+
+    # save_webhook_data
+    execution_details = payload.get('data') or payload.get('execution') or payload
+    telephony_data = payload.get('telephony_data') or execution_details.get('telephony_data') or {}
+    entry = {
+        'status': payload.get('status') or execution_details.get('status') or 'unknown',
+        'transcript': (
+            payload.get('transcript') or payload.get('conversation_transcript') or
+            execution_details.get('transcript') or execution_details.get('conversation_transcript') or ''
+        ),
+        'summary': payload.get('summary') or execution_details.get('summary') or '',
+        'extracted_data': payload.get('extracted_data') or execution_details.get('extracted_data') or {},
+        'recipient_phone_number': (
+            payload.get('user_number') or payload.get('recipient_phone_number') or
+            payload.get('phone_number') or payload.get('phone') or
+            execution_details.get('user_number') or execution_details.get('recipient_phone_number') or
+            telephony_data.get('to_number') or None
+        ),
+        'agent_phone_number': (
+            payload.get('agent_number') or payload.get('agent_phone_number') or
+            telephony_data.get('from_number') or None
+        ),
+        'telephony_data': telephony_data,
+        'recording_url': (
+            telephony_data.get('recording_url') or payload.get('recording_url') or
+            execution_details.get('recording_url') or ''
+        ),
+    }
+    for key, default in (
+        ('conversation_duration', None), ('total_cost', None), ('cost_breakdown', {}),
+        ('usage_breakdown', {}), ('context_details', {}), ('latency_data', {}),
+        ('agent_id', None), ('batch_id', None), ('created_at', None), ('updated_at', None),
+        ('answered_by_voice_mail', None), ('error_message', None), ('agent_extraction', None),
+        ('provider', None)
+    ):
+        entry[key] = payload.get(key) or execution_details.get(key) or default
+
+    # save_transcript_separately
+    telephony_data = (
+        payload.get('telephony_data') or payload.get('data', {}).get('telephony_data') or
+        payload.get('execution', {}).get('telephony_data') or {}
+    )
+    caller_id = telephony_data.get('from_number') or payload.get('agent_phone_number') or payload.get('caller_id')
+    recipient_phone = telephony_data.get('to_number') or payload.get('recipient_phone_number')
+    transcript_status = payload.get('status') or payload.get('data', {}).get('status') or 'unknown'
+    call_duration = telephony_data.get('duration') or payload.get('conversation_duration')
+
+    return endpoint_id, endpoint_status, updated_at, execution_id, phone_number, status, transcript, extracted_data, entry, caller_id, recipient_phone, transcript_status, call_duration
+
+
+def normalized_extract(payload):
+    """Resolve once, then every consumer reads attributes"""
+    webhook = WebhookPayload(payload)
+    entry = webhook.stored_fields()
+    return (
+        webhook.execution_id, webhook.status_lower, webhook.updated_at,
+        webhook.execution_id, webhook.recipient_phone_number, webhook.status_lower,
+        webhook.transcript, webhook.extracted_data, entry, webhook.agent_phone_number,
+        webhook.recipient_phone_number, webhook.status,
+        webhook.telephony_data.get('duration') or webhook.conversation_duration
+    )
+
+
+def time_per_call(func, payload, iterations: int) -> float:
+    """Best-of-7 average time per call in microseconds"""
+    best = None
+    for _ in range(7):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func(payload)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark webhook field extraction")
+    parser.add_argument('--iterations', '-n', type=int, default=50000, help='Calls per measurement (default: 50000)')
+    args = parser.parse_args()
+
+    print(f"{'='*70}")
+    print(f"⏱️  Webhook Field Extraction Benchmark ({args.iterations} iterations, best of 7)")
+    print(f"{'='*70}\n")
+
+    for label, payload in (('flat payload', FLAT_PAYLOAD), ('nested payload', NESTED_PAYLOAD)):
+        before = time_per_call(legacy_extract, payload, args.iterations)
+        after = time_per_call(normalized_extract, payload, args.iterations)
+        print(f"📦 {label}")
+        print(f"   Before (per-consumer chains): {before:8.2f} µs/webhook")
+        print(f"   After  (WebhookPayload):      {after:8.2f} µs/webhook")
+        print(f"   Speedup: {before / after:.2f}x\n")
+
+
+if __name__ == '__main__':
+    main()
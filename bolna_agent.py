@@ -5,7 +5,9 @@ Creates and manages the Ava interview scheduling agent
 
 import requests
 import json
-from typing import Optional, Dict, Any, List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Iterator
 from config import (
     BOLNA_API_BASE,
     BOLNA_API_KEY,
@@ -16,16 +18,22 @@ from config import (
     TEMPERATURE,
     VOICE_PROVIDER,
     VOICE_ID,
-    VOICE_LANGUAGE
+    VOICE_LANGUAGE,
+    BOLNA_PAGE_WORKERS
 )
 from system_prompt import SYSTEM_PROMPT, INTRO_PROMPT
 from time_formatter import format_time_for_speech, format_datetime_for_speech, format_slots_for_speech
 from call_extraction_schema import EXTRACTION_SCHEMA
+from bolna_http import get_bolna_http, request_not_sent, CircuitOpenError
+from single_flight import SingleFlight
 
 
 class BolnaAgent:
     """Class to interact with Bolna AI API for voice calling agent"""
     
+    # Concurrent identical reads (same execution / page) share one HTTP request
+    _single_flight = SingleFlight()
+    
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize the Bolna Agent
@@ -42,6 +50,8 @@ class BolnaAgent:
             "Content-Type": "application/json"
         }
         self.agent_id = None
+        # Shared pooled session (keep-alive, timeouts, retries) for every Bolna call
+        self.http = get_bolna_http()
     
     def create_agent(self) -> Dict[str, Any]:
         """
@@ -183,7 +193,7 @@ class BolnaAgent:
         try:
             print(f"📤 Sending request to: {url}")
             print(f"📋 Payload structure: {json.dumps(payload, indent=2)[:500]}...")
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = self.http.post(url, operation='agent', headers=self.headers, json=payload)
             
             # Print response for debugging
             print(f"📥 Response status: {response.status_code}")
@@ -237,6 +247,11 @@ class BolnaAgent:
         
         Returns:
             Dictionary containing call execution details
+        
+        Raises:
+            ValueError: Bolna rejected the call, or the request failed after it may have been sent
+            requests.exceptions.RequestException: The request never reached Bolna (safe to retry)
+            CircuitOpenError: The dial circuit is open; nothing was sent
         """
         if not self.agent_id:
             raise ValueError("Agent not created yet. Please call create_agent() first.")
@@ -292,7 +307,7 @@ class BolnaAgent:
             payload["scheduled_at"] = scheduled_at
         
         try:
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = self.http.post(url, operation='call', headers=self.headers, json=payload)
             
             # Check for specific error messages in response
             if response.status_code != 200:
@@ -327,7 +342,14 @@ class BolnaAgent:
         except ValueError as e:
             # Re-raise ValueError (wallet balance or custom errors)
             raise
+        except CircuitOpenError:
+            # Nothing was sent; let callers tell an outage from an API error
+            raise
         except requests.exceptions.RequestException as e:
+            if request_not_sent(e):
+                # Nothing reached Bolna (refused connection, connect timeout): callers may retry safely
+                print(f"❌ Error making call (not sent): {e}")
+                raise
             error_msg = f"Error making call: {e}"
             if hasattr(e, 'response') and e.response is not None:
                 try:
@@ -343,6 +365,10 @@ class BolnaAgent:
             print(f"❌ {error_msg}")
             raise ValueError(error_msg)
     
+    def _coalesce(self, key: tuple, func, *args):
+        """Run a read through the shared single-flight group (see single_flight.py)"""
+        return BolnaAgent._single_flight.do((self.base_url, self.api_key) + key, lambda: func(*args))
+    
     def get_execution_details(self, execution_id: str) -> Dict[str, Any]:
         """
         Get details of a call execution using Bolna AI Execution API
@@ -358,11 +384,15 @@ class BolnaAgent:
             - extracted_data (if any data was extracted)
             - context_details, latency_data, usage_breakdown
         """
-        # Try /execution/{id} first, then /executions/{id} if needed
-        url = f"{self.base_url}/execution/{execution_id}"
+        return self._coalesce(('execution', execution_id), self._fetch_execution_details, execution_id)
+    
+    def _fetch_execution_details(self, execution_id: str) -> Dict[str, Any]:
+        # Accounts serve either /execution/{id} or /executions/{id}; the client
+        # remembers which one answers so the other isn't tried on every call
+        urls = [f"{self.base_url}/execution/{execution_id}", f"{self.base_url}/executions/{execution_id}"]
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.http.get_first_found('execution_details', urls, operation='execution', headers=self.headers)
             response.raise_for_status()
             result = response.json()
             
@@ -376,46 +406,26 @@ class BolnaAgent:
                     return data[0]
                 return data
             return result
-        except requests.exceptions.HTTPError as e:
-            # If 404, try alternative endpoint format (/executions instead of /execution)
-            if e.response and e.response.status_code == 404:
-                try:
-                    alt_url = f"{self.base_url}/executions/{execution_id}"
-                    alt_response = requests.get(alt_url, headers=self.headers)
-                    alt_response.raise_for_status()
-                    result = alt_response.json()
-                    print(f"✅ Found execution using /executions endpoint")
-                    if isinstance(result, list) and len(result) > 0:
-                        return result[0]
-                    elif isinstance(result, dict) and 'data' in result:
-                        data = result['data']
-                        if isinstance(data, list) and len(data) > 0:
-                            return data[0]
-                        return data
-                    return result
-                except requests.exceptions.HTTPError as alt_e:
-                    # If alternative also fails with 404, re-raise original 404 exception
-                    # (404 is expected for expired executions - don't log as error)
-                    if alt_e.response and alt_e.response.status_code == 404:
-                        raise e  # Re-raise original 404
-                    # If alternative fails with different error, raise that
-                    raise alt_e
-                except:
-                    # For any other exception from alternative endpoint, re-raise original 404
-                    raise e
-            # For non-404 HTTP errors, log as actual error
-            print(f"❌ Error fetching execution details: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"Response: {e.response.text}")
-            raise
         except requests.exceptions.RequestException as e:
-            # Only log non-404 errors as actual errors
+            # 404 is expected for expired executions - don't log it as an error
             if not (hasattr(e, 'response') and e.response is not None and e.response.status_code == 404):
                 print(f"❌ Error fetching execution details: {e}")
                 if hasattr(e, 'response') and e.response is not None:
                     print(f"Response: {e.response.text}")
             raise
     
+    @staticmethod
+    def transcript_from_details(details: Dict[str, Any]) -> str:
+        """Transcript from already fetched execution details ('' if there is none)"""
+        # Try different possible keys for transcript
+        return (
+            details.get('transcript') or 
+            details.get('conversation_transcript') or 
+            details.get('call_transcript') or
+            details.get('transcript_text') or
+            ''
+        )
+    
     def get_transcript(self, execution_id: str) -> str:
         """
         Get transcript from a call execution
@@ -427,15 +437,7 @@ class BolnaAgent:
             Transcript string from the call
         """
         details = self.get_execution_details(execution_id)
-        
-        # Try different possible keys for transcript
-        transcript = (
-            details.get('transcript') or 
-            details.get('conversation_transcript') or 
-            details.get('call_transcript') or
-            details.get('transcript_text') or
-            ''
-        )
+        transcript = self.transcript_from_details(details)
         
         if transcript:
             print(f"📝 Found transcript ({len(transcript)} characters)")
@@ -461,27 +463,15 @@ class BolnaAgent:
             - transcriber and synthesizer logs
             - component-level execution data
         """
-        url = f"{self.base_url}/execution/{execution_id}/logs"
+        return self._coalesce(('logs', execution_id), self._fetch_execution_logs, execution_id)
+    
+    def _fetch_execution_logs(self, execution_id: str) -> Dict[str, Any]:
+        urls = [f"{self.base_url}/execution/{execution_id}/logs", f"{self.base_url}/executions/{execution_id}/logs"]
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.http.get_first_found('execution_logs', urls, operation='execution', headers=self.headers)
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.HTTPError as e:
-            # If 404, try alternative endpoint format
-            if e.response and e.response.status_code == 404:
-                try:
-                    alt_url = f"{self.base_url}/executions/{execution_id}/logs"
-                    alt_response = requests.get(alt_url, headers=self.headers)
-                    alt_response.raise_for_status()
-                    print(f"✅ Found execution logs using /executions endpoint")
-                    return alt_response.json()
-                except:
-                    pass
-            print(f"❌ Error fetching execution logs: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"Response: {e.response.text}")
-            raise
         except requests.exceptions.RequestException as e:
             print(f"❌ Error fetching execution logs: {e}")
             if hasattr(e, 'response') and e.response is not None:
@@ -533,7 +523,14 @@ class BolnaAgent:
                 "has_more": True
             }
         """
-        url = f"{self.base_url}/execution"
+        target_agent_id = agent_id or self.agent_id
+        return self._coalesce(
+            ('list', target_agent_id, page_number, page_size),
+            self._fetch_executions_page, target_agent_id, page_number, page_size
+        )
+    
+    def _fetch_executions_page(self, agent_id: Optional[str], page_number: int, page_size: int) -> Dict[str, Any]:
+        urls = [f"{self.base_url}/execution", f"{self.base_url}/executions"]
         params = {
             "page_number": page_number,
             "page_size": page_size
@@ -545,7 +542,7 @@ class BolnaAgent:
             params["agent_id"] = target_agent_id
         
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self.http.get_first_found('list_executions', urls, operation='list', headers=self.headers, params=params)
             response.raise_for_status()
             result = response.json()
             
@@ -560,79 +557,123 @@ class BolnaAgent:
                 print(f"📋 Executions page {page_num}: {data_count} results (total: {total}, has_more: {has_more})")
             
             return result
-        except requests.exceptions.HTTPError as e:
-            # Try alternative endpoint format if needed
-            if e.response and e.response.status_code == 404:
-                try:
-                    alt_url = f"{self.base_url}/executions"
-                    alt_response = requests.get(alt_url, headers=self.headers, params=params)
-                    alt_response.raise_for_status()
-                    print(f"✅ Found executions using /executions endpoint")
-                    return alt_response.json()
-                except:
-                    pass
-            print(f"❌ Error listing executions: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"Response: {e.response.text}")
-            raise
         except requests.exceptions.RequestException as e:
             print(f"❌ Error listing executions: {e}")
             if hasattr(e, 'response') and e.response is not None:
                 print(f"Response: {e.response.text}")
             raise
     
+    def iter_execution_pages(
+        self,
+        agent_id: Optional[str] = None,
+        page_size: int = 50,
+        max_pages: Optional[int] = None,
+        workers: int = BOLNA_PAGE_WORKERS
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield each page of executions, in page order, as soon as it is available
+
+        The first page reveals `total`; the remaining pages are then fetched by
+        up to `workers` threads. At most `workers` pages are in flight or
+        buffered, so memory stays bounded by page size even for long histories.
+        Without a `total` in the response, pages are walked one by one until
+        has_more is false.
+
+        Args:
+            agent_id: Optional agent ID to filter executions
+            page_size: Number of results per page
+            max_pages: Maximum number of pages to fetch (None = fetch all)
+            workers: Concurrent page requests after the first page
+
+        Yields:
+            List of execution objects for one page
+        """
+        first = self.list_executions(agent_id=agent_id, page_number=1, page_size=page_size)
+        if isinstance(first, list):
+            yield first
+            return
+        if not isinstance(first, dict):
+            return
+        yield first.get('data', [])
+        if not first.get('has_more', False) or max_pages == 1:
+            return
+
+        total = first.get('total')
+        if not isinstance(total, int) or total <= 0 or workers <= 1:
+            page = 1
+            result = first
+            while result.get('has_more', False) and not (max_pages and page >= max_pages):
+                page += 1
+                result = self.list_executions(agent_id=agent_id, page_number=page, page_size=page_size)
+                if not isinstance(result, dict):
+                    break
+                yield result.get('data', [])
+            return
+
+        last_page = -(-total // page_size)
+        if max_pages:
+            last_page = min(last_page, max_pages)
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bolna-pages')
+        pending = deque()
+        next_page = 2
+        try:
+            while next_page <= last_page or pending:
+                while next_page <= last_page and len(pending) < workers:
+                    pending.append(executor.submit(
+                        self.list_executions, agent_id=agent_id, page_number=next_page, page_size=page_size
+                    ))
+                    next_page += 1
+                result = pending.popleft().result()
+                if isinstance(result, dict):
+                    yield result.get('data', [])
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def iter_executions(
+        self,
+        agent_id: Optional[str] = None,
+        page_size: int = 50,
+        max_pages: Optional[int] = None,
+        workers: int = BOLNA_PAGE_WORKERS
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream executions across all pages (see iter_execution_pages)
+
+        Callers can process page 1 while later pages are still in flight.
+        """
+        for executions in self.iter_execution_pages(agent_id, page_size, max_pages, workers):
+            yield from executions
+
     def list_all_executions(
         self,
         agent_id: Optional[str] = None,
         page_size: int = 50,
-        max_pages: Optional[int] = None
+        max_pages: Optional[int] = None,
+        workers: int = BOLNA_PAGE_WORKERS
     ) -> List[Dict[str, Any]]:
         """
         Fetch all executions for an agent across all pages automatically.
-        This is a convenience method that uses list_executions() with pagination.
+        This is a convenience method that uses list_executions() with pagination;
+        pages after the first are fetched concurrently (see iter_execution_pages).
         
         Args:
             agent_id: Optional agent ID to filter executions
             page_size: Number of results per page (default: 50, max typically 100)
             max_pages: Maximum number of pages to fetch (None = fetch all)
+            workers: Concurrent page requests (1 = one page at a time)
         
         Returns:
             List of all execution objects across all pages
         """
         all_executions = []
-        page = 1
-        
-        while True:
-            if max_pages and page > max_pages:
-                break
-            
-            result = self.list_executions(
-                agent_id=agent_id,
-                page_number=page,
-                page_size=page_size
-            )
-            
-            if not result:
-                break
-            
-            # Handle different response formats
-            if isinstance(result, dict):
-                executions = result.get('data', [])
-                has_more = result.get('has_more', False)
-                
-                all_executions.extend(executions)
-                
-                if not has_more:
-                    break
-            elif isinstance(result, list):
-                all_executions.extend(result)
-                break
-            else:
-                break
-            
-            page += 1
+        pages = 0
+        for executions in self.iter_execution_pages(agent_id, page_size, max_pages, workers):
+            all_executions.extend(executions)
+            pages += 1
         
-        print(f"✅ Fetched {len(all_executions)} total executions across {page} page(s)")
+        print(f"✅ Fetched {len(all_executions)} total executions across {pages} page(s)")
         return all_executions
     
     def get_agent(self, agent_id: Optional[str] = None) -> Dict[str, Any]:
@@ -655,7 +696,7 @@ class BolnaAgent:
         url = f"{self.base_url}/v2/agent/{agent_id}"
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.http.get(url, operation='agent', headers=self.headers)
             response.raise_for_status()
             result = response.json()
             
@@ -679,7 +720,7 @@ class BolnaAgent:
         url = f"{self.base_url}/agent"
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.http.get(url, operation='agent', headers=self.headers)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -0,0 +1,318 @@
+"""
+Shared HTTP client for the Bolna API
+One pooled keep-alive requests.Session (no TCP+TLS handshake per call) with
+per-operation connect/read timeouts, token-bucket rate limiting, jittered
+exponential backoff retries on 429/5xx responses and connection errors, and a
+circuit breaker per endpoint class that fails fast while Bolna is down
+"""
+
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from rate_limiter import TokenBucketLimiter, DEFAULT_RATES
+from circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED
+from config import (
+    BOLNA_HTTP_POOL_SIZE,
+    BOLNA_CONNECT_TIMEOUT,
+    BOLNA_READ_TIMEOUT,
+    BOLNA_HTTP_RETRIES,
+    BOLNA_HTTP_BACKOFF,
+    BOLNA_HTTP_BACKOFF_MAX,
+    BOLNA_ENDPOINT_REPROBE
+)
+
+# (connect, read) timeouts per operation
+TIMEOUTS: Dict[str, Tuple[float, float]] = {
+    'default': (BOLNA_CONNECT_TIMEOUT, BOLNA_READ_TIMEOUT),
+    'call': (BOLNA_CONNECT_TIMEOUT, BOLNA_READ_TIMEOUT),
+    'execution': (BOLNA_CONNECT_TIMEOUT, BOLNA_READ_TIMEOUT),
+    'list': (BOLNA_CONNECT_TIMEOUT, BOLNA_READ_TIMEOUT * 2),  # large pages
+    'agent': (BOLNA_CONNECT_TIMEOUT, BOLNA_READ_TIMEOUT * 2),  # agent create/update
+}
+
+# Rate limit and circuit breaker class per operation (see rate_limiter.py); anything else is a 'read'
+RATE_CLASSES = {'call': 'dial', 'list': 'list'}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def request_not_sent(error: BaseException) -> bool:
+    """
+    True if a request certainly never reached Bolna: a connect timeout, a
+    refused connection or a DNS failure. Read timeouts and dropped connections
+    are ambiguous (Bolna may already have acted on the request).
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+        return isinstance(getattr(error.args[0], 'reason', None), NewConnectionError)
+    return False
+
+
+# Safe to repeat after the request may have reached the server
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+
+class EndpointMemo:
+    """
+    Remembers which URL variant answers for each operation
+
+    Some Bolna accounts serve /execution/..., others /executions/.... Once a
+    variant has answered, it is tried first (and a 404 from it is taken as a
+    real 404); every `reprobe_interval` seconds the canonical variant gets
+    another chance in case the API changed.
+    """
+
+    def __init__(self, reprobe_interval: float = BOLNA_ENDPOINT_REPROBE):
+        self.reprobe_interval = reprobe_interval
+        self._choice: Dict[str, Tuple[int, float]] = {}  # operation -> (variant index, learned at)
+        self._lock = threading.Lock()
+        self.stats = {'fallbacks': 0, 'reprobes': 0, 'round_trips_saved': 0}
+
+    def plan(self, key: str, count: int) -> Tuple[List[int], bool]:
+        """
+        Variant indexes to try, in order, and whether the first one is trusted
+        (a 404 from a trusted variant is final)
+        """
+        with self._lock:
+            choice = self._choice.get(key)
+            if choice is None:
+                return list(range(count)), False
+            index, learned_at = choice
+            now = time.monotonic()
+            if index != 0 and now - learned_at >= self.reprobe_interval:
+                self._choice[key] = (index, now)
+                self.stats['reprobes'] += 1
+                return [0, index] + [i for i in range(1, count) if i != index], False
+            return [index] + [i for i in range(count) if i != index], True
+
+    def record(self, key: str, index: int, saved: int):
+        """Note the variant that answered and the round trips the plan saved"""
+        with self._lock:
+            previous = self._choice.get(key)
+            if previous is None or previous[0] != index:
+                self._choice[key] = (index, time.monotonic())
+                if index != 0:
+                    self.stats['fallbacks'] += 1
+                    print(f"🔀 Bolna {key}: using fallback endpoint variant {index}")
+            self.stats['round_trips_saved'] += saved
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, learned={key: index for key, (index, _) in self._choice.items()})
+
+
+class BolnaHTTPClient:
+    """
+    Thread-safe pooled session for Bolna API requests
+
+    Non-idempotent requests (POST /call, POST /agent) are only retried when the
+    server certainly did not act on them: a 429 response, or a connection that
+    was never established (see request_not_sent).
+    A duplicate POST /call would dial the candidate twice.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = BOLNA_HTTP_POOL_SIZE,
+        retries: int = BOLNA_HTTP_RETRIES,
+        backoff: float = BOLNA_HTTP_BACKOFF,
+        backoff_max: float = BOLNA_HTTP_BACKOFF_MAX
+    ):
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.session = requests.Session()
+        # Retries are handled in request() so they can be jittered and counted
+        self.adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        self.endpoints = EndpointMemo()
+        self.limiter = TokenBucketLimiter()
+        self.breakers = {family: CircuitBreaker(family) for family in DEFAULT_RATES}
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'attempts': 0,
+            'retries': 0,
+            'errors': 0,
+            'timeouts': 0,
+            'status_counts': {},
+        }
+
+    def _backoff_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Full-jitter exponential backoff, honouring a numeric Retry-After header"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.backoff_max)
+                except ValueError:
+                    pass
+        return random.uniform(0, min(self.backoff_max, self.backoff * (2 ** attempt)))
+
+    def _count(self, key: str, amount: int = 1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def request(self, method: str, url: str, operation: str = 'default', **kwargs) -> requests.Response:
+        """
+        Send a request through the shared session
+
+        Args:
+            method: HTTP method
+            url: Full URL
+            operation: Key into TIMEOUTS (ignored if `timeout` is passed)
+            **kwargs: Passed to requests.Session.request (headers, json, params, ...)
+
+        Returns:
+            The final response (callers still call raise_for_status())
+
+        Raises:
+            CircuitOpenError: The endpoint class is failing; nothing was sent
+        """
+        method = method.upper()
+        kwargs.setdefault('timeout', TIMEOUTS.get(operation, TIMEOUTS['default']))
+        idempotent = method in IDEMPOTENT_METHODS
+        rate_class = RATE_CLASSES.get(operation, 'read')
+        breaker = self.breakers[rate_class]
+        self._count('requests')
+        breaker.before_request()
+        try:
+            response = self._send(method, url, idempotent, rate_class, **kwargs)
+        except requests.exceptions.RequestException as e:
+            breaker.record_failure(e.__class__.__name__)
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure(f'HTTP {response.status_code}')
+        else:
+            breaker.record_success()
+        return response
+
+    def _send(self, method: str, url: str, idempotent: bool, rate_class: str, **kwargs) -> requests.Response:
+        """Send with retries; returns the final response or raises the final error"""
+        attempt = 0
+        while True:
+            self.limiter.acquire(rate_class)
+            self._count('attempts')
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                if isinstance(e, requests.exceptions.Timeout):
+                    self._count('timeouts')
+                retryable = request_not_sent(e) or (
+                    idempotent and isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+                )
+                if not retryable or attempt >= self.retries:
+                    self._count('errors')
+                    raise
+                delay = self._backoff_delay(attempt)
+                print(f"⚠️  Bolna {method} {url} failed ({e.__class__.__name__}), retrying in {delay:.1f}s")
+            else:
+                with self._stats_lock:
+                    counts = self._stats['status_counts']
+                    counts[response.status_code] = counts.get(response.status_code, 0) + 1
+                retryable = response.status_code in RETRY_STATUSES and (idempotent or response.status_code == 429)
+                if not retryable or attempt >= self.retries:
+                    return response
+                delay = self._backoff_delay(attempt, response)
+                print(f"⚠️  Bolna {method} {url} returned {response.status_code}, retrying in {delay:.1f}s")
+                response.close()
+
+            attempt += 1
+            self._count('retries')
+            time.sleep(delay)
+
+    def get(self, url: str, operation: str = 'default', **kwargs) -> requests.Response:
+        return self.request('GET', url, operation, **kwargs)
+
+    def get_first_found(self, key: str, urls: List[str], operation: str = 'default', **kwargs) -> requests.Response:
+        """
+        GET the first URL variant that doesn't answer 404, remembering per `key`
+        which variant works (see EndpointMemo)
+
+        Args:
+            key: Operation name the choice is remembered under
+            urls: Equivalent URLs, canonical form first
+
+        Returns:
+            The answering response, or the first 404 if every variant tried 404s
+        """
+        order, trusted = self.endpoints.plan(key, len(urls))
+        first_404 = None
+        requests_made = 0
+        for index in order:
+            response = self.get(urls[index], operation, **kwargs)
+            requests_made += 1
+            if response.status_code == 404:
+                if first_404 is None:
+                    first_404 = response
+                if trusted:
+                    break
+                continue
+            if response.ok:
+                # Without memoization every variant before this one would have been tried
+                self.endpoints.record(key, index, max(index + 1 - requests_made, 0))
+            return response
+        if trusted:
+            self.endpoints.record(key, order[0], len(urls) - requests_made)
+        return first_404
+
+    def post(self, url: str, operation: str = 'default', **kwargs) -> requests.Response:
+        return self.request('POST', url, operation, **kwargs)
+
+    def put(self, url: str, operation: str = 'default', **kwargs) -> requests.Response:
+        return self.request('PUT', url, operation, **kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Request/retry counters and connection reuse from the urllib3 pools"""
+        connections_opened = 0
+        pool_requests = 0
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections_opened += pool.num_connections
+            pool_requests += pool.num_requests
+
+        with self._stats_lock:
+            stats = dict(self._stats)
+            stats['status_counts'] = {str(k): v for k, v in self._stats['status_counts'].items()}
+        stats.update({
+            'connections_opened': connections_opened,
+            'connections_reused': max(pool_requests - connections_opened, 0),
+            'reuse_ratio': round(1 - connections_opened / pool_requests, 3) if pool_requests else None,
+            'pool_size': self.adapter._pool_maxsize,
+            'endpoints': self.endpoints.get_stats(),
+            'rate_limit': self.limiter.get_stats(),
+            'circuit_breakers': {family: breaker.get_stats() for family, breaker in self.breakers.items()},
+            'as_of': datetime.now().isoformat()
+        })
+        return stats
+
+    def is_available(self) -> bool:
+        """True when no endpoint class is failing fast"""
+        return all(breaker.state == CLOSED for breaker in self.breakers.values())
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_bolna_http() -> BolnaHTTPClient:
+    """Get the process-wide Bolna HTTP client"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = BolnaHTTPClient()
+    return _client
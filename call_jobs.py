@@ -0,0 +1,345 @@
+"""
+Durable outbound-call job queue
+/api/call records each requested dial as a job in SQLite (data/call_jobs.db)
+before anything is sent to Bolna; worker threads lease jobs and place the
+calls. A job leased by a process that dies (e.g. a systemd restart mid-dial)
+becomes visible again once its lease expires and is retried, so every
+requested call is attempted at least once.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Any, List, Optional, Callable, Iterable
+from circuit_breaker import CircuitOpenError
+from config import (
+    CALL_JOB_WORKERS,
+    CALL_JOB_VISIBILITY_TIMEOUT,
+    CALL_JOB_MAX_ATTEMPTS,
+    CALL_JOB_RETRY_DELAY,
+    CALL_JOB_RETENTION
+)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CALL_JOBS_DB_PATH = os.path.join(BASE_DIR, 'data', 'call_jobs.db')
+
+# Job lifecycle: queued -> leased -> done
+#                           \-> queued again (failed attempt or expired lease) ... -> dead
+FINAL_STATES = ('done', 'dead')
+
+# How often wait() re-reads a job, and how often idle workers look for new jobs
+POLL_INTERVAL = 0.05
+IDLE_INTERVAL = 0.5
+
+
+class PermanentJobError(Exception):
+    """Raised by a job handler for failures that retrying won't fix (the job goes straight to 'dead')"""
+
+
+class CallJobQueue:
+    """
+    SQLite (WAL) job queue with leases
+
+    lease() hands out the oldest visible jobs inside a write transaction and
+    hides them for `visibility_timeout` seconds under a fresh lease ID. Only
+    the current lease holder can ack or fail a job; a lease that runs out is
+    returned to the queue by the next lease() call. Jobs that fail
+    `max_attempts` times are moved to 'dead'.
+    """
+
+    def __init__(
+        self,
+        db_path: str = CALL_JOBS_DB_PATH,
+        visibility_timeout: float = CALL_JOB_VISIBILITY_TIMEOUT,
+        max_attempts: int = CALL_JOB_MAX_ATTEMPTS,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            db_path: SQLite file shared by every process that enqueues or works jobs
+            visibility_timeout: Seconds a leased job stays hidden from other workers
+            max_attempts: Leases per job before it is dead-lettered
+            clock: Time source (seconds since the epoch)
+        """
+        self.db_path = os.path.abspath(db_path)
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.clock = clock
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._create_schema()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self):
+        self._conn().executescript("""
+            CREATE TABLE IF NOT EXISTS call_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                payload TEXT NOT NULL,
+                state TEXT NOT NULL,
+                available_at REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_id TEXT,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_call_jobs_visible ON call_jobs(state, available_at);
+        """)
+
+    def _write(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run func(conn) in a BEGIN IMMEDIATE transaction"""
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                result = func(conn)
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        return result
+
+    @staticmethod
+    def _job(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job['payload'] = json.loads(row['payload'])
+        job['result'] = json.loads(row['result']) if row['result'] else None
+        return job
+
+    def enqueue(self, payload: Dict[str, Any], delay: float = 0) -> int:
+        """Add a job (visible after `delay` seconds). Returns the job ID."""
+        return self.enqueue_many([payload], delay)[0]
+
+    def enqueue_many(self, payloads: Iterable[Dict[str, Any]], delay: float = 0) -> List[int]:
+        """Add several jobs in one transaction. Returns their IDs in order."""
+        now = self.clock()
+
+        def insert(conn):
+            return [
+                conn.execute(
+                    "INSERT INTO call_jobs (payload, state, available_at, created_at, updated_at) VALUES (?, 'queued', ?, ?, ?)",
+                    (json.dumps(payload), now + delay, now, now)
+                ).lastrowid
+                for payload in payloads
+            ]
+
+        return self._write(insert)
+
+    def lease(self, limit: int = 1) -> List[Dict[str, Any]]:
+        """
+        Lease up to `limit` visible jobs, oldest first
+
+        Returns:
+            Jobs (id, payload, attempts, lease_id, ...); pass lease_id to ack()/fail()
+        """
+        now = self.clock()
+
+        def lease_jobs(conn):
+            # Leases that ran out (worker crashed or hung) go back to the queue
+            conn.execute(
+                "UPDATE call_jobs SET state = 'queued', lease_id = NULL, error = COALESCE(error, 'lease expired'), updated_at = ? "
+                "WHERE state = 'leased' AND available_at <= ?",
+                (now, now)
+            )
+            rows = conn.execute(
+                "SELECT * FROM call_jobs WHERE state = 'queued' AND available_at <= ? ORDER BY available_at, id LIMIT ?",
+                (now, limit)
+            ).fetchall()
+            jobs = []
+            for row in rows:
+                lease_id = uuid.uuid4().hex
+                conn.execute(
+                    "UPDATE call_jobs SET state = 'leased', lease_id = ?, attempts = attempts + 1, available_at = ?, updated_at = ? WHERE id = ?",
+                    (lease_id, now + self.visibility_timeout, now, row['id'])
+                )
+                job = self._job(row)
+                job.update(state='leased', lease_id=lease_id, attempts=row['attempts'] + 1)
+                jobs.append(job)
+            return jobs
+
+        return self._write(lease_jobs)
+
+    def extend(self, job_id: int, lease_id: str) -> bool:
+        """Push a held lease's expiry out by another visibility timeout. False if the lease was lost."""
+        now = self.clock()
+        return bool(self._write(lambda conn: conn.execute(
+            "UPDATE call_jobs SET available_at = ?, updated_at = ? WHERE id = ? AND lease_id = ? AND state = 'leased'",
+            (now + self.visibility_timeout, now, job_id, lease_id)
+        ).rowcount))
+
+    def ack(self, job_id: int, lease_id: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        """Mark a leased job done. False if the lease had expired and was handed to someone else."""
+        now = self.clock()
+        return bool(self._write(lambda conn: conn.execute(
+            "UPDATE call_jobs SET state = 'done', result = ?, lease_id = NULL, available_at = ?, updated_at = ? "
+            "WHERE id = ? AND lease_id = ? AND state = 'leased'",
+            (json.dumps(result) if result is not None else None, now, now, job_id, lease_id)
+        ).rowcount))
+
+    def fail(self, job_id: int, lease_id: str, error: str, retry_delay: float = CALL_JOB_RETRY_DELAY, permanent: bool = False) -> Optional[str]:
+        """
+        Record a failed attempt: the job is queued again after `retry_delay`,
+        or dead-lettered if it is permanent or out of attempts
+
+        Returns:
+            The job's new state, or None if the lease had been lost
+        """
+        now = self.clock()
+
+        def record(conn):
+            row = conn.execute(
+                "SELECT attempts FROM call_jobs WHERE id = ? AND lease_id = ? AND state = 'leased'", (job_id, lease_id)
+            ).fetchone()
+            if row is None:
+                return None
+            state = 'dead' if permanent or row['attempts'] >= self.max_attempts else 'queued'
+            conn.execute(
+                'UPDATE call_jobs SET state = ?, error = ?, lease_id = NULL, available_at = ?, updated_at = ? WHERE id = ?',
+                (state, error, now + (retry_delay if state == 'queued' else 0), now, job_id)
+            )
+            return state
+
+        return self._write(record)
+
+    def get_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute('SELECT * FROM call_jobs WHERE id = ?', (job_id,)).fetchone()
+        return self._job(row) if row else None
+
+    def wait(self, job_id: int, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Wait until a job is done/dead or has had a failed attempt
+
+        Returns:
+            The job as last read (check its state), or None if it doesn't exist
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get_job(job_id)
+            if job is None or job['state'] in FINAL_STATES or (job['state'] == 'queued' and job['error']):
+                return job
+            if time.monotonic() >= deadline:
+                return job
+            time.sleep(POLL_INTERVAL)
+
+    def purge(self, older_than: float = CALL_JOB_RETENTION) -> int:
+        """Delete done and dead jobs last updated more than `older_than` seconds ago"""
+        cutoff = self.clock() - older_than
+        return self._write(lambda conn: conn.execute(
+            "DELETE FROM call_jobs WHERE state IN ('done', 'dead') AND available_at < ?", (cutoff,)
+        ).rowcount)
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self._conn().execute('SELECT state, COUNT(*) FROM call_jobs GROUP BY state').fetchall())
+
+
+class CallJobWorkers:
+    """
+    Background threads that lease call jobs and run them through `handler`
+
+    handler(payload) returns the job result; PermanentJobError dead-letters
+    the job at once, CircuitOpenError retries it when the circuit's cooldown
+    ends, and any other exception retries it after the queue's retry delay.
+    While the handler runs, a heartbeat extends the job's lease every third of
+    the visibility timeout, so a slow dial isn't handed to a second worker.
+    """
+
+    def __init__(self, queue: CallJobQueue, handler: Callable[[Dict[str, Any]], Dict[str, Any]], workers: int = CALL_JOB_WORKERS):
+        self.queue = queue
+        self.handler = handler
+        self.workers = workers
+        self._threads: List[threading.Thread] = []
+        self._wake = threading.Event()
+        self.stats = {'leased': 0, 'done': 0, 'retried': 0, 'dead': 0, 'lost_leases': 0}
+        self._stats_lock = threading.Lock()
+        self._last_purge = 0.0
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _heartbeat(self, job: Dict[str, Any], done: threading.Event):
+        """Keep extending a job's lease until `done` is set (or the lease is lost)"""
+        while not done.wait(self.queue.visibility_timeout / 3):
+            try:
+                if not self.queue.extend(job['id'], job['lease_id']):
+                    return
+            except Exception as e:
+                print(f"⚠️  Call job {job['id']}: could not extend lease: {e}")
+
+    def run_job(self, job: Dict[str, Any]):
+        """Run one leased job and record the outcome"""
+        self._count('leased')
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job, done), daemon=True)
+        heartbeat.start()
+        try:
+            result = self.handler(job['payload'])
+        except PermanentJobError as e:
+            state = self.queue.fail(job['id'], job['lease_id'], str(e), permanent=True)
+        except CircuitOpenError as e:
+            state = self.queue.fail(job['id'], job['lease_id'], str(e), retry_delay=e.retry_after)
+        except Exception as e:
+            print(f"❌ Call job {job['id']} attempt {job['attempts']} failed: {e}")
+            state = self.queue.fail(job['id'], job['lease_id'], str(e))
+        else:
+            state = 'done' if self.queue.ack(job['id'], job['lease_id'], result) else None
+        finally:
+            done.set()
+        if state is None:
+            print(f"⚠️  Call job {job['id']}: lease expired before the attempt finished")
+            self._count('lost_leases')
+        else:
+            self._count('retried' if state == 'queued' else state)
+
+    def _loop(self):
+        while True:
+            try:
+                jobs = self.queue.lease(1)
+                if jobs:
+                    self.run_job(jobs[0])
+                    continue
+                if time.time() - self._last_purge > 3600:
+                    self._last_purge = time.time()
+                    self.queue.purge()
+            except Exception as e:
+                print(f"❌ Call job worker error: {e}")
+            self._wake.wait(IDLE_INTERVAL)
+            self._wake.clear()
+
+    def wake(self):
+        """Look for jobs now (called after enqueueing)"""
+        self._wake.set()
+
+    def start(self):
+        """Start the worker threads (jobs left by a previous process are picked up as their leases expire)"""
+        if not self._threads:
+            waiting = self.queue.counts()
+            if waiting.get('queued') or waiting.get('leased'):
+                print(f"📥 Call job queue: {waiting.get('queued', 0)} queued, {waiting.get('leased', 0)} leased before restart")
+            for number in range(self.workers):
+                thread = threading.Thread(target=self._loop, name=f'call-job-worker-{number}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats.update({
+            'jobs': self.queue.counts(),
+            'workers': len(self._threads)
+        })
+        return stats
@@ -0,0 +1,176 @@
+"""
+Background reconciler for candidates stuck in "calling"
+A candidate leaves "calling" when the call's webhook arrives (or someone uses
+POST /api/call/<id>/check-status). If the webhook is lost they would stay there
+forever, so this periodically looks up candidates that have been "calling" for
+longer than a threshold, fetches their latest executions from Bolna
+concurrently, and applies the outcome the same way the manual check does.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Tuple
+import requests
+from async_bolna_agent import AsyncBolnaAgent
+from bolna_agent import BolnaAgent
+from candidate_store import CandidateStore
+from execution_mapping import ExecutionMappingIndex
+from circuit_breaker import CircuitOpenError
+from config import CALL_RECONCILE_INTERVAL, CALL_RECONCILE_STALE_AFTER, CALL_RECONCILE_BATCH_SIZE, CALL_RECONCILE_CONCURRENCY
+
+
+class CallReconciler:
+    """
+    Finds stale "calling" candidates through the store's (status, updated_at)
+    index, then fetches their executions through AsyncBolnaAgent with at most
+    `concurrency` requests in flight (the shared 'read' token bucket and
+    circuit breaker apply as well). Executions still in progress are left
+    alone and looked at again on the next pass. Candidates that can't be
+    resolved (no execution on record, or one Bolna doesn't know) are reset to
+    pending, so they leave the scan instead of filling every batch.
+    """
+
+    def __init__(
+        self,
+        agent: BolnaAgent,
+        store: CandidateStore,
+        mappings: ExecutionMappingIndex,
+        apply_status: Callable[[str, int, Dict[str, Any], str], Dict[str, Any]],
+        stale_after: float = CALL_RECONCILE_STALE_AFTER,
+        batch_size: int = CALL_RECONCILE_BATCH_SIZE,
+        concurrency: int = CALL_RECONCILE_CONCURRENCY,
+        interval: float = CALL_RECONCILE_INTERVAL,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            agent: BolnaAgent used to fetch execution details
+            store: Candidate store
+            mappings: Execution mapping index (candidate -> latest execution)
+            apply_status: apply_status(execution_id, candidate_id, details, transcript)
+                          -> result dict; 'updated' is True if the candidate's status was changed
+            stale_after: Seconds a candidate must have been "calling" before it is checked
+            batch_size: Candidates checked per pass
+            concurrency: Execution detail requests in flight
+            interval: Seconds between passes of the background loop
+            clock: Time source (seconds since the epoch)
+        """
+        self.agent = agent
+        self.store = store
+        self.mappings = mappings
+        self.apply_status = apply_status
+        self.stale_after = stale_after
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.interval = interval
+        self.clock = clock
+        self._thread = None
+        self.last_run: Optional[str] = None
+        self.last_result: Optional[Dict[str, Any]] = None
+        self.stats = {'passes': 0, 'checked': 0, 'updated': 0, 'in_progress': 0, 'not_found': 0, 'no_execution': 0, 'errors': 0}
+
+    def find_stuck(self) -> List[Tuple[Dict[str, Any], Optional[str]]]:
+        """Stale "calling" candidates (oldest first) with their latest execution ID"""
+        cutoff = datetime.fromtimestamp(self.clock() - self.stale_after).isoformat()
+        candidates = self.store.list_by_status('calling', updated_before=cutoff, limit=self.batch_size)
+        return [(candidate, self.mappings.latest_for_candidate(candidate['id'])) for candidate in candidates]
+
+    def _reset_unmapped(self, candidate_id: int) -> bool:
+        """Put a "calling" candidate with no execution on record back to pending"""
+        reset = {}
+
+        def to_pending(candidate):
+            if candidate.get('status') == 'calling':
+                candidate['status'] = 'pending'
+                reset['done'] = True
+
+        self.store.update_candidate(candidate_id, to_pending)
+        return bool(reset)
+
+    def _fetch_details(self, execution_ids: List[str]) -> Dict[str, Any]:
+        async def fetch():
+            async with AsyncBolnaAgent(agent=self.agent, concurrency=self.concurrency) as async_agent:
+                return await async_agent.get_many_execution_details(execution_ids)
+
+        return asyncio.run(fetch())
+
+    def reconcile_once(self) -> Dict[str, Any]:
+        """
+        Run one pass
+
+        Returns:
+            Counts for the pass (stuck, checked, updated, in_progress, not_found, no_execution, errors)
+        """
+        stuck = self.find_stuck()
+        result = {'stuck': len(stuck), 'checked': 0, 'updated': 0, 'in_progress': 0, 'not_found': 0, 'no_execution': 0, 'errors': 0}
+        by_execution = {}
+        for candidate, execution_id in stuck:
+            if execution_id is None:
+                result['no_execution'] += 1
+                try:
+                    if self._reset_unmapped(candidate['id']):
+                        print(f"🔧 Reconciled candidate {candidate['id']}: calling -> pending (no execution on record)")
+                except Exception as e:
+                    result['errors'] += 1
+                    print(f"❌ Reconciler: resetting candidate {candidate['id']} failed: {e}")
+            else:
+                by_execution[execution_id] = candidate['id']
+
+        details_by_id = self._fetch_details(list(by_execution)) if by_execution else {}
+        for execution_id, details in details_by_id.items():
+            candidate_id = by_execution[execution_id]
+            if isinstance(details, Exception):
+                response = getattr(details, 'response', None)
+                if not (isinstance(details, requests.exceptions.HTTPError) and response is not None and response.status_code == 404):
+                    result['errors'] += 1
+                    if not isinstance(details, CircuitOpenError):
+                        print(f"⚠️  Reconciler: could not fetch execution {execution_id}: {details}")
+                    continue
+                # Bolna has no such execution: the call never happened, so handle it as a failed one
+                result['not_found'] += 1
+                details = {'id': execution_id, 'status': 'failed', 'error_message': 'execution not found'}
+            else:
+                result['checked'] += 1
+            try:
+                outcome = self.apply_status(execution_id, candidate_id, details, BolnaAgent.transcript_from_details(details))
+            except Exception as e:
+                result['errors'] += 1
+                print(f"❌ Reconciler: updating candidate {candidate_id} from {execution_id} failed: {e}")
+                continue
+            if not outcome.get('updated'):
+                result['in_progress'] += 1
+            else:
+                result['updated'] += 1
+                print(f"🔧 Reconciled candidate {candidate_id}: calling -> {outcome['status']} (execution {execution_id})")
+
+        self.stats['passes'] += 1
+        for key in ('checked', 'updated', 'in_progress', 'not_found', 'no_execution', 'errors'):
+            self.stats[key] += result[key]
+        self.last_run = datetime.now().isoformat()
+        self.last_result = result
+        return result
+
+    def _loop(self):
+        while True:
+            try:
+                self.reconcile_once()
+            except Exception as e:
+                print(f"❌ Call reconciler error: {e}")
+            time.sleep(self.interval)
+
+    def start(self):
+        """Start the background loop"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='call-reconciler', daemon=True)
+            self._thread.start()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(
+            self.stats,
+            last_run=self.last_run,
+            last_result=self.last_result,
+            stale_after=self.stale_after,
+            running=self._thread is not None
+        )
@@ -0,0 +1,252 @@
+"""
+In-flight call registry
+Records which candidates and phone numbers have a call being placed or live,
+in SQLite (data/call_registry.db) so every Flask worker and CLI process sees
+the same claims. A second dial for the same candidate or number while one is
+in flight gets the existing execution ID instead of placing another call.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Any, List, Optional, Callable
+from config import CALL_REGISTRY_TTL, CALL_REGISTRY_DIAL_TIMEOUT
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CALL_REGISTRY_DB_PATH = os.path.join(BASE_DIR, 'data', 'call_registry.db')
+
+# How often a duplicate request re-checks for the first dial's execution ID
+WAIT_POLL_INTERVAL = 0.1
+
+
+class CallInFlightError(Exception):
+    """Raised instead of dialing when the candidate or number already has a call in flight"""
+
+    def __init__(self, execution_id: Optional[str], candidate_id: Optional[int], phone: Optional[str]):
+        super().__init__(
+            f"A call to candidate {candidate_id} ({phone}) is already in flight"
+            + (f" (execution {execution_id})" if execution_id else "")
+        )
+        self.execution_id = execution_id
+        self.candidate_id = candidate_id
+        self.phone = phone
+
+
+def registry_keys(candidate_id: Optional[int], phone: Optional[str]) -> List[str]:
+    """Registry keys for a call: one per candidate ID and one per normalized phone number"""
+    keys = []
+    if candidate_id is not None:
+        keys.append(f"candidate:{candidate_id}")
+    digits = re.sub(r'[^\d+]', '', phone or '')
+    if digits:
+        keys.append(f"phone:{digits}")
+    return keys
+
+
+class CallRegistry:
+    """
+    One row per key, all rows of a call sharing a claim ID
+
+    acquire() checks and claims every key of a call in one BEGIN IMMEDIATE
+    transaction, so of two concurrent dials (in any process) exactly one
+    wins. A claim is held for `dial_timeout` seconds while the dial request
+    is running, then for `ttl` seconds once the execution ID is attached (or
+    `ttl` past the scheduled time of a call Bolna places later); a terminal
+    webhook releases it earlier. Expired rows are ignored and replaced by the
+    next acquire.
+    """
+
+    def __init__(
+        self,
+        db_path: str = CALL_REGISTRY_DB_PATH,
+        ttl: float = CALL_REGISTRY_TTL,
+        dial_timeout: float = CALL_REGISTRY_DIAL_TIMEOUT,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            db_path: SQLite file shared by all processes on the host
+            ttl: Seconds a live call holds its claim without a terminal webhook
+            dial_timeout: Seconds a claim is held while the dial request runs
+            clock: Time source (seconds since the epoch)
+        """
+        self.db_path = os.path.abspath(db_path)
+        self.ttl = ttl
+        self.dial_timeout = dial_timeout
+        self.clock = clock
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self.stats = {'acquired': 0, 'duplicates': 0, 'released': 0, 'expired': 0}
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._create_schema()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self):
+        self._conn().executescript("""
+            CREATE TABLE IF NOT EXISTS in_flight_calls (
+                key TEXT PRIMARY KEY,
+                claim_id TEXT NOT NULL,
+                candidate_id INTEGER,
+                phone TEXT,
+                execution_id TEXT,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_in_flight_calls_claim ON in_flight_calls(claim_id);
+            CREATE INDEX IF NOT EXISTS idx_in_flight_calls_execution ON in_flight_calls(execution_id);
+        """)
+
+    def _write(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run func(conn) in a BEGIN IMMEDIATE transaction"""
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                result = func(conn)
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        return result
+
+    @staticmethod
+    def _placeholders(keys: List[str]) -> str:
+        return ','.join('?' * len(keys))
+
+    def acquire(self, candidate_id: Optional[int], phone: Optional[str]) -> Dict[str, Any]:
+        """
+        Claim a candidate and phone number for a new call
+
+        Returns:
+            {"acquired": True, "claim_id": ...}, or {"acquired": False, "claim_id",
+            "execution_id" (None while the other dial is still running),
+            "candidate_id", "phone", "since"} describing the call already in flight
+        """
+        keys = registry_keys(candidate_id, phone)
+        claim_id = uuid.uuid4().hex
+        now = self.clock()
+
+        def check_and_set(conn):
+            expired = conn.execute(
+                f'DELETE FROM in_flight_calls WHERE key IN ({self._placeholders(keys)}) AND expires_at <= ?',
+                (*keys, now)
+            ).rowcount
+            existing = conn.execute(
+                f'SELECT * FROM in_flight_calls WHERE key IN ({self._placeholders(keys)}) ORDER BY created_at LIMIT 1',
+                keys
+            ).fetchone()
+            if existing is not None:
+                return expired, existing
+            conn.executemany(
+                'INSERT INTO in_flight_calls (key, claim_id, candidate_id, phone, created_at, expires_at) VALUES (?, ?, ?, ?, ?, ?)',
+                [(key, claim_id, candidate_id, phone, now, now + self.dial_timeout) for key in keys]
+            )
+            return expired, None
+
+        expired, existing = self._write(check_and_set)
+        self.stats['expired'] += expired
+        if existing is None:
+            self.stats['acquired'] += 1
+            return {'acquired': True, 'claim_id': claim_id}
+        self.stats['duplicates'] += 1
+        return {
+            'acquired': False,
+            'claim_id': existing['claim_id'],
+            'execution_id': existing['execution_id'],
+            'candidate_id': existing['candidate_id'],
+            'phone': existing['phone'],
+            'since': existing['created_at']
+        }
+
+    def attach(self, claim_id: str, execution_id: str, hold_until: Optional[float] = None):
+        """
+        The dial returned an execution ID: hold the claim until its terminal webhook (or the TTL)
+
+        Args:
+            claim_id: Claim from acquire()
+            execution_id: Execution ID Bolna returned
+            hold_until: When a scheduled call will be placed (epoch seconds); the
+                        TTL then counts from that time instead of now
+        """
+        start = max(self.clock(), hold_until or 0)
+        self._write(lambda conn: conn.execute(
+            'UPDATE in_flight_calls SET execution_id = ?, expires_at = ? WHERE claim_id = ?',
+            (execution_id, start + self.ttl, claim_id)
+        ))
+
+    def release_claim(self, claim_id: str):
+        """Drop a claim whose dial failed"""
+        if self._write(lambda conn: conn.execute('DELETE FROM in_flight_calls WHERE claim_id = ?', (claim_id,)).rowcount):
+            self.stats['released'] += 1
+
+    def release_execution(self, execution_id: str) -> bool:
+        """Drop the claim of a finished call (terminal webhook). Returns False if it wasn't registered."""
+        released = self._write(lambda conn: conn.execute(
+            'DELETE FROM in_flight_calls WHERE execution_id = ?', (execution_id,)
+        ).rowcount)
+        if released:
+            self.stats['released'] += 1
+        return bool(released)
+
+    def release_candidate(self, candidate_id: int) -> bool:
+        """
+        Drop the claim held for a candidate (their status was reset by an operator),
+        including its phone-number key. Returns False if they had none.
+        """
+        released = self._write(lambda conn: conn.execute(
+            'DELETE FROM in_flight_calls WHERE claim_id IN (SELECT claim_id FROM in_flight_calls WHERE key = ?)',
+            (f"candidate:{candidate_id}",)
+        ).rowcount)
+        if released:
+            self.stats['released'] += 1
+        return bool(released)
+
+    def wait_for_execution(self, claim_id: str, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Wait for another dial's execution ID (used by duplicate requests)
+
+        Returns:
+            The execution ID, or None if that dial failed or didn't finish in time
+        """
+        deadline = time.monotonic() + (self.dial_timeout if timeout is None else timeout)
+        while True:
+            row = self._conn().execute(
+                'SELECT execution_id FROM in_flight_calls WHERE claim_id = ? LIMIT 1', (claim_id,)
+            ).fetchone()
+            if row is None or row['execution_id']:
+                return row['execution_id'] if row else None
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(WAIT_POLL_INTERVAL)
+
+    def get_stats(self) -> Dict[str, Any]:
+        in_flight = self._conn().execute(
+            'SELECT COUNT(DISTINCT claim_id) FROM in_flight_calls WHERE expires_at > ?', (self.clock(),)
+        ).fetchone()[0]
+        return dict(self.stats, in_flight=in_flight, ttl=self.ttl)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_call_registry() -> CallRegistry:
+    """Get the process-wide in-flight call registry"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = CallRegistry()
+    return _registry
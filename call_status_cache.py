@@ -0,0 +1,106 @@
+"""
+Call status cache
+CallStatus.tsx polls /api/call-status/<id> every few seconds; this keeps the
+responses in memory so repeated polls don't re-read the webhook event log or
+call the Bolna API
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+from config import CALL_STATUS_CACHE_SIZE, CALL_STATUS_CACHE_TTL
+from webhook_dedup import TERMINAL_STATUSES
+
+
+class CallStatusCache:
+    """
+    Bounded LRU of execution_id -> /api/call-status response body
+
+    Executions in a terminal status never change, so they stay cached until
+    evicted; in-progress ones expire after `ttl` seconds. A webhook for an
+    execution invalidates its entry. Expired entries are kept (until evicted)
+    so peek() can serve them while the Bolna API is unavailable.
+    """
+
+    def __init__(self, max_entries: int = CALL_STATUS_CACHE_SIZE, ttl: float = CALL_STATUS_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # execution_id -> (response, expires_at or None for terminal)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'terminal_hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'stale_served': 0,
+            'invalidations': 0,
+            'evictions': 0
+        }
+
+    def get(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """Cached response for an execution, or None on a miss/expiry"""
+        with self._lock:
+            entry = self._entries.get(execution_id)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            response, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(execution_id)
+            self.stats['hits'] += 1
+            if expires_at is None:
+                self.stats['terminal_hits'] += 1
+            return response
+
+    def peek(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """Last cached response for an execution, even if expired (stale fallback)"""
+        with self._lock:
+            entry = self._entries.get(execution_id)
+            if entry is None:
+                return None
+            self.stats['stale_served'] += 1
+            return entry[0]
+
+    def put(self, execution_id: str, response: Dict[str, Any], status: Optional[str]):
+        """Cache a response; terminal statuses are kept until evicted"""
+        expires_at = None if str(status or '').lower() in TERMINAL_STATUSES else time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[execution_id] = (response, expires_at)
+            self._entries.move_to_end(execution_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def invalidate(self, execution_id: str):
+        """Drop an execution (called when a webhook for it arrives)"""
+        with self._lock:
+            if self._entries.pop(execution_id, None) is not None:
+                self.stats['invalidations'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return dict(
+                self.stats,
+                entries=len(self._entries),
+                hit_rate=round(self.stats['hits'] / lookups, 3) if lookups else None
+            )
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_call_status_cache() -> CallStatusCache:
+    """Get the process-wide call status cache"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CallStatusCache()
+    return _cache
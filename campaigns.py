@@ -0,0 +1,526 @@
+"""
+Outbound calling campaigns
+A campaign selects candidates by filter and queues them in a persistent
+priority queue (data/campaigns.db); the CampaignDispatcher dials them through
+BolnaAgent.make_call with at most `max_in_flight` calls live at a time, instead
+of the operator starting every call from the UI
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable
+from circuit_breaker import CircuitOpenError
+from config import CAMPAIGN_MAX_IN_FLIGHT, CAMPAIGN_CALL_TIMEOUT, CAMPAIGN_TICK_INTERVAL
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CAMPAIGNS_DB_PATH = os.path.join(BASE_DIR, 'data', 'campaigns.db')
+
+# Item lifecycle: queued -> dialing -> in_call -> completed / timed_out
+#                 (or failed / skipped / cancelled)
+LIVE_STATES = ('dialing', 'in_call')
+FINISHED_STATES = ('completed', 'timed_out', 'failed', 'skipped', 'cancelled')
+
+# Candidate fields a campaign can filter on
+FILTER_FIELDS = ('status', 'position', 'ids')
+
+
+class DialDeferred(Exception):
+    """Raised by a dial function to put the item back and try it again after `retry_after` seconds"""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+
+def matches_filter(candidate: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    """
+    Whether a candidate matches a campaign filter
+
+    Args:
+        candidate: Candidate dict
+        filters: {"status": "pending" | [...], "position": "X" | [...], "ids": [1, 2]};
+                 strings compare case-insensitively, missing keys match everything
+    """
+    for field in FILTER_FIELDS:
+        wanted = filters.get(field)
+        if wanted is None:
+            continue
+        wanted = wanted if isinstance(wanted, list) else [wanted]
+        if field == 'ids':
+            if candidate.get('id') not in wanted:
+                return False
+        elif str(candidate.get(field, '')).lower() not in [str(w).lower() for w in wanted]:
+            return False
+    return True
+
+
+class CampaignQueue:
+    """
+    SQLite (WAL) store for campaigns and their queued candidates
+
+    Items are claimed highest campaign priority first, then in enqueue order.
+    Claiming flips an item from 'queued' to 'dialing' inside a write
+    transaction, so an item is only ever handed to one dialer.
+    """
+
+    def __init__(self, db_path: str = CAMPAIGNS_DB_PATH):
+        self.db_path = os.path.abspath(db_path)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._create_schema()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self):
+        self._conn().executescript("""
+            CREATE TABLE IF NOT EXISTS campaigns (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT,
+                filters TEXT NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 0,
+                max_in_flight INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                first_dial_at REAL,
+                finished_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS campaign_items (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                campaign_id INTEGER NOT NULL,
+                candidate_id INTEGER NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 0,
+                state TEXT NOT NULL,
+                not_before REAL NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                execution_id TEXT,
+                outcome TEXT,
+                error TEXT,
+                enqueued_at REAL NOT NULL,
+                dialed_at REAL,
+                finished_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_campaign_items_queue ON campaign_items(state, priority DESC, id);
+            CREATE INDEX IF NOT EXISTS idx_campaign_items_campaign ON campaign_items(campaign_id, state);
+            CREATE INDEX IF NOT EXISTS idx_campaign_items_execution ON campaign_items(execution_id);
+        """)
+
+    def _write(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run func(conn) in a BEGIN IMMEDIATE transaction"""
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                result = func(conn)
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        return result
+
+    @staticmethod
+    def _refresh_campaign(conn: sqlite3.Connection, campaign_id: int, now: float):
+        """Mark a running campaign completed once none of its items are queued or live"""
+        remaining = conn.execute(
+            "SELECT COUNT(*) FROM campaign_items WHERE campaign_id = ? AND state IN ('queued', 'dialing', 'in_call')",
+            (campaign_id,)
+        ).fetchone()[0]
+        if not remaining:
+            conn.execute(
+                "UPDATE campaigns SET status = 'completed', finished_at = ? WHERE id = ? AND status IN ('running', 'paused')",
+                (now, campaign_id)
+            )
+
+    # ------------------------------------------------------------------
+    # Campaigns
+    # ------------------------------------------------------------------
+
+    def create_campaign(
+        self,
+        filters: Dict[str, Any],
+        candidate_ids: List[int],
+        name: Optional[str] = None,
+        priority: int = 0,
+        max_in_flight: int = CAMPAIGN_MAX_IN_FLIGHT,
+        now: Optional[float] = None
+    ) -> int:
+        """Create a running campaign with one queued item per candidate. Returns the campaign ID."""
+        now = time.time() if now is None else now
+
+        def create(conn):
+            campaign_id = conn.execute(
+                'INSERT INTO campaigns (name, filters, priority, max_in_flight, status, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (name, json.dumps(filters), priority, max_in_flight, 'running' if candidate_ids else 'completed', now)
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO campaign_items (campaign_id, candidate_id, priority, state, enqueued_at) VALUES (?, ?, ?, 'queued', ?)",
+                [(campaign_id, candidate_id, priority, now) for candidate_id in candidate_ids]
+            )
+            return campaign_id
+
+        return self._write(create)
+
+    def set_status(self, campaign_id: int, action: str, now: Optional[float] = None) -> bool:
+        """
+        Pause, resume or cancel a campaign (cancel drops its queued items;
+        calls already live are left to finish)
+
+        Returns:
+            False if the campaign doesn't exist or is already finished
+        """
+        now = time.time() if now is None else now
+        target = {'pause': 'paused', 'resume': 'running', 'cancel': 'cancelled'}[action]
+
+        def update(conn):
+            row = conn.execute('SELECT status FROM campaigns WHERE id = ?', (campaign_id,)).fetchone()
+            if row is None or row['status'] in ('completed', 'cancelled'):
+                return False
+            if action == 'cancel':
+                conn.execute(
+                    "UPDATE campaign_items SET state = 'cancelled', finished_at = ? WHERE campaign_id = ? AND state = 'queued'",
+                    (now, campaign_id)
+                )
+                conn.execute('UPDATE campaigns SET status = ?, finished_at = ? WHERE id = ?', (target, now, campaign_id))
+            else:
+                conn.execute('UPDATE campaigns SET status = ? WHERE id = ?', (target, campaign_id))
+            return True
+
+        return self._write(update)
+
+    def _progress(self, row: sqlite3.Row, now: float) -> Dict[str, Any]:
+        counts = {
+            state: count for state, count in self._conn().execute(
+                'SELECT state, COUNT(*) FROM campaign_items WHERE campaign_id = ? GROUP BY state', (row['id'],)
+            )
+        }
+        total = sum(counts.values())
+        dialed = self._conn().execute(
+            'SELECT COUNT(*) FROM campaign_items WHERE campaign_id = ? AND dialed_at IS NOT NULL', (row['id'],)
+        ).fetchone()[0]
+        queued = counts.get('queued', 0)
+        live = sum(counts.get(state, 0) for state in LIVE_STATES)
+
+        throughput = None
+        eta_seconds = None
+        if row['first_dial_at'] is not None and dialed:
+            elapsed = (row['finished_at'] or now) - row['first_dial_at']
+            if elapsed > 0:
+                throughput = round(dialed / elapsed * 60, 2)
+                if queued and row['status'] == 'running':
+                    eta_seconds = round(queued / (dialed / elapsed))
+
+        def iso(ts):
+            return datetime.fromtimestamp(ts).isoformat() if ts else None
+
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'filters': json.loads(row['filters']),
+            'priority': row['priority'],
+            'max_in_flight': row['max_in_flight'],
+            'status': row['status'],
+            'created_at': iso(row['created_at']),
+            'finished_at': iso(row['finished_at']),
+            'total': total,
+            'counts': counts,
+            'dialed': dialed,
+            'remaining': queued + live,
+            'progress': round((total - queued - live) / total, 3) if total else 1.0,
+            'throughput_per_minute': throughput,
+            'eta_seconds': eta_seconds
+        }
+
+    def get_campaign(self, campaign_id: int, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Campaign with per-state counts, throughput (dials/minute) and ETA"""
+        row = self._conn().execute('SELECT * FROM campaigns WHERE id = ?', (campaign_id,)).fetchone()
+        return self._progress(row, time.time() if now is None else now) if row else None
+
+    def list_campaigns(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        now = time.time() if now is None else now
+        rows = self._conn().execute('SELECT * FROM campaigns ORDER BY id DESC').fetchall()
+        return [self._progress(row, now) for row in rows]
+
+    def get_items(self, campaign_id: int) -> List[Dict[str, Any]]:
+        rows = self._conn().execute('SELECT * FROM campaign_items WHERE campaign_id = ? ORDER BY id', (campaign_id,))
+        return [dict(row) for row in rows]
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+
+    def live_count(self) -> int:
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM campaign_items WHERE state IN ('dialing', 'in_call')"
+        ).fetchone()[0]
+
+    def claim(self, limit: int, now: float) -> List[Dict[str, Any]]:
+        """
+        Move up to `limit` queued items of running campaigns to 'dialing',
+        respecting each campaign's max_in_flight
+
+        Returns:
+            Claimed items, each with the campaign's `filters`
+        """
+        if limit <= 0:
+            return []
+
+        def claim_items(conn):
+            live = {
+                campaign_id: count for campaign_id, count in conn.execute(
+                    "SELECT campaign_id, COUNT(*) FROM campaign_items WHERE state IN ('dialing', 'in_call') GROUP BY campaign_id"
+                )
+            }
+            caps = dict(conn.execute("SELECT id, max_in_flight FROM campaigns WHERE status = 'running'").fetchall())
+            # Campaigns already at their cap are left out of the query entirely
+            full = [campaign_id for campaign_id, cap in caps.items() if live.get(campaign_id, 0) >= cap]
+            rows = conn.execute(
+                f"""SELECT i.*, c.filters, c.max_in_flight FROM campaign_items i
+                   JOIN campaigns c ON c.id = i.campaign_id
+                   WHERE i.state = 'queued' AND c.status = 'running' AND i.not_before <= ?
+                   AND i.campaign_id NOT IN ({','.join('?' * len(full))})
+                   ORDER BY i.priority DESC, i.id
+                   LIMIT ?""",
+                (now, *full, limit * 4)
+            ).fetchall()
+            claimed = []
+            for row in rows:
+                if len(claimed) >= limit:
+                    break
+                if live.get(row['campaign_id'], 0) >= row['max_in_flight']:
+                    continue
+                conn.execute(
+                    "UPDATE campaign_items SET state = 'dialing', attempts = attempts + 1 WHERE id = ?", (row['id'],)
+                )
+                conn.execute(
+                    'UPDATE campaigns SET first_dial_at = COALESCE(first_dial_at, ?) WHERE id = ?',
+                    (now, row['campaign_id'])
+                )
+                live[row['campaign_id']] = live.get(row['campaign_id'], 0) + 1
+                item = dict(row)
+                item['filters'] = json.loads(row['filters'])
+                claimed.append(item)
+            return claimed
+
+        return self._write(claim_items)
+
+    def mark_dialed(self, item_id: int, execution_id: Optional[str], now: float):
+        """The call was accepted by Bolna; the item stays live until its webhook or timeout"""
+        self._write(lambda conn: conn.execute(
+            "UPDATE campaign_items SET state = 'in_call', execution_id = ?, dialed_at = ? WHERE id = ?",
+            (execution_id, now, item_id)
+        ))
+
+    def mark_finished(self, item_id: int, state: str, now: float, error: Optional[str] = None):
+        """Finish an item that never went live (failed / skipped)"""
+        def finish(conn):
+            conn.execute(
+                'UPDATE campaign_items SET state = ?, error = ?, finished_at = ? WHERE id = ?',
+                (state, error, now, item_id)
+            )
+            row = conn.execute('SELECT campaign_id FROM campaign_items WHERE id = ?', (item_id,)).fetchone()
+            if row:
+                self._refresh_campaign(conn, row['campaign_id'], now)
+
+        self._write(finish)
+
+    def requeue(self, item_id: int, not_before: float):
+        """Put a claimed item back (e.g. Bolna is unavailable) to be retried after `not_before`"""
+        self._write(lambda conn: conn.execute(
+            "UPDATE campaign_items SET state = 'queued', not_before = ?, attempts = attempts - 1 WHERE id = ?",
+            (not_before, item_id)
+        ))
+
+    def finish_execution(self, execution_id: str, outcome: str, now: float) -> int:
+        """
+        Complete the live items dialed as `execution_id` (called on a terminal webhook);
+        several campaigns can be waiting on the same call
+
+        Returns:
+            Number of items completed
+        """
+        def finish(conn):
+            rows = conn.execute(
+                "SELECT DISTINCT campaign_id FROM campaign_items WHERE execution_id = ? AND state = 'in_call'",
+                (execution_id,)
+            ).fetchall()
+            if not rows:
+                return 0
+            completed = conn.execute(
+                "UPDATE campaign_items SET state = 'completed', outcome = ?, finished_at = ? WHERE execution_id = ? AND state = 'in_call'",
+                (outcome, now, execution_id)
+            ).rowcount
+            for row in rows:
+                self._refresh_campaign(conn, row['campaign_id'], now)
+            return completed
+
+        return self._write(finish)
+
+    def expire_calls(self, dialed_before: float, now: float) -> int:
+        """Time out live calls dialed before `dialed_before` whose webhook never came"""
+        def expire(conn):
+            rows = conn.execute(
+                "SELECT id, campaign_id FROM campaign_items WHERE state = 'in_call' AND dialed_at < ?",
+                (dialed_before,)
+            ).fetchall()
+            for row in rows:
+                conn.execute(
+                    "UPDATE campaign_items SET state = 'timed_out', finished_at = ? WHERE id = ?", (now, row['id'])
+                )
+            for campaign_id in {row['campaign_id'] for row in rows}:
+                self._refresh_campaign(conn, campaign_id, now)
+            return len(rows)
+
+        return self._write(expire)
+
+    def recover(self, now: float) -> int:
+        """
+        On startup, fail items left in 'dialing' by a crash: the request may have
+        reached Bolna, so they are not re-dialed automatically
+        """
+        def fail_interrupted(conn):
+            rows = conn.execute("SELECT id, campaign_id FROM campaign_items WHERE state = 'dialing'").fetchall()
+            conn.execute(
+                "UPDATE campaign_items SET state = 'failed', error = 'interrupted while dialing', finished_at = ? WHERE state = 'dialing'",
+                (now,)
+            )
+            for campaign_id in {row['campaign_id'] for row in rows}:
+                self._refresh_campaign(conn, campaign_id, now)
+            return len(rows)
+
+        return self._write(fail_interrupted)
+
+
+class CampaignDispatcher:
+    """
+    Dials claimed campaign items
+
+    Each tick times out stale live calls, then claims as many items as there
+    are free slots (global `max_in_flight` and each campaign's own cap) and
+    dials them concurrently. Dials go through the shared Bolna HTTP client, so
+    the 'dial' token bucket and circuit breaker apply; while the circuit is
+    open items are put back with a delay. `clock` is injectable for tests.
+    """
+
+    def __init__(
+        self,
+        queue: CampaignQueue,
+        dial: Callable[[Dict[str, Any]], Optional[str]],
+        max_in_flight: int = CAMPAIGN_MAX_IN_FLIGHT,
+        call_timeout: float = CAMPAIGN_CALL_TIMEOUT,
+        tick_interval: float = CAMPAIGN_TICK_INTERVAL,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            queue: Campaign queue
+            dial: Dials an item's candidate and returns the execution ID, or None
+                  to skip it (candidate gone or no longer matching the filter);
+                  raises DialDeferred to try again later, anything else on failure
+            max_in_flight: Calls live at once across all campaigns
+            call_timeout: Seconds a dialed call may stay live without a terminal webhook
+            tick_interval: Seconds between ticks of the background loop
+            clock: Time source (seconds since the epoch)
+        """
+        self.queue = queue
+        self.dial = dial
+        self.max_in_flight = max_in_flight
+        self.call_timeout = call_timeout
+        self.tick_interval = tick_interval
+        self.clock = clock
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_in_flight), thread_name_prefix='campaign-dial')
+        self._wake = threading.Event()
+        self._thread = None
+        self.stats = {'dialed': 0, 'skipped': 0, 'failed': 0, 'deferred': 0, 'timed_out': 0, 'completed': 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _dial_item(self, item: Dict[str, Any]):
+        try:
+            execution_id = self.dial(item)
+        except (CircuitOpenError, DialDeferred) as e:
+            self.queue.requeue(item['id'], self.clock() + e.retry_after)
+            self._count('deferred')
+            return
+        except Exception as e:
+            print(f"❌ Campaign {item['campaign_id']}: dialing candidate {item['candidate_id']} failed: {e}")
+            self.queue.mark_finished(item['id'], 'failed', self.clock(), str(e))
+            self._count('failed')
+            return
+        if execution_id is None:
+            self.queue.mark_finished(item['id'], 'skipped', self.clock(), 'candidate no longer matches the campaign filter')
+            self._count('skipped')
+        else:
+            self.queue.mark_dialed(item['id'], execution_id, self.clock())
+            self._count('dialed')
+
+    def tick(self) -> int:
+        """
+        Run one dispatch round (blocks until this round's dials return)
+
+        Returns:
+            Number of items claimed
+        """
+        now = self.clock()
+        timed_out = self.queue.expire_calls(now - self.call_timeout, now)
+        if timed_out:
+            print(f"⏱️  {timed_out} campaign call(s) timed out without a webhook")
+            self._count('timed_out', timed_out)
+        items = self.queue.claim(self.max_in_flight - self.queue.live_count(), now)
+        for future in [self._executor.submit(self._dial_item, item) for item in items]:
+            future.result()
+        return len(items)
+
+    def on_execution_finished(self, execution_id: str, outcome: str):
+        """Free the slot of a campaign call once its terminal webhook arrives"""
+        completed = self.queue.finish_execution(execution_id, outcome, self.clock())
+        if completed:
+            self._count('completed', completed)
+            self._wake.set()
+
+    def wake(self):
+        """Run the next tick now (e.g. after a campaign was created or resumed)"""
+        self._wake.set()
+
+    def _loop(self):
+        while True:
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"❌ Campaign dispatcher error: {e}")
+            self._wake.wait(self.tick_interval)
+            self._wake.clear()
+
+    def start(self):
+        """Recover interrupted dials and start the background loop"""
+        if self._thread is None:
+            interrupted = self.queue.recover(self.clock())
+            if interrupted:
+                print(f"⚠️  {interrupted} campaign dial(s) were interrupted by a restart and marked failed")
+            self._thread = threading.Thread(target=self._loop, name='campaign-dispatcher', daemon=True)
+            self._thread.start()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats.update({
+            'live': self.queue.live_count(),
+            'max_in_flight': self.max_in_flight,
+            'running': self._thread is not None
+        })
+        return stats
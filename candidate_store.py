@@ -0,0 +1,656 @@
+"""
+Candidate storage backends
+Provides a pluggable CandidateStore so status changes update a single record
+instead of rewriting the whole data/candidates.json file
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable
+from config import CANDIDATE_STORE_BACKEND, CANDIDATE_CHANGE_LOG_SIZE
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process locking only
+    fcntl = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CANDIDATES_JSON_PATH = os.path.join(BASE_DIR, 'data', 'candidates.json')
+CANDIDATES_DB_PATH = os.path.join(BASE_DIR, 'data', 'candidates.db')
+
+# How often wait_for_change re-checks the version for writes made by other processes
+STORE_POLL_INTERVAL = 2.0
+
+
+class CandidateStore:
+    """
+    Interface shared by all candidate storage backends
+
+    Mutations take a `mutator` callable that receives the candidate dict and
+    edits it in place, so business rules (e.g. preserving originalInterview)
+    stay with the callers and every backend applies them the same way.
+    """
+
+    backend_name = 'base'
+    _changed = threading.Condition()
+    _notifications = 0  # bumped under _changed by every local write
+
+    def get_candidate(self, candidate_id: int) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def find_by_phone(self, phone: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def list_candidates(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def get_available_slots(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def list_by_status(self, status: str, updated_before: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Candidates with a status, least recently updated first
+
+        Args:
+            status: Status to match
+            updated_before: ISO timestamp; only candidates last written before it
+                            (ignored by backends that don't track write times)
+            limit: Maximum number of candidates returned
+        """
+        candidates = [c for c in self.list_candidates() if c.get('status') == status]
+        return candidates[:limit] if limit is not None else candidates
+
+    def add_candidate(self, candidate: Dict[str, Any]) -> int:
+        """Insert a candidate, assigning the next free ID. Returns the new ID."""
+        raise NotImplementedError
+
+    def update_candidate(self, candidate_id: int, mutator: Callable[[Dict[str, Any]], None]) -> Optional[Dict[str, Any]]:
+        """Apply mutator to one candidate. Returns the updated candidate, or None if not found."""
+        raise NotImplementedError
+
+    def update_all(self, mutator: Callable[[Dict[str, Any]], bool], exclude_status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Apply mutator to every candidate (optionally skipping one status)
+
+        The mutator returns True when it changed the candidate; only those are
+        written back and returned.
+        """
+        raise NotImplementedError
+
+    def delete_candidate(self, candidate_id: int) -> Optional[Dict[str, Any]]:
+        """Delete a candidate. Returns the deleted record, or None if not found."""
+        raise NotImplementedError
+
+    def count_candidates(self) -> int:
+        return len(self.list_candidates())
+
+    def export_data(self) -> Dict[str, Any]:
+        """Return the document in the same shape as data/candidates.json"""
+        return {
+            'candidates': self.list_candidates(),
+            'availableSlots': self.get_available_slots()
+        }
+
+    def get_version(self) -> int:
+        """Monotonically increasing store version; changes whenever any candidate changes"""
+        raise NotImplementedError
+
+    def changes_since(self, version: int) -> Dict[str, Any]:
+        """
+        Candidates changed after `version`
+
+        Returns:
+            Dict with 'version' (current), 'reset', 'candidates', 'deleted' and
+            'availableSlots'. When the changes can't be computed incrementally
+            (unknown or too old version) 'reset' is True and 'candidates' holds
+            the full list.
+        """
+        current = self.get_version()
+        if version == current:
+            return {'version': current, 'reset': False, 'candidates': [], 'deleted': [], 'availableSlots': None}
+        return {
+            'version': current,
+            'reset': True,
+            'candidates': self.list_candidates(),
+            'deleted': [],
+            'availableSlots': self.get_available_slots()
+        }
+
+    def wait_for_change(self, version: int, timeout: float) -> int:
+        """
+        Block until the store version differs from `version` or the timeout expires
+
+        Writes from this process wake waiters immediately; writes from other
+        processes (CLI scripts) are picked up by re-checking the version. The
+        version is read outside the shared Condition, so waiting SSE clients
+        and writers' notifications don't queue up behind each other's disk reads.
+
+        Returns:
+            The current version
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._changed:
+                seen = CandidateStore._notifications
+            current = self.get_version()
+            remaining = deadline - time.monotonic()
+            if current != version or remaining <= 0:
+                return current
+            with self._changed:
+                # Skip the wait if a local write landed while we were reading the version
+                if CandidateStore._notifications == seen:
+                    self._changed.wait(min(remaining, STORE_POLL_INTERVAL))
+
+    def _notify_changed(self):
+        with self._changed:
+            CandidateStore._notifications += 1
+            self._changed.notify_all()
+
+    def describe(self) -> str:
+        return self.backend_name
+
+
+class JsonCandidateStore(CandidateStore):
+    """Legacy backend that keeps everything in data/candidates.json"""
+
+    backend_name = 'json'
+
+    def __init__(self, json_path: str = CANDIDATES_JSON_PATH):
+        self.json_path = os.path.abspath(json_path)
+        self._lock = threading.RLock()
+
+    def _load(self) -> Dict[str, Any]:
+        with open(self.json_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save(self, data: Dict[str, Any]):
+        with open(self.json_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        self._notify_changed()
+
+    def get_version(self) -> int:
+        # No change log in the JSON file: the modification time is the version
+        try:
+            return os.stat(self.json_path).st_mtime_ns
+        except OSError:
+            return 0
+
+    def get_candidate(self, candidate_id: int) -> Optional[Dict[str, Any]]:
+        return next((c for c in self._load()['candidates'] if c['id'] == candidate_id), None)
+
+    def find_by_phone(self, phone: str) -> Optional[Dict[str, Any]]:
+        return next((c for c in self._load()['candidates'] if c.get('phone') == phone), None)
+
+    def list_candidates(self) -> List[Dict[str, Any]]:
+        return self._load().get('candidates', [])
+
+    def get_available_slots(self) -> List[Dict[str, Any]]:
+        return self._load().get('availableSlots', [])
+
+    def add_candidate(self, candidate: Dict[str, Any]) -> int:
+        with self._lock:
+            data = self._load()
+            new_id = max([c['id'] for c in data['candidates']], default=0) + 1
+            data['candidates'].append({'id': new_id, **candidate})
+            self._save(data)
+            return new_id
+
+    def update_candidate(self, candidate_id: int, mutator: Callable[[Dict[str, Any]], None]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            data = self._load()
+            candidate = next((c for c in data['candidates'] if c['id'] == candidate_id), None)
+            if not candidate:
+                return None
+            mutator(candidate)
+            self._save(data)
+            return candidate
+
+    def update_all(self, mutator: Callable[[Dict[str, Any]], bool], exclude_status: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            data = self._load()
+            changed = [
+                c for c in data['candidates']
+                if (exclude_status is None or c.get('status') != exclude_status) and mutator(c)
+            ]
+            if changed:
+                self._save(data)
+            return changed
+
+    def delete_candidate(self, candidate_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            data = self._load()
+            candidate = next((c for c in data['candidates'] if c['id'] == candidate_id), None)
+            if not candidate:
+                return None
+            data['candidates'] = [c for c in data['candidates'] if c['id'] != candidate_id]
+            self._save(data)
+            return candidate
+
+    def export_data(self) -> Dict[str, Any]:
+        return self._load()
+
+    def describe(self) -> str:
+        return f"json ({self.json_path})"
+
+
+class SQLiteCandidateStore(CandidateStore):
+    """
+    SQLite backend (WAL mode) with indexed single-row updates
+
+    Each candidate is stored as its original JSON document plus a few indexed
+    columns (id, phone, status) used for lookups. Insertion order is kept via
+    the rowid so exports match the order of data/candidates.json.
+
+    The Next.js routes still read data/candidates.json, so after every write
+    the file is rewritten (atomically, via os.replace) from the database.
+    """
+
+    backend_name = 'sqlite'
+
+    def __init__(self, db_path: str = CANDIDATES_DB_PATH, import_path: Optional[str] = CANDIDATES_JSON_PATH):
+        """
+        Args:
+            db_path: SQLite database file
+            import_path: candidates.json imported when the database is first
+                         created and kept in sync with it afterwards (None: neither)
+        """
+        self.db_path = os.path.abspath(db_path)
+        self.json_path = os.path.abspath(import_path) if import_path else None
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._write_generation = 0
+        self._mirror_lock = threading.Lock()
+        self._mirrored_version = -1
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._create_schema()
+
+        # One-shot import the first time the database is created
+        if import_path and not self._get_meta('imported_at') and os.path.exists(import_path):
+            self.import_from_json(import_path)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self):
+        conn = self._conn()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS candidates (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER NOT NULL UNIQUE,
+                phone TEXT,
+                status TEXT,
+                updated_at TEXT,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_candidates_phone ON candidates(phone);
+            CREATE INDEX IF NOT EXISTS idx_candidates_status ON candidates(status, updated_at);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS candidate_changes (
+                version INTEGER PRIMARY KEY AUTOINCREMENT,
+                candidate_id INTEGER,
+                op TEXT NOT NULL,
+                changed_at TEXT NOT NULL
+            );
+        """)
+        # Databases created before versioning lack the per-row version column
+        columns = [row[1] for row in conn.execute('PRAGMA table_info(candidates)')]
+        if 'version' not in columns:
+            conn.execute('ALTER TABLE candidates ADD COLUMN version INTEGER NOT NULL DEFAULT 0')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_candidates_version ON candidates(version)')
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._conn().execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, conn: sqlite3.Connection, key: str, value: str):
+        conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    @staticmethod
+    def _dumps(candidate: Dict[str, Any]) -> str:
+        return json.dumps(candidate, ensure_ascii=False)
+
+    def _record_change(self, conn: sqlite3.Connection, candidate_id: Optional[int], op: str) -> int:
+        """Append to the change log inside the caller's transaction. Returns the new version."""
+        version = conn.execute(
+            'INSERT INTO candidate_changes (candidate_id, op, changed_at) VALUES (?, ?, ?)',
+            (candidate_id, op, datetime.now().isoformat())
+        ).lastrowid
+        # Keep the change log bounded; clients further behind get a full reset
+        if version % 100 == 0:
+            conn.execute('DELETE FROM candidate_changes WHERE version <= ?', (version - CANDIDATE_CHANGE_LOG_SIZE,))
+        return version
+
+    def _write_row(self, conn: sqlite3.Connection, candidate: Dict[str, Any]):
+        version = self._record_change(conn, candidate['id'], 'update')
+        conn.execute(
+            'UPDATE candidates SET phone = ?, status = ?, updated_at = ?, data = ?, version = ? WHERE id = ?',
+            (
+                candidate.get('phone'),
+                candidate.get('status'),
+                datetime.now().isoformat(),
+                self._dumps(candidate),
+                version,
+                candidate['id']
+            )
+        )
+
+    def import_from_json(self, json_path: str = CANDIDATES_JSON_PATH, replace: bool = True) -> int:
+        """
+        Import candidates and availableSlots from a candidates.json file
+
+        Args:
+            json_path: Path to the JSON document
+            replace: Drop existing rows before importing
+
+        Returns:
+            Number of candidates imported
+        """
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        now = datetime.now().isoformat()
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                if replace:
+                    conn.execute('DELETE FROM candidates')
+                # An import invalidates every client cursor, so it is logged as one 'import' change
+                version = self._record_change(conn, None, 'import')
+                conn.executemany(
+                    'INSERT OR REPLACE INTO candidates (id, phone, status, updated_at, data, version) VALUES (?, ?, ?, ?, ?, ?)',
+                    [
+                        (c['id'], c.get('phone'), c.get('status'), now, self._dumps(c), version)
+                        for c in data.get('candidates', [])
+                    ]
+                )
+                self._set_meta(conn, 'available_slots', json.dumps(data.get('availableSlots', []), ensure_ascii=False))
+                self._set_meta(conn, 'imported_at', now)
+                self._set_meta(conn, 'imported_from', os.path.abspath(json_path))
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        self._notify_changed()
+
+        count = len(data.get('candidates', []))
+        print(f"📥 Imported {count} candidates from {json_path} into {self.db_path}")
+        return count
+
+    def export_to_json(self, json_path: str = CANDIDATES_JSON_PATH):
+        """Write the store back out in the candidates.json format"""
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(self.export_data(), f, indent=2, ensure_ascii=False)
+        print(f"📤 Exported candidates to {json_path}")
+
+    def get_candidate(self, candidate_id: int) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute('SELECT data FROM candidates WHERE id = ?', (candidate_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find_by_phone(self, phone: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            'SELECT data FROM candidates WHERE phone = ? ORDER BY seq LIMIT 1', (phone,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list_candidates(self) -> List[Dict[str, Any]]:
+        rows = self._conn().execute('SELECT data FROM candidates ORDER BY seq').fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def get_available_slots(self) -> List[Dict[str, Any]]:
+        value = self._get_meta('available_slots')
+        return json.loads(value) if value else []
+
+    def count_candidates(self) -> int:
+        return self._conn().execute('SELECT COUNT(*) FROM candidates').fetchone()[0]
+
+    def list_by_status(self, status: str, updated_before: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        # Served by idx_candidates_status (status, updated_at)
+        rows = self._conn().execute(
+            'SELECT data FROM candidates WHERE status = ? AND updated_at < ? ORDER BY updated_at LIMIT ?',
+            (status, updated_before or '9999', -1 if limit is None else limit)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def add_candidate(self, candidate: Dict[str, Any]) -> int:
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                new_id = conn.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM candidates').fetchone()[0]
+                record = {'id': new_id, **candidate}
+                version = self._record_change(conn, new_id, 'add')
+                conn.execute(
+                    'INSERT INTO candidates (id, phone, status, updated_at, data, version) VALUES (?, ?, ?, ?, ?, ?)',
+                    (new_id, record.get('phone'), record.get('status'), datetime.now().isoformat(), self._dumps(record), version)
+                )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        self._notify_changed()
+        return new_id
+
+    def update_candidate(self, candidate_id: int, mutator: Callable[[Dict[str, Any]], None]) -> Optional[Dict[str, Any]]:
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute('SELECT data FROM candidates WHERE id = ?', (candidate_id,)).fetchone()
+                if not row:
+                    conn.execute('ROLLBACK')
+                    return None
+                candidate = json.loads(row[0])
+                mutator(candidate)
+                self._write_row(conn, candidate)
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        self._notify_changed()
+        return candidate
+
+    def update_all(self, mutator: Callable[[Dict[str, Any]], bool], exclude_status: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                if exclude_status is None:
+                    rows = conn.execute('SELECT data FROM candidates ORDER BY seq').fetchall()
+                else:
+                    rows = conn.execute(
+                        'SELECT data FROM candidates WHERE status IS NOT ? ORDER BY seq', (exclude_status,)
+                    ).fetchall()
+                changed = []
+                for row in rows:
+                    candidate = json.loads(row[0])
+                    if mutator(candidate):
+                        self._write_row(conn, candidate)
+                        changed.append(candidate)
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        if changed:
+            self._notify_changed()
+        return changed
+
+    def delete_candidate(self, candidate_id: int) -> Optional[Dict[str, Any]]:
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute('SELECT data FROM candidates WHERE id = ?', (candidate_id,)).fetchone()
+                if row:
+                    conn.execute('DELETE FROM candidates WHERE id = ?', (candidate_id,))
+                    self._record_change(conn, candidate_id, 'delete')
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        if row:
+            self._notify_changed()
+        return json.loads(row[0]) if row else None
+
+    def _notify_changed(self):
+        self._write_generation += 1
+        super()._notify_changed()
+        self._mirror_to_json()
+
+    def _mirror_to_json(self):
+        """
+        Rewrite the candidates.json mirror if it is behind the database
+
+        Writers serialize on a lock file next to the mirror and each one exports
+        the latest committed state, so the file ends up at the newest version
+        whichever process writes last; a writer that finds its own change already
+        exported by a concurrent one skips the rewrite.
+        """
+        if not self.json_path:
+            return
+        try:
+            with self._mirror_lock, open(self.json_path + '.lock', 'a') as lock_file:
+                if fcntl:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                conn = self._conn()
+                # One read transaction so the version matches the exported rows
+                conn.execute('BEGIN')
+                try:
+                    version = conn.execute('SELECT MAX(version) FROM candidate_changes').fetchone()[0] or 0
+                    if version <= self._mirrored_version:
+                        return
+                    rows = conn.execute('SELECT data FROM candidates ORDER BY seq').fetchall()
+                    slots = conn.execute("SELECT value FROM meta WHERE key = 'available_slots'").fetchone()
+                finally:
+                    conn.execute('COMMIT')
+                data = {
+                    'candidates': [json.loads(row[0]) for row in rows],
+                    'availableSlots': json.loads(slots[0]) if slots else []
+                }
+                tmp_path = f"{self.json_path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_path, self.json_path)
+                self._mirrored_version = version
+        except (OSError, sqlite3.Error) as e:
+            # The database is the source of truth; the next write retries the mirror
+            print(f"⚠️  Could not update {self.json_path}: {e}")
+
+    def get_version(self) -> int:
+        """
+        Current store version
+
+        Cached per connection and only re-read when PRAGMA data_version (bumped
+        when another connection or process commits) or a local write says the
+        database changed, so unchanged reads don't touch the tables.
+        """
+        conn = self._conn()
+        data_version = conn.execute('PRAGMA data_version').fetchone()[0]
+        key = (data_version, self._write_generation)
+        cached = getattr(self._local, 'version', None)
+        if cached and cached[0] == key:
+            return cached[1]
+        row = conn.execute('SELECT MAX(version) FROM candidate_changes').fetchone()
+        version = row[0] or 0
+        self._local.version = (key, version)
+        return version
+
+    def changes_since(self, version: int) -> Dict[str, Any]:
+        conn = self._conn()
+        # One read transaction so the version and the rows are consistent
+        conn.execute('BEGIN')
+        try:
+            current, oldest = conn.execute('SELECT MAX(version), MIN(version) FROM candidate_changes').fetchone()
+            current = current or 0
+            if version == current:
+                return {'version': current, 'reset': False, 'candidates': [], 'deleted': [], 'availableSlots': None}
+            imported = conn.execute(
+                "SELECT 1 FROM candidate_changes WHERE version > ? AND op = 'import' LIMIT 1", (version,)
+            ).fetchone()
+            if version > current or oldest is None or version < oldest - 1 or imported:
+                rows = conn.execute('SELECT data FROM candidates ORDER BY seq').fetchall()
+                return {
+                    'version': current,
+                    'reset': True,
+                    'candidates': [json.loads(row[0]) for row in rows],
+                    'deleted': [],
+                    'availableSlots': self.get_available_slots()
+                }
+            rows = conn.execute(
+                'SELECT data FROM candidates WHERE version > ? ORDER BY seq', (version,)
+            ).fetchall()
+            deleted = conn.execute(
+                """SELECT DISTINCT candidate_id FROM candidate_changes
+                   WHERE version > ? AND op = 'delete'
+                   AND candidate_id NOT IN (SELECT id FROM candidates)""", (version,)
+            ).fetchall()
+            return {
+                'version': current,
+                'reset': False,
+                'candidates': [json.loads(row[0]) for row in rows],
+                'deleted': [row[0] for row in deleted],
+                'availableSlots': None
+            }
+        finally:
+            conn.execute('COMMIT')
+
+    def describe(self) -> str:
+        return f"sqlite ({self.db_path})"
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_candidate_store() -> CandidateStore:
+    """
+    Get the process-wide candidate store
+
+    The backend is selected with CANDIDATE_STORE_BACKEND in .env
+    ("sqlite" by default, "json" for the legacy file-based store).
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if CANDIDATE_STORE_BACKEND == 'json':
+                    _store = JsonCandidateStore()
+                else:
+                    _store = SQLiteCandidateStore()
+                print(f"🗄️  Candidate store: {_store.describe()}")
+    return _store
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Import/export candidates between data/candidates.json and the SQLite store"
+    )
+    parser.add_argument('command', choices=['import', 'export'], help='import JSON into SQLite, or export SQLite to JSON')
+    parser.add_argument('--json', default=CANDIDATES_JSON_PATH, help='Path to candidates.json')
+    parser.add_argument('--db', default=CANDIDATES_DB_PATH, help='Path to candidates.db')
+    args = parser.parse_args()
+
+    store = SQLiteCandidateStore(db_path=args.db, import_path=None)
+    if args.command == 'import':
+        store.import_from_json(args.json)
+    else:
+        store.export_to_json(args.json)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,7 @@ import json
 import time
 import os
 from datetime import datetime
+from execution_mapping import get_execution_mappings
 
 FLASK_URL = "http://localhost:5000"
 
@@ -22,27 +23,19 @@ def check_webhook_status():
 
 def check_execution_mappings():
     """Check execution mappings file"""
-    mapping_file = 'execution_mapping.json'
-    if os.path.exists(mapping_file):
-        try:
-            with open(mapping_file, 'r', encoding='utf-8') as f:
-                mappings = json.load(f)
-            return mappings
-        except:
-            return None
-    return None
+    try:
+        mappings = get_execution_mappings()
+        return dict(mappings.items()) if len(mappings) else None
+    except:
+        return None
 
 def check_candidate_statuses():
     """Check current candidate statuses"""
-    candidates_file = 'data/candidates.json'
-    if os.path.exists(candidates_file):
-        try:
-            with open(candidates_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            return data.get('candidates', [])
-        except:
-            return None
-    return None
+    try:
+        from candidate_store import get_candidate_store
+        return get_candidate_store().list_candidates()
+    except:
+        return None
 
 def test_webhook_endpoint():
     """Test if webhook endpoint is accessible"""
@@ -0,0 +1,105 @@
+"""
+Circuit breaker for Bolna API endpoint families
+After repeated failures (timeouts, connection errors, 5xx) requests to that
+family are rejected immediately instead of tying up a Flask worker on a dead
+upstream; after a cooldown one trial request decides whether to close again
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional
+import requests
+from config import BOLNA_BREAKER_FAILURES, BOLNA_BREAKER_COOLDOWN
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while the circuit is open"""
+
+    def __init__(self, family: str, retry_after: float):
+        super().__init__(f"Bolna API circuit for '{family}' is open; retry in {retry_after:.0f}s")
+        self.family = family
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    closed -> open after `failure_threshold` consecutive failures
+    open -> half_open once `cooldown` seconds have passed (one trial request)
+    half_open -> closed on success, back to open on failure
+    """
+
+    def __init__(self, family: str, failure_threshold: int = BOLNA_BREAKER_FAILURES, cooldown: float = BOLNA_BREAKER_COOLDOWN):
+        self.family = family
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.last_failure: Optional[str] = None
+        self.last_state_change = datetime.now().isoformat()
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self.stats = {'rejected': 0, 'opened': 0, 'failures': 0, 'successes': 0}
+
+    def _set_state(self, state: str):
+        if state != self.state:
+            print(f"{'🔴' if state == OPEN else '🟡' if state == HALF_OPEN else '🟢'} Bolna circuit '{self.family}': {self.state} -> {state}")
+            self.state = state
+            self.last_state_change = datetime.now().isoformat()
+
+    def before_request(self):
+        """Raise CircuitOpenError unless a request may be sent now"""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            remaining = self.opened_at + self.cooldown - time.monotonic()
+            if self.state == OPEN and remaining <= 0:
+                self._set_state(HALF_OPEN)
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            self.stats['rejected'] += 1
+            raise CircuitOpenError(self.family, max(remaining, 1))
+
+    def record_success(self):
+        with self._lock:
+            self.stats['successes'] += 1
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+            self._set_state(CLOSED)
+
+    def release(self):
+        """The request ended without an answer either way; let another trial through"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self, reason: str):
+        with self._lock:
+            self.stats['failures'] += 1
+            self.consecutive_failures += 1
+            self.last_failure = reason
+            self._trial_in_flight = False
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.stats['opened'] += 1
+                self.opened_at = time.monotonic()
+                self._set_state(OPEN)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(self.opened_at + self.cooldown - time.monotonic(), 0), 1)
+            return dict(
+                self.stats,
+                state=self.state,
+                consecutive_failures=self.consecutive_failures,
+                last_failure=self.last_failure,
+                last_state_change=self.last_state_change,
+                retry_in=retry_in
+            )
@@ -19,6 +19,11 @@ interface Candidate {
     day: string
     datetime: string
   }
+  callRetry?: {
+    attempt: number
+    maxAttempts: number
+    scheduledAt: string
+  }
   applicationDate: string
 }
 
@@ -96,6 +101,11 @@ export default function CandidateCard({ candidate, onCall, isCalling, onReset, o
         <div style={{ color: '#666', fontSize: '0.9rem', marginBottom: '0.5rem' }}>
           💼 {candidate.position}
         </div>
+        {candidate.callRetry && (
+          <div style={{ color: '#856404', fontSize: '0.85rem', marginBottom: '0.5rem' }}>
+            🔁 Retry {candidate.callRetry.attempt}/{candidate.callRetry.maxAttempts} at {new Date(candidate.callRetry.scheduledAt).toLocaleString()}
+          </div>
+        )}
         <div style={{ 
           background: '#f8f9fa', 
           padding: '0.75rem', 
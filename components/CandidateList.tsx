@@ -64,7 +64,11 @@ export default function CandidateList({
 
       const data = await response.json()
       
-      if (data.success) {
+      if (data.success && data.queued) {
+        // Bolna didn't take the call yet; the server keeps retrying it
+        alert(data.message)
+        onStatusUpdate()
+      } else if (data.success) {
         onCallInitiated({
           candidate: candidate.name,
           candidateId: candidate.id,
@@ -33,3 +33,118 @@ VOICE_LANGUAGE = "en"
 # Agent ID (if you already have an agent created)
 AGENT_ID = os.getenv("AGENT_ID", None)  # Will create new agent if none exists
 
+
+# Candidate Store Configuration
+# "sqlite" (default) keeps candidates in data/candidates.db, "json" uses data/candidates.json directly
+CANDIDATE_STORE_BACKEND = os.getenv("CANDIDATE_STORE_BACKEND", "sqlite").lower()
+
+# Webhook Event Log Configuration
+# Webhooks are appended to JSONL segments in data/webhook_log/ instead of rewriting data/webhook_data.json
+WEBHOOK_LOG_SEGMENT_BYTES = int(os.getenv("WEBHOOK_LOG_SEGMENT_BYTES", str(16 * 1024 * 1024)))
+WEBHOOK_LOG_FSYNC_BATCH = int(os.getenv("WEBHOOK_LOG_FSYNC_BATCH", "20"))  # fsync after this many appends...
+WEBHOOK_LOG_FSYNC_INTERVAL = float(os.getenv("WEBHOOK_LOG_FSYNC_INTERVAL", "1.0"))  # ...or after this many seconds
+WEBHOOK_LOG_COMPACT_INTERVAL = float(os.getenv("WEBHOOK_LOG_COMPACT_INTERVAL", "300"))  # seconds between compaction runs
+
+# Execution Mapping Configuration
+# Mappings are appended to execution_mapping.log.jsonl and folded into execution_mapping.json every N writes
+EXECUTION_MAPPING_SNAPSHOT_EVERY = int(os.getenv("EXECUTION_MAPPING_SNAPSHOT_EVERY", "200"))
+
+# Webhook Ingestion Queue Configuration
+# Webhooks are journaled, acknowledged with 202 and processed by a background worker pool
+WEBHOOK_ASYNC = os.getenv("WEBHOOK_ASYNC", "true").lower() == "true"
+WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", "4"))
+WEBHOOK_QUEUE_MAX = int(os.getenv("WEBHOOK_QUEUE_MAX", "1000"))
+WEBHOOK_QUEUE_FSYNC = os.getenv("WEBHOOK_QUEUE_FSYNC", "true").lower() == "true"
+# A failing payload is retried this many times (delay doubling from WEBHOOK_QUEUE_RETRY_DELAY seconds),
+# then left unacknowledged in the journal so the next start replays it
+WEBHOOK_QUEUE_RETRIES = int(os.getenv("WEBHOOK_QUEUE_RETRIES", "3"))
+WEBHOOK_QUEUE_RETRY_DELAY = float(os.getenv("WEBHOOK_QUEUE_RETRY_DELAY", "1.0"))
+# Number of executions remembered for duplicate/stale webhook detection
+WEBHOOK_DEDUP_CACHE_SIZE = int(os.getenv("WEBHOOK_DEDUP_CACHE_SIZE", "10000"))
+
+# Candidate Change Log Configuration
+# Every candidate write bumps the store version; clients resume /api/candidates/stream or ?since= from it
+CANDIDATE_CHANGE_LOG_SIZE = int(os.getenv("CANDIDATE_CHANGE_LOG_SIZE", "5000"))
+CANDIDATE_STREAM_HEARTBEAT = float(os.getenv("CANDIDATE_STREAM_HEARTBEAT", "15"))
+
+# Bolna HTTP Client Configuration
+# All Bolna API calls share one pooled keep-alive session with timeouts and retries
+BOLNA_HTTP_POOL_SIZE = int(os.getenv("BOLNA_HTTP_POOL_SIZE", "10"))  # keep-alive connections per host
+BOLNA_CONNECT_TIMEOUT = float(os.getenv("BOLNA_CONNECT_TIMEOUT", "5"))
+BOLNA_READ_TIMEOUT = float(os.getenv("BOLNA_READ_TIMEOUT", "30"))
+BOLNA_HTTP_RETRIES = int(os.getenv("BOLNA_HTTP_RETRIES", "3"))  # retries on 429/5xx and connection errors
+BOLNA_HTTP_BACKOFF = float(os.getenv("BOLNA_HTTP_BACKOFF", "0.5"))  # base seconds, doubled per attempt (jittered)
+BOLNA_HTTP_BACKOFF_MAX = float(os.getenv("BOLNA_HTTP_BACKOFF_MAX", "10"))
+# Seconds before a learned fallback endpoint (e.g. /executions instead of /execution) is re-probed
+BOLNA_ENDPOINT_REPROBE = float(os.getenv("BOLNA_ENDPOINT_REPROBE", "3600"))
+# AsyncBolnaAgent: requests in flight, and an extra requests/second cap across its tasks
+# (0 = only the shared per-class token buckets below apply)
+BOLNA_ASYNC_CONCURRENCY = int(os.getenv("BOLNA_ASYNC_CONCURRENCY", "10"))
+BOLNA_ASYNC_RATE_LIMIT = float(os.getenv("BOLNA_ASYNC_RATE_LIMIT", "0"))
+# Concurrent page requests when BolnaAgent walks all execution pages
+BOLNA_PAGE_WORKERS = int(os.getenv("BOLNA_PAGE_WORKERS", "4"))
+# Token buckets per endpoint class, in requests/second (0 = unlimited). Shared by all
+# processes on the host through data/bolna_rate_limit.json unless BOLNA_RATE_LIMIT_SHARED=false
+BOLNA_RATE_DIAL = float(os.getenv("BOLNA_RATE_DIAL", "2"))  # POST /call
+BOLNA_RATE_READ = float(os.getenv("BOLNA_RATE_READ", "10"))  # execution details/logs, agent reads
+BOLNA_RATE_LIST = float(os.getenv("BOLNA_RATE_LIST", "5"))  # execution list pages
+BOLNA_RATE_LIMIT_SHARED = os.getenv("BOLNA_RATE_LIMIT_SHARED", "true").lower() == "true"
+# Circuit breaker per endpoint class: after N consecutive failed requests (connection errors,
+# timeouts, 5xx) the class fails fast for the cooldown, then one trial request is let through
+BOLNA_BREAKER_FAILURES = int(os.getenv("BOLNA_BREAKER_FAILURES", "5"))
+BOLNA_BREAKER_COOLDOWN = float(os.getenv("BOLNA_BREAKER_COOLDOWN", "30"))
+
+# Call Status Cache Configuration
+# /api/call-status responses: terminal executions are cached until evicted, in-progress ones for the TTL
+CALL_STATUS_CACHE_SIZE = int(os.getenv("CALL_STATUS_CACHE_SIZE", "5000"))
+CALL_STATUS_CACHE_TTL = float(os.getenv("CALL_STATUS_CACHE_TTL", "2"))
+
+# Historical Backfill Configuration
+# fetch_historical_calls.py fetches execution details/logs with a worker pool and writes them in batches
+BACKFILL_WORKERS = int(os.getenv("BACKFILL_WORKERS", "8"))
+BACKFILL_BATCH_SIZE = int(os.getenv("BACKFILL_BATCH_SIZE", "50"))  # entries per webhook log write + checkpoint
+
+# Execution Sync Configuration
+# execution_sync.py lists executions created since its watermark and writes ones missing from the webhook log
+EXECUTION_SYNC_INTERVAL = float(os.getenv("EXECUTION_SYNC_INTERVAL", "60"))  # seconds between passes
+EXECUTION_SYNC_BUDGET = float(os.getenv("EXECUTION_SYNC_BUDGET", "30"))  # list requests per minute (0 = unlimited)
+EXECUTION_SYNC_LOOKBACK = float(os.getenv("EXECUTION_SYNC_LOOKBACK", "3600"))  # seconds before the watermark re-checked
+EXECUTION_SYNC_PAGE_SIZE = int(os.getenv("EXECUTION_SYNC_PAGE_SIZE", "50"))
+
+# Campaign Configuration
+# POST /api/campaigns queues matching candidates in data/campaigns.db; a dispatcher dials them
+CAMPAIGN_MAX_IN_FLIGHT = int(os.getenv("CAMPAIGN_MAX_IN_FLIGHT", "3"))  # live campaign calls at once
+CAMPAIGN_CALL_TIMEOUT = float(os.getenv("CAMPAIGN_CALL_TIMEOUT", "900"))  # seconds to wait for a call's terminal webhook
+CAMPAIGN_TICK_INTERVAL = float(os.getenv("CAMPAIGN_TICK_INTERVAL", "2"))
+
+# Call Retry Configuration
+# Unanswered calls are re-dialed through Bolna's scheduler (scheduled_at) with exponential backoff
+CALL_RETRY_ENABLED = os.getenv("CALL_RETRY_ENABLED", "true").lower() == "true"
+CALL_RETRY_MAX_ATTEMPTS = int(os.getenv("CALL_RETRY_MAX_ATTEMPTS", "3"))  # calls per candidate, including the first
+CALL_RETRY_BASE_DELAY = float(os.getenv("CALL_RETRY_BASE_DELAY", "1800"))  # seconds before the first retry, doubled per retry
+CALL_RETRY_MAX_DELAY = float(os.getenv("CALL_RETRY_MAX_DELAY", "14400"))
+CALL_RETRY_WINDOW = os.getenv("CALL_RETRY_WINDOW", "09:00-19:00")  # daily dialing window in CALL_RETRY_TIMEZONE
+CALL_RETRY_TIMEZONE = os.getenv("CALL_RETRY_TIMEZONE", "Asia/Kolkata")
+CALL_RETRY_OUTCOMES = tuple(s.strip() for s in os.getenv("CALL_RETRY_OUTCOMES", "no_answer,no-answer,no answer,busy").split(",") if s.strip())
+
+# Call Reconciler Configuration
+# Candidates left in "calling" (e.g. their webhook was lost) are re-checked against Bolna in the background
+CALL_RECONCILE_ENABLED = os.getenv("CALL_RECONCILE_ENABLED", "true").lower() == "true"
+CALL_RECONCILE_INTERVAL = float(os.getenv("CALL_RECONCILE_INTERVAL", "120"))  # seconds between passes
+CALL_RECONCILE_STALE_AFTER = float(os.getenv("CALL_RECONCILE_STALE_AFTER", "600"))  # seconds in "calling" before a check
+CALL_RECONCILE_BATCH_SIZE = int(os.getenv("CALL_RECONCILE_BATCH_SIZE", "100"))  # candidates per pass
+CALL_RECONCILE_CONCURRENCY = int(os.getenv("CALL_RECONCILE_CONCURRENCY", "4"))  # execution lookups in flight
+
+# Call Registry Configuration
+# One call in flight per candidate and phone number across all workers (data/call_registry.db)
+CALL_REGISTRY_TTL = float(os.getenv("CALL_REGISTRY_TTL", "900"))  # seconds a live call blocks re-dials without a terminal webhook
+CALL_REGISTRY_DIAL_TIMEOUT = float(os.getenv("CALL_REGISTRY_DIAL_TIMEOUT", "45"))  # seconds a dial request may hold its claim
+
+# Call Job Queue Configuration
+# /api/call dials are recorded as jobs in data/call_jobs.db and placed by worker threads (at-least-once)
+CALL_JOB_WORKERS = int(os.getenv("CALL_JOB_WORKERS", "2"))  # worker threads per API server process
+CALL_JOB_VISIBILITY_TIMEOUT = float(os.getenv("CALL_JOB_VISIBILITY_TIMEOUT", "60"))  # seconds a leased job is hidden
+CALL_JOB_MAX_ATTEMPTS = int(os.getenv("CALL_JOB_MAX_ATTEMPTS", "5"))
+CALL_JOB_RETRY_DELAY = float(os.getenv("CALL_JOB_RETRY_DELAY", "10"))  # seconds before a failed dial is retried
+CALL_JOB_WAIT = float(os.getenv("CALL_JOB_WAIT", "30"))  # seconds /api/call waits for its job before answering 202
+CALL_JOB_RETENTION = float(os.getenv("CALL_JOB_RETENTION", "604800"))  # seconds finished jobs are kept
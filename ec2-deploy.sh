@@ -168,6 +168,27 @@ StandardError=journal
 WantedBy=multi-user.target
 EOF
 
+# Execution sync Service (writes executions whose webhooks were missed into the webhook log)
+sudo tee /etc/systemd/system/bolna-sync.service > /dev/null << EOF
+[Unit]
+Description=Bolna Execution Sync (fills executions missed by webhooks)
+After=network.target bolna-flask.service
+
+[Service]
+Type=simple
+User=$SERVICE_USER
+WorkingDirectory=$PROJECT_DIR
+Environment="PATH=$PROJECT_DIR/venv/bin"
+ExecStart=$PROJECT_DIR/venv/bin/python execution_sync.py
+Restart=always
+RestartSec=10
+StandardOutput=journal
+StandardError=journal
+
+[Install]
+WantedBy=multi-user.target
+EOF
+
 echo "✅ Systemd service files created"
 
 # Reload systemd
@@ -179,6 +200,7 @@ echo "🔌 Enabling services..."
 sudo systemctl enable bolna-flask
 sudo systemctl enable bolna-nextjs
 sudo systemctl enable bolna-ngrok
+sudo systemctl enable bolna-sync
 
 # Start services
 echo "▶️  Starting services..."
@@ -187,6 +209,7 @@ sleep 3
 sudo systemctl restart bolna-nextjs
 sleep 3
 sudo systemctl restart bolna-ngrok
+sudo systemctl restart bolna-sync
 
 # Wait a bit for services to start
 sleep 5
@@ -261,8 +284,9 @@ echo "Useful commands:"
 echo "  View Flask logs:    sudo journalctl -u bolna-flask -f"
 echo "  View Next.js logs:  sudo journalctl -u bolna-nextjs -f"
 echo "  View ngrok logs:    sudo journalctl -u bolna-ngrok -f"
+echo "  View sync logs:     sudo journalctl -u bolna-sync -f"
 echo "  View nginx logs:    sudo tail -f /var/log/nginx/error.log"
-echo "  Restart all:        sudo systemctl restart bolna-flask bolna-nextjs bolna-ngrok nginx"
-echo "  Stop all:           sudo systemctl stop bolna-flask bolna-nextjs bolna-ngrok nginx"
+echo "  Restart all:        sudo systemctl restart bolna-flask bolna-nextjs bolna-ngrok bolna-sync nginx"
+echo "  Stop all:           sudo systemctl stop bolna-flask bolna-nextjs bolna-ngrok bolna-sync nginx"
 echo ""
 
@@ -0,0 +1,223 @@
+"""
+In-process execution_id -> candidate mapping index
+Loaded once from execution_mapping.json (snapshot) plus an append log, so
+lookups on the webhook hot path never touch disk
+"""
+
+import atexit
+import contextlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple
+from config import EXECUTION_MAPPING_SNAPSHOT_EVERY
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process locking only
+    fcntl = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MAPPING_SNAPSHOT_PATH = os.path.join(BASE_DIR, 'execution_mapping.json')
+MAPPING_LOG_PATH = os.path.join(BASE_DIR, 'execution_mapping.log.jsonl')
+
+
+class ExecutionMappingIndex:
+    """
+    Dict-backed execution mapping with append-only persistence
+
+    Writes append one JSON line to the log; every EXECUTION_MAPPING_SNAPSHOT_EVERY
+    writes the full dict is written to execution_mapping.json (same format as
+    before) and the log is truncated. Startup = load snapshot + replay log.
+
+    Several processes share the files (API server, execution sync, CLI tools):
+    appends and snapshots hold an exclusive flock on a lock file next to the
+    log, reads a shared one. Each snapshot bumps a generation counter, and a
+    process whose generation is behind reloads instead of resuming from a log
+    offset that no longer exists.
+    """
+
+    def __init__(self, snapshot_path: str = MAPPING_SNAPSHOT_PATH, log_path: str = MAPPING_LOG_PATH):
+        self.snapshot_path = snapshot_path
+        self.log_path = log_path
+        self.generation_path = log_path + '.generation'
+        self._lock = threading.RLock()
+        self._lock_file = open(log_path + '.lock', 'a')
+        self._mappings: Dict[str, Dict[str, Any]] = {}
+        # candidate_id -> their most recently mapped execution_id
+        self._latest: Dict[int, str] = {}
+        self._log_offset = 0
+        self._generation = 0
+        self._writes_since_snapshot = 0
+        with self._lock, self._file_lock(exclusive=False):
+            self._load()
+        atexit.register(self.close)
+
+    @contextlib.contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Cross-process lock on the snapshot and log (callers hold self._lock)"""
+        if fcntl:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _read_generation(self) -> int:
+        try:
+            with open(self.generation_path, 'r') as f:
+                return int(f.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _write_generation(self, generation: int):
+        with open(self.generation_path + '.tmp', 'w') as f:
+            f.write(str(generation))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(self.generation_path + '.tmp', self.generation_path)
+
+    def _load(self):
+        """Load the snapshot and the whole log (callers hold both locks)"""
+        self._mappings = {}
+        self._latest = {}
+        self._log_offset = 0
+        self._generation = self._read_generation()
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                    self._mappings = json.load(f)
+            except Exception as e:
+                print(f"⚠️  Error reading execution mapping snapshot: {e}")
+        for execution_id, mapping in self._mappings.items():
+            self._latest[mapping.get('candidate_id')] = execution_id
+        self._apply_log()
+
+    def _replay_log(self):
+        """Catch up with writes since the last read, by this or another process (callers hold both locks)"""
+        if self._read_generation() != self._generation:
+            # Another process snapshotted and truncated the log: our offset is meaningless
+            self._load()
+        else:
+            self._apply_log()
+
+    def _catch_up(self):
+        with self._lock, self._file_lock(exclusive=False):
+            self._replay_log()
+
+    def _apply_log(self):
+        """Apply log lines past our offset"""
+        if not os.path.exists(self.log_path):
+            self._log_offset = 0
+            return
+        if os.path.getsize(self.log_path) == self._log_offset:
+            return
+        with open(self.log_path, 'rb') as f:
+            f.seek(self._log_offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                self._log_offset += len(line)
+                try:
+                    record = json.loads(line)
+                    execution_id = record.pop('execution_id')
+                    self._mappings[execution_id] = record
+                    self._latest[record.get('candidate_id')] = execution_id
+                except (ValueError, KeyError):
+                    continue
+
+    def get(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """Get the mapping for an execution (candidate_id, phone, created_at) or None"""
+        mapping = self._mappings.get(execution_id)
+        if mapping is None:
+            with self._lock:
+                self._catch_up()
+                mapping = self._mappings.get(execution_id)
+        return mapping
+
+    def set(self, execution_id: str, candidate_id: int, phone: str) -> Dict[str, Any]:
+        """Record a mapping and append it to the log"""
+        mapping = {
+            'candidate_id': candidate_id,
+            'phone': phone,
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+        line = (json.dumps({'execution_id': execution_id, **mapping}, ensure_ascii=False) + '\n').encode('utf-8')
+        with self._lock:
+            with self._file_lock(exclusive=True):
+                self._replay_log()
+                with open(self.log_path, 'ab') as f:
+                    f.write(line)
+                self._log_offset += len(line)
+                self._mappings[execution_id] = mapping
+                self._latest[candidate_id] = execution_id
+                self._writes_since_snapshot += 1
+            if self._writes_since_snapshot >= EXECUTION_MAPPING_SNAPSHOT_EVERY:
+                self.snapshot()
+        return mapping
+
+    def latest_for_candidate(self, candidate_id: int) -> Optional[str]:
+        """The candidate's most recently mapped execution_id, or None"""
+        with self._lock:
+            self._catch_up()
+            return self._latest.get(candidate_id)
+
+    def snapshot(self):
+        """Write the full mapping to execution_mapping.json and truncate the log"""
+        with self._lock, self._file_lock(exclusive=True):
+            self._replay_log()
+            tmp_path = self.snapshot_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._mappings, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            # Bump the generation before truncating: a crash in between only makes
+            # other processes reload the snapshot and replay a log it already holds
+            self._generation += 1
+            self._write_generation(self._generation)
+            open(self.log_path, 'wb').close()
+            self._log_offset = 0
+            self._writes_since_snapshot = 0
+
+    def close(self):
+        # Only fold the log if this process wrote to it, so read-only CLI tools
+        # never truncate the log underneath the API server
+        with self._lock:
+            if self._writes_since_snapshot:
+                try:
+                    self.snapshot()
+                except Exception as e:
+                    print(f"⚠️  Error snapshotting execution mappings: {e}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._catch_up()
+            return len(self._mappings)
+
+    def __contains__(self, execution_id: str) -> bool:
+        return self.get(execution_id) is not None
+
+    def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        with self._lock:
+            self._catch_up()
+            return list(self._mappings.items())
+
+    def keys(self) -> List[str]:
+        return [execution_id for execution_id, _ in self.items()]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_execution_mappings() -> ExecutionMappingIndex:
+    """Get the process-wide execution mapping index (loaded on first use)"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = ExecutionMappingIndex()
+    return _index
@@ -0,0 +1,246 @@
+"""
+Incremental execution sync service
+Periodically lists recent Bolna executions and writes the ones the webhook
+event log is missing (or holds with an outdated status) into it, so calls whose
+webhooks were lost still end up in data/webhook_log/. Only executions created
+since the last watermark (minus a lookback window for calls still in progress)
+are fetched, within a fixed API budget per minute.
+
+Run: python execution_sync.py            (loop, see systemd/bolna-sync.service)
+     python execution_sync.py --once     (single pass)
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+from bolna_agent import BolnaAgent
+from webhook_store import get_webhook_log
+from webhook_dedup import TERMINAL_STATUSES
+from rate_limiter import TokenBucketLimiter
+from fetch_historical_calls import describe_execution, build_storage_entry, get_candidate_id_from_execution
+from config import (
+    AGENT_ID,
+    EXECUTION_SYNC_INTERVAL,
+    EXECUTION_SYNC_BUDGET,
+    EXECUTION_SYNC_LOOKBACK,
+    EXECUTION_SYNC_PAGE_SIZE
+)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+EXECUTION_SYNC_STATE_PATH = os.path.join(BASE_DIR, 'data', 'execution_sync_state.json')
+
+
+def _timestamp(value: Optional[str]) -> Optional[float]:
+    """Seconds since the epoch for a Bolna ISO timestamp, or None if unparseable"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+def load_sync_state(path: str = EXECUTION_SYNC_STATE_PATH) -> Dict[str, Any]:
+    """Last saved sync state ({} if the service has never run)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+class ExecutionSync:
+    """
+    Watermark-based execution sync
+
+    The watermark is the newest `created_at` seen in a completed pass. Bolna
+    lists executions newest first, so a pass stops at the first page with
+    nothing created after `watermark - lookback` (if a page turns out not to
+    be in descending order, the pass keeps walking instead). The watermark is
+    only advanced once a pass completes, so an interrupted pass is redone.
+    """
+
+    def __init__(
+        self,
+        agent: BolnaAgent,
+        agent_id: Optional[str] = AGENT_ID,
+        state_path: str = EXECUTION_SYNC_STATE_PATH,
+        budget_per_minute: float = EXECUTION_SYNC_BUDGET,
+        lookback: float = EXECUTION_SYNC_LOOKBACK,
+        page_size: int = EXECUTION_SYNC_PAGE_SIZE,
+        max_pages: Optional[int] = None
+    ):
+        """
+        Args:
+            agent: BolnaAgent used to list executions
+            agent_id: Agent whose executions are synced (None = all)
+            state_path: JSON file holding the watermark and run statistics
+            budget_per_minute: List requests allowed per minute (0 = unlimited)
+            lookback: Seconds before the watermark that are re-checked for status changes
+            page_size: Executions per list request
+            max_pages: Cap on pages per pass (None = until the watermark is reached).
+                       A pass cut short by the cap leaves the watermark where it was
+        """
+        self.agent = agent
+        self.agent_id = agent_id
+        self.state_path = state_path
+        self.lookback = lookback
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.budget = TokenBucketLimiter(rates={'sync': budget_per_minute / 60.0}, state_path=None)
+        self.webhook_log = get_webhook_log(background=False)
+        self.state = load_sync_state(state_path)
+
+    def _save_state(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def _entry_if_changed(self, execution: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Webhook log entry for a listed execution, or None if the log is already up to date"""
+        execution_id = execution.get('execution_id') or execution.get('id') or execution.get('executionId')
+        if not execution_id:
+            return None
+        described = describe_execution(execution)
+        status = str(described['status']).lower()
+        stored = self.webhook_log.get(execution_id)
+        if stored is not None:
+            stored_status = str(stored.get('status', '')).lower()
+            if stored_status == status or (stored_status in TERMINAL_STATUSES and status not in TERMINAL_STATUSES):
+                return None
+        execution_data = dict(
+            described,
+            execution_id=execution_id,
+            fetched_at=datetime.now().isoformat(),
+            execution_details=execution,
+            raw_data={'execution_details': execution, 'fetched_via': 'execution_sync', 'api_endpoint': '/execution'}
+        )
+        entry = build_storage_entry(execution_data, get_candidate_id_from_execution(execution_id))
+        entry['fetched_from'] = 'execution_sync'
+        return entry
+
+    def sync_once(self) -> Dict[str, Any]:
+        """
+        Run one pass
+
+        Returns:
+            Statistics for the pass (pages, seen, filled, updated, complete,
+            watermark, elapsed)
+        """
+        start = time.monotonic()
+        watermark = self.state.get('watermark')
+        watermark_ts = _timestamp(watermark)
+        cutoff = watermark_ts - self.lookback if watermark_ts is not None else None
+        newest, newest_ts = watermark, watermark_ts
+        result = {'pages': 0, 'seen': 0, 'filled': 0, 'updated': 0}
+        # Set once the walk reaches the cutoff or the last page (not when max_pages stops it)
+        complete = False
+
+        page_number = 1
+        while self.max_pages is None or page_number <= self.max_pages:
+            self.budget.acquire('sync')
+            page = self.agent.list_executions(agent_id=self.agent_id, page_number=page_number, page_size=self.page_size)
+            executions = page.get('data', []) if isinstance(page, dict) else (page or [])
+            result['pages'] += 1
+            if not executions:
+                complete = True
+                break
+
+            entries: List[Dict[str, Any]] = []
+            stamps = []
+            for execution in executions:
+                created_ts = _timestamp(execution.get('created_at'))
+                if created_ts is not None:
+                    stamps.append(created_ts)
+                    if newest_ts is None or created_ts > newest_ts:
+                        newest, newest_ts = execution.get('created_at'), created_ts
+                if cutoff is not None and created_ts is not None and created_ts < cutoff:
+                    continue
+                result['seen'] += 1
+                entry = self._entry_if_changed(execution)
+                if entry is not None:
+                    result['updated' if entry['execution_id'] in self.webhook_log else 'filled'] += 1
+                    entries.append(entry)
+            if entries:
+                self.webhook_log.append_many(entries)
+
+            has_more = page.get('has_more', len(executions) >= self.page_size) if isinstance(page, dict) else len(executions) >= self.page_size
+            if not has_more:
+                complete = True
+                break
+            descending = stamps == sorted(stamps, reverse=True)
+            if cutoff is not None and descending and stamps and stamps[-1] < cutoff:
+                complete = True
+                break  # everything after this page is older than the lookback window
+            page_number += 1
+
+        if not complete:
+            # Pages between here and the cutoff were never read; the next pass must walk them
+            print(f"⚠️  Execution sync stopped after {result['pages']} page(s) before reaching the watermark; keeping it at {watermark or 'none'}")
+            newest = watermark
+        result['complete'] = complete
+        result['watermark'] = newest
+        result['elapsed'] = round(time.monotonic() - start, 2)
+        totals = self.state.get('totals', {})
+        for key in ('pages', 'filled', 'updated'):
+            totals[key] = totals.get(key, 0) + result[key]
+        self.state.update({
+            'watermark': newest,
+            'last_run': datetime.now().isoformat(),
+            'last_result': result,
+            'totals': totals
+        })
+        self._save_state()
+        return result
+
+    def run_forever(self, interval: float = EXECUTION_SYNC_INTERVAL):
+        """Run passes every `interval` seconds until interrupted"""
+        print(f"🔄 Execution sync running every {interval:.0f}s (watermark: {self.state.get('watermark') or 'none'})")
+        while True:
+            try:
+                result = self.sync_once()
+                if result['filled'] or result['updated']:
+                    print(f"✅ Synced {result['pages']} page(s): {result['filled']} missing, {result['updated']} updated executions written")
+            except Exception as e:
+                print(f"❌ Execution sync pass failed: {e}")
+                self.state['last_error'] = {'at': datetime.now().isoformat(), 'error': str(e)}
+                self._save_state()
+            time.sleep(interval)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sync recent Bolna executions into the webhook event log")
+    parser.add_argument('--agent-id', type=str, default=AGENT_ID, help='Agent ID to sync (default: from config)')
+    parser.add_argument('--once', action='store_true', help='Run a single pass and exit')
+    parser.add_argument('--interval', type=float, default=EXECUTION_SYNC_INTERVAL, help=f'Seconds between passes (default: {EXECUTION_SYNC_INTERVAL:.0f})')
+    parser.add_argument('--budget', type=float, default=EXECUTION_SYNC_BUDGET, help=f'List requests per minute (default: {EXECUTION_SYNC_BUDGET:.0f})')
+    parser.add_argument('--max-pages', type=int, help='Cap on pages per pass')
+    parser.add_argument('--reset', action='store_true', help='Forget the watermark and walk every page again')
+    args = parser.parse_args()
+
+    agent = BolnaAgent()
+    if args.agent_id:
+        agent.agent_id = args.agent_id
+    sync = ExecutionSync(agent, agent_id=args.agent_id, budget_per_minute=args.budget, max_pages=args.max_pages)
+    if args.reset:
+        sync.state.pop('watermark', None)
+
+    try:
+        if args.once:
+            result = sync.sync_once()
+            print(f"✅ {result['pages']} page(s), {result['seen']} recent executions: "
+                  f"{result['filled']} missing and {result['updated']} updated written (watermark: {result['watermark']})")
+        else:
+            sync.run_forever(args.interval)
+    except KeyboardInterrupt:
+        print("\n⏹️  Execution sync stopped")
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,7 @@ import sys
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 from config import BOLNA_API_BASE, BOLNA_API_KEY
+from bolna_http import get_bolna_http
 
 def fetch_batch_executions(
     batch_id: Optional[str] = None,
@@ -57,7 +58,7 @@ def fetch_batch_executions(
             print(f"   Agent ID: {agent_id}")
         print(f"   Page: {page_number}, Size: {page_size}")
         
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = get_bolna_http().get(url, operation='list', headers=headers, params=params)
         response.raise_for_status()
         
         result = response.json()
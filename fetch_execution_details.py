@@ -8,6 +8,7 @@ import json
 import sys
 from datetime import datetime
 from config import BOLNA_API_BASE, BOLNA_API_KEY
+from bolna_http import get_bolna_http
 
 def fetch_execution_details(execution_id: str):
     """
@@ -32,7 +33,7 @@ def fetch_execution_details(execution_id: str):
     
     try:
         print(f"📡 Fetching execution details for: {execution_id}")
-        response = requests.get(url, headers=headers, timeout=10)
+        response = get_bolna_http().get(url, operation='execution', headers=headers)
         response.raise_for_status()
         
         result = response.json()
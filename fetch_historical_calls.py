@@ -1,14 +1,28 @@
 """
 Fetch historical call data from Bolna API
 Retrieves transcripts, recordings, traces, logs, and raw data for all past calls
+
+Executions are fetched by a worker pool and written to the webhook event log in
+batches; completed execution IDs are appended to a checkpoint file after each
+batch, so an interrupted backfill resumes where it stopped.
 """
 
 import json
 import os
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
+from typing import Dict, Any, List, Optional, Set
 from bolna_agent import BolnaAgent
-from config import AGENT_ID
+from webhook_store import get_webhook_log
+from execution_mapping import get_execution_mappings
+from webhook_payload import WebhookPayload
+from config import AGENT_ID, BACKFILL_WORKERS, BACKFILL_BATCH_SIZE
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKFILL_CHECKPOINT_PATH = os.path.join(BASE_DIR, 'data', 'backfill_checkpoint.jsonl')
+PROGRESS_INTERVAL = 5.0  # seconds between progress lines
 
 def fetch_all_executions(agent, agent_id=None, max_pages=10):
     """
@@ -78,7 +92,6 @@ def fetch_all_executions(agent, agent_id=None, max_pages=10):
                 break
             
             page_number += 1
-            time.sleep(0.5)  # Rate limiting
             
         except Exception as e:
             print(f"❌ Error fetching page {page_number}: {e}")
@@ -86,7 +99,22 @@ def fetch_all_executions(agent, agent_id=None, max_pages=10):
     
     return all_executions
 
-def fetch_complete_execution_data(agent, execution_id):
+def describe_execution(details):
+    """Resolve transcript, recording, status, dates, etc. from execution details in one pass"""
+    execution = WebhookPayload(details)
+    return {
+        'transcript': execution.transcript or None,
+        'recording_url': execution.recording_url or None,
+        'status': execution.status,
+        'created_at': execution.created_at or '',
+        'updated_at': execution.updated_at or '',
+        'agent_id': execution.agent_id or '',
+        'recipient_phone_number': execution.recipient_phone_number,
+        'extracted_data': execution.extracted_data,
+        'cost_breakdown': execution.cost_breakdown
+    }
+
+def fetch_complete_execution_data(agent, execution_id, verbose=True):
     """
     Fetch complete data for a single execution:
     - Execution details (full)
@@ -98,10 +126,12 @@ def fetch_complete_execution_data(agent, execution_id):
     Args:
         agent: BolnaAgent instance
         execution_id: Execution ID to fetch
+        verbose: Print each step (off when fetching from a worker pool)
     
     Returns:
         Dictionary with all execution data
     """
+    log = print if verbose else (lambda *args, **kwargs: None)
     data = {
         'execution_id': execution_id,
         'fetched_at': datetime.now().isoformat(),
@@ -114,47 +144,21 @@ def fetch_complete_execution_data(agent, execution_id):
     
     try:
         # 1. Get execution details (includes most data)
-        print(f"      📋 Fetching execution details...", end=" ")
+        log(f"      📋 Fetching execution details...", end=" ")
         details = agent.get_execution_details(execution_id)
         data['execution_details'] = details
+        data.update(describe_execution(details))
         
-        # Extract transcript from details
-        transcript = (
-            details.get('transcript') or 
-            details.get('conversation_transcript') or 
-            details.get('call_transcript') or
-            details.get('transcript_text') or
-            ''
-        )
-        data['transcript'] = transcript if transcript else None
-        
-        # Extract recording URL
-        telephony_data = details.get('telephony_data', {})
-        if isinstance(telephony_data, dict):
-            data['recording_url'] = telephony_data.get('recording_url') or telephony_data.get('recording')
-        
-        # Extract status, dates, etc.
-        data['status'] = details.get('status', 'unknown')
-        data['created_at'] = details.get('created_at', '')
-        data['updated_at'] = details.get('updated_at', details.get('modified_at', ''))
-        data['agent_id'] = details.get('agent_id', '')
-        data['recipient_phone_number'] = (
-            telephony_data.get('recipient_phone_number') if isinstance(telephony_data, dict) else None or
-            details.get('recipient_phone_number')
-        )
-        data['extracted_data'] = details.get('extracted_data', {})
-        data['cost_breakdown'] = details.get('cost_breakdown', {})
-        
-        print("✅")
+        log("✅")
         
         # 2. Get execution logs/traces (if available)
         try:
-            print(f"      📊 Fetching execution logs...", end=" ")
+            log(f"      📊 Fetching execution logs...", end=" ")
             logs = agent.get_execution_logs(execution_id)
             data['execution_logs'] = logs
-            print("✅")
+            log("✅")
         except Exception as e:
-            print(f"⚠️  (logs not available: {str(e)[:50]})")
+            log(f"⚠️  (logs not available: {str(e)[:50]})")
         
         # 3. Store raw data (complete response)
         data['raw_data'] = {
@@ -165,7 +169,7 @@ def fetch_complete_execution_data(agent, execution_id):
         }
         
     except Exception as e:
-        print(f"❌ Error: {e}")
+        log(f"❌ Error: {e}")
         data['error'] = str(e)
         data['error_type'] = type(e).__name__
         # Still return data even on error so we can track failed fetches
@@ -174,26 +178,8 @@ def fetch_complete_execution_data(agent, execution_id):
     
     return data
 
-def save_to_permanent_storage(execution_data, candidate_id=None):
-    """
-    Save execution data to permanent storage in data/webhook_data.json
-    Merges with existing data
-    """
-    webhook_data_file = 'data/webhook_data.json'
-    os.makedirs('data', exist_ok=True)
-    
-    # Load existing data
-    webhook_data = {}
-    if os.path.exists(webhook_data_file):
-        try:
-            with open(webhook_data_file, 'r', encoding='utf-8') as f:
-                webhook_data = json.load(f)
-        except:
-            pass
-    
-    if 'all_webhooks' not in webhook_data:
-        webhook_data['all_webhooks'] = []
-    
+def build_storage_entry(execution_data, candidate_id=None):
+    """Build the webhook event log entry for fetched execution data"""
     execution_id = execution_data['execution_id']
     
     # Create/update entry
@@ -224,58 +210,158 @@ def save_to_permanent_storage(execution_data, candidate_id=None):
         'error': execution_data.get('error'),
         'error_type': execution_data.get('error_type')
     }
-    
-    # Store by execution_id
-    webhook_data[execution_id] = entry
-    
-    # Update chronological index
-    existing_index = next(
-        (i for i, w in enumerate(webhook_data['all_webhooks']) if w.get('execution_id') == execution_id),
-        None
-    )
-    
-    index_entry = {
-        'execution_id': execution_id,
-        'candidate_id': candidate_id,
-        'timestamp': entry['timestamp'],
-        'status': entry['status'],
-        'fetched_from': 'bolna_api'
-    }
-    
-    if existing_index is not None:
-        webhook_data['all_webhooks'][existing_index] = index_entry
-    else:
-        webhook_data['all_webhooks'].insert(0, index_entry)
-    
-    # Sort by timestamp (newest first)
-    webhook_data['all_webhooks'].sort(
-        key=lambda x: x.get('timestamp', ''),
-        reverse=True
-    )
-    
-    # Keep only last 1000 in index
-    webhook_data['all_webhooks'] = webhook_data['all_webhooks'][:1000]
-    
-    # Save
-    with open(webhook_data_file, 'w', encoding='utf-8') as f:
-        json.dump(webhook_data, f, indent=2, ensure_ascii=False)
-    
+    return entry
+
+def save_to_permanent_storage(execution_data, candidate_id=None):
+    """
+    Save execution data to permanent storage in the webhook event log
+    Appends a new record; the latest record per execution wins
+    """
+    get_webhook_log(background=False).append(build_storage_entry(execution_data, candidate_id))
     return True
 
 def get_candidate_id_from_execution(execution_id):
-    """Try to find candidate_id from execution_mapping.json"""
+    """Try to find candidate_id from the execution mapping index"""
     try:
-        mapping_file = 'execution_mapping.json'
-        if os.path.exists(mapping_file):
-            with open(mapping_file, 'r', encoding='utf-8') as f:
-                mappings = json.load(f)
-                mapping = mappings.get(execution_id)
-                if mapping:
-                    return mapping.get('candidate_id')
+        mapping = get_execution_mappings().get(execution_id)
+        if mapping:
+            return mapping.get('candidate_id')
     except:
         pass
     return None
 
+class BackfillCheckpoint:
+    """
+    Append-only record of execution IDs already saved by a backfill
+    One JSON line per written batch: {"done": [...], "failed": {...}, "at": ...}
+    Failed executions are not marked done, so a resumed run retries them.
+    """
+
+    def __init__(self, path: str = BACKFILL_CHECKPOINT_PATH):
+        self.path = path
+        self.done: Set[str] = set()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self.done.update(json.loads(line).get('done', []))
+                    except ValueError:
+                        continue  # torn last line from an interrupted run
+
+    def record(self, done: List[str], failed: Dict[str, str]):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        line = json.dumps({'done': done, 'failed': failed, 'at': datetime.now().isoformat()})
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self.done.update(done)
+
+    def clear(self):
+        self.done = set()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def backfill_executions(
+    agent,
+    execution_ids: List[str],
+    workers: int = BACKFILL_WORKERS,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+    checkpoint: Optional[BackfillCheckpoint] = None
+) -> Dict[str, Any]:
+    """
+    Fetch and save complete data for many executions
+
+    Details and logs are fetched by `workers` threads (at most 2x workers
+    results held in memory); entries are written to the webhook event log
+    `batch_size` at a time, then recorded in the checkpoint.
+
+    Args:
+        agent: BolnaAgent instance
+        execution_ids: Executions to fetch (already-checkpointed ones are skipped)
+        workers: Concurrent fetches
+        batch_size: Entries per webhook log write
+        checkpoint: Resume state (None = no checkpointing)
+
+    Returns:
+        Statistics dict (total, skipped, fetched, errors, elapsed, rate)
+    """
+    skipped = 0
+    if checkpoint is not None:
+        pending = [i for i in execution_ids if i not in checkpoint.done]
+        skipped = len(execution_ids) - len(pending)
+        if skipped:
+            print(f"⏩ Resuming: {skipped} executions already saved by a previous run")
+    else:
+        pending = list(execution_ids)
+
+    webhook_log = get_webhook_log(background=False)
+    stats = {'total': len(execution_ids), 'skipped': skipped, 'fetched': 0, 'errors': 0}
+    batch: List[Dict[str, Any]] = []
+    failed: Dict[str, str] = {}
+    start = time.monotonic()
+    last_report = start
+
+    def flush():
+        if not batch and not failed:
+            return
+        webhook_log.append_many(batch)
+        if checkpoint is not None:
+            checkpoint.record([entry['execution_id'] for entry in batch], dict(failed))
+        batch.clear()
+        failed.clear()
+
+    def report(final=False):
+        elapsed = time.monotonic() - start
+        processed = stats['fetched'] + stats['errors']
+        rate = processed / elapsed if elapsed > 0 else 0.0
+        remaining = len(pending) - processed
+        eta = f"{remaining / rate:.0f}s" if rate > 0 and not final else '-'
+        print(f"   📈 {processed}/{len(pending)} | ✅ {stats['fetched']} ❌ {stats['errors']} | {rate:.1f} executions/s | ETA {eta}")
+        return elapsed, rate
+
+    def handle(execution_id, execution_data):
+        if execution_data.get('error'):
+            stats['errors'] += 1
+            failed[execution_id] = execution_data['error']
+            return
+        batch.append(build_storage_entry(execution_data, get_candidate_id_from_execution(execution_id)))
+        stats['fetched'] += 1
+
+    ids = iter(pending)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        in_flight = {}
+
+        def submit_next():
+            execution_id = next(ids, None)
+            if execution_id is not None:
+                in_flight[executor.submit(fetch_complete_execution_data, agent, execution_id, False)] = execution_id
+
+        for _ in range(max(1, workers) * 2):
+            submit_next()
+        try:
+            while in_flight:
+                finished, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    execution_id = in_flight.pop(future)
+                    handle(execution_id, future.result())
+                    submit_next()
+                if len(batch) + len(failed) >= batch_size:
+                    flush()
+                if time.monotonic() - last_report >= PROGRESS_INTERVAL:
+                    last_report = time.monotonic()
+                    report()
+        finally:
+            # Save what was fetched before an interrupt, so resume doesn't redo it
+            for future in in_flight:
+                future.cancel()
+            flush()
+
+    elapsed, rate = report(final=True)
+    stats['elapsed'] = round(elapsed, 2)
+    stats['rate'] = round(rate, 2)
+    return stats
+
 def main():
     import argparse
     
@@ -304,6 +390,29 @@ def main():
         type=int,
         help='Limit number of executions to fetch (for testing)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=BACKFILL_WORKERS,
+        help=f'Concurrent execution fetches (default: {BACKFILL_WORKERS})'
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=BACKFILL_BATCH_SIZE,
+        help=f'Entries per webhook log write and checkpoint (default: {BACKFILL_BATCH_SIZE})'
+    )
+    parser.add_argument(
+        '--checkpoint',
+        type=str,
+        default=BACKFILL_CHECKPOINT_PATH,
+        help='Checkpoint file used to resume an interrupted backfill'
+    )
+    parser.add_argument(
+        '--fresh',
+        action='store_true',
+        help='Ignore the checkpoint and fetch every execution again'
+    )
     
     args = parser.parse_args()
     
@@ -342,46 +451,40 @@ def main():
             
             print(f"\n{'='*70}")
             print(f"📥 Fetching Complete Data for {len(executions)} Executions")
+            print(f"   Workers: {args.workers} | Batch size: {args.batch_size}")
             print(f"{'='*70}\n")
             
-            fetched = 0
-            errors = 0
+            checkpoint = BackfillCheckpoint(args.checkpoint)
+            if args.fresh:
+                checkpoint.clear()
             
-            for i, exec_info in enumerate(executions, 1):
-                exec_id = exec_info['execution_id']
-                print(f"\n[{i}/{len(executions)}] {exec_id}")
-                print(f"   Status: {exec_info.get('status', 'unknown')}")
-                
-                # Fetch complete data
-                execution_data = fetch_complete_execution_data(agent, exec_id)
-                
-                # Find candidate_id
-                candidate_id = get_candidate_id_from_execution(exec_id)
-                
-                # Save to permanent storage
-                try:
-                    save_to_permanent_storage(execution_data, candidate_id)
-                    fetched += 1
-                    print(f"   💾 Saved to permanent storage")
-                except Exception as e:
-                    print(f"   ❌ Error saving: {e}")
-                    errors += 1
-                
-                # Rate limiting
-                if i < len(executions):
-                    time.sleep(0.3)
+            stats = backfill_executions(
+                agent,
+                [e['execution_id'] for e in executions],
+                workers=args.workers,
+                batch_size=args.batch_size,
+                checkpoint=checkpoint
+            )
             
             print(f"\n{'='*70}")
             print(f"✅ Fetch Complete!")
             print(f"{'='*70}")
             print(f"📊 Statistics:")
-            print(f"   Total executions found: {len(executions)}")
-            print(f"   ✅ Successfully fetched: {fetched}")
-            print(f"   ❌ Errors: {errors}")
+            print(f"   Total executions found: {stats['total']}")
+            print(f"   ⏩ Already saved (resumed): {stats['skipped']}")
+            print(f"   ✅ Successfully fetched: {stats['fetched']}")
+            print(f"   ❌ Errors: {stats['errors']}")
+            print(f"   ⏱️  {stats['elapsed']}s ({stats['rate']} executions/s)")
+            if stats['errors']:
+                print(f"\n🔁 Re-run to retry the failed executions (checkpoint: {args.checkpoint})")
+            else:
+                checkpoint.clear()
             print(f"\n💡 View stored data:")
             print(f"   python view_webhook_data.py")
             print(f"{'='*70}\n")
     
+    except KeyboardInterrupt:
+        print(f"\n⏸️  Interrupted - re-run the same command to resume")
     except Exception as e:
         print(f"❌ Error: {e}")
         import traceback
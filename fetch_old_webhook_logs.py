@@ -9,6 +9,9 @@ import json
 import os
 import requests
 from datetime import datetime
+from webhook_store import get_webhook_log
+from execution_mapping import get_execution_mappings
+from webhook_payload import WebhookPayload
 
 def check_webhook_logs_file():
     """Check for webhook_logs.json in root directory"""
@@ -138,52 +141,27 @@ def migrate_from_ngrok(ngrok_requests):
     
     print(f"\n📥 Migrating {len(ngrok_requests)} requests from ngrok...")
     
-    webhook_data_file = 'data/webhook_data.json'
-    os.makedirs('data', exist_ok=True)
-    
-    # Load existing storage
-    webhook_data = {}
-    if os.path.exists(webhook_data_file):
-        try:
-            with open(webhook_data_file, 'r', encoding='utf-8') as f:
-                webhook_data = json.load(f)
-        except:
-            pass
-    
-    if 'all_webhooks' not in webhook_data:
-        webhook_data['all_webhooks'] = []
-    
+    webhook_log = get_webhook_log(background=False)
+    new_entries = []
     migrated = 0
     
     for ngrok_req in ngrok_requests:
         try:
             payload = convert_ngrok_request_to_payload(ngrok_req)
+            webhook = WebhookPayload(payload)
             
             # Extract execution_id
-            execution_id = (
-                payload.get('execution_id') or 
-                payload.get('executionId') or 
-                payload.get('id') or
-                payload.get('data', {}).get('execution_id') or
-                f"ngrok_{ngrok_req.get('id', 'unknown')}"
-            )
+            execution_id = webhook.execution_id or f"ngrok_{ngrok_req.get('id', 'unknown')}"
             
             # Skip if already exists
-            if execution_id in webhook_data:
+            if execution_id in webhook_log:
                 continue
             
             # Find candidate_id
             candidate_id = None
-            mapping_file = 'execution_mapping.json'
-            if os.path.exists(mapping_file):
-                try:
-                    with open(mapping_file, 'r', encoding='utf-8') as f:
-                        mappings = json.load(f)
-                        mapping = mappings.get(execution_id)
-                        if mapping:
-                            candidate_id = mapping.get('candidate_id')
-                except:
-                    pass
+            mapping = get_execution_mappings().get(execution_id)
+            if mapping:
+                candidate_id = mapping.get('candidate_id')
             
             # Create entry
             timestamp = ngrok_req.get('started_at', datetime.now().isoformat())
@@ -193,22 +171,11 @@ def migrate_from_ngrok(ngrok_requests):
                 'timestamp': timestamp,
                 'received_at': timestamp.split('T')[0] + ' ' + timestamp.split('T')[1].split('.')[0] if 'T' in timestamp else timestamp,
                 'payload': payload,
-                'extracted_data': payload.get('extracted_data', {}),
-                'transcript': payload.get('transcript', ''),
-                'status': payload.get('status', 'unknown'),
-                'recipient_phone_number': payload.get('recipient_phone_number'),
-                'telephony_data': payload.get('telephony_data', {}),
+                **webhook.stored_fields(),
                 '_source': 'ngrok_logs'
             }
             
-            webhook_data[execution_id] = entry
-            webhook_data['all_webhooks'].insert(0, {
-                'execution_id': execution_id,
-                'candidate_id': candidate_id,
-                'timestamp': timestamp,
-                'status': entry['status']
-            })
-            
+            new_entries.append(entry)
             migrated += 1
             
         except Exception as e:
@@ -217,8 +184,7 @@ def migrate_from_ngrok(ngrok_requests):
     
     # Save
     if migrated > 0:
-        with open(webhook_data_file, 'w', encoding='utf-8') as f:
-            json.dump(webhook_data, f, indent=2, ensure_ascii=False)
+        webhook_log.append_many(new_entries)
         
         print(f"✅ Migrated {migrated} requests from ngrok to permanent storage")
 
@@ -260,14 +226,11 @@ def main():
         print(f"❌ No ngrok logs found")
     
     # Check permanent storage
-    if os.path.exists('data/webhook_data.json'):
-        try:
-            with open('data/webhook_data.json', 'r', encoding='utf-8') as f:
-                permanent_data = json.load(f)
-                count = len([k for k in permanent_data.keys() if k != 'all_webhooks'])
-                print(f"✅ Permanent storage: {count} entries")
-        except:
-            pass
+    try:
+        count = get_webhook_log(background=False).count()
+        print(f"✅ Permanent storage: {count} entries")
+    except:
+        pass
     
     print(f"\n💡 View stored data: python view_webhook_data.py")
     print(f"{'='*70}\n")
@@ -2,28 +2,23 @@
 Quick script to fix candidate status if webhook didn't update it
 """
 
-import json
 import sys
+from candidate_store import get_candidate_store
 
 def reset_candidate_status(candidate_id: int, new_status: str = 'pending'):
     """Reset a candidate's status"""
     try:
-        json_path = 'data/candidates.json'
+        old = {}
         
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        def set_status(candidate):
+            old['status'] = candidate.get('status', 'unknown')
+            candidate['status'] = new_status
         
-        candidate = next((c for c in data['candidates'] if c['id'] == candidate_id), None)
+        candidate = get_candidate_store().update_candidate(candidate_id, set_status)
         
         if candidate:
-            old_status = candidate.get('status', 'unknown')
-            candidate['status'] = new_status
-            
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
             print(f"✅ Candidate {candidate_id} ({candidate['name']})")
-            print(f"   Status updated: {old_status} → {new_status}")
+            print(f"   Status updated: {old['status']} → {new_status}")
             return True
         else:
             print(f"❌ Candidate {candidate_id} not found")
@@ -3,10 +3,10 @@ Fix Voice Processing Issues
 Updates agent configuration to improve voice recognition and processing
 """
 
-import requests
 import json
 import os
 from config import BOLNA_API_BASE, BOLNA_API_KEY, AGENT_ID
+from bolna_http import get_bolna_http
 
 def get_current_agent():
     """Get current agent configuration"""
@@ -17,7 +17,7 @@ def get_current_agent():
     }
     
     try:
-        response = requests.get(url, headers=headers)
+        response = get_bolna_http().get(url, operation='agent', headers=headers)
         response.raise_for_status()
         return response.json()
     except Exception as e:
@@ -92,7 +92,7 @@ def update_agent(agent_data):
     
     try:
         print(f"📤 Updating agent {AGENT_ID}...")
-        response = requests.put(url, headers=headers, json=payload)
+        response = get_bolna_http().put(url, operation='agent', headers=headers, json=payload)
         response.raise_for_status()
         return response.json()
     except Exception as e:
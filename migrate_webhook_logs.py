@@ -1,18 +1,20 @@
 """
 Migrate old temporary webhook logs from webhook_logs.json to permanent storage
-in data/webhook_data.json
+in the webhook event log (data/webhook_log/)
 """
 
 import json
 import os
 from datetime import datetime
+from webhook_store import get_webhook_log
+from execution_mapping import get_execution_mappings
+from webhook_payload import WebhookPayload
 
 def migrate_webhook_logs():
     """
     Migrate old webhook logs from temporary storage to permanent storage
     """
     old_log_file = 'webhook_logs.json'
-    new_data_file = 'data/webhook_data.json'
     
     # Check if old logs exist
     if not os.path.exists(old_log_file):
@@ -32,25 +34,11 @@ def migrate_webhook_logs():
         
         print(f"✅ Found {len(old_logs)} old log entries")
         
-        # Load existing permanent storage
-        webhook_data = {}
-        if os.path.exists(new_data_file):
-            try:
-                with open(new_data_file, 'r', encoding='utf-8') as f:
-                    webhook_data = json.load(f)
-                print(f"✅ Loaded existing permanent storage with {len([k for k in webhook_data.keys() if k != 'all_webhooks'])} entries")
-            except Exception as e:
-                print(f"⚠️  Could not load existing storage: {e}")
-                webhook_data = {}
-        else:
-            # Create data directory if needed
-            os.makedirs('data', exist_ok=True)
-            print(f"📁 Created data directory")
-        
-        # Initialize all_webhooks array if needed
-        if 'all_webhooks' not in webhook_data:
-            webhook_data['all_webhooks'] = []
+        # Open permanent storage
+        webhook_log = get_webhook_log(background=False)
+        print(f"✅ Loaded existing permanent storage with {webhook_log.count()} entries")
         
+        migrated_entries = []
         migrated_count = 0
         skipped_count = 0
         
@@ -61,13 +49,8 @@ def migrate_webhook_logs():
                 timestamp = log_entry.get('timestamp', datetime.now().isoformat())
                 
                 # Extract execution_id
-                execution_id = (
-                    payload.get('execution_id') or 
-                    payload.get('executionId') or 
-                    payload.get('id') or
-                    payload.get('data', {}).get('execution_id') or
-                    payload.get('data', {}).get('executionId')
-                )
+                webhook = WebhookPayload(payload)
+                execution_id = webhook.execution_id
                 
                 if not execution_id:
                     print(f"⚠️  Log entry #{i}: No execution_id found, skipping")
@@ -75,9 +58,10 @@ def migrate_webhook_logs():
                     continue
                 
                 # Check if already exists in permanent storage
-                if execution_id in webhook_data:
+                existing_entry = webhook_log.get(execution_id)
+                if existing_entry:
                     # Check if this is newer data
-                    existing_timestamp = webhook_data[execution_id].get('timestamp', '')
+                    existing_timestamp = existing_entry.get('timestamp', '')
                     if timestamp > existing_timestamp:
                         print(f"🔄 Log entry #{i}: Updating existing entry for {execution_id}")
                     else:
@@ -89,16 +73,9 @@ def migrate_webhook_logs():
                 
                 # Try to find candidate_id from execution_mapping
                 candidate_id = None
-                mapping_file = 'execution_mapping.json'
-                if os.path.exists(mapping_file):
-                    try:
-                        with open(mapping_file, 'r', encoding='utf-8') as f:
-                            mappings = json.load(f)
-                            mapping = mappings.get(execution_id)
-                            if mapping:
-                                candidate_id = mapping.get('candidate_id')
-                    except:
-                        pass
+                mapping = get_execution_mappings().get(execution_id)
+                if mapping:
+                    candidate_id = mapping.get('candidate_id')
                 
                 # Create entry similar to save_webhook_data format
                 entry = {
@@ -107,56 +84,10 @@ def migrate_webhook_logs():
                     'timestamp': timestamp,
                     'received_at': timestamp.split('T')[0] + ' ' + timestamp.split('T')[1].split('.')[0] if 'T' in timestamp else timestamp,
                     'payload': payload,  # Complete payload
-                    'extracted_data': (
-                        payload.get('extracted_data') or
-                        payload.get('data', {}).get('extracted_data') or
-                        payload.get('execution', {}).get('extracted_data') or
-                        {}
-                    ),
-                    'transcript': (
-                        payload.get('transcript') or
-                        payload.get('conversation_transcript') or
-                        payload.get('data', {}).get('transcript') or
-                        payload.get('execution', {}).get('transcript') or
-                        ''
-                    ),
-                    'status': (
-                        payload.get('status') or
-                        payload.get('data', {}).get('status') or
-                        payload.get('execution', {}).get('status') or
-                        'unknown'
-                    ),
-                    'recipient_phone_number': (
-                        payload.get('recipient_phone_number') or
-                        payload.get('phone_number') or
-                        payload.get('phone') or
-                        payload.get('data', {}).get('recipient_phone_number') or
-                        None
-                    ),
-                    'telephony_data': (
-                        payload.get('telephony_data') or
-                        payload.get('data', {}).get('telephony_data') or
-                        payload.get('execution', {}).get('telephony_data') or
-                        {}
-                    )
+                    **webhook.stored_fields()
                 }
                 
-                # Store in permanent storage
-                webhook_data[execution_id] = entry
-                
-                # Add to chronological list if not already there
-                existing_in_index = any(
-                    w.get('execution_id') == execution_id 
-                    for w in webhook_data['all_webhooks']
-                )
-                
-                if not existing_in_index:
-                    webhook_data['all_webhooks'].insert(0, {
-                        'execution_id': execution_id,
-                        'candidate_id': candidate_id,
-                        'timestamp': timestamp,
-                        'status': entry['status']
-                    })
+                migrated_entries.append(entry)
                 
                 migrated_count += 1
                 
@@ -165,19 +96,10 @@ def migrate_webhook_logs():
                 skipped_count += 1
                 continue
         
-        # Sort chronological list by timestamp (newest first)
-        webhook_data['all_webhooks'].sort(
-            key=lambda x: x.get('timestamp', ''),
-            reverse=True
-        )
-        
-        # Keep only last 1000 in chronological index
-        webhook_data['all_webhooks'] = webhook_data['all_webhooks'][:1000]
-        
-        # Save to permanent storage
-        print(f"\n💾 Saving migrated data to {new_data_file}...")
-        with open(new_data_file, 'w', encoding='utf-8') as f:
-            json.dump(webhook_data, f, indent=2, ensure_ascii=False)
+        # Save to permanent storage (oldest first, so the newest record wins)
+        print(f"\n💾 Saving migrated data to {webhook_log.log_dir}...")
+        migrated_entries.sort(key=lambda x: x.get('timestamp', ''))
+        webhook_log.append_many(migrated_entries)
         
         print(f"\n{'='*70}")
         print(f"✅ Migration Complete!")
@@ -186,7 +108,7 @@ def migrate_webhook_logs():
         print(f"   Total old logs: {len(old_logs)}")
         print(f"   ✅ Migrated: {migrated_count}")
         print(f"   ⏭️  Skipped: {skipped_count}")
-        print(f"   📁 Permanent storage now has: {len([k for k in webhook_data.keys() if k != 'all_webhooks'])} entries")
+        print(f"   📁 Permanent storage now has: {webhook_log.count()} entries")
         print(f"\n💡 You can now view the migrated data with:")
         print(f"   python view_webhook_data.py")
         print(f"{'='*70}\n")
@@ -0,0 +1,129 @@
+"""
+Token-bucket rate limiter for Bolna API requests
+One bucket per endpoint class (dial, read, list), shared by every thread in
+the process and, through a flock'd state file, by every process on the host
+(API server, CLI scripts, backfills), so bulk jobs run at the allowed rate
+instead of sleeping a fixed interval between requests
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, Optional
+from config import BOLNA_RATE_DIAL, BOLNA_RATE_READ, BOLNA_RATE_LIST, BOLNA_RATE_LIMIT_SHARED
+
+try:
+    import fcntl
+except ImportError:  # Windows: buckets are shared between threads only
+    fcntl = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RATE_LIMIT_STATE_PATH = os.path.join(BASE_DIR, 'data', 'bolna_rate_limit.json')
+
+# Requests per second per endpoint class (0 = unlimited); bursts up to one second's worth
+DEFAULT_RATES = {
+    'dial': BOLNA_RATE_DIAL,
+    'read': BOLNA_RATE_READ,
+    'list': BOLNA_RATE_LIST,
+}
+
+
+class TokenBucketLimiter:
+    """
+    Per-class token buckets
+
+    The bucket state lives in `state_path` ({class: [tokens, updated_at]})
+    and is updated under an exclusive flock, so all processes using the same
+    file draw from the same buckets. Without fcntl or a state path, the
+    buckets are kept in memory for this process.
+    """
+
+    def __init__(
+        self,
+        rates: Optional[Dict[str, float]] = None,
+        state_path: Optional[str] = RATE_LIMIT_STATE_PATH if BOLNA_RATE_LIMIT_SHARED else None
+    ):
+        """
+        Args:
+            rates: Requests per second per class (default: DEFAULT_RATES)
+            state_path: Shared bucket state file (None = this process only)
+        """
+        self.rates = dict(DEFAULT_RATES if rates is None else rates)
+        self.state_path = state_path if fcntl else None
+        if self.state_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._local_state: Dict[str, list] = {}
+        self.stats = {
+            name: {'acquired': 0, 'waited': 0, 'wait_seconds': 0.0}
+            for name in self.rates
+        }
+
+    @staticmethod
+    def _take(state: Dict[str, list], name: str, rate: float, now: float) -> float:
+        """Refill and take one token. Returns 0, or the seconds until a token is available."""
+        burst = max(1.0, rate)
+        tokens, updated = state.get(name) or (burst, now)
+        tokens = min(burst, tokens + max(now - updated, 0) * rate)
+        if tokens >= 1:
+            state[name] = [tokens - 1, now]
+            return 0.0
+        state[name] = [tokens, now]
+        return (1 - tokens) / rate
+
+    def _take_shared(self, name: str, rate: float) -> float:
+        if self.state_path:
+            try:
+                with open(self.state_path, 'a+', encoding='utf-8') as f:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                    f.seek(0)
+                    try:
+                        state = json.loads(f.read() or '{}')
+                    except ValueError:
+                        state = {}
+                    wait = self._take(state, name, rate, time.time())
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+                    f.flush()
+                    return wait
+            except OSError as e:
+                print(f"⚠️  Rate limit state file unavailable ({e}), limiting per process")
+                self.state_path = None
+        return self._take(self._local_state, name, rate, time.time())
+
+    def acquire(self, name: str) -> float:
+        """
+        Block until a request of class `name` may be sent
+
+        Returns:
+            Seconds spent waiting
+        """
+        rate = self.rates.get(name) or 0
+        if rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                wait = self._take_shared(name, rate)
+            if wait <= 0:
+                break
+            time.sleep(wait)
+            waited += wait
+
+        with self._lock:
+            stats = self.stats.setdefault(name, {'acquired': 0, 'waited': 0, 'wait_seconds': 0.0})
+            stats['acquired'] += 1
+            if waited:
+                stats['waited'] += 1
+                stats['wait_seconds'] = round(stats['wait_seconds'] + waited, 3)
+        return waited
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'rates': dict(self.rates),
+                'shared_across_processes': bool(self.state_path),
+                'classes': {name: dict(stats) for name, stats in self.stats.items()}
+            }
@@ -0,0 +1,283 @@
+"""
+Automatic call retries
+When a call ends unanswered (no_answer / busy) the candidate is re-dialed with
+exponential backoff, up to a maximum number of calls, inside a time-of-day
+dialing window. Retries are placed with BolnaAgent.make_call's `scheduled_at`,
+so Bolna's scheduler holds them rather than this process. Every call and its
+outcome is kept in data/call_attempts.db, indexed per candidate.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, time as dtime
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from zoneinfo import ZoneInfo
+from config import (
+    CALL_RETRY_ENABLED,
+    CALL_RETRY_MAX_ATTEMPTS,
+    CALL_RETRY_BASE_DELAY,
+    CALL_RETRY_MAX_DELAY,
+    CALL_RETRY_WINDOW,
+    CALL_RETRY_TIMEZONE,
+    CALL_RETRY_OUTCOMES
+)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CALL_ATTEMPTS_DB_PATH = os.path.join(BASE_DIR, 'data', 'call_attempts.db')
+
+
+def parse_window(window: str) -> Tuple[dtime, dtime]:
+    """
+    Parse a dialing window like "09:00-19:00" (an end before the start wraps past midnight)
+
+    Returns:
+        Tuple of (start, end) times
+    """
+    start, end = (dtime.fromisoformat(part.strip()) for part in window.split('-'))
+    return start, end
+
+
+def next_in_window(when: datetime, start: dtime, end: dtime) -> datetime:
+    """
+    Earliest moment at or after `when` inside the daily dialing window
+
+    Args:
+        when: Timezone-aware datetime, already in the window's timezone
+        start: Window start (inclusive)
+        end: Window end (exclusive)
+    """
+    now = when.time()
+    if start == end:
+        return when
+    if start < end:
+        inside = start <= now < end
+    else:
+        inside = now >= start or now < end
+    if inside:
+        return when
+    opens = when.replace(hour=start.hour, minute=start.minute, second=0, microsecond=0)
+    return opens if opens > when else opens + timedelta(days=1)
+
+
+class RetryScheduler:
+    """
+    Call attempt history plus the retry policy
+
+    A candidate's attempt count is the number of consecutive retryable outcomes
+    in their latest calls; the n-th unanswered call is retried after
+    base_delay * 2^(n-1) seconds (capped at max_delay, then moved into the
+    dialing window) until `max_attempts` calls have gone unanswered. Any other
+    outcome ends the series.
+    """
+
+    def __init__(
+        self,
+        dial: Callable[[int, str], Optional[str]],
+        db_path: str = CALL_ATTEMPTS_DB_PATH,
+        max_attempts: int = CALL_RETRY_MAX_ATTEMPTS,
+        base_delay: float = CALL_RETRY_BASE_DELAY,
+        max_delay: float = CALL_RETRY_MAX_DELAY,
+        window: str = CALL_RETRY_WINDOW,
+        timezone: str = CALL_RETRY_TIMEZONE,
+        outcomes: Tuple[str, ...] = CALL_RETRY_OUTCOMES,
+        enabled: bool = CALL_RETRY_ENABLED,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            dial: dial(candidate_id, scheduled_at ISO string) -> execution ID, or None to skip
+            db_path: SQLite file holding the attempt history
+            max_attempts: Calls per candidate (including the first) before giving up
+            base_delay: Seconds before the first retry, doubled for each further one
+            max_delay: Cap on the backoff delay in seconds
+            window: Daily dialing window, e.g. "09:00-19:00"
+            timezone: IANA timezone of the dialing window (the candidates' local time)
+            outcomes: Call statuses that are retried
+            enabled: False records history only and never schedules retries
+            clock: Returns the current time in seconds since the epoch (injectable for tests)
+        """
+        self.dial = dial
+        self.db_path = os.path.abspath(db_path)
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.window = parse_window(window)
+        self.tz = ZoneInfo(timezone)
+        self.outcomes = {outcome.lower() for outcome in outcomes}
+        self.enabled = enabled
+        self.clock = clock
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self.stats = {'recorded': 0, 'scheduled': 0, 'exhausted': 0, 'duplicates': 0, 'dial_failed': 0}
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._create_schema()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self):
+        self._conn().executescript("""
+            CREATE TABLE IF NOT EXISTS call_attempts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                candidate_id INTEGER NOT NULL,
+                execution_id TEXT,
+                kind TEXT NOT NULL,
+                scheduled_for REAL,
+                created_at REAL NOT NULL,
+                outcome TEXT,
+                finished_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_call_attempts_candidate ON call_attempts(candidate_id, id);
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_call_attempts_execution ON call_attempts(execution_id);
+        """)
+
+    def _write(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run func(conn) in a BEGIN IMMEDIATE transaction"""
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                result = func(conn)
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        return result
+
+    def is_retryable(self, outcome: Optional[str]) -> bool:
+        return str(outcome or '').lower() in self.outcomes
+
+    def record_call(self, candidate_id: int, execution_id: str, kind: str = 'call', scheduled_for: Optional[float] = None):
+        """Record a dialed call ('call' = placed now, 'retry' = scheduled with Bolna)"""
+        self._write(lambda conn: conn.execute(
+            'INSERT OR IGNORE INTO call_attempts (candidate_id, execution_id, kind, scheduled_for, created_at) VALUES (?, ?, ?, ?, ?)',
+            (candidate_id, execution_id, kind, scheduled_for, self.clock())
+        ))
+
+    def unanswered_streak(self, candidate_id: int) -> int:
+        """Consecutive retryable outcomes in the candidate's latest finished calls"""
+        streak = 0
+        rows = self._conn().execute(
+            'SELECT outcome FROM call_attempts WHERE candidate_id = ? AND outcome IS NOT NULL ORDER BY id DESC LIMIT ?',
+            (candidate_id, self.max_attempts)
+        )
+        for row in rows:
+            if not self.is_retryable(row['outcome']):
+                break
+            streak += 1
+        return streak
+
+    def retry_time(self, streak: int, now: float) -> Optional[datetime]:
+        """When to place the next call after `streak` unanswered calls (None = give up)"""
+        if streak >= self.max_attempts:
+            return None
+        delay = min(self.base_delay * (2 ** (streak - 1)), self.max_delay)
+        when = datetime.fromtimestamp(now + delay, self.tz)
+        return next_in_window(when, *self.window)
+
+    def on_call_outcome(self, candidate_id: int, execution_id: str, outcome: str) -> Dict[str, Any]:
+        """
+        Record a call's terminal outcome and schedule a retry if it went unanswered
+
+        Returns:
+            {"action": "scheduled" | "exhausted" | "not_retryable" | "pending" | "duplicate"
+                       | "disabled" | "skipped" | "dial_failed", "attempts": n, ...};
+            "scheduled" adds "scheduledAt" and "executionId"
+        """
+        now = self.clock()
+        outcome = str(outcome or '').lower()
+
+        def finish(conn):
+            row = conn.execute('SELECT id, outcome FROM call_attempts WHERE execution_id = ?', (execution_id,)).fetchone()
+            if row is None:
+                # Dialed before the history existed, or outside start_candidate_call
+                conn.execute(
+                    "INSERT INTO call_attempts (candidate_id, execution_id, kind, created_at, outcome, finished_at) VALUES (?, ?, 'call', ?, ?, ?)",
+                    (candidate_id, execution_id, now, outcome, now)
+                )
+                return True
+            if row['outcome'] is not None:
+                return False
+            conn.execute('UPDATE call_attempts SET outcome = ?, finished_at = ? WHERE id = ?', (outcome, now, row['id']))
+            return True
+
+        if not self._write(finish):
+            self.stats['duplicates'] += 1
+            return {'action': 'duplicate'}
+        self.stats['recorded'] += 1
+
+        streak = self.unanswered_streak(candidate_id)
+        if not self.is_retryable(outcome):
+            return {'action': 'not_retryable', 'attempts': streak}
+        if not self.enabled:
+            return {'action': 'disabled', 'attempts': streak}
+
+        # A retry already waiting at Bolna covers this candidate (e.g. a manual call went unanswered meanwhile)
+        pending = self._conn().execute(
+            "SELECT scheduled_for FROM call_attempts WHERE candidate_id = ? AND kind = 'retry' AND outcome IS NULL AND scheduled_for > ?",
+            (candidate_id, now - self.max_delay)
+        ).fetchone()
+        if pending is not None:
+            return {'action': 'pending', 'attempts': streak, 'scheduledAt': datetime.fromtimestamp(pending['scheduled_for'], self.tz).isoformat()}
+
+        when = self.retry_time(streak, now)
+        if when is None:
+            self.stats['exhausted'] += 1
+            print(f"🛑 Candidate {candidate_id}: {streak} unanswered calls, no more retries")
+            return {'action': 'exhausted', 'attempts': streak}
+
+        scheduled_at = when.isoformat(timespec='seconds')
+        try:
+            retry_execution_id = self.dial(candidate_id, scheduled_at)
+        except Exception as e:
+            self.stats['dial_failed'] += 1
+            print(f"❌ Could not schedule retry for candidate {candidate_id}: {e}")
+            return {'action': 'dial_failed', 'attempts': streak, 'error': str(e)}
+        if not retry_execution_id:
+            return {'action': 'skipped', 'attempts': streak}
+
+        self.record_call(candidate_id, retry_execution_id, kind='retry', scheduled_for=when.timestamp())
+        self.stats['scheduled'] += 1
+        print(f"🔁 Candidate {candidate_id}: retry {streak + 1}/{self.max_attempts} scheduled for {scheduled_at}")
+        return {
+            'action': 'scheduled',
+            'attempts': streak,
+            'attempt': streak + 1,
+            'maxAttempts': self.max_attempts,
+            'scheduledAt': scheduled_at,
+            'executionId': retry_execution_id
+        }
+
+    def get_history(self, candidate_id: int) -> List[Dict[str, Any]]:
+        """A candidate's calls, oldest first"""
+        def iso(value):
+            return datetime.fromtimestamp(value, self.tz).isoformat(timespec='seconds') if value is not None else None
+
+        return [
+            {
+                'executionId': row['execution_id'],
+                'kind': row['kind'],
+                'scheduledFor': iso(row['scheduled_for']),
+                'createdAt': iso(row['created_at']),
+                'outcome': row['outcome'],
+                'finishedAt': iso(row['finished_at'])
+            }
+            for row in self._conn().execute('SELECT * FROM call_attempts WHERE candidate_id = ? ORDER BY id', (candidate_id,))
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(
+            self.stats,
+            enabled=self.enabled,
+            max_attempts=self.max_attempts,
+            window=f"{self.window[0]:%H:%M}-{self.window[1]:%H:%M} {self.tz.key}"
+        )
@@ -0,0 +1,88 @@
+"""
+Single-flight request coalescing
+Concurrent callers asking for the same key share one in-flight call: the
+first caller runs it, the others wait for its result (or its exception)
+"""
+
+import copy
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls (keyed by any hashable)
+
+    Nothing is cached: once the leader's call finishes, the next caller with
+    the same key starts a new one. Waiters get a deep copy of the leader's
+    result so nobody can mutate another caller's data.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'calls': 0,
+            'executed': 0,
+            'shared': 0,  # calls answered by another caller's in-flight request
+            'errors': 0
+        }
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        Run func() unless a call with the same key is already in flight
+
+        Returns:
+            func()'s result (re-raises its exception for every caller)
+        """
+        with self._lock:
+            self.stats['calls'] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.stats['shared'] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.stats['executed'] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # A lone waiter can keep the snapshot; several each get their own copy
+            return call.result if call.waiters == 1 else copy.deepcopy(call.result)
+
+        try:
+            result = func()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.stats['errors'] += 1
+                del self._calls[key]
+            call.done.set()
+            raise
+
+        with self._lock:
+            del self._calls[key]
+            waiters = call.waiters
+        # Snapshot for the waiters before the leader's caller can touch the result
+        if waiters:
+            call.result = copy.deepcopy(result)
+        call.done.set()
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, in_flight=len(self._calls))
@@ -0,0 +1,238 @@
+"""
+Test AsyncBolnaAgent against a local mock Bolna server
+No API key or network access needed: the mock serves /call, /execution,
+/execution/{id} and /execution/{id}/logs on 127.0.0.1
+
+Run: python test_async_bolna_agent.py   (or: python -m pytest test_async_bolna_agent.py)
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from async_bolna_agent import AsyncBolnaAgent, AsyncRateLimiter
+from bolna_agent import BolnaAgent
+from bolna_http import get_bolna_http
+from rate_limiter import TokenBucketLimiter
+
+TOTAL_EXECUTIONS = 230
+RESPONSE_DELAY = 0.05  # seconds per mock request
+
+
+class MockBolnaServer:
+    """Minimal Bolna API: records request counts and peak concurrency"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = []
+        self.executions = [
+            {'id': f'exec-{i:04d}', 'status': 'completed', 'transcript': f'user: call {i}'}
+            for i in range(TOTAL_EXECUTIONS)
+        ]
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, code, body):
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _handle(self, method):
+                with server.lock:
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                    server.requests.append((method, self.path))
+                try:
+                    time.sleep(RESPONSE_DELAY)
+                    code, body = server.route(method, self.path, self)
+                    self._send(code, body)
+                finally:
+                    with server.lock:
+                        server.in_flight -= 1
+
+            def do_GET(self):
+                self._handle('GET')
+
+            def do_POST(self):
+                self._handle('POST')
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f'http://127.0.0.1:{self.httpd.server_port}'
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def route(self, method, path, handler):
+        path, _, query = path.partition('?')
+        params = dict(part.split('=', 1) for part in query.split('&') if '=' in part)
+        if method == 'POST' and path == '/call':
+            length = int(handler.headers.get('Content-Length', 0))
+            payload = json.loads(handler.rfile.read(length) or b'{}')
+            return 200, {'execution_id': f"call-{payload.get('recipient_phone_number')}", 'status': 'queued'}
+        if method == 'GET' and path == '/execution':
+            page = int(params.get('page_number', 1))
+            size = int(params.get('page_size', 10))
+            data = self.executions[(page - 1) * size:page * size]
+            return 200, {
+                'data': data, 'page_number': page, 'page_size': size,
+                'total': len(self.executions), 'has_more': page * size < len(self.executions)
+            }
+        match = re.fullmatch(r'/execution/([^/]+)(/logs)?', path)
+        if method == 'GET' and match:
+            execution = next((e for e in self.executions if e['id'] == match.group(1)), None)
+            if execution is None:
+                return 404, {'message': 'not found'}
+            if match.group(2):
+                return 200, {'data': [{'component': 'llm', 'execution_id': execution['id']}]}
+            return 200, execution
+        return 404, {'message': 'not found'}
+
+    def reset_counters(self):
+        with self.lock:
+            self.requests = []
+            self.max_in_flight = 0
+
+    def shutdown(self):
+        self.httpd.shutdown()
+
+
+_server = None
+
+
+def mock_server() -> MockBolnaServer:
+    global _server
+    if _server is None:
+        _server = MockBolnaServer()
+        # The mock has no rate limits; keep the host-wide Bolna buckets out of it
+        get_bolna_http().limiter = TokenBucketLimiter(rates={}, state_path=None)
+    _server.reset_counters()
+    return _server
+
+
+def make_agent(server: MockBolnaServer, **kwargs) -> AsyncBolnaAgent:
+    sync_agent = BolnaAgent(api_key='test-key')
+    sync_agent.base_url = server.base_url
+    sync_agent.agent_id = 'agent-test'
+    return AsyncBolnaAgent(agent=sync_agent, **kwargs)
+
+
+def test_get_many_execution_details_runs_concurrently():
+    server = mock_server()
+    ids = [e['id'] for e in server.executions[:40]]
+
+    async def run():
+        async with make_agent(server, concurrency=8, rate_limit=0) as agent:
+            return await agent.get_many_execution_details(ids + ['missing'])
+
+    start = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+
+    assert all(results[i]['id'] == i for i in ids)
+    assert isinstance(results['missing'], Exception)
+    assert 1 < server.max_in_flight <= 8
+    # 41 requests of 50ms each: serial would take > 2s
+    assert elapsed < 41 * RESPONSE_DELAY / 2
+
+
+def test_list_all_executions_merges_pages_in_order():
+    server = mock_server()
+
+    async def run():
+        async with make_agent(server, concurrency=4, rate_limit=0) as agent:
+            return await agent.list_all_executions(page_size=50)
+
+    executions = asyncio.run(run())
+    assert [e['id'] for e in executions] == [e['id'] for e in server.executions]
+    pages = [path for method, path in server.requests if path.startswith('/execution?')]
+    assert len(pages) == 5
+    assert server.max_in_flight > 1
+
+
+def test_list_all_executions_respects_max_pages():
+    server = mock_server()
+
+    async def run():
+        async with make_agent(server, rate_limit=0) as agent:
+            return await agent.list_all_executions(page_size=50, max_pages=2)
+
+    assert len(asyncio.run(run())) == 100
+
+
+def test_make_call_and_logs():
+    server = mock_server()
+
+    async def run():
+        async with make_agent(server, rate_limit=0) as agent:
+            calls = await asyncio.gather(*(
+                agent.make_call(f'+9100000000{i}', None, f'Candidate {i}', 'Monday', '10:00 A.M.')
+                for i in range(5)
+            ))
+            logs = await agent.get_execution_logs('exec-0001')
+            return calls, logs
+
+    calls, logs = asyncio.run(run())
+    assert sorted(c['execution_id'] for c in calls) == [f'call-+9100000000{i}' for i in range(5)]
+    assert logs['data'][0]['execution_id'] == 'exec-0001'
+    assert sum(1 for method, _ in server.requests if method == 'POST') == 5
+
+
+def test_rate_limit_is_shared_across_tasks():
+    server = mock_server()
+    limiter = AsyncRateLimiter(rate=20, burst=1)
+    ids = [e['id'] for e in server.executions[:11]]
+
+    async def run():
+        first = make_agent(server, concurrency=10, limiter=limiter)
+        second = make_agent(server, concurrency=10, limiter=limiter)
+        async with first, second:
+            await asyncio.gather(
+                first.get_many_execution_details(ids[:6]),
+                second.get_many_execution_details(ids[6:])
+            )
+
+    start = time.perf_counter()
+    asyncio.run(run())
+    # 11 requests at 20/s with a burst of 1: at least 10 intervals of 50ms
+    assert time.perf_counter() - start >= 0.45
+
+
+def main():
+    tests = [
+        test_get_many_execution_details_runs_concurrently,
+        test_list_all_executions_merges_pages_in_order,
+        test_list_all_executions_respects_max_pages,
+        test_make_call_and_logs,
+        test_rate_limit_is_shared_across_tasks,
+    ]
+    print("\n" + "="*70)
+    print("🧪 Testing AsyncBolnaAgent against a mock Bolna server")
+    print("="*70 + "\n")
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e!r}")
+
+    print("\n" + "="*70)
+    print(f"{'✅ All tests passed' if not failures else f'❌ {failures} test(s) failed'}")
+    print("="*70)
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,9 @@
 Test Bolna AI API connection and endpoints
 """
 
-import requests
 import os
 from config import BOLNA_API_BASE, BOLNA_API_KEY
+from bolna_http import get_bolna_http
 
 def test_api_connection():
     """Test basic API connection"""
@@ -31,7 +31,7 @@ def test_api_connection():
     print("-" * 70)
     try:
         url = f"{BOLNA_API_BASE}/agent"
-        response = requests.get(url, headers=headers, timeout=10)
+        response = get_bolna_http().get(url, operation='agent', headers=headers)
         print(f"   Status: {response.status_code}")
         if response.status_code == 200:
             agents = response.json()
@@ -54,7 +54,7 @@ def test_api_connection():
     try:
         url = f"{BOLNA_API_BASE}/execution"
         params = {"page_number": 1, "page_size": 5}
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = get_bolna_http().get(url, operation='list', headers=headers, params=params)
         print(f"   Status: {response.status_code}")
         if response.status_code == 200:
             data = response.json()
@@ -84,7 +84,7 @@ def test_api_connection():
     try:
         url = f"{BOLNA_API_BASE}/execution"
         params = {"page_number": 1, "page_size": 1}
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = get_bolna_http().get(url, operation='list', headers=headers, params=params)
         if response.status_code == 200:
             data = response.json()
             if isinstance(data, dict) and 'data' in data and data['data']:
@@ -98,7 +98,7 @@ def test_api_connection():
                 print(f"   Using execution ID: {test_exec_id}")
                 # Try to fetch it
                 detail_url = f"{BOLNA_API_BASE}/execution/{test_exec_id}"
-                detail_response = requests.get(detail_url, headers=headers, timeout=10)
+                detail_response = get_bolna_http().get(detail_url, operation='execution', headers=headers)
                 print(f"   Status: {detail_response.status_code}")
                 if detail_response.status_code == 200:
                     print(f"   ✅ Successfully fetched execution details")
@@ -125,7 +125,7 @@ def test_api_connection():
             print(f"   Trying to fetch this execution...")
             try:
                 detail_url = f"{BOLNA_API_BASE}/execution/{local_exec_id}"
-                detail_response = requests.get(detail_url, headers=headers, timeout=10)
+                detail_response = get_bolna_http().get(detail_url, operation='execution', headers=headers)
                 print(f"   Status: {detail_response.status_code}")
                 if detail_response.status_code == 200:
                     print(f"   ✅ Execution found in API")
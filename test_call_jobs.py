@@ -0,0 +1,203 @@
+"""
+Test the durable call job queue
+Leases and retries run on a simulated clock; a second CallJobQueue on the
+same database stands in for the process that takes over after a restart.
+The worker test dials the local mock Bolna server.
+
+Run: python test_call_jobs.py   (or: python -m pytest test_call_jobs.py)
+"""
+
+import os
+import socket
+import tempfile
+import threading
+import time
+import bolna_http
+from bolna_agent import BolnaAgent
+from bolna_http import BolnaHTTPClient
+from call_jobs import CallJobQueue, CallJobWorkers, PermanentJobError
+from circuit_breaker import CircuitOpenError
+from test_async_bolna_agent import mock_server
+from test_campaigns import FakeClock
+
+
+def make_queue(**kwargs):
+    kwargs.setdefault('clock', FakeClock())
+    return CallJobQueue(os.path.join(tempfile.mkdtemp(), 'call_jobs.db'), **kwargs)
+
+
+def test_lease_order_and_ack():
+    queue = make_queue()
+    ids = queue.enqueue_many([{'candidateId': i} for i in range(3)])
+    first = queue.lease(2)
+    assert [job['id'] for job in first] == ids[:2]
+    assert [job['payload']['candidateId'] for job in queue.lease(5)] == [2]
+    assert queue.lease(1) == []
+
+    assert queue.ack(first[0]['id'], first[0]['lease_id'], {'executionId': 'exec-1'})
+    assert queue.get_job(ids[0])['result'] == {'executionId': 'exec-1'}
+    assert queue.counts() == {'done': 1, 'leased': 2}
+
+
+def test_expired_lease_is_redelivered_after_restart():
+    clock = FakeClock()
+    queue = make_queue(visibility_timeout=60, clock=clock)
+    job_id = queue.enqueue({'candidateId': 1})
+    crashed = queue.lease(1)[0]
+
+    # The process dies mid-dial; its replacement opens the same database
+    restarted = CallJobQueue(queue.db_path, visibility_timeout=60, clock=clock)
+    assert restarted.lease(1) == []  # still hidden
+    clock.advance(61)
+    job = restarted.lease(1)[0]
+    assert job['id'] == job_id and job['attempts'] == 2
+
+    # The old lease holder can no longer finish the job
+    assert not queue.ack(job_id, crashed['lease_id'])
+    assert restarted.ack(job_id, job['lease_id'])
+
+
+def test_failures_retry_then_dead_letter():
+    clock = FakeClock()
+    queue = make_queue(max_attempts=2, clock=clock)
+    job_id, permanent_id = queue.enqueue_many([{'candidateId': 1}, {'candidateId': 2}])
+    job, permanent = queue.lease(2)
+
+    assert queue.fail(job_id, job['lease_id'], 'timeout', retry_delay=10) == 'queued'
+    assert queue.fail(permanent_id, permanent['lease_id'], 'wallet balance low', permanent=True) == 'dead'
+    assert queue.lease(1) == []
+    clock.advance(10)
+    job = queue.lease(1)[0]
+    assert queue.fail(job_id, job['lease_id'], 'timeout') == 'dead'  # second attempt
+    assert queue.counts() == {'dead': 2}
+    clock.advance(8 * 24 * 3600)
+    assert queue.purge() == 2
+
+
+def test_heartbeat_keeps_slow_dial_leased():
+    queue = make_queue(visibility_timeout=0.3, clock=time.time)
+    job_id = queue.enqueue({'phone': '+919000000001'})
+    other_worker = CallJobQueue(queue.db_path, visibility_timeout=0.3)
+    stolen = []
+
+    def slow_dial(payload):
+        # Slower than the visibility timeout, like a dial waiting on the registry and HTTP retries
+        for _ in range(5):
+            time.sleep(0.2)
+            stolen.extend(other_worker.lease(1))
+        return {'executionId': 'exec-1'}
+
+    workers = CallJobWorkers(queue, slow_dial)
+    workers.run_job(queue.lease(1)[0])
+    assert stolen == []
+    assert workers.stats['lost_leases'] == 0 and queue.get_job(job_id)['state'] == 'done'
+
+
+def test_unsent_dial_retries_ambiguous_dial_does_not():
+    server = mock_server()
+    agent = BolnaAgent(api_key='test-key')
+    agent.http = BolnaHTTPClient(retries=0)  # own circuit breakers
+    agent.agent_id = 'agent-test'
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        closed_url = f'http://127.0.0.1:{sock.getsockname()[1]}'
+
+    def handler(payload):
+        # Same error mapping as api_server.run_call_job
+        agent.base_url = payload['base_url']
+        try:
+            agent.make_call('+919000000001', None, 'Candidate', 'Monday', '10:00 A.M.')
+        except ValueError as e:
+            raise PermanentJobError(str(e))
+        return {}
+
+    queue = make_queue()
+    refused, timed_out = queue.enqueue_many([{'base_url': closed_url}, {'base_url': server.base_url}])
+    workers = CallJobWorkers(queue, handler)
+    timeouts = bolna_http.TIMEOUTS['call']
+    bolna_http.TIMEOUTS['call'] = (1, 0.001)
+    try:
+        for job in queue.lease(2):
+            workers.run_job(job)
+    finally:
+        bolna_http.TIMEOUTS['call'] = timeouts
+
+    # Connection refused: Bolna never saw the request, so the job is retried
+    assert queue.get_job(refused)['state'] == 'queued'
+    # Read timeout: Bolna may have placed the call, so it must not be dialed again
+    assert queue.get_job(timed_out)['state'] == 'dead'
+
+
+def test_workers_dial_each_job_once():
+    server = mock_server()
+    agent = BolnaAgent(api_key='test-key')
+    agent.base_url = server.base_url
+    agent.agent_id = 'agent-test'
+    outage = {'retry_after': 5}
+
+    def handler(payload):
+        if payload['phone'] == 'outage' and outage:
+            raise CircuitOpenError('dial', outage.pop('retry_after'))
+        if payload['phone'] == 'rejected':
+            raise PermanentJobError('Bolna API Error: invalid number')
+        result = agent.make_call(payload['phone'], None, 'Candidate', 'Monday', '10:00 A.M.')
+        return {'executionId': result['execution_id']}
+
+    clock = FakeClock()
+    queue = make_queue(clock=clock)
+    phones = [f'+9190000{i:05d}' for i in range(40)]
+    queue.enqueue_many([{'phone': phone} for phone in phones + ['outage', 'rejected']])
+
+    # Several workers (each with its own connection, like separate processes) drain the queue
+    def drain():
+        worker = CallJobWorkers(CallJobQueue(queue.db_path, clock=clock), handler)
+        while True:
+            jobs = worker.queue.lease(1)
+            if not jobs:
+                return
+            worker.run_job(jobs[0])
+
+    threads = [threading.Thread(target=drain) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    dialed = [path for method, path in server.requests if method == 'POST']
+    assert len(dialed) == len(phones)
+    assert queue.counts() == {'done': 40, 'queued': 1, 'dead': 1}
+    clock.advance(5)  # the circuit's retry_after
+    drain()
+    assert queue.counts() == {'done': 41, 'dead': 1}
+
+
+def main():
+    tests = [
+        test_lease_order_and_ack,
+        test_expired_lease_is_redelivered_after_restart,
+        test_failures_retry_then_dead_letter,
+        test_heartbeat_keeps_slow_dial_leased,
+        test_unsent_dial_retries_ambiguous_dial_does_not,
+        test_workers_dial_each_job_once,
+    ]
+    print("\n" + "="*70)
+    print("🧪 Testing durable call job queue")
+    print("="*70 + "\n")
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e!r}")
+
+    print("\n" + "="*70)
+    print(f"{'✅ All tests passed' if not failures else f'❌ {failures} test(s) failed'}")
+    print("="*70)
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Test the reconciler for candidates stuck in "calling" against a local mock Bolna server
+Candidates live in a temporary SQLite store; the reconciler's clock is moved
+forward so they count as stale without waiting
+
+Run: python test_call_reconciler.py   (or: python -m pytest test_call_reconciler.py)
+"""
+
+import os
+import tempfile
+import time
+from bolna_agent import BolnaAgent
+from call_reconciler import CallReconciler
+from candidate_store import SQLiteCandidateStore
+from execution_mapping import ExecutionMappingIndex
+from test_async_bolna_agent import mock_server, RESPONSE_DELAY
+
+STALE_AFTER = 600
+
+
+def make_reconciler(statuses, executions, concurrency=4):
+    """
+    Reconciler over a fresh store with one candidate per status; `executions`
+    maps candidate ID -> execution ID. apply_status marks the candidate
+    confirmed (pending for a failed call) unless the mock transcript is for
+    call 3 (left in progress).
+    """
+    server = mock_server()
+    agent = BolnaAgent(api_key='test-key')
+    agent.base_url = server.base_url
+    agent.agent_id = 'agent-test'
+
+    directory = tempfile.mkdtemp()
+    store = SQLiteCandidateStore(os.path.join(directory, 'candidates.db'), import_path=None)
+    for status in statuses:
+        store.add_candidate({'name': 'Candidate', 'phone': '+919000000000', 'status': status})
+    mappings = ExecutionMappingIndex(os.path.join(directory, 'mapping.json'), os.path.join(directory, 'mapping.log.jsonl'))
+    for candidate_id, execution_id in executions.items():
+        mappings.set(execution_id, candidate_id, '+919000000000')
+
+    applied = []
+
+    def apply_status(execution_id, candidate_id, details, transcript):
+        applied.append((execution_id, candidate_id, transcript))
+        if transcript == 'user: call 3':
+            return {'success': True, 'status': 'in_progress', 'updated': False}
+        status = 'pending' if details['status'] == 'failed' else 'confirmed'
+        store.update_candidate(candidate_id, lambda candidate: candidate.update(status=status))
+        return {'success': True, 'status': status, 'updated': True}
+
+    reconciler = CallReconciler(
+        agent, store, mappings, apply_status,
+        stale_after=STALE_AFTER, concurrency=concurrency, clock=lambda: time.time() + STALE_AFTER + 1
+    )
+    return reconciler, store, applied, server
+
+
+def test_only_stale_calling_candidates_are_checked():
+    reconciler, store, applied, _ = make_reconciler(
+        ['calling', 'pending', 'calling', 'confirmed'],
+        {1: 'exec-0001', 2: 'exec-0002', 3: 'exec-0003', 4: 'exec-0004'}
+    )
+    result = reconciler.reconcile_once()
+    assert result['stuck'] == 2
+    assert sorted(candidate_id for _, candidate_id, _ in applied) == [1, 3]
+    assert result['updated'] == 1 and result['in_progress'] == 1  # call 3 still running
+    assert store.get_candidate(1)['status'] == 'confirmed'
+    assert store.get_candidate(3)['status'] == 'calling'
+
+    # Not stale yet with the real clock
+    reconciler.clock = time.time
+    assert reconciler.reconcile_once()['stuck'] == 0
+
+
+def test_latest_execution_missing_and_unmapped():
+    reconciler, store, applied, _ = make_reconciler(
+        ['calling', 'calling', 'calling'],
+        {1: 'exec-0010', 2: 'missing-execution'}
+    )
+    reconciler.mappings.set('exec-0011', 1, '+919000000000')  # a later call replaces the first
+    result = reconciler.reconcile_once()
+    assert sorted(applied) == [('exec-0011', 1, 'user: call 11'), ('missing-execution', 2, '')]
+    assert result['not_found'] == 1 and result['no_execution'] == 1 and result['errors'] == 0
+
+    # Unresolvable candidates are put back to pending instead of filling every later batch
+    assert [store.get_candidate(i)['status'] for i in (1, 2, 3)] == ['confirmed', 'pending', 'pending']
+    assert reconciler.reconcile_once()['stuck'] == 0
+
+
+def test_lookups_are_concurrent_but_bounded():
+    count = 24
+    reconciler, store, applied, server = make_reconciler(
+        ['calling'] * count,
+        {i: f'exec-{i + 20:04d}' for i in range(1, count + 1)},
+        concurrency=4
+    )
+    start = time.perf_counter()
+    result = reconciler.reconcile_once()
+    elapsed = time.perf_counter() - start
+    assert result['updated'] == count
+    assert 1 < server.max_in_flight <= 4
+    assert elapsed < count * RESPONSE_DELAY  # the least serial lookups could take
+    assert not store.list_by_status('calling')
+
+
+def main():
+    tests = [
+        test_only_stale_calling_candidates_are_checked,
+        test_latest_execution_missing_and_unmapped,
+        test_lookups_are_concurrent_but_bounded,
+    ]
+    print("\n" + "="*70)
+    print("🧪 Testing call reconciler against a mock Bolna server")
+    print("="*70 + "\n")
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e!r}")
+
+    print("\n" + "="*70)
+    print(f"{'✅ All tests passed' if not failures else f'❌ {failures} test(s) failed'}")
+    print("="*70)
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Test the in-flight call registry
+Separate processes stand in for Flask workers racing to dial the same
+candidate; TTLs are checked on a simulated clock
+
+Run: python test_call_registry.py   (or: python -m pytest test_call_registry.py)
+"""
+
+import multiprocessing
+import os
+import tempfile
+import threading
+from call_registry import CallRegistry, registry_keys
+from test_campaigns import FakeClock
+
+
+def make_registry(**kwargs):
+    return CallRegistry(os.path.join(tempfile.mkdtemp(), 'call_registry.db'), **kwargs)
+
+
+def _race(db_path, barrier, results):
+    barrier.wait()
+    results.put(CallRegistry(db_path).acquire(7, '+91 90000 00007')['acquired'])
+
+
+def test_one_winner_across_processes():
+    db_path = make_registry().db_path
+    context = multiprocessing.get_context('spawn')
+    workers = 6
+    barrier, results = context.Barrier(workers), context.Queue()
+    processes = [context.Process(target=_race, args=(db_path, barrier, results)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    outcomes = [results.get(timeout=30) for _ in processes]
+    for process in processes:
+        process.join()
+    assert outcomes.count(True) == 1
+
+
+def test_duplicate_gets_existing_execution_id():
+    registry = make_registry()
+    claim = registry.acquire(1, '+919000000001')
+    assert claim['acquired']
+
+    # The duplicate arrives while the first dial is still running
+    threading.Timer(0.2, registry.attach, (claim['claim_id'], 'exec-1')).start()
+    duplicate = registry.acquire(1, '+919000000001')
+    assert not duplicate['acquired'] and duplicate['execution_id'] is None
+    assert registry.wait_for_execution(duplicate['claim_id'], timeout=5) == 'exec-1'
+
+    # Same number under another candidate ID, or the same candidate with a reformatted number
+    assert registry.acquire(2, '+91 9000-000001')['execution_id'] == 'exec-1'
+    assert registry.acquire(1, None)['execution_id'] == 'exec-1'
+
+    assert registry.release_execution('exec-1')
+    assert registry.acquire(1, '+919000000001')['acquired']
+
+
+def test_failed_dial_and_ttl_release_claims():
+    clock = FakeClock()
+    registry = make_registry(ttl=900, dial_timeout=45, clock=clock)
+    claim = registry.acquire(1, '+919000000001')
+    registry.release_claim(claim['claim_id'])
+    assert registry.wait_for_execution(claim['claim_id'], timeout=0) is None
+
+    # A dial that never returned only blocks for the dial timeout
+    registry.acquire(1, '+919000000001')
+    clock.advance(46)
+    claim = registry.acquire(1, '+919000000001')
+    assert claim['acquired'] and registry.stats['expired'] == 2
+
+    # A live call without a terminal webhook blocks for the TTL
+    registry.attach(claim['claim_id'], 'exec-2')
+    clock.advance(899)
+    assert not registry.acquire(1, '+919000000001')['acquired']
+    clock.advance(2)
+    assert registry.get_stats()['in_flight'] == 0
+    assert registry.acquire(1, '+919000000001')['acquired']
+    assert registry_keys(None, '') == []
+
+
+def test_scheduled_retry_holds_claim_until_it_is_placed():
+    clock = FakeClock()
+    registry = make_registry(ttl=900, clock=clock)
+    claim = registry.acquire(1, '+919000000001')
+    # Bolna places the retry in two hours; a campaign or manual dial meanwhile must not go through
+    registry.attach(claim['claim_id'], 'exec-retry', hold_until=clock() + 7200)
+    clock.advance(7200 + 899)
+    assert registry.acquire(1, '+919000000001')['execution_id'] == 'exec-retry'
+    clock.advance(2)
+    assert registry.acquire(1, '+919000000001')['acquired']
+
+
+def test_release_candidate_frees_both_keys():
+    registry = make_registry()
+    claim = registry.acquire(1, '+919000000001')
+    registry.attach(claim['claim_id'], 'exec-1')
+    registry.acquire(2, '+919000000002')
+
+    assert registry.release_candidate(1)
+    assert not registry.release_candidate(1)
+    assert registry.acquire(1, '+919000000001')['acquired']
+    assert not registry.acquire(2, None)['acquired']  # other candidates keep their claims
+
+
+def main():
+    tests = [
+        test_one_winner_across_processes,
+        test_duplicate_gets_existing_execution_id,
+        test_failed_dial_and_ttl_release_claims,
+        test_scheduled_retry_holds_claim_until_it_is_placed,
+        test_release_candidate_frees_both_keys,
+    ]
+    print("\n" + "="*70)
+    print("🧪 Testing in-flight call registry")
+    print("="*70 + "\n")
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e!r}")
+
+    print("\n" + "="*70)
+    print(f"{'✅ All tests passed' if not failures else f'❌ {failures} test(s) failed'}")
+    print("="*70)
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Test the campaign queue and dispatcher against a local mock Bolna server
+Time is simulated: the dispatcher's clock is a FakeClock the tests advance,
+so call timeouts, throughput and ETA are checked without waiting
+
+Run: python test_campaigns.py   (or: python -m pytest test_campaigns.py)
+"""
+
+import os
+import tempfile
+from bolna_agent import BolnaAgent
+from campaigns import CampaignQueue, CampaignDispatcher, DialDeferred, matches_filter
+from circuit_breaker import CircuitOpenError
+from test_async_bolna_agent import mock_server
+
+
+class FakeClock:
+    """Simulated wall clock (seconds since the epoch)"""
+
+    def __init__(self, start: float = 1_700_000_000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+def make_candidates(count, start_id=1, **fields):
+    return {
+        i: dict({'id': i, 'name': f'Candidate {i}', 'phone': f'+91900000{i:04d}', 'status': 'pending', 'position': 'Engineer'}, **fields)
+        for i in range(start_id, start_id + count)
+    }
+
+
+def make_dispatcher(candidates, max_in_flight=4, call_timeout=600, dial=None):
+    """Dispatcher on a fresh queue whose dial function calls the mock Bolna server"""
+    server = mock_server()
+    agent = BolnaAgent(api_key='test-key')
+    agent.base_url = server.base_url
+    agent.agent_id = 'agent-test'
+
+    def dial_candidate(item):
+        candidate = candidates.get(item['candidate_id'])
+        if candidate is None or not matches_filter(candidate, item['filters']):
+            return None
+        result = agent.make_call(candidate['phone'], None, candidate['name'], 'Monday', '10:00 A.M.')
+        candidate['status'] = 'calling'
+        return result['execution_id']
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'campaigns.db')
+    clock = FakeClock()
+    dispatcher = CampaignDispatcher(
+        CampaignQueue(db_path), dial or dial_candidate,
+        max_in_flight=max_in_flight, call_timeout=call_timeout, clock=clock
+    )
+    return dispatcher, clock, server
+
+
+def live_executions(dispatcher, campaign_id):
+    return [item['execution_id'] for item in dispatcher.queue.get_items(campaign_id) if item['state'] == 'in_call']
+
+
+def test_priority_order_and_global_cap():
+    candidates = make_candidates(5)
+    candidates.update(make_candidates(3, start_id=100, position='Designer'))
+    dispatcher, clock, server = make_dispatcher(candidates, max_in_flight=4)
+    low = dispatcher.queue.create_campaign({'position': 'Engineer'}, [1, 2, 3, 4, 5], priority=0, now=clock())
+    high = dispatcher.queue.create_campaign({'position': 'designer'}, [100, 101, 102], priority=5, now=clock())
+
+    assert dispatcher.tick() == 4
+    assert sum(1 for method, _ in server.requests if method == 'POST') == 4
+    assert len(live_executions(dispatcher, high)) == 3  # higher priority dialed first
+    assert len(live_executions(dispatcher, low)) == 1
+    assert dispatcher.tick() == 0  # every slot is taken
+
+    for execution_id in live_executions(dispatcher, high)[:2]:
+        dispatcher.on_execution_finished(execution_id, 'completed')
+    assert dispatcher.tick() == 2
+    assert len(live_executions(dispatcher, low)) == 3
+
+
+def test_per_campaign_cap():
+    dispatcher, clock, _ = make_dispatcher(make_candidates(5), max_in_flight=10)
+    campaign_id = dispatcher.queue.create_campaign({'status': 'pending'}, list(range(1, 6)), max_in_flight=2, now=clock())
+    assert dispatcher.tick() == 2
+    assert dispatcher.tick() == 0
+    assert dispatcher.queue.get_campaign(campaign_id, clock())['counts'] == {'in_call': 2, 'queued': 3}
+
+
+def test_call_timeout_frees_slot():
+    dispatcher, clock, _ = make_dispatcher(make_candidates(3), max_in_flight=1, call_timeout=600)
+    campaign_id = dispatcher.queue.create_campaign({'status': 'pending'}, [1, 2, 3], now=clock())
+    assert dispatcher.tick() == 1
+    clock.advance(599)
+    assert dispatcher.tick() == 0
+    clock.advance(2)  # no webhook within the timeout
+    assert dispatcher.tick() == 1
+    counts = dispatcher.queue.get_campaign(campaign_id, clock())['counts']
+    assert counts == {'timed_out': 1, 'in_call': 1, 'queued': 1}
+
+
+def test_progress_throughput_and_eta():
+    dispatcher, clock, _ = make_dispatcher(make_candidates(10), max_in_flight=2)
+    campaign_id = dispatcher.queue.create_campaign({'status': 'pending'}, list(range(1, 11)), now=clock())
+
+    # Two calls per simulated minute
+    for _ in range(3):
+        dispatcher.tick()
+        clock.advance(60)
+        for execution_id in live_executions(dispatcher, campaign_id):
+            dispatcher.on_execution_finished(execution_id, 'completed')
+
+    campaign = dispatcher.queue.get_campaign(campaign_id, clock())
+    assert campaign['dialed'] == 6 and campaign['counts'] == {'completed': 6, 'queued': 4}
+    assert campaign['throughput_per_minute'] == 2.0
+    assert campaign['eta_seconds'] == 120
+    assert campaign['progress'] == 0.6
+
+    while dispatcher.tick():
+        for execution_id in live_executions(dispatcher, campaign_id):
+            dispatcher.on_execution_finished(execution_id, 'no_answer')
+    campaign = dispatcher.queue.get_campaign(campaign_id, clock())
+    assert campaign['status'] == 'completed' and campaign['eta_seconds'] is None
+
+
+def test_skips_changed_candidates_and_defers_on_outage():
+    candidates = make_candidates(3)
+    dispatcher, clock, _ = make_dispatcher(candidates, max_in_flight=5)
+    campaign_id = dispatcher.queue.create_campaign({'status': 'pending'}, [1, 2, 3], now=clock())
+    candidates[2]['status'] = 'confirmed'  # changed after the campaign was created
+
+    real_dial = dispatcher.dial
+    dispatcher.dial = lambda item: (_ for _ in ()).throw(CircuitOpenError('dial', 30))
+    assert dispatcher.tick() == 3
+    assert dispatcher.stats['deferred'] == 3
+    assert dispatcher.tick() == 0  # deferred until the circuit's retry time
+    clock.advance(31)
+    dispatcher.dial = real_dial
+    assert dispatcher.tick() == 3
+    counts = dispatcher.queue.get_campaign(campaign_id, clock())['counts']
+    assert counts == {'in_call': 2, 'skipped': 1}
+
+
+def test_deferred_dial_is_retried_not_skipped():
+    dispatcher, clock, _ = make_dispatcher(make_candidates(1))
+    campaign_id = dispatcher.queue.create_campaign({'status': 'pending'}, [1], now=clock())
+
+    # Another dial for the candidate is still running (or failed): no execution ID to wait on
+    real_dial = dispatcher.dial
+    dispatcher.dial = lambda item: (_ for _ in ()).throw(DialDeferred('call in flight', 45))
+    assert dispatcher.tick() == 1
+    assert dispatcher.queue.get_campaign(campaign_id, clock())['counts'] == {'queued': 1}
+    clock.advance(46)
+    dispatcher.dial = real_dial
+    assert dispatcher.tick() == 1
+    assert dispatcher.queue.get_campaign(campaign_id, clock())['counts'] == {'in_call': 1}
+
+
+def test_shared_execution_completes_every_campaign():
+    dispatcher, clock, _ = make_dispatcher(make_candidates(1))
+    first = dispatcher.queue.create_campaign({'status': 'pending'}, [1], now=clock())
+    second = dispatcher.queue.create_campaign({'position': 'Engineer'}, [1], now=clock())
+    # The second campaign's dial adopts the call already in flight (CallInFlightError path)
+    dispatcher.dial = lambda item: 'exec-shared'
+    assert dispatcher.tick() == 2
+
+    dispatcher.on_execution_finished('exec-shared', 'completed')
+    assert dispatcher.stats['completed'] == 2
+    for campaign_id in (first, second):
+        assert dispatcher.queue.get_campaign(campaign_id, clock())['counts'] == {'completed': 1}
+
+
+def test_pause_cancel_and_restart_recovery():
+    dispatcher, clock, _ = make_dispatcher(make_candidates(6), max_in_flight=2)
+    campaign_id = dispatcher.queue.create_campaign({'status': 'pending'}, list(range(1, 7)), now=clock())
+    dispatcher.queue.set_status(campaign_id, 'pause', clock())
+    assert dispatcher.tick() == 0
+    dispatcher.queue.set_status(campaign_id, 'resume', clock())
+    assert dispatcher.tick() == 2
+
+    # A crash mid-dial leaves an item in 'dialing'; a new process sees the queue as it was
+    dispatcher.queue.claim(1, clock())
+    reopened = CampaignQueue(dispatcher.queue.db_path)
+    assert reopened.recover(clock()) == 1
+    assert reopened.get_campaign(campaign_id, clock())['counts'] == {'in_call': 2, 'failed': 1, 'queued': 3}
+
+    reopened.set_status(campaign_id, 'cancel', clock())
+    assert reopened.get_campaign(campaign_id, clock())['counts'] == {'in_call': 2, 'failed': 1, 'cancelled': 3}
+
+
+def main():
+    tests = [
+        test_priority_order_and_global_cap,
+        test_per_campaign_cap,
+        test_call_timeout_frees_slot,
+        test_progress_throughput_and_eta,
+        test_skips_changed_candidates_and_defers_on_outage,
+        test_deferred_dial_is_retried_not_skipped,
+        test_shared_execution_completes_every_campaign,
+        test_pause_cancel_and_restart_recovery,
+    ]
+    print("\n" + "="*70)
+    print("🧪 Testing campaign dispatcher against a mock Bolna server")
+    print("="*70 + "\n")
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e!r}")
+
+    print("\n" + "="*70)
+    print(f"{'✅ All tests passed' if not failures else f'❌ {failures} test(s) failed'}")
+    print("="*70)
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Test the SQLite candidate store
+Each test uses a fresh database in a temporary directory, imported from a
+small candidates.json written next to it
+
+Run: python test_candidate_store.py   (or: python -m pytest test_candidate_store.py)
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import candidate_store
+from candidate_store import SQLiteCandidateStore
+
+
+def make_store(candidates=()):
+    directory = tempfile.mkdtemp()
+    json_path = os.path.join(directory, 'candidates.json')
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump({'candidates': list(candidates), 'availableSlots': [{'id': 1, 'datetime': 'Monday at 10:00 A.M.'}]}, f)
+    return SQLiteCandidateStore(os.path.join(directory, 'candidates.db'), import_path=json_path)
+
+
+def sample_candidates(count=3):
+    return [
+        {'id': i, 'name': f'Candidate {i}', 'phone': f'+91900000000{i}', 'status': 'pending', 'notes': {'source': 'referral'}}
+        for i in range(1, count + 1)
+    ]
+
+
+def test_single_row_updates():
+    store = make_store(sample_candidates())
+    versions = dict(store._conn().execute('SELECT id, version FROM candidates').fetchall())
+
+    updated = store.update_candidate(2, lambda candidate: candidate.update(status='calling'))
+    assert updated['status'] == 'calling' and updated['notes'] == {'source': 'referral'}  # whole document kept
+    after = dict(store._conn().execute('SELECT id, version FROM candidates').fetchall())
+    assert after[1] == versions[1] and after[3] == versions[3] and after[2] > versions[2]
+    assert store.find_by_phone('+919000000002')['status'] == 'calling'
+    assert [c['id'] for c in store.list_by_status('calling')] == [2]
+    assert store.update_candidate(99, lambda candidate: None) is None
+
+    # A failing mutator leaves the row untouched
+    def broken(candidate):
+        candidate['status'] = 'confirmed'
+        raise RuntimeError('validation failed')
+    try:
+        store.update_candidate(2, broken)
+        assert False, 'expected the mutator error'
+    except RuntimeError:
+        pass
+    assert store.get_candidate(2)['status'] == 'calling'
+
+    def reset(candidate):
+        candidate['status'] = 'pending'
+        return True
+    assert [c['id'] for c in store.update_all(reset, exclude_status='pending')] == [2]
+    assert [c['id'] for c in store.list_candidates()] == [1, 2, 3]  # insertion order kept
+
+
+def test_changes_since_increments_and_resets():
+    store = make_store(sample_candidates())
+    start = store.get_version()
+    assert store.changes_since(start) == {'version': start, 'reset': False, 'candidates': [], 'deleted': [], 'availableSlots': None}
+
+    store.update_candidate(1, lambda candidate: candidate.update(status='confirmed'))
+    store.delete_candidate(2)
+    new_id = store.add_candidate({'name': 'New', 'phone': '+919000000009', 'status': 'pending'})
+    changes = store.changes_since(start)
+    assert not changes['reset'] and changes['version'] == store.get_version()
+    assert [c['id'] for c in changes['candidates']] == [1, new_id]
+    assert changes['deleted'] == [2]
+
+    # A client ahead of the store (database replaced) gets the full list
+    assert store.changes_since(changes['version'] + 50)['reset']
+
+    # So does one behind a re-import, which rewrites every row in one change
+    store.import_from_json(store._get_meta('imported_from'))
+    changes = store.changes_since(changes['version'])
+    assert changes['reset'] and len(changes['candidates']) == 3 and changes['availableSlots']
+
+    # ...and one older than the trimmed change log
+    log_size = candidate_store.CANDIDATE_CHANGE_LOG_SIZE
+    candidate_store.CANDIDATE_CHANGE_LOG_SIZE = 10
+    try:
+        behind = store.get_version()
+        while store.get_version() % 100:
+            store.update_candidate(1, lambda candidate: candidate.update(status='pending'))
+        assert store.changes_since(behind)['reset']
+        assert not store.changes_since(store.get_version() - 5)['reset']
+    finally:
+        candidate_store.CANDIDATE_CHANGE_LOG_SIZE = log_size
+
+
+def test_wait_for_change_reads_version_outside_the_lock():
+    store = make_store()
+    version = store.get_version()
+    real_get_version = store.get_version
+
+    def slow_get_version():
+        time.sleep(0.5)  # a slow disk read in one SSE client
+        return real_get_version()
+
+    store.get_version = slow_get_version
+    woke = {}
+
+    def waiter():
+        woke['version'] = store.wait_for_change(version, timeout=5)
+        woke['at'] = time.monotonic()
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    time.sleep(0.1)  # the waiter is inside its version read
+
+    # The writer's notify must not wait for that read
+    start = time.monotonic()
+    store.add_candidate({'name': 'Candidate', 'phone': '+919000000001', 'status': 'pending'})
+    assert time.monotonic() - start < 0.3
+    thread.join()
+    # The write landed during the read, so the waiter re-checks at once instead of sleeping out the poll interval
+    assert woke['version'] > version and woke['at'] - start < 1.5
+
+
+def test_api_writes_are_mirrored_to_candidates_json():
+    import api_server
+    store = make_store(sample_candidates(1))
+    previous, candidate_store._store = candidate_store._store, store
+    try:
+        client = api_server.app.test_client()
+        response = client.post('/api/candidate/add', json={
+            'name': 'Added via API', 'phone': '+919000000042', 'email': 'new@example.com',
+            'position': 'Engineer', 'scheduledInterview': {'datetime': 'Monday at 10:00 A.M.'}
+        })
+        new_id = response.get_json()['candidate_id']
+        response = client.put(f'/api/candidate/{new_id}/rescheduling-slots', json={'reschedulingSlots': [1]})
+        assert response.get_json()['success']
+    finally:
+        candidate_store._store = previous
+
+    # What the Next.js routes (/api/call, /api/candidates, /api/available-slots) read
+    with open(store.json_path, encoding='utf-8') as f:
+        data = json.load(f)
+    added = next(c for c in data['candidates'] if c['id'] == new_id)
+    assert added['name'] == 'Added via API' and added['reschedulingSlots'] == [1]
+    assert [c['id'] for c in data['candidates']] == [1, new_id]
+    assert data['availableSlots'] == store.get_available_slots()
+
+
+def main():
+    tests = [
+        test_single_row_updates,
+        test_changes_since_increments_and_resets,
+        test_api_writes_are_mirrored_to_candidates_json,
+        test_wait_for_change_reads_version_outside_the_lock,
+    ]
+    print("\n" + "="*70)
+    print("🧪 Testing SQLite candidate store")
+    print("="*70 + "\n")
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e!r}")
+
+    print("\n" + "="*70)
+    print(f"{'✅ All tests passed' if not failures else f'❌ {failures} test(s) failed'}")
+    print("="*70)
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
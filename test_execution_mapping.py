@@ -0,0 +1,94 @@
+"""
+Test the execution mapping index
+Two ExecutionMappingIndex instances on the same files stand in for the API
+server and the execution sync process; spawned processes check concurrent
+appends and snapshots across real processes
+
+Run: python test_execution_mapping.py   (or: python -m pytest test_execution_mapping.py)
+"""
+
+import multiprocessing
+import os
+import tempfile
+import execution_mapping
+from execution_mapping import ExecutionMappingIndex
+
+
+def make_index(directory=None):
+    directory = directory or tempfile.mkdtemp()
+    return ExecutionMappingIndex(
+        os.path.join(directory, 'execution_mapping.json'),
+        os.path.join(directory, 'execution_mapping.log.jsonl')
+    )
+
+
+def test_reader_reloads_after_a_snapshot_in_another_process():
+    server = make_index()
+    sync = make_index(os.path.dirname(server.log_path))
+    for i in range(3):
+        server.set(f'exec-{i}', i, f'+9190000000{i}')
+    assert sync.get('exec-2')['candidate_id'] == 2  # the reader's offset is now the end of the log
+
+    # Snapshot truncates the log, then new appends grow it past the reader's old offset
+    server.snapshot()
+    for i in range(3, 9):
+        server.set(f'exec-{i}', i, f'+9190000000{i}')
+    assert os.path.getsize(server.log_path) > sync._log_offset
+
+    for i in range(9):
+        assert sync.get(f'exec-{i}')['candidate_id'] == i
+    assert sync.latest_for_candidate(8) == 'exec-8'
+    assert len(sync) == 9
+
+
+def _writer(directory, name, barrier):
+    execution_mapping.EXECUTION_MAPPING_SNAPSHOT_EVERY = 7
+    index = make_index(directory)
+    barrier.wait()
+    for i in range(40):
+        index.set(f'{name}-{i}', i, f'+91900000{i:04d}')
+    index.close()
+
+
+def test_concurrent_writers_and_snapshots_keep_every_mapping():
+    directory = tempfile.mkdtemp()
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Barrier(2)
+    writers = [context.Process(target=_writer, args=(directory, name, barrier)) for name in ('server', 'sync')]
+    for process in writers:
+        process.start()
+    for process in writers:
+        process.join(60)
+    assert [process.exitcode for process in writers] == [0, 0]
+
+    index = make_index(directory)
+    assert len(index) == 80
+    assert all(index.get(f'{name}-{i}')['candidate_id'] == i for name in ('server', 'sync') for i in range(40))
+
+
+def main():
+    tests = [
+        test_reader_reloads_after_a_snapshot_in_another_process,
+        test_concurrent_writers_and_snapshots_keep_every_mapping,
+    ]
+    print("\n" + "="*70)
+    print("🧪 Testing execution mapping index")
+    print("="*70 + "\n")
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e!r}")
+
+    print("\n" + "="*70)
+    print(f"{'✅ All tests passed' if not failures else f'❌ {failures} test(s) failed'}")
+    print("="*70)
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Test the incremental execution sync
+A fake agent serves execution list pages newest first; the webhook log and
+execution mappings live in a temporary directory
+
+Run: python test_execution_sync.py   (or: python -m pytest test_execution_sync.py)
+"""
+
+import os
+import tempfile
+import execution_mapping
+import webhook_store
+from execution_mapping import ExecutionMappingIndex
+from execution_sync import ExecutionSync
+from webhook_store import WebhookEventLog
+
+
+class FakeAgent:
+    def __init__(self, executions, page_size):
+        self.executions = executions
+        self.page_size = page_size
+        self.requests = []
+
+    def list_executions(self, agent_id=None, page_number=1, page_size=None):
+        self.requests.append(page_number)
+        start = (page_number - 1) * self.page_size
+        page = self.executions[start:start + self.page_size]
+        return {'data': page, 'has_more': start + self.page_size < len(self.executions)}
+
+
+def make_sync(agent, directory, **kwargs):
+    webhook_store._log = WebhookEventLog(os.path.join(directory, 'webhook_log'), legacy_path=None, background=False)
+    execution_mapping._index = ExecutionMappingIndex(
+        os.path.join(directory, 'execution_mapping.json'),
+        os.path.join(directory, 'execution_mapping.log.jsonl')
+    )
+    return ExecutionSync(
+        agent, agent_id=None, state_path=os.path.join(directory, 'execution_sync_state.json'),
+        budget_per_minute=0, lookback=0, page_size=agent.page_size, **kwargs
+    )
+
+
+def test_watermark_kept_when_max_pages_cuts_a_pass_short():
+    # Six executions newer than the watermark over three pages, then older ones
+    executions = [
+        {'id': f'exec-{i}', 'status': 'completed', 'created_at': f'2026-01-01T10:{59 - i:02d}:00'}
+        for i in range(10)
+    ]
+    watermark = '2026-01-01T10:53:30'
+    previous = webhook_store._log, execution_mapping._index
+    try:
+        agent = FakeAgent(executions, page_size=2)
+        sync = make_sync(agent, tempfile.mkdtemp(), max_pages=2)
+        sync.state['watermark'] = watermark
+
+        result = sync.sync_once()
+        assert not result['complete'] and result['filled'] == 4
+        assert sync.state['watermark'] == watermark  # page 3 was never read
+
+        sync.max_pages = None
+        result = sync.sync_once()
+        assert result['complete'] and result['filled'] == 2  # exec-4 and exec-5 from page 3
+        assert sync.state['watermark'] == executions[0]['created_at']
+        assert 'exec-5' in sync.webhook_log and 'exec-6' not in sync.webhook_log
+    finally:
+        webhook_store._log, execution_mapping._index = previous
+
+
+def main():
+    tests = [
+        test_watermark_kept_when_max_pages_cuts_a_pass_short,
+    ]
+    print("\n" + "="*70)
+    print("🧪 Testing execution sync")
+    print("="*70 + "\n")
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e!r}")
+
+    print("\n" + "="*70)
+    print(f"{'✅ All tests passed' if not failures else f'❌ {failures} test(s) failed'}")
+    print("="*70)
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Test the call retry scheduler's backoff, attempt limit and dialing window
+Time is simulated with the FakeClock from test_campaigns; the dial function
+records the scheduled_at it would send to Bolna instead of calling it
+
+Run: python test_retry_scheduler.py   (or: python -m pytest test_retry_scheduler.py)
+"""
+
+import os
+import tempfile
+from datetime import datetime, time as dtime
+from zoneinfo import ZoneInfo
+from retry_scheduler import RetryScheduler, next_in_window, parse_window
+from test_campaigns import FakeClock
+
+TZ = ZoneInfo('Asia/Kolkata')
+
+
+def at(hour, minute=0):
+    """FakeClock starting on 1 Jan 2025 at the given local time"""
+    return FakeClock(datetime(2025, 1, 1, hour, minute, tzinfo=TZ).timestamp())
+
+
+def make_scheduler(clock, **kwargs):
+    dialed = []
+
+    def dial(candidate_id, scheduled_at):
+        dialed.append((candidate_id, scheduled_at))
+        return f'retry-{len(dialed)}'
+
+    options = dict(max_attempts=3, base_delay=1800, max_delay=14400, window='09:00-19:00', timezone='Asia/Kolkata', clock=clock)
+    options.update(kwargs)
+    db_path = os.path.join(tempfile.mkdtemp(), 'call_attempts.db')
+    return RetryScheduler(dial, db_path=db_path, **options), dialed
+
+
+def test_backoff_doubles_until_max_attempts():
+    clock = at(10)
+    scheduler, dialed = make_scheduler(clock)
+    scheduler.record_call(1, 'exec-1')
+
+    first = scheduler.on_call_outcome(1, 'exec-1', 'no_answer')
+    assert first['action'] == 'scheduled' and first['attempt'] == 2
+    assert dialed[-1] == (1, '2025-01-01T10:30:00+05:30')
+
+    clock.advance(1800)
+    second = scheduler.on_call_outcome(1, first['executionId'], 'busy')
+    assert second['action'] == 'scheduled' and second['attempt'] == 3
+    assert dialed[-1] == (1, '2025-01-01T11:30:00+05:30')  # 2 x base delay
+
+    clock.advance(3600)
+    assert scheduler.on_call_outcome(1, second['executionId'], 'no_answer')['action'] == 'exhausted'
+    assert len(dialed) == 2
+    assert [a['kind'] for a in scheduler.get_history(1)] == ['call', 'retry', 'retry']
+
+
+def test_answered_call_resets_the_series():
+    clock = at(10)
+    scheduler, dialed = make_scheduler(clock, max_attempts=2)
+    retry = scheduler.on_call_outcome(1, 'exec-1', 'no_answer')
+    clock.advance(1800)
+    assert scheduler.on_call_outcome(1, retry['executionId'], 'completed')['action'] == 'not_retryable'
+    assert scheduler.unanswered_streak(1) == 0
+
+    # A later unanswered call starts a new series
+    scheduler.record_call(1, 'exec-2')
+    assert scheduler.on_call_outcome(1, 'exec-2', 'no_answer')['action'] == 'scheduled'
+    assert scheduler.on_call_outcome(2, 'exec-3', 'failed')['action'] == 'not_retryable'
+    assert len(dialed) == 2
+
+
+def test_duplicate_and_overlapping_outcomes_schedule_once():
+    clock = at(10)
+    scheduler, dialed = make_scheduler(clock)
+    assert scheduler.on_call_outcome(1, 'exec-1', 'no_answer')['action'] == 'scheduled'
+    assert scheduler.on_call_outcome(1, 'exec-1', 'no_answer')['action'] == 'duplicate'
+    # A manual call going unanswered while the retry waits at Bolna
+    assert scheduler.on_call_outcome(1, 'exec-2', 'no_answer')['action'] == 'pending'
+    assert len(dialed) == 1
+
+
+def test_retries_land_inside_the_dialing_window():
+    scheduler, dialed = make_scheduler(at(18, 45))
+    scheduler.on_call_outcome(1, 'exec-1', 'no_answer')
+    assert dialed[-1] == (1, '2025-01-02T09:00:00+05:30')  # 19:15 is after hours
+
+    scheduler, dialed = make_scheduler(at(3))
+    scheduler.on_call_outcome(1, 'exec-1', 'no_answer')
+    assert dialed[-1] == (1, '2025-01-01T09:00:00+05:30')
+
+    start, end = parse_window('22:00-06:00')
+    late = datetime(2025, 1, 1, 23, 30, tzinfo=TZ)
+    assert next_in_window(late, start, end) == late
+    assert next_in_window(datetime(2025, 1, 1, 12, 0, tzinfo=TZ), start, end) == datetime(2025, 1, 1, 22, 0, tzinfo=TZ)
+    assert (start, end) == (dtime(22, 0), dtime(6, 0))
+
+
+def main():
+    tests = [
+        test_backoff_doubles_until_max_attempts,
+        test_answered_call_resets_the_series,
+        test_duplicate_and_overlapping_outcomes_schedule_once,
+        test_retries_land_inside_the_dialing_window,
+    ]
+    print("\n" + "="*70)
+    print("🧪 Testing call retry scheduler")
+    print("="*70 + "\n")
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e!r}")
+
+    print("\n" + "="*70)
+    print(f"{'✅ All tests passed' if not failures else f'❌ {failures} test(s) failed'}")
+    print("="*70)
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
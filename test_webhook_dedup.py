@@ -0,0 +1,90 @@
+"""
+Test webhook delivery deduplication
+Deliveries are checked the way /webhook/bolna checks them: execution id,
+raw payload, lower-cased status and Bolna's updated_at
+
+Run: python test_webhook_dedup.py   (or: python -m pytest test_webhook_dedup.py)
+"""
+
+from webhook_dedup import WebhookDeduplicator
+
+
+def delivery(status, updated_at, **extra):
+    payload = {'id': 'exec-1', 'status': status, 'updated_at': updated_at}
+    payload.update(extra)
+    return payload
+
+
+def check(dedup, status, updated_at, **extra):
+    return dedup.check('exec-1', delivery(status, updated_at, **extra), status, updated_at)
+
+
+def test_duplicate_deliveries_are_skipped():
+    dedup = WebhookDeduplicator()
+    assert check(dedup, 'in_progress', '2026-01-01T10:00:00') is None
+    # Same payload redelivered
+    assert check(dedup, 'in_progress', '2026-01-01T10:00:00') == 'duplicate'
+    # Same status and updated_at, different content (e.g. a retry counter)
+    assert check(dedup, 'in_progress', '2026-01-01T10:00:00', attempt=2) == 'duplicate'
+    # Other executions are tracked separately
+    assert dedup.check('exec-2', delivery('in_progress', '2026-01-01T10:00:00'), 'in_progress', '2026-01-01T10:00:00') is None
+    stats = dedup.get_stats()
+    assert stats['accepted'] == 2 and stats['duplicates'] == 2 and stats['writes_avoided'] == 2
+    assert stats['tracked_executions'] == 2
+
+
+def test_stale_and_post_terminal_deliveries_are_skipped():
+    dedup = WebhookDeduplicator()
+    assert check(dedup, 'ringing', '2026-01-01T10:00:05') is None
+    # Arrived out of order: older than the last accepted update
+    assert check(dedup, 'queued', '2026-01-01T10:00:01') == 'stale'
+    assert check(dedup, 'completed', '2026-01-01T10:02:00') is None
+    # A late "in progress" must not move a finished call back
+    assert check(dedup, 'in_progress', '2026-01-01T10:03:00') == 'stale'
+    assert check(dedup, 'in_progress', None) == 'stale'
+    # ...but a newer terminal update (e.g. with the transcript) is processed
+    assert check(dedup, 'completed', '2026-01-01T10:02:30', transcript='Hello') is None
+    assert dedup.get_stats()['stale'] == 3
+
+
+def test_forget_and_eviction_allow_redelivery():
+    dedup = WebhookDeduplicator(max_entries=2)
+    assert check(dedup, 'completed', '2026-01-01T10:00:00') is None
+    # Processing failed: the redelivery must go through
+    dedup.forget('exec-1')
+    assert check(dedup, 'completed', '2026-01-01T10:00:00') is None
+
+    for execution_id in ('exec-2', 'exec-3'):
+        assert dedup.check(execution_id, {'id': execution_id}, 'queued', None) is None
+    assert dedup.get_stats()['tracked_executions'] == 2
+    # exec-1 was the least recently seen and has been evicted
+    assert check(dedup, 'completed', '2026-01-01T10:00:00') is None
+
+
+def main():
+    tests = [
+        test_duplicate_deliveries_are_skipped,
+        test_stale_and_post_terminal_deliveries_are_skipped,
+        test_forget_and_eviction_allow_redelivery,
+    ]
+    print("\n" + "="*70)
+    print("🧪 Testing webhook deduplication")
+    print("="*70 + "\n")
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e!r}")
+
+    print("\n" + "="*70)
+    print(f"{'✅ All tests passed' if not failures else f'❌ {failures} test(s) failed'}")
+    print("="*70)
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
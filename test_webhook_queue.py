@@ -0,0 +1,150 @@
+"""
+Test the durable webhook ingestion queue
+Most queues are built without worker threads so the test can hold records
+the way a worker does; a second queue on the same journal stands in for the
+process that starts after a crash
+
+Run: python test_webhook_queue.py   (or: python -m pytest test_webhook_queue.py)
+"""
+
+import os
+import tempfile
+import threading
+import time
+import webhook_queue
+from webhook_queue import WebhookIngestQueue
+
+
+def make_queue(journal_path=None, handler=lambda payload: None, workers=0):
+    journal_path = journal_path or os.path.join(tempfile.mkdtemp(), 'webhook_queue.jsonl')
+    return WebhookIngestQueue(handler, journal_path, workers=workers)
+
+
+def take(queue):
+    """Take the next record off the single worker queue, as a worker would"""
+    return queue._queues[0].get()
+
+
+def test_journal_kept_while_a_record_is_unacknowledged():
+    truncate_bytes = webhook_queue.JOURNAL_TRUNCATE_BYTES
+    webhook_queue.JOURNAL_TRUNCATE_BYTES = 0  # truncate whenever allowed
+    try:
+        queue = make_queue()
+        first = queue.enqueue({'id': 'exec-1', 'status': 'completed'})
+        second = queue.enqueue({'id': 'exec-2', 'status': 'completed'})
+        # Two workers have taken a record each; the queue is empty but exec-2 isn't processed
+        take(queue)
+        take(queue)
+        queue._ack(first)
+
+        # Crash before exec-2 finishes: the restarted queue must replay it
+        restarted = make_queue(queue.journal_path)
+        assert [record['seq'] for record in list(restarted._queues[0].queue)] == [second]
+
+        queue._ack(second)
+        assert queue._journal.tell() == 0  # everything acknowledged: journal truncated
+    finally:
+        webhook_queue.JOURNAL_TRUNCATE_BYTES = truncate_bytes
+
+
+def test_journal_compacted_around_a_slow_record():
+    truncate_bytes = webhook_queue.JOURNAL_TRUNCATE_BYTES
+    webhook_queue.JOURNAL_TRUNCATE_BYTES = 1024
+    try:
+        queue = make_queue()
+        slow = queue.enqueue({'id': 'exec-slow', 'status': 'in_progress'})
+        take(queue)
+        # Steady traffic while one record stays in flight
+        for i in range(200):
+            seq = queue.enqueue({'id': f'exec-{i}', 'status': 'completed', 'transcript': 'x' * 50})
+            take(queue)
+            queue._ack(seq)
+        assert queue._journal.tell() < 4 * 1024
+
+        restarted = make_queue(queue.journal_path)
+        assert [record['seq'] for record in list(restarted._queues[0].queue)] == [slow]
+    finally:
+        webhook_queue.JOURNAL_TRUNCATE_BYTES = truncate_bytes
+
+
+def test_updates_for_one_execution_stay_in_order():
+    handled = []
+
+    def handler(payload):
+        if payload['status'] == 'in_progress':
+            time.sleep(0.3)  # e.g. a slow candidate lookup
+        handled.append((payload['id'], payload['status']))
+
+    queue = make_queue(handler=handler, workers=2)
+    # An execution pinned to the other worker, to show the slow one doesn't block it
+    other = next(f'exec-{i}' for i in range(2, 100) if queue._queue_for(f'exec-{i}') is not queue._queue_for('exec-1'))
+    queue.enqueue({'id': 'exec-1', 'status': 'in_progress'}, key='exec-1')
+    queue.enqueue({'id': 'exec-1', 'status': 'completed'}, key='exec-1')
+    queue.enqueue({'id': other, 'status': 'completed'}, key=other)
+    queue.join()
+
+    assert [status for eid, status in handled if eid == 'exec-1'] == ['in_progress', 'completed']
+    assert handled[0] == (other, 'completed')
+    assert queue.get_stats()['processed'] == 3
+
+
+def test_failed_payloads_are_retried_then_kept():
+    retries, delay = webhook_queue.WEBHOOK_QUEUE_RETRIES, webhook_queue.WEBHOOK_QUEUE_RETRY_DELAY
+    webhook_queue.WEBHOOK_QUEUE_RETRIES, webhook_queue.WEBHOOK_QUEUE_RETRY_DELAY = 2, 0
+    try:
+        attempts = {}
+        lock = threading.Lock()
+
+        def handler(payload):
+            with lock:
+                attempts[payload['id']] = attempts.get(payload['id'], 0) + 1
+                count = attempts[payload['id']]
+            if payload['id'] == 'exec-busy' and count < 2:
+                raise RuntimeError('database is locked')
+            if payload['id'] == 'exec-broken':
+                raise OSError('No space left on device')
+
+        queue = make_queue(handler=handler, workers=1)
+        queue.enqueue({'id': 'exec-busy', 'status': 'completed'}, key='exec-busy')
+        broken = queue.enqueue({'id': 'exec-broken', 'status': 'completed'}, key='exec-broken')
+        queue.join()
+
+        assert attempts == {'exec-busy': 2, 'exec-broken': 3}
+        stats = queue.get_stats()
+        assert stats['processed'] == 1 and stats['failed'] == 1 and stats['unacked'] == 1
+
+        # Not acknowledged: the next start replays it
+        restarted = make_queue(queue.journal_path)
+        assert [record['seq'] for record in list(restarted._queues[0].queue)] == [broken]
+    finally:
+        webhook_queue.WEBHOOK_QUEUE_RETRIES, webhook_queue.WEBHOOK_QUEUE_RETRY_DELAY = retries, delay
+
+
+def main():
+    tests = [
+        test_journal_kept_while_a_record_is_unacknowledged,
+        test_journal_compacted_around_a_slow_record,
+        test_updates_for_one_execution_stay_in_order,
+        test_failed_payloads_are_retried_then_kept,
+    ]
+    print("\n" + "="*70)
+    print("🧪 Testing webhook ingestion queue")
+    print("="*70 + "\n")
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e!r}")
+
+    print("\n" + "="*70)
+    print(f"{'✅ All tests passed' if not failures else f'❌ {failures} test(s) failed'}")
+    print("="*70)
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
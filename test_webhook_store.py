@@ -0,0 +1,113 @@
+"""
+Test the append-only webhook event log
+Two WebhookEventLog instances on the same directory stand in for the API
+server and another process (execution sync, backfill) sharing the log, and a
+spawned process checks the same from a real second process; tiny segments
+make every few appends roll to a new segment
+
+Run: python test_webhook_store.py   (or: python -m pytest test_webhook_store.py)
+"""
+
+import multiprocessing
+import tempfile
+from webhook_store import WebhookEventLog
+
+SEGMENT_BYTES = 256
+
+
+def make_log(log_dir=None):
+    return WebhookEventLog(log_dir or tempfile.mkdtemp(), legacy_path=None, background=False, segment_bytes=SEGMENT_BYTES)
+
+
+def entry(execution_id, status, writer='server'):
+    return {'execution_id': execution_id, 'status': status, 'writer': writer, 'transcript': 'x' * 40}
+
+
+def test_compaction_keeps_records_from_other_processes():
+    server = make_log()
+    sync = make_log(server.log_dir)
+    for i in range(6):
+        server.append(entry(f'exec-{i}', 'in_progress'))
+    # The other process appends (and seals segments) after the server last caught up
+    for i in range(6):
+        sync.append(entry(f'exec-{i}', 'completed', 'sync'))
+    for i in range(6, 10):
+        sync.append(entry(f'exec-{i}', 'completed', 'sync'))
+    server.append(entry('exec-10', 'queued'))
+
+    assert server.compact() > 0
+    expected = {f'exec-{i}': 'completed' for i in range(10)}
+    expected['exec-10'] = 'queued'
+    for log in (server, sync, make_log(server.log_dir)):
+        assert log.count() == len(expected)
+        assert {eid: log.get(eid)['status'] for eid in expected} == expected
+
+    # The other process's offsets were stale; it must not read a different record
+    sync.append(entry('exec-11', 'completed', 'sync'))
+    assert server.get('exec-11')['writer'] == 'sync'
+    assert sync.get('exec-3')['execution_id'] == 'exec-3'
+
+
+def _reader(log_dir, ids, indexed, compacted, results):
+    log = make_log(log_dir)
+    results.put({eid: log.get(eid)['status'] for eid in ids})
+    indexed.set()
+    compacted.wait(30)
+    # Offsets indexed before the compaction now point into rewritten segments
+    results.put({eid: log.get(eid)['status'] for eid in ids})
+    log.append(entry('exec-reader', 'completed', 'reader'))
+
+
+def test_reader_in_another_process_survives_compaction():
+    server = make_log()
+    for i in range(8):
+        server.append(entry(f'exec-{i}', 'in_progress'))
+    for i in range(8):
+        server.append(entry(f'exec-{i}', 'completed'))
+    ids = [f'exec-{i}' for i in range(8)]
+
+    context = multiprocessing.get_context('spawn')
+    indexed, compacted, results = context.Event(), context.Event(), context.Queue()
+    reader = context.Process(target=_reader, args=(server.log_dir, ids, indexed, compacted, results))
+    reader.start()
+    try:
+        before = results.get(timeout=30)
+        assert indexed.wait(30)
+        assert server.compact() > 0
+        compacted.set()
+        after = results.get(timeout=30)
+    finally:
+        compacted.set()
+        reader.join(30)
+    assert reader.exitcode == 0
+    expected = {eid: 'completed' for eid in ids}
+    assert before == expected and after == expected
+    assert server.get('exec-reader')['writer'] == 'reader'
+
+
+def main():
+    tests = [
+        test_compaction_keeps_records_from_other_processes,
+        test_reader_in_another_process_survives_compaction,
+    ]
+    print("\n" + "="*70)
+    print("🧪 Testing webhook event log")
+    print("="*70 + "\n")
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e!r}")
+
+    print("\n" + "="*70)
+    print(f"{'✅ All tests passed' if not failures else f'❌ {failures} test(s) failed'}")
+    print("="*70)
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Single-scan transcript outcome classifier
+Scores the CONFIRMED / DECLINED / RESCHEDULED keyword patterns used by
+parse_call_outcome in one pass over the transcript
+
+Every pattern has the shape `\\b(term|term...)\\b.*\\b(term|...)\\b...`: groups
+of words/phrases that must appear in order on the same line (`.` does not
+match a newline). Instead of running one regex per pattern, a single compiled
+scanner finds the words that occur in any pattern, phrases are assembled from
+adjacent words and every pattern advances a small per-line state machine.
+"""
+
+import re
+from typing import Dict, List, Tuple
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+MONTHS = [
+    'december', 'january', 'february', 'march', 'april', 'may', 'june',
+    'july', 'august', 'september', 'october', 'november'
+]
+
+# Pattern tables: (category, [group, group, ...]). A group is (terms, prefix):
+# prefix=True means the group has no trailing \b in the original regex, so its
+# last word only has to be the start of a word (e.g. "remove" matches "removed").
+# '#day_number' stands for \d{1,2}(?:st|nd|rd|th)?
+PATTERNS = [
+    # CONFIRMED
+    ('confirmed', [(['confirmed', 'confirm', 'confirmation'], False)]),
+    ('confirmed', [(['yes', 'yeah', 'sure', 'okay', 'ok', 'alright', 'sounds good', 'that works', 'perfect'], False),
+                   (['interview', 'slot', 'time'], False)]),
+    ('confirmed', [(["i will", "i'll", 'i can'], True),
+                   (['attend', 'come', 'be there'], False)]),
+    ('confirmed', [(['see you', 'looking forward', 'thank you'], True),
+                   (['confirmation', 'confirm'], False)]),
+    # DECLINED (a wrong person answering must NOT count as declined)
+    ('declined', [(['declined', 'decline', 'not interested', 'no longer interested'], False)]),
+    ('declined', [(["i don't want", 'i do not want'], True),
+                  (['interview', 'position', 'job'], False)]),
+    ('declined', [(['remove', 'withdraw', 'not pursuing'], True),
+                  (['application', 'position'], False)]),
+    ('declined', [(['no thank you', 'no thanks'], True),
+                  (['not interested', 'not pursuing'], False)]),
+    # RESCHEDULED
+    ('rescheduled', [(['rescheduled', 'reschedule', 'change', 'different', 'another'], False),
+                     (['time', 'slot', 'date', 'day'], False)]),
+    ('rescheduled', [(WEEKDAYS, False), (['#day_number'], False), (MONTHS, False)]),
+    ('rescheduled', [(['new', 'different', 'another'], False),
+                     (['slot', 'time', 'date'], False)]),
+    ('rescheduled', [(['change', 'switch', 'move'], True),
+                     (['to', 'for'], False),
+                     (WEEKDAYS[:5], False)]),
+    # Fallbacks when no pattern above scored
+    ('fallback_confirmed', [(['great', 'perfect', 'thank you', 'sounds good'], False),
+                            (['confirmation', 'confirm', 'confirmed'], False)]),
+    ('negative_word', [(['not', 'no', 'decline', 'cancel', 'withdraw'], False)]),
+    ('positive_word', [(['yes', 'sure', 'okay', 'confirm'], False)]),
+    ('positive_language', [(['yes', 'sure', 'okay', 'alright', 'perfect', 'great', 'thank you'], False)]),
+]
+
+_WORD_SPLIT_RE = re.compile(r"(\w+)")
+_DAY_NUMBER_RE = re.compile(r'\d{1,2}(?:st|nd|rd|th)?')
+
+
+def _split_phrase(phrase: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """'i don't want' -> (('i', 'don', 't', 'want'), (' ', "'", ' '))"""
+    if phrase.startswith('#'):
+        return (phrase,), ()
+    parts = _WORD_SPLIT_RE.split(phrase)
+    return tuple(parts[1::2]), tuple(parts[2:-1:2])
+
+
+class _Term:
+    __slots__ = ('words', 'separators', 'prefix', 'slots')
+
+    def __init__(self, words, separators, prefix):
+        self.words = words
+        self.separators = separators
+        self.prefix = prefix
+        # (pattern index, group index) pairs this term satisfies
+        self.slots: List[Tuple[int, int]] = []
+
+
+def _build():
+    terms: Dict[Tuple, _Term] = {}
+    for pattern_index, (_, groups) in enumerate(PATTERNS):
+        for group_index, (phrases, prefix) in enumerate(groups):
+            for phrase in phrases:
+                words, separators = _split_phrase(phrase)
+                key = (words, separators, prefix)
+                if key not in terms:
+                    terms[key] = _Term(words, separators, prefix)
+                terms[key].slots.append((pattern_index, group_index))
+
+    full_words = set()
+    prefix_words = set()
+    for term in terms.values():
+        full_words.update(term.words[:-1])
+        (prefix_words if term.prefix else full_words).add(term.words[-1])
+    full_words.discard('#day_number')
+
+    # One scanner for every word any pattern cares about, plus newlines.
+    # It always matches whole words, so overlapping phrases are assembled in Python.
+    alternation = lambda words: '|'.join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+    scanner = re.compile(
+        r'\n'
+        r'|\b(?:' + alternation(full_words) + r')\b'
+        r'|\b(?:' + alternation(prefix_words) + r')\w*'
+        r'|\b\d{1,2}(?:st|nd|rd|th)?\b'
+    )
+    return list(terms.values()), scanner, frozenset(prefix_words)
+
+
+_TERMS, _SCANNER, _PREFIX_WORDS = _build()
+_PATTERN_SIZES = [len(groups) for _, groups in PATTERNS]
+# word -> terms whose first word is exactly that word / starts with that prefix word
+_TERMS_BY_FIRST_WORD: Dict[str, List[_Term]] = {}
+for _term in _TERMS:
+    _TERMS_BY_FIRST_WORD.setdefault(_term.words[0], []).append(_term)
+_word_cache: Dict[str, Tuple[List[_Term], Tuple[str, ...]]] = {}
+
+
+def _lookup(word: str):
+    """Terms starting at this word and the prefix words it begins with (memoized)"""
+    cached = _word_cache.get(word)
+    if cached is None:
+        starts = list(_TERMS_BY_FIRST_WORD.get(word, ()))
+        prefixes = tuple(p for p in _PREFIX_WORDS if word.startswith(p) and p != word)
+        for prefix in prefixes:
+            starts.extend(t for t in _TERMS_BY_FIRST_WORD.get(prefix, ()) if t.prefix and len(t.words) == 1)
+        if _DAY_NUMBER_RE.fullmatch(word):
+            starts.extend(_TERMS_BY_FIRST_WORD['#day_number'])
+        if len(_word_cache) > 10000:
+            _word_cache.clear()
+        cached = _word_cache[word] = (starts, prefixes)
+    return cached
+
+
+def _word_matches(term: _Term, index: int, word: str, prefixes: Tuple[str, ...]) -> bool:
+    expected = term.words[index]
+    if expected == word:
+        return True
+    return term.prefix and index == len(term.words) - 1 and expected in prefixes
+
+
+def match_patterns(transcript: str) -> List[bool]:
+    """
+    Evaluate every entry of PATTERNS against the transcript in one scan
+
+    Returns:
+        List of booleans, one per pattern (same order as PATTERNS)
+    """
+    text = transcript.lower()
+    matched = [False] * len(PATTERNS)
+    stage = [0] * len(PATTERNS)        # groups matched so far on the current line
+    last_end = [-1] * len(PATTERNS)    # word ordinal where the last matched group ended
+    partials: List[Tuple[_Term, int, int]] = []  # (term, next word index, start ordinal)
+    prev_end = -2
+    ordinal = 0
+
+    for m in _SCANNER.finditer(text):
+        word = m.group()
+        if word == '\n':
+            if partials:
+                partials = []
+            for i in range(len(stage)):
+                stage[i] = 0
+                last_end[i] = -1
+            prev_end = -2
+            continue
+
+        start = m.start()
+        ordinal += 1
+        starts, prefixes = _lookup(word)
+        completed = []
+
+        # Continue phrases from the previous word if they are directly adjacent
+        if partials:
+            separator = text[prev_end] if start - prev_end == 1 else None
+            still_open = []
+            if separator is not None:
+                for term, index, term_start in partials:
+                    if term.separators[index - 1] == separator and _word_matches(term, index, word, prefixes):
+                        if index + 1 == len(term.words):
+                            completed.append((term, term_start))
+                        else:
+                            still_open.append((term, index + 1, term_start))
+            partials = still_open
+
+        for term in starts:
+            if len(term.words) == 1:
+                completed.append((term, ordinal))
+            else:
+                partials.append((term, 1, ordinal))
+
+        for term, term_start in completed:
+            for pattern_index, group_index in term.slots:
+                if matched[pattern_index] or stage[pattern_index] != group_index:
+                    continue
+                if term_start <= last_end[pattern_index]:
+                    continue
+                stage[pattern_index] = group_index + 1
+                last_end[pattern_index] = ordinal
+                if group_index + 1 == _PATTERN_SIZES[pattern_index]:
+                    matched[pattern_index] = True
+
+        prev_end = m.end()
+
+    return matched
+
+
+def classify_transcript(transcript: str) -> Dict[str, int]:
+    """
+    Score a transcript
+
+    Returns:
+        Dict with 'confirmed', 'declined' and 'rescheduled' scores (number of
+        matching patterns) and 0/1 flags 'fallback_confirmed', 'negative_word',
+        'positive_word' and 'positive_language'
+    """
+    scores = {category: 0 for category, _ in PATTERNS}
+    for (category, _), hit in zip(PATTERNS, match_patterns(transcript)):
+        if hit:
+            scores[category] += 1
+    return scores
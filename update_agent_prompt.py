@@ -3,11 +3,11 @@ Update agent system prompt and welcome message
 This script updates the agent configuration in Bolna Dashboard with the fixed prompt
 """
 
-import requests
 import json
 import os
 from config import BOLNA_API_BASE, BOLNA_API_KEY, AGENT_ID
 from system_prompt import SYSTEM_PROMPT, INTRO_PROMPT
+from bolna_http import get_bolna_http
 
 def get_current_agent():
     """Get current agent configuration"""
@@ -18,7 +18,7 @@ def get_current_agent():
     }
     
     try:
-        response = requests.get(url, headers=headers)
+        response = get_bolna_http().get(url, operation='agent', headers=headers)
         response.raise_for_status()
         return response.json()
     except Exception as e:
@@ -56,7 +56,7 @@ def update_agent(agent_data):
     
     try:
         print(f"📤 Updating agent {AGENT_ID} with fixed prompts...")
-        response = requests.put(url, headers=headers, json=payload)
+        response = get_bolna_http().put(url, operation='agent', headers=headers, json=payload)
         response.raise_for_status()
         return response.json()
     except Exception as e:
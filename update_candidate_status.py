@@ -6,6 +6,15 @@ import json
 import re
 from typing import Dict, Any, Optional
 from slot_converter import convert_slot_to_interview_format
+from candidate_store import get_candidate_store
+from transcript_classifier import classify_transcript
+
+# Slot patterns, compiled once at import
+SLOT_TIME_RE = re.compile(r'(\d{1,2}):(\d{2})\s*(A\.M\.|P\.M\.)', re.IGNORECASE)
+TRANSCRIPT_SLOT_RE = re.compile(
+    r'(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)[,\s]+(?:the\s+)?(\d{1,2})(?:st|nd|rd|th)?\s+of\s+(\w+)[,\s]+at\s+(\d{1,2}):(\d{2})\s+(A\.M\.|P\.M\.)',
+    re.IGNORECASE
+)
 
 def parse_call_outcome(execution_details: Dict[str, Any], transcript: Optional[str] = None) -> Dict[str, Any]:
     """
@@ -103,56 +112,22 @@ def parse_call_outcome(execution_details: Dict[str, Any], transcript: Optional[s
     
     # Fallback: Parse transcript for keywords (more comprehensive)
     if status == "pending" and transcript:
-        transcript_lower = transcript.lower()
-        transcript_full = transcript  # Keep original for pattern matching
-        
         print(f"📝 Parsing transcript (length: {len(transcript)} chars)...")
         print(f"📝 Transcript preview: {transcript[:200]}...")
         
-        # Strong indicators for CONFIRMED
-        confirmed_patterns = [
-            r'\b(confirmed|confirm|confirmation)\b',
-            r'\b(yes|yeah|sure|okay|ok|alright|sounds good|that works|perfect)\b.*\b(interview|slot|time)\b',
-            r'\b(i will|i\'ll|i can).*\b(attend|come|be there)\b',
-            r'\b(see you|looking forward|thank you).*\b(confirmation|confirm)\b'
-        ]
-        
-        # Strong indicators for DECLINED
-        # ⚠️ Be careful: Only mark as declined if candidate explicitly declined
-        # Wrong person answering should NOT be marked as declined
-        declined_patterns = [
-            r'\b(declined|decline|not interested|no longer interested)\b',
-            r'\b(i don\'t want|i do not want).*\b(interview|position|job)\b',
-            r'\b(remove|withdraw|not pursuing).*\b(application|position)\b',
-            r'\b(no thank you|no thanks).*\b(not interested|not pursuing)\b'
-        ]
-        
-        # Patterns that indicate WRONG PERSON (NOT declined)
-        wrong_person_patterns = [
-            r'\b(i\'m|this is|i am)\s+[a-z]+\s*(?!{name})',  # Someone says "I'm [different name]"
-            r'\b(wrong number|wrong person|not [name])\b',
-            r'\b(trying to reach|looking for)\s+{name}'
-        ]
-        
-        # Strong indicators for RESCHEDULED
-        rescheduled_patterns = [
-            r'\b(rescheduled|reschedule|change|different|another)\b.*\b(time|slot|date|day)\b',
-            r'\b(monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b.*\b(\d{1,2}(?:st|nd|rd|th)?)\b.*\b(december|january|february|march|april|may|june|july|august|september|october|november)\b',
-            r'\b(new|different|another)\b.*\b(slot|time|date)\b',
-            r'\b(change|switch|move).*\b(to|for)\b.*\b(monday|tuesday|wednesday|thursday|friday)\b'
-        ]
-        
-        # Check for confirmed (highest priority)
-        confirmed_score = sum(1 for pattern in confirmed_patterns if re.search(pattern, transcript_lower, re.IGNORECASE))
-        declined_score = sum(1 for pattern in declined_patterns if re.search(pattern, transcript_lower, re.IGNORECASE))
-        rescheduled_score = sum(1 for pattern in rescheduled_patterns if re.search(pattern, transcript_full, re.IGNORECASE))
+        # All keyword patterns are scored in a single pass (see transcript_classifier.py).
+        # ⚠️ Wrong person answering should NOT be marked as declined - only explicit declines count
+        scores = classify_transcript(transcript)
+        confirmed_score = scores['confirmed']
+        declined_score = scores['declined']
+        rescheduled_score = scores['rescheduled']
         
         print(f"📊 Pattern scores - Confirmed: {confirmed_score}, Declined: {declined_score}, Rescheduled: {rescheduled_score}")
         
         # Determine status based on scores
         if rescheduled_score > 0 and rescheduled_score >= declined_score:
             status = 'rescheduled'
-            updated_interview = extract_slot_from_transcript(transcript_full)
+            updated_interview = extract_slot_from_transcript(transcript)
             print(f"✅ Detected RESCHEDULED - New slot: {updated_interview}")
         elif declined_score > 0 and declined_score > confirmed_score:
             status = 'declined'
@@ -162,15 +137,15 @@ def parse_call_outcome(execution_details: Dict[str, Any], transcript: Optional[s
             print(f"✅ Detected CONFIRMED")
         else:
             # Fallback: Look for specific phrases
-            if re.search(r'\b(great|perfect|thank you|sounds good)\b.*\b(confirmation|confirm|confirmed)\b', transcript_lower):
+            if scores['fallback_confirmed']:
                 status = 'confirmed'
                 print(f"✅ Detected CONFIRMED (fallback)")
-            elif re.search(r'\b(not|no|decline|cancel|withdraw)\b', transcript_lower) and not re.search(r'\b(yes|sure|okay|confirm)\b', transcript_lower):
+            elif scores['negative_word'] and not scores['positive_word']:
                 status = 'declined'
                 print(f"✅ Detected DECLINED (fallback)")
             else:
                 # Default to confirmed if we see positive language
-                if re.search(r'\b(yes|sure|okay|alright|perfect|great|thank you)\b', transcript_lower):
+                if scores['positive_language']:
                     status = 'confirmed'
                     print(f"✅ Detected CONFIRMED (default positive)")
                 else:
@@ -202,7 +177,7 @@ def parse_slot_string(slot_string: str) -> Optional[Dict[str, str]]:
                 break
         
         # Look for time patterns (e.g., "2:00 P.M.", "10:00 A.M.")
-        time_match = re.search(r'(\d{1,2}):(\d{2})\s*(A\.M\.|P\.M\.)', slot_string, re.IGNORECASE)
+        time_match = SLOT_TIME_RE.search(slot_string)
         time = None
         if time_match:
             hour = time_match.group(1)
@@ -232,8 +207,7 @@ def extract_slot_from_transcript(transcript: str) -> Optional[Dict[str, str]]:
     Extract rescheduled slot information from transcript
     """
     # Look for patterns like "Monday, the 15th of December at 2:00 P.M."
-    slot_pattern = r'(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)[,\s]+(?:the\s+)?(\d{1,2})(?:st|nd|rd|th)?\s+of\s+(\w+)[,\s]+at\s+(\d{1,2}):(\d{2})\s+(A\.M\.|P\.M\.)'
-    match = re.search(slot_pattern, transcript, re.IGNORECASE)
+    match = TRANSCRIPT_SLOT_RE.search(transcript)
     
     if match:
         day = match.group(1)
@@ -254,7 +228,7 @@ def extract_slot_from_transcript(transcript: str) -> Optional[Dict[str, str]]:
 
 def update_candidate_in_json(candidate_id: int, status: str, updated_interview: Optional[Dict[str, str]] = None):
     """
-    Update candidate status and interview info in candidates.json
+    Update candidate status and interview info in the candidate store
     
     Args:
         candidate_id: ID of the candidate
@@ -262,38 +236,13 @@ def update_candidate_in_json(candidate_id: int, status: str, updated_interview:
         updated_interview: Updated interview details if rescheduled
     """
     try:
-        import os
-        # Use absolute path to ensure we're always using the same file
-        # Get the directory where this script is located
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        json_path = os.path.join(script_dir, 'data', 'candidates.json')
-        
-        # Fallback to relative path if absolute doesn't exist
-        if not os.path.exists(json_path):
-            json_path = 'data/candidates.json'
-            if not os.path.exists(json_path):
-                # Try from current working directory
-                current_dir = os.getcwd()
-                json_path = os.path.join(current_dir, 'data', 'candidates.json')
-        
-        # Normalize the path to ensure consistency
-        json_path = os.path.abspath(json_path)
-        
-        print(f"📁 Updating candidate status - Using path: {json_path}")
-        
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        store = get_candidate_store()
+        changes = {}
         
-        # Find the candidate
-        candidate = next((c for c in data['candidates'] if c['id'] == candidate_id), None)
-        
-        if candidate:
-            old_status = candidate.get('status', 'unknown')
+        def apply_update(candidate):
+            changes['old_status'] = candidate.get('status', 'unknown')
             candidate['status'] = status
             
-            print(f"📝 Updating candidate {candidate_id}: {old_status} → {status}")
-            print(f"   File path: {json_path}")
-            
             # Update interview details if rescheduled
             if status == 'rescheduled' and updated_interview:
                 # Preserve original interview if not already stored
@@ -310,38 +259,22 @@ def update_candidate_in_json(candidate_id: int, status: str, updated_interview:
                     'datetime': updated_interview.get('datetime', candidate['scheduledInterview']['datetime'])
                 }
                 print(f"📅 Updated interview: {old_interview['datetime']} → {candidate['scheduledInterview']['datetime']}")
-            
-            # Write back to file with proper error handling
-            try:
-                with open(json_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
-                
-                # Verify write was successful
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    verify_data = json.load(f)
-                    verify_candidate = next((c for c in verify_data.get('candidates', []) if c['id'] == candidate_id), None)
-                    if verify_candidate and verify_candidate.get('status') == status:
-                        print(f"✅ Successfully updated candidate {candidate_id} in {json_path}")
-                        print(f"   Status: {old_status} → {status}")
-                        return True
-                    else:
-                        print(f"⚠️  Status update verification failed. Expected {status}, got {verify_candidate.get('status') if verify_candidate else 'candidate not found'}")
-                        return False
-            except PermissionError as pe:
-                print(f"❌ Permission error writing to {json_path}: {pe}")
-                return False
-            except Exception as write_error:
-                print(f"❌ Error writing to {json_path}: {write_error}")
-                import traceback
-                traceback.print_exc()
-                return False
+        
+        try:
+            candidate = store.update_candidate(candidate_id, apply_update)
+        except PermissionError as pe:
+            print(f"❌ Permission error updating candidate store ({store.describe()}): {pe}")
+            return False
+        
+        if candidate:
+            print(f"✅ Successfully updated candidate {candidate_id} in {store.describe()}")
+            print(f"   Status: {changes['old_status']} → {status}")
+            return True
         else:
-            print(f"❌ Candidate {candidate_id} not found in candidates.json")
-            print(f"   Available IDs: {[c['id'] for c in data['candidates']]}")
+            print(f"❌ Candidate {candidate_id} not found in candidate store")
             return False
     except Exception as e:
         import traceback
         print(f"❌ Error updating candidate: {e}")
         traceback.print_exc()
         return False
-
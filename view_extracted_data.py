@@ -6,19 +6,38 @@ Shows the structured extraction data (call_outcome, original_slot, final_slot, n
 import json
 import os
 from datetime import datetime
+from webhook_store import get_webhook_log
+
+def load_from_event_log():
+    """Load stored webhooks from the event log in webhook_logs.json format (oldest first)"""
+    entries = list(get_webhook_log(background=False).iter_latest())
+    return [
+        {
+            'timestamp': entry.get('timestamp', 'Unknown'),
+            'payload': {
+                **(entry.get('payload') or {}),
+                'execution_id': entry.get('execution_id'),
+                'status': entry.get('status'),
+                'extracted_data': entry.get('extracted_data') or {}
+            }
+        }
+        for entry in reversed(entries)
+    ]
 
 def view_extracted_data(limit=10):
     """View extracted data from webhook logs"""
     webhook_log_file = 'webhook_logs.json'
     
-    if not os.path.exists(webhook_log_file):
-        print(f"❌ {webhook_log_file} not found")
-        print("   This file is created when webhooks are received.")
-        return
-    
     try:
-        with open(webhook_log_file, 'r', encoding='utf-8') as f:
-            webhook_logs = json.load(f)
+        webhook_logs = load_from_event_log()
+        
+        if not webhook_logs:
+            if not os.path.exists(webhook_log_file):
+                print(f"❌ No webhook data in the event log and {webhook_log_file} not found")
+                print("   Webhook data is stored when webhooks are received.")
+                return
+            with open(webhook_log_file, 'r', encoding='utf-8') as f:
+                webhook_logs = json.load(f)
         
         if not webhook_logs:
             print("📭 No webhook logs found")
@@ -1,11 +1,12 @@
 """
-View all stored webhook data from data/webhook_data.json
+View all stored webhook data from the webhook event log (data/webhook_log/)
 Shows complete webhook payloads, extracted_data, transcripts, and more
 """
 
 import json
 import os
 from datetime import datetime
+from webhook_store import get_webhook_log
 
 def view_webhook_data(execution_id: str = None, limit: int = 10, show_full: bool = False):
     """
@@ -16,56 +17,45 @@ def view_webhook_data(execution_id: str = None, limit: int = 10, show_full: bool
         limit: Number of recent entries to show
         show_full: Show full payload (default: False, shows summary)
     """
-    webhook_data_file = 'data/webhook_data.json'
-    
-    if not os.path.exists(webhook_data_file):
-        print(f"❌ {webhook_data_file} not found")
-        print("   This file is created when webhooks are received.")
-        return
-    
     try:
-        with open(webhook_data_file, 'r', encoding='utf-8') as f:
-            webhook_data = json.load(f)
+        webhook_log = get_webhook_log(background=False)
         
         # If specific execution_id requested
         if execution_id:
-            if execution_id in webhook_data:
-                entry = webhook_data[execution_id]
+            entry = webhook_log.get(execution_id)
+            if entry:
                 print(f"\n{'='*70}")
                 print(f"📊 Webhook Data for Execution: {execution_id}")
                 print(f"{'='*70}\n")
                 print_json_entry(entry, show_full=True)
             else:
                 print(f"❌ Execution ID '{execution_id}' not found")
-                print(f"   Available execution IDs: {list(k for k in webhook_data.keys() if k != 'all_webhooks')[:10]}")
+                print(f"   Available execution IDs: {webhook_log.execution_ids()[-10:]}")
             return
         
-        # Show recent entries from chronological list
-        all_webhooks = webhook_data.get('all_webhooks', [])
+        # Show recent entries (most recently received first)
+        total = webhook_log.count()
         
-        if not all_webhooks:
+        if not total:
             print("📭 No webhook data found")
+            print("   Webhook data is stored when webhooks are received.")
             return
         
         print(f"\n{'='*70}")
         print(f"📊 Stored Webhook Data")
         print(f"{'='*70}\n")
-        print(f"Total executions: {len([k for k in webhook_data.keys() if k != 'all_webhooks'])}")
-        print(f"Showing last {min(limit, len(all_webhooks))} entries:\n")
+        print(f"Total executions: {total}")
+        print(f"Showing last {min(limit, total)} entries:\n")
         
-        for i, entry_summary in enumerate(all_webhooks[:limit], 1):
-            exec_id = entry_summary['execution_id']
-            entry = webhook_data.get(exec_id, {})
-            
+        for i, entry in enumerate(webhook_log.iter_latest(limit), 1):
             print(f"{'─'*70}")
             print(f"📋 Entry #{i}")
-            print(f"   Execution ID: {exec_id}")
-            print(f"   Candidate ID: {entry_summary.get('candidate_id', 'N/A')}")
-            print(f"   Timestamp: {entry_summary.get('timestamp', 'N/A')}")
-            print(f"   Status: {entry_summary.get('status', 'N/A')}")
+            print(f"   Execution ID: {entry.get('execution_id')}")
+            print(f"   Candidate ID: {entry.get('candidate_id', 'N/A')}")
+            print(f"   Timestamp: {entry.get('timestamp', 'N/A')}")
+            print(f"   Status: {entry.get('status', 'N/A')}")
             
-            if entry:
-                print_json_entry(entry, show_full=show_full)
+            print_json_entry(entry, show_full=show_full)
             print()
         
         print(f"{'='*70}\n")
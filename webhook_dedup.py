@@ -0,0 +1,121 @@
+"""
+Webhook delivery deduplication
+Bolna re-delivers webhooks and sends several status updates per execution;
+this filters out duplicate and stale deliveries before any disk I/O happens
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+from config import WEBHOOK_DEDUP_CACHE_SIZE
+
+# Statuses after which an execution can no longer move back to "in progress"
+TERMINAL_STATUSES = {
+    'completed', 'ended', 'stopped', 'finished',
+    'no_answer', 'no-answer', 'no answer',
+    'failed', 'error', 'cancelled', 'canceled', 'cut', 'terminated',
+    'hung_up', 'disconnected', 'busy', 'rejected'
+}
+
+
+def payload_fingerprint(payload: Dict[str, Any]) -> str:
+    """Content hash of a webhook payload (key order independent)"""
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()
+
+
+class WebhookDeduplicator:
+    """
+    Remembers the last accepted delivery per execution_id (bounded LRU)
+
+    A delivery is skipped when it is:
+      - a duplicate: same content hash, or same status + updated_at
+      - stale: updated_at older than the last accepted one, or a non-terminal
+        status arriving after a terminal one
+    """
+
+    def __init__(self, max_entries: int = WEBHOOK_DEDUP_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._seen: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            'checked': 0,
+            'accepted': 0,
+            'duplicates': 0,
+            'stale': 0,
+            # Deliveries whose webhook log append, transcript rewrite and
+            # candidate status update were skipped
+            'writes_avoided': 0
+        }
+
+    def check(self, execution_id: str, payload: Dict[str, Any], status: str, updated_at: Optional[str]) -> Optional[str]:
+        """
+        Check a delivery and record it if it is new
+
+        Args:
+            execution_id: Execution the webhook belongs to
+            payload: Raw webhook payload
+            status: Lower-cased call status
+            updated_at: Bolna's updated_at for the execution, if present
+
+        Returns:
+            None if the delivery should be processed, otherwise 'duplicate' or 'stale'
+        """
+        fingerprint = payload_fingerprint(payload)
+        with self._lock:
+            self.stats['checked'] += 1
+            previous = self._seen.get(execution_id)
+            reason = None
+
+            if previous:
+                if previous['hash'] == fingerprint:
+                    reason = 'duplicate'
+                elif updated_at and previous['updated_at']:
+                    if updated_at < previous['updated_at']:
+                        reason = 'stale'
+                    elif updated_at == previous['updated_at'] and status == previous['status']:
+                        reason = 'duplicate'
+                if reason is None and previous['status'] in TERMINAL_STATUSES and status not in TERMINAL_STATUSES:
+                    reason = 'stale'
+
+            if reason:
+                self.stats['duplicates' if reason == 'duplicate' else 'stale'] += 1
+                self.stats['writes_avoided'] += 1
+                self._seen.move_to_end(execution_id)
+                return reason
+
+            self._seen[execution_id] = {
+                'hash': fingerprint,
+                'status': status,
+                'updated_at': updated_at or (previous or {}).get('updated_at')
+            }
+            self._seen.move_to_end(execution_id)
+            while len(self._seen) > self.max_entries:
+                self._seen.popitem(last=False)
+            self.stats['accepted'] += 1
+            return None
+
+    def forget(self, execution_id: str):
+        """Drop the record for an execution so a redelivery is processed again (used when processing fails)"""
+        with self._lock:
+            self._seen.pop(execution_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, tracked_executions=len(self._seen))
+
+
+_deduplicator = None
+_deduplicator_lock = threading.Lock()
+
+
+def get_webhook_deduplicator() -> WebhookDeduplicator:
+    """Get the process-wide webhook deduplicator"""
+    global _deduplicator
+    if _deduplicator is None:
+        with _deduplicator_lock:
+            if _deduplicator is None:
+                _deduplicator = WebhookDeduplicator()
+    return _deduplicator
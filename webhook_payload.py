@@ -0,0 +1,122 @@
+"""
+Normalized Bolna webhook / execution payload
+Resolves every field's fallback chain (top-level payload -> nested data/execution
+-> telephony_data) once, so webhook consumers don't re-probe the raw dicts
+"""
+
+from typing import Dict, Any
+
+# Fields stored in webhook event log entries, in entry order
+STORED_FIELDS = (
+    'status', 'transcript', 'summary', 'extracted_data', 'recipient_phone_number',
+    'agent_phone_number', 'telephony_data', 'recording_url', 'conversation_duration',
+    'total_cost', 'cost_breakdown', 'usage_breakdown', 'context_details', 'latency_data',
+    'agent_id', 'batch_id', 'created_at', 'updated_at', 'answered_by_voice_mail',
+    'error_message', 'agent_extraction', 'provider'
+)
+
+
+class WebhookPayload:
+    """
+    A webhook payload (or execution details from the Bolna API) with every
+    field resolved once
+
+    Attributes mirror the keys stored in the webhook event log; `raw` is the
+    original payload, `details` the nested execution dict and `telephony_data`
+    the resolved telephony dict.
+    """
+
+    __slots__ = ('raw', 'details', 'execution_id') + STORED_FIELDS
+
+    def __init__(self, payload: Dict[str, Any]):
+        """
+        Args:
+            payload: Raw webhook payload or execution details dict
+        """
+        if not isinstance(payload, dict):
+            payload = {}
+        # Bolna sends a flat payload; older formats nest it under data/execution
+        details = payload.get('data') or payload.get('execution') or payload
+        if not isinstance(details, dict):
+            details = payload
+
+        # Bound methods as locals: each field is a short chain of dict lookups
+        p = payload.get
+        d = details.get
+        telephony_data = p('telephony_data') or d('telephony_data') or {}
+        if not isinstance(telephony_data, dict):
+            telephony_data = {}
+        t = telephony_data.get
+
+        self.raw = payload
+        self.details = details
+        self.telephony_data = telephony_data
+        self.execution_id = (
+            p('id') or p('execution_id') or p('executionId') or
+            d('id') or d('execution_id') or d('executionId')
+        )
+        self.status = p('status') or d('status') or 'unknown'
+        self.transcript = (
+            p('transcript') or p('conversation_transcript') or
+            d('transcript') or d('conversation_transcript') or
+            d('call_transcript') or d('transcript_text') or ''
+        )
+        self.summary = p('summary') or d('summary') or ''
+        self.extracted_data = p('extracted_data') or d('extracted_data') or {}
+        self.recipient_phone_number = (
+            p('user_number') or p('recipient_phone_number') or p('phone_number') or p('phone') or
+            d('user_number') or d('recipient_phone_number') or t('to_number') or None
+        )
+        self.agent_phone_number = (
+            p('agent_number') or p('agent_phone_number') or t('from_number') or p('caller_id') or None
+        )
+        self.recording_url = t('recording_url') or p('recording_url') or d('recording_url') or t('recording') or ''
+        self.conversation_duration = p('conversation_duration') or d('conversation_duration') or t('duration') or None
+        self.total_cost = p('total_cost') or d('total_cost') or None
+        self.cost_breakdown = p('cost_breakdown') or d('cost_breakdown') or {}
+        self.usage_breakdown = p('usage_breakdown') or d('usage_breakdown') or {}
+        self.context_details = p('context_details') or d('context_details') or {}
+        self.latency_data = p('latency_data') or d('latency_data') or {}
+        self.agent_id = p('agent_id') or d('agent_id') or None
+        self.batch_id = p('batch_id') or d('batch_id') or None
+        self.created_at = p('created_at') or d('created_at') or None
+        self.updated_at = p('updated_at') or d('updated_at') or d('modified_at') or None
+        self.answered_by_voice_mail = p('answered_by_voice_mail') or d('answered_by_voice_mail') or None
+        self.error_message = p('error_message') or d('error_message') or None
+        self.agent_extraction = p('agent_extraction') or d('agent_extraction') or None
+        self.provider = p('provider') or d('provider') or t('provider') or None
+
+    @property
+    def status_lower(self) -> str:
+        """Status lower-cased for comparisons ('unknown' if missing)"""
+        return str(self.status).lower()
+
+    def stored_fields(self) -> Dict[str, Any]:
+        """Normalized fields as stored in a webhook event log entry"""
+        return {
+            'status': self.status,
+            'transcript': self.transcript,
+            'summary': self.summary,
+            'extracted_data': self.extracted_data,
+            'recipient_phone_number': self.recipient_phone_number,
+            'agent_phone_number': self.agent_phone_number,
+            'telephony_data': self.telephony_data,
+            'recording_url': self.recording_url,
+            'conversation_duration': self.conversation_duration,
+            'total_cost': self.total_cost,
+            'cost_breakdown': self.cost_breakdown,
+            'usage_breakdown': self.usage_breakdown,
+            'context_details': self.context_details,
+            'latency_data': self.latency_data,
+            'agent_id': self.agent_id,
+            'batch_id': self.batch_id,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'answered_by_voice_mail': self.answered_by_voice_mail,
+            'error_message': self.error_message,
+            'agent_extraction': self.agent_extraction,
+            'provider': self.provider
+        }
+
+    def __repr__(self) -> str:
+        return f"WebhookPayload(execution_id={self.execution_id!r}, status={self.status!r})"
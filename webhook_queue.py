@@ -0,0 +1,267 @@
+"""
+Asynchronous webhook ingestion queue
+Webhook payloads are journaled to disk and acknowledged immediately; a bounded
+worker pool does the actual processing (mapping lookup, storage, status update)
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Callable, Optional
+from config import (
+    WEBHOOK_WORKERS,
+    WEBHOOK_QUEUE_MAX,
+    WEBHOOK_QUEUE_FSYNC,
+    WEBHOOK_QUEUE_RETRIES,
+    WEBHOOK_QUEUE_RETRY_DELAY
+)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+WEBHOOK_JOURNAL_PATH = os.path.join(BASE_DIR, 'data', 'webhook_queue.jsonl')
+
+# Compact the journal down to its unacknowledged entries once it grew past this size
+JOURNAL_TRUNCATE_BYTES = 1024 * 1024
+
+
+class WebhookIngestQueue:
+    """
+    Durable, bounded webhook queue with a worker pool
+
+    Each enqueued payload is written to a JSONL journal as {"seq", "received_at",
+    "key", "payload"} before it is acknowledged; workers append {"ack": seq} once
+    the handler has succeeded. On startup every unacknowledged payload is
+    re-queued, so a restart never loses a webhook that Bolna was told we accepted.
+
+    Every worker has its own FIFO queue and payloads are routed by key (the
+    execution_id), so the updates for one call are handled one at a time and in
+    the order they arrived.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Dict[str, Any]], Any],
+        journal_path: str = WEBHOOK_JOURNAL_PATH,
+        workers: int = WEBHOOK_WORKERS,
+        maxsize: int = WEBHOOK_QUEUE_MAX,
+        fsync: bool = WEBHOOK_QUEUE_FSYNC
+    ):
+        """
+        Initialize the queue and start the workers
+
+        Args:
+            handler: Called on a worker thread with each payload (or its prepared
+                form); raising marks the payload as failed and retries it
+            journal_path: JSONL journal used for durability
+            workers: Number of worker threads (0: records stay queued, for tests)
+            maxsize: Maximum queued payloads; beyond this enqueue() rejects
+            fsync: fsync the journal before acknowledging
+        """
+        self.handler = handler
+        self.journal_path = journal_path
+        self.maxsize = maxsize
+        self.fsync = fsync
+        self._queues = [queue.Queue() for _ in range(max(workers, 1))]
+        self._journal_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._seq = 0
+        self._in_flight = 0
+        # Journaled records not yet acknowledged, by sequence number (what compaction keeps)
+        self._unacked: Dict[int, Dict[str, Any]] = {}
+        self._compacted_bytes = 0
+        self.stats = {
+            'enqueued': 0,
+            'processed': 0,
+            'failed': 0,
+            'retried': 0,
+            'dropped': 0,
+            'recovered': 0,
+            'last_lag_ms': 0.0,
+            'max_lag_ms': 0.0,
+            'total_lag_ms': 0.0
+        }
+
+        os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+        pending = self._recover()
+        self._journal = open(self.journal_path, 'ab')
+
+        for i in range(workers):
+            thread = threading.Thread(target=self._worker, args=(self._queues[i],), name=f'webhook-worker-{i + 1}', daemon=True)
+            thread.start()
+
+        for record in pending:
+            self._queue_for(record.get('key')).put(record)
+
+    def _queue_for(self, key: Any) -> "queue.Queue":
+        """The worker queue a key is pinned to"""
+        if key is None:
+            return min(self._queues, key=lambda q: q.qsize())
+        return self._queues[hash(key) % len(self._queues)]
+
+    def _depth(self) -> int:
+        return sum(q.qsize() for q in self._queues)
+
+    def _rewrite_journal(self, records):
+        """Replace the journal file with just `records` (callers hold the journal lock or run before the workers)"""
+        tmp_path = self.journal_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            for record in records:
+                f.write((json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+        self._compacted_bytes = os.path.getsize(self.journal_path)
+
+    def _recover(self):
+        """Read the journal, rewrite it with only unacknowledged entries and return them"""
+        if not os.path.exists(self.journal_path):
+            return []
+
+        pending = {}
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if 'ack' in record:
+                    pending.pop(record['ack'], None)
+                elif 'seq' in record:
+                    pending[record['seq']] = record
+                    self._seq = max(self._seq, record['seq'])
+
+        records = list(pending.values())
+        self._rewrite_journal(records)
+
+        self._unacked.update(pending)
+        if records:
+            self.stats['recovered'] = len(records)
+            print(f"♻️  Re-queued {len(records)} unprocessed webhook(s) from {self.journal_path}")
+        return records
+
+    def _write_journal(self, record: Dict[str, Any], sync: bool):
+        self._journal.write((json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8'))
+        self._journal.flush()
+        if sync:
+            os.fsync(self._journal.fileno())
+
+    def enqueue(self, payload: Dict[str, Any], prepared: Any = None, key: Optional[str] = None) -> Optional[int]:
+        """
+        Durably enqueue a raw webhook payload
+
+        Args:
+            payload: Raw webhook payload (this is what gets journaled)
+            prepared: Optional already-parsed form of the payload, handed to the
+                handler instead of the raw dict (kept in memory only; payloads
+                replayed from the journal arrive raw)
+            key: Ordering key (execution_id); payloads with the same key are
+                processed one at a time, in enqueue order
+
+        Returns:
+            Sequence number, or None if the queue is full (the payload is
+            dropped and the caller should ask the sender to retry)
+        """
+        with self._journal_lock:
+            if self._depth() >= self.maxsize:
+                with self._stats_lock:
+                    self.stats['dropped'] += 1
+                return None
+            self._seq += 1
+            record = {
+                'seq': self._seq,
+                'received_at': time.time(),
+                'key': key,
+                'payload': payload
+            }
+            self._write_journal(record, sync=self.fsync)
+            self._unacked[record['seq']] = record
+            if prepared is not None:
+                record = dict(record, prepared=prepared)
+            self._queue_for(key).put_nowait(record)
+        with self._stats_lock:
+            self.stats['enqueued'] += 1
+        return record['seq']
+
+    def _ack(self, seq: int):
+        with self._journal_lock:
+            self._write_journal({'ack': seq}, sync=False)
+            self._unacked.pop(seq, None)
+            # Rewrite the journal with only the unacknowledged records once it has
+            # grown well past what they take up, or everything is acknowledged.
+            # (Tracked against the journal, not the queues: a worker that has
+            # just taken a record off its queue has not acknowledged it yet.)
+            size = self._journal.tell()
+            if size > JOURNAL_TRUNCATE_BYTES and (not self._unacked or size > 2 * self._compacted_bytes):
+                self._journal.close()
+                self._rewrite_journal([self._unacked[s] for s in sorted(self._unacked)])
+                self._journal = open(self.journal_path, 'ab')
+
+    def _handle(self, record: Dict[str, Any]) -> bool:
+        """Run the handler, retrying with backoff. Returns False if every attempt failed."""
+        for attempt in range(WEBHOOK_QUEUE_RETRIES + 1):
+            if attempt:
+                with self._stats_lock:
+                    self.stats['retried'] += 1
+                time.sleep(WEBHOOK_QUEUE_RETRY_DELAY * 2 ** (attempt - 1))
+            try:
+                self.handler(record.get('prepared') or record['payload'])
+                return True
+            except Exception as e:
+                import traceback
+                print(f"❌ Error processing queued webhook #{record['seq']} (attempt {attempt + 1}): {e}")
+                traceback.print_exc()
+        return False
+
+    def _worker(self, records: "queue.Queue"):
+        while True:
+            record = records.get()
+            lag_ms = (time.time() - record['received_at']) * 1000
+            with self._stats_lock:
+                self._in_flight += 1
+                self.stats['last_lag_ms'] = round(lag_ms, 2)
+                self.stats['max_lag_ms'] = round(max(self.stats['max_lag_ms'], lag_ms), 2)
+                self.stats['total_lag_ms'] += lag_ms
+            try:
+                # Retried in place so later updates for the same execution keep waiting behind it
+                processed = self._handle(record)
+                with self._stats_lock:
+                    self.stats['processed' if processed else 'failed'] += 1
+                if processed:
+                    self._ack(record['seq'])
+                else:
+                    # Left unacknowledged: kept through compaction and replayed on the next start
+                    print(f"⚠️  Giving up on queued webhook #{record['seq']} until restart")
+            finally:
+                with self._stats_lock:
+                    self._in_flight -= 1
+                records.task_done()
+
+    def join(self):
+        """Block until every queued payload has been handled"""
+        for records in self._queues:
+            records.join()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, in-flight count, processing lag and drop counters"""
+        with self._stats_lock:
+            handled = self.stats['processed'] + self.stats['failed']
+            return {
+                'depth': self._depth(),
+                'max_depth': self.maxsize,
+                'in_flight': self._in_flight,
+                'enqueued': self.stats['enqueued'],
+                'processed': self.stats['processed'],
+                'failed': self.stats['failed'],
+                'retried': self.stats['retried'],
+                'unacked': len(self._unacked),
+                'dropped': self.stats['dropped'],
+                'recovered': self.stats['recovered'],
+                'last_lag_ms': self.stats['last_lag_ms'],
+                'max_lag_ms': self.stats['max_lag_ms'],
+                'avg_lag_ms': round(self.stats['total_lag_ms'] / handled, 2) if handled else 0.0,
+                'as_of': datetime.now().isoformat()
+            }
@@ -0,0 +1,434 @@
+"""
+Append-only webhook event log
+Stores webhook entries as JSONL segments in data/webhook_log/ with an in-memory
+execution_id -> offset index, instead of rewriting data/webhook_data.json on every webhook
+"""
+
+import atexit
+import contextlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+from config import (
+    WEBHOOK_LOG_SEGMENT_BYTES,
+    WEBHOOK_LOG_FSYNC_BATCH,
+    WEBHOOK_LOG_FSYNC_INTERVAL,
+    WEBHOOK_LOG_COMPACT_INTERVAL
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process locking only
+    fcntl = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+WEBHOOK_LOG_DIR = os.path.join(BASE_DIR, 'data', 'webhook_log')
+WEBHOOK_DATA_JSON_PATH = os.path.join(BASE_DIR, 'data', 'webhook_data.json')
+
+SEGMENT_PATTERN = re.compile(r'^segment-(\d+)\.jsonl$')
+
+# Held (flock) by appenders and the compactor exclusively, by readers shared
+LOCK_FILE = 'log.lock'
+# Bumped by every compaction; other processes rebuild their index when it changes
+GENERATION_FILE = 'GENERATION'
+
+
+class WebhookEventLog:
+    """
+    Append-only JSONL segment log of webhook entries
+
+    Every save appends one line to the active segment. The index maps each
+    execution_id to the (segment, offset) of its latest record and is rebuilt
+    by scanning the segments at startup. A background compactor rewrites sealed
+    segments keeping only the latest record per execution.
+
+    Several processes may share the log (API server, execution sync, backfill
+    scripts). They coordinate through an flock on log.lock, and compaction bumps
+    the GENERATION file so the others know their offsets are stale.
+    """
+
+    def __init__(
+        self,
+        log_dir: str = WEBHOOK_LOG_DIR,
+        legacy_path: Optional[str] = WEBHOOK_DATA_JSON_PATH,
+        background: bool = True,
+        segment_bytes: int = WEBHOOK_LOG_SEGMENT_BYTES
+    ):
+        """
+        Initialize the event log
+
+        Args:
+            log_dir: Directory holding the segment files
+            legacy_path: data/webhook_data.json to import if the log is empty
+            background: Run the fsync/compaction thread (only the API server should)
+            segment_bytes: Size at which the active segment is sealed
+        """
+        self.log_dir = os.path.abspath(log_dir)
+        self.segment_bytes = segment_bytes
+        os.makedirs(self.log_dir, exist_ok=True)
+        self._lock_file = open(os.path.join(self.log_dir, LOCK_FILE), 'a+b')
+
+        self._lock = threading.RLock()
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._scanned: Dict[int, int] = {}
+        self._segment_records: Dict[int, int] = {}
+        self._generation = 0
+        self._active_segment: Optional[int] = None
+        self._active_file = None
+        self._pending_fsync = 0
+        self._stop = threading.Event()
+        self.stats = {
+            'appended': 0,
+            'fsyncs': 0,
+            'compactions': 0,
+            'records_compacted_away': 0
+        }
+
+        self._rebuild_index()
+
+        if legacy_path and not self._list_segments() and os.path.exists(legacy_path):
+            self.import_legacy_json(legacy_path)
+
+        if background:
+            thread = threading.Thread(target=self._background_loop, name='webhook-log', daemon=True)
+            thread.start()
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Segment bookkeeping
+    # ------------------------------------------------------------------
+
+    @contextlib.contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Cross-process lock on the whole log (callers hold self._lock)"""
+        if fcntl:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _read_generation(self) -> int:
+        try:
+            with open(os.path.join(self.log_dir, GENERATION_FILE), 'r') as f:
+                return int(f.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _write_generation(self, generation: int):
+        path = os.path.join(self.log_dir, GENERATION_FILE)
+        with open(path + '.tmp', 'w') as f:
+            f.write(str(generation))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + '.tmp', path)
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.log_dir, f'segment-{segment:06d}.jsonl')
+
+    def _list_segments(self) -> List[int]:
+        segments = []
+        for name in os.listdir(self.log_dir):
+            match = SEGMENT_PATTERN.match(name)
+            if match:
+                segments.append(int(match.group(1)))
+        return sorted(segments)
+
+    def _scan_segment(self, segment: int, start: int = 0):
+        """Index complete lines of a segment starting at byte offset `start`"""
+        try:
+            with open(self._segment_path(segment), 'rb') as f:
+                f.seek(start)
+                offset = start
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # partially written tail, picked up on the next scan
+                    try:
+                        execution_id = json.loads(line).get('execution_id')
+                    except ValueError:
+                        execution_id = None
+                    if execution_id:
+                        self._index.pop(execution_id, None)
+                        self._index[execution_id] = (segment, offset)
+                        self._segment_records[segment] = self._segment_records.get(segment, 0) + 1
+                    offset += len(line)
+                self._scanned[segment] = offset
+        except FileNotFoundError:
+            self._scanned.pop(segment, None)
+
+    def _rebuild_index(self):
+        with self._lock, self._file_lock(exclusive=False):
+            self._rebuild_index_locked()
+
+    def _rebuild_index_locked(self):
+        self._index = {}
+        self._scanned = {}
+        self._segment_records = {}
+        self._generation = self._read_generation()
+        for segment in self._list_segments():
+            self._scan_segment(segment)
+
+    def _catch_up(self):
+        """
+        Index records appended by other processes since the last scan
+        (callers hold self._lock and the file lock)
+        """
+        if self._read_generation() != self._generation:
+            # Another process compacted: every offset we hold may be stale
+            self._rebuild_index_locked()
+            return
+        segments = self._list_segments()
+        if any(s not in segments for s in self._scanned):
+            self._rebuild_index_locked()
+            return
+        for segment in segments:
+            size = os.path.getsize(self._segment_path(segment))
+            if size > self._scanned.get(segment, 0):
+                self._scan_segment(segment, self._scanned.get(segment, 0))
+
+    def _open_active(self):
+        if self._active_file is not None:
+            # Another process may have rolled to a newer segment
+            if not os.path.exists(self._segment_path(self._active_segment + 1)):
+                return self._active_file
+            self._close_active()
+        segments = self._list_segments()
+        self._active_segment = segments[-1] if segments else 1
+        self._active_file = open(self._segment_path(self._active_segment), 'ab')
+        return self._active_file
+
+    def _close_active(self):
+        if self._active_file is not None:
+            self._fsync()
+            self._active_file.close()
+            self._active_file = None
+
+    def _fsync(self):
+        if self._active_file is not None and self._pending_fsync:
+            self._active_file.flush()
+            os.fsync(self._active_file.fileno())
+            self._pending_fsync = 0
+            self.stats['fsyncs'] += 1
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def append(self, entry: Dict[str, Any]):
+        """Append a webhook entry (must contain execution_id)"""
+        execution_id = entry['execution_id']
+        line = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+
+        with self._lock, self._file_lock(exclusive=True):
+            # Rolling is checked under the file lock, so no process appends to a segment another has sealed
+            f = self._open_active()
+            f.seek(0, os.SEEK_END)
+            offset = f.tell()
+            f.write(line)
+            f.flush()
+
+            segment = self._active_segment
+            self._index.pop(execution_id, None)
+            self._index[execution_id] = (segment, offset)
+            self._segment_records[segment] = self._segment_records.get(segment, 0) + 1
+            if self._scanned.get(segment, 0) == offset:
+                self._scanned[segment] = offset + len(line)
+
+            self.stats['appended'] += 1
+            self._pending_fsync += 1
+            if self._pending_fsync >= WEBHOOK_LOG_FSYNC_BATCH:
+                self._fsync()
+
+            if offset + len(line) >= self.segment_bytes:
+                self._close_active()
+                self._active_file = open(self._segment_path(segment + 1), 'ab')
+                self._active_segment = segment + 1
+
+    def append_many(self, entries: List[Dict[str, Any]]):
+        """Append several entries and fsync once at the end"""
+        with self._lock:
+            for entry in entries:
+                self.append(entry)
+            self._fsync()
+
+    def _read(self, location: Tuple[int, int]) -> Dict[str, Any]:
+        segment, offset = location
+        with open(self._segment_path(segment), 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def get(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """Get the latest entry for an execution, or None"""
+        with self._lock, self._file_lock(exclusive=False):
+            if self._read_generation() != self._generation:
+                self._rebuild_index_locked()
+            location = self._index.get(execution_id)
+            if location is None:
+                self._catch_up()
+                location = self._index.get(execution_id)
+                if location is None:
+                    return None
+            try:
+                return self._read(location)
+            except (FileNotFoundError, ValueError):
+                self._rebuild_index_locked()
+                location = self._index.get(execution_id)
+                return self._read(location) if location else None
+
+    def __contains__(self, execution_id: str) -> bool:
+        with self._lock, self._file_lock(exclusive=False):
+            if execution_id not in self._index:
+                self._catch_up()
+            return execution_id in self._index
+
+    def count(self) -> int:
+        with self._lock, self._file_lock(exclusive=False):
+            self._catch_up()
+            return len(self._index)
+
+    def execution_ids(self) -> List[str]:
+        """All execution IDs, oldest first"""
+        with self._lock, self._file_lock(exclusive=False):
+            self._catch_up()
+            return list(self._index.keys())
+
+    def iter_latest(self, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the latest entry of each execution, most recently written first"""
+        with self._lock, self._file_lock(exclusive=False):
+            self._catch_up()
+            execution_ids = list(reversed(list(self._index.keys())))
+        if limit is not None:
+            execution_ids = execution_ids[:limit]
+        for execution_id in execution_ids:
+            entry = self.get(execution_id)
+            if entry is not None:
+                yield entry
+
+    def flush(self):
+        with self._lock:
+            self._fsync()
+
+    def close(self):
+        self._stop.set()
+        with self._lock:
+            self._close_active()
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    def compact(self) -> int:
+        """
+        Rewrite sealed segments keeping only the latest record per execution
+
+        Runs under the exclusive file lock after catching up with records other
+        processes appended, so no live record is missed. The surviving records
+        are written into the newest sealed segment's file (via a temp file +
+        rename) and the older sealed segments are deleted. Replay order stays
+        correct even if we crash in between, because the compacted segment sorts
+        after the ones it replaces. The generation is bumped first, so every
+        other process rebuilds its index instead of trusting old offsets.
+
+        Returns:
+            Number of superseded records dropped
+        """
+        with self._lock, self._file_lock(exclusive=True):
+            self._catch_up()
+            # The newest segment is the one everyone appends to
+            sealed = self._list_segments()[:-1]
+            if not sealed:
+                return 0
+            sealed_set = set(sealed)
+            live = [(eid, loc) for eid, loc in self._index.items() if loc[0] in sealed_set]
+            total = sum(self._segment_records.get(s, 0) for s in sealed)
+            if total <= len(live) and len(sealed) == 1:
+                return 0
+
+            target = sealed[-1]
+            tmp_path = self._segment_path(target) + '.compact'
+            new_locations = {}
+            with open(tmp_path, 'wb') as out:
+                for eid, (segment, offset) in live:
+                    with open(self._segment_path(segment), 'rb') as f:
+                        f.seek(offset)
+                        line = f.readline()
+                    new_locations[eid] = (target, out.tell())
+                    out.write(line)
+                out.flush()
+                os.fsync(out.fileno())
+                compacted_size = out.tell()
+
+            self._generation = self._read_generation() + 1
+            self._write_generation(self._generation)
+            os.replace(tmp_path, self._segment_path(target))
+            for segment in sealed[:-1]:
+                try:
+                    os.remove(self._segment_path(segment))
+                except FileNotFoundError:
+                    pass
+                self._scanned.pop(segment, None)
+                self._segment_records.pop(segment, None)
+            self._scanned[target] = compacted_size
+            self._segment_records[target] = len(live)
+            self._index.update(new_locations)
+
+        dropped = total - len(live)
+        self.stats['compactions'] += 1
+        self.stats['records_compacted_away'] += dropped
+        print(f"🗜️  Compacted {len(sealed)} webhook log segment(s): dropped {dropped} superseded record(s)")
+        return dropped
+
+    def _background_loop(self):
+        last_compaction = time.monotonic()
+        while not self._stop.wait(WEBHOOK_LOG_FSYNC_INTERVAL):
+            try:
+                self.flush()
+                if time.monotonic() - last_compaction >= WEBHOOK_LOG_COMPACT_INTERVAL:
+                    last_compaction = time.monotonic()
+                    self.compact()
+            except Exception as e:
+                print(f"⚠️  Webhook log background task error: {e}")
+
+    # ------------------------------------------------------------------
+    # Migration
+    # ------------------------------------------------------------------
+
+    def import_legacy_json(self, json_path: str = WEBHOOK_DATA_JSON_PATH) -> int:
+        """One-shot import of data/webhook_data.json into the log (oldest first)"""
+        with open(json_path, 'r', encoding='utf-8') as f:
+            webhook_data = json.load(f)
+
+        ordered_ids = [w.get('execution_id') for w in reversed(webhook_data.get('all_webhooks', []))]
+        listed = set(ordered_ids)
+        unlisted = [k for k in webhook_data.keys() if k != 'all_webhooks' and k not in listed]
+        entries = [
+            {'execution_id': eid, **webhook_data[eid]} for eid in unlisted + ordered_ids
+            if eid in webhook_data and isinstance(webhook_data[eid], dict)
+        ]
+        self.append_many(entries)
+        print(f"📥 Imported {len(entries)} webhook entries from {json_path} into {self.log_dir}")
+        return len(entries)
+
+
+_log = None
+_log_lock = threading.Lock()
+
+
+def get_webhook_log(background: bool = True) -> WebhookEventLog:
+    """
+    Get the process-wide webhook event log
+
+    Args:
+        background: Start the fsync/compaction thread. CLI tools pass False so
+                    only the API server compacts.
+    """
+    global _log
+    if _log is None:
+        with _log_lock:
+            if _log is None:
+                _log = WebhookEventLog(background=background)
+    return _log